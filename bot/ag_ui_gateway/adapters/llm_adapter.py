@@ -9,6 +9,8 @@ import uuid
 import time
 from loguru import logger
 
+from luka_bot.utils.log_budget import hot
+
 # Lazy import to avoid circular dependencies
 # from luka_bot.services.llm_service import LLMService
 
@@ -281,7 +283,7 @@ class LLMAdapter:
         full_response = ""
         
         try:
-            logger.info(f"🤖 LLM stream started: user={user_id}, thread={thread_id}")
+            logger.debug("🤖 LLM stream started: user={}, thread={}", user_id, thread_id)
             
             # Emit TEXT_MESSAGE_START event first
             yield AGUIProtocol.text_message_start(message_id)
@@ -294,8 +296,7 @@ class LLMAdapter:
                 thread = await self._ensure_thread_with_kb(user_id, thread_id)
             
             # Stream response from luka_bot LLM service
-            logger.debug(f"🔍 About to call llm_service.stream_response()")
-            logger.debug(f"   user_id={user_id}, thread_id={thread_id}, has_thread={thread is not None}")
+            logger.debug("🔍 Calling llm_service.stream_response(): user_id={}, thread_id={}, has_thread={}", user_id, thread_id, thread is not None)
             
             chunk_count = 0
             try:
@@ -307,10 +308,7 @@ class LLMAdapter:
                     save_history=True
                 ):
                     chunk_count += 1
-                    if chunk_count == 1:
-                        logger.debug(f"✅ First chunk received from llm_service!")
-                    elif chunk_count % 10 == 0:
-                        logger.debug(f"📊 Received {chunk_count} chunks so far...")
+                    hot.debug("📊 Chunk {} received from llm_service", chunk_count)
                     
                     # Check if chunk is a tool notification (dict with type)
                     if isinstance(chunk, dict) and chunk.get("type") == "tool_notification":
@@ -347,7 +345,7 @@ class LLMAdapter:
                         if chunk:
                             sanitized_chunk = self._sanitize_markdown(chunk)
                             if sanitized_chunk:
-                                logger.debug(f"📤 Yielding text chunk: {len(sanitized_chunk)} chars - '{sanitized_chunk[:100]}...'")
+                                hot.debug("📤 Yielding text chunk: {} chars", len(sanitized_chunk))
                                 # Emit text stream delta with sanitized Markdown
                                 yield AGUIProtocol.text_stream_delta(
                                     text=sanitized_chunk,
@@ -355,13 +353,13 @@ class LLMAdapter:
                                 )
                                 full_response += sanitized_chunk
                             else:
-                                logger.debug("⚠️  Sanitized chunk became empty after removing HTML, skipping")
+                                hot.debug("⚠️  Sanitized chunk became empty after removing HTML, skipping")
                         else:
-                            logger.debug("⚠️  Received empty string chunk, skipping")
+                            hot.debug("⚠️  Received empty string chunk, skipping")
                     else:
                         logger.warning(f"⚠️  Received unknown chunk type: {type(chunk)}")
                 
-                logger.debug(f"✅ llm_service.stream_response() completed, total chunks: {chunk_count}")
+                logger.debug("✅ llm_service.stream_response() completed, total chunks: {}", chunk_count)
                 
             except Exception as llm_error:
                 logger.error(f"❌ FATAL ERROR in llm_service.stream_response(): {llm_error}", exc_info=True)
@@ -375,7 +373,7 @@ class LLMAdapter:
                 full_text=full_response
             )
             
-            logger.info(f"✅ LLM stream complete: {len(full_response)} chars")
+            logger.info("✅ LLM stream complete: user={}, thread={}, {} chunks, {} chars", user_id, thread_id, chunk_count, len(full_response))
             
         except Exception as e:
             logger.error(f"❌ LLM streaming error: {e}")
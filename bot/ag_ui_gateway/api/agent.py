@@ -76,6 +76,7 @@ from ag_ui_gateway.adapters.task_adapter import get_task_adapter
 from ag_ui_gateway.adapters.catalog_adapter import get_catalog_adapter
 from ag_ui_gateway.adapters.command_adapter import get_command_adapter
 from ag_ui_gateway.services.ui_events import build_task_list_event, build_ui_context_event
+from luka_bot.utils.log_budget import hot
 
 router = APIRouter()
 
@@ -177,7 +178,7 @@ class LukaAgent:
         
         # Emit RUN_STARTED first (required by CopilotKit)
         run_id = f"run_{int(time.time()*1000)}"
-        logger.debug(f"🎬 agent.run() starting: run_id={run_id}, messages={len(messages) if messages else 0}")
+        logger.debug("🎬 agent.run() starting: run_id={}, messages={}", run_id, len(messages) if messages else 0)
         
         yield {
             "type": "RUN_STARTED",
@@ -186,7 +187,7 @@ class LukaAgent:
             "timestamp": int(time.time() * 1000)
         }
         
-        logger.debug(f"✅ Yielded RUN_STARTED for {run_id}")
+        logger.debug("✅ Yielded RUN_STARTED for {}", run_id)
 
         user_id_int, is_guest = self._resolve_user_id(user_id)
 
@@ -213,7 +214,7 @@ class LukaAgent:
             hasattr(msg, 'content') and not msg.content
         )]
         
-        logger.debug(f"📊 Filtered messages: {len(messages)} -> {len(filtered_messages)}")
+        logger.debug("📊 Filtered messages: {} -> {}", len(messages), len(filtered_messages))
         
         if not filtered_messages:
             logger.warning("All messages were empty placeholders")
@@ -236,8 +237,8 @@ class LukaAgent:
         last_message = filtered_messages[-1]
         message_content = last_message.content if hasattr(last_message, 'content') else str(last_message)
         
-        logger.info(f"Processing message for user {user_id}, thread {thread_id}: {message_content[:50]}...")
-        logger.debug(f"📝 Full message: role={getattr(last_message, 'role', 'unknown')}, content={message_content}")
+        logger.debug("Processing message for user {}, thread {}: {}...", user_id, thread_id, message_content[:50])
+        hot.debug("📝 Full message: role={}, content={}", getattr(last_message, 'role', 'unknown'), message_content)
         
         def _build_text_events(text: str, role: str = "assistant"):
             message_id = f"msg_{int(time.time()*1000)}"
@@ -362,10 +363,9 @@ class LukaAgent:
                     raw_user_id=user_id,
                 ):
                     event_count += 1
-                    event_type = event.get('type') if isinstance(event, dict) else type(event).__name__
-                    logger.debug(f"   → Yielding LLM event #{event_count}: {event_type}")
+                    hot.debug("   → Yielding LLM event #{}: {}", event_count, event.get('type') if isinstance(event, dict) else type(event).__name__)
                     yield event
-                logger.debug(f"✅ LLM adapter yielded {event_count} events total")
+                logger.debug("✅ LLM adapter yielded {} events total", event_count)
 
             task_list_event = await self._build_task_list_event(
                 user_id_int=user_id_int,
@@ -781,7 +781,7 @@ async def luka_agent_endpoint(input_data: RunAgentInput, request: Request, featu
                         id=msg_id
                     )
                 )
-                logger.debug(f"   Converted message: role={role}, content_len={len(content)}, id={msg_id}")
+                hot.debug("   Converted message: role={}, content_len={}, id={}", role, len(content), msg_id)
             
             input_data.messages = converted_messages
             
@@ -887,22 +887,22 @@ async def luka_agent_endpoint(input_data: RunAgentInput, request: Request, featu
                 event_type = event.get("type") if isinstance(event, dict) else "unknown"
                 
                 # Track run state to ensure proper cleanup
-                if event.get("type") == "RUN_STARTED":
+                if event_type == "RUN_STARTED":
                     run_started = True
                     run_id = event.get("runId")
-                    logger.debug(f"🚀 Run started: {run_id}")
-                elif event.get("type") == "RUN_FINISHED":
+                    logger.debug("🚀 Run started: {}", run_id)
+                elif event_type == "RUN_FINISHED":
                     run_finished = True
-                    logger.debug(f"✅ Run finished: {run_id}")
+                    logger.debug("✅ Run finished: {}", run_id)
                 else:
-                    logger.debug(f"📤 Event #{event_num}: {event_type}")
+                    hot.debug("📤 Event #{}: {}", event_num, event_type)
                 
                 # Encode and yield event
                 encoded = encoder.encode(event)
-                logger.debug(f"   Encoded length: {len(encoded)} bytes")
+                hot.debug("   Encoded length: {} bytes", len(encoded))
                 yield encoded
             
-            logger.debug(f"🏁 agent.run() completed, yielded {event_num} events total")
+            logger.debug("🏁 agent.run() completed, yielded {} events total", event_num)
                 
         except GeneratorExit:
             # Client disconnected - log but don't try to send more data
@@ -0,0 +1,6 @@
+"""
+AG-UI Gateway Benchmarks
+
+Load-test and latency harness that runs the gateway in-process against
+local stand-ins (fakeredis, in-memory Elasticsearch, fake streaming LLM).
+"""
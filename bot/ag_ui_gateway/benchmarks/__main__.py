@@ -0,0 +1,166 @@
+"""
+AG-UI Gateway Benchmark CLI
+
+Usage (from bot/):
+    python -m ag_ui_gateway.benchmarks --sessions 200 --concurrency 50
+    python -m ag_ui_gateway.benchmarks --save ag_ui_gateway/benchmarks/baselines/local.json
+    python -m ag_ui_gateway.benchmarks --compare ag_ui_gateway/benchmarks/baselines/local.json
+    python -m ag_ui_gateway.benchmarks --log-level INFO   # include logging cost
+
+Exits with status 1 when --compare finds a metric worse than the baseline
+by more than --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ag_ui_gateway.benchmarks.stubs import FakeStreamingLLM, local_stand_ins
+
+HIGHER_IS_BETTER_SUFFIXES = ("_per_second",)
+LOWER_IS_BETTER_SUFFIXES = ("_ms", "_us", "_kb")
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m ag_ui_gateway.benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=["sse", "ws", "both"], default="both")
+    parser.add_argument("--sessions", type=int, default=100, help="Chats per transport")
+    parser.add_argument("--concurrency", type=int, default=25, help="Chats in flight at once")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--first-token-latency", type=float, default=0.2, help="Seconds")
+    parser.add_argument("--response-tokens", type=int, default=100)
+    parser.add_argument("--hot-path-iterations", type=int, default=200, help="0 to skip")
+    parser.add_argument("--save", type=Path, help="Write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="Compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression")
+    parser.add_argument("--log-level", default="CRITICAL",
+                        help="Level of the production log sink (written to os.devnull), "
+                             "to measure logging cost per stream")
+    parser.add_argument("--hot-path-debug", action="store_true", help="Enable per-chunk hot-path DEBUG logging")
+    return parser.parse_args(argv)
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    from luka_bot.utils.log_budget import setup_logging
+
+    llm = FakeStreamingLLM(
+        tokens_per_second=args.tokens_per_second,
+        first_token_latency=args.first_token_latency,
+        response_tokens=args.response_tokens,
+    )
+
+    with local_stand_ins(llm):
+        from ag_ui_gateway.benchmarks.hot_paths import run_hot_paths
+        from ag_ui_gateway.benchmarks.load import run_load
+        from ag_ui_gateway.main import app
+
+        # Production sinks, but writing to os.devnull: log formatting is
+        # measured, terminal I/O is not (importing main installs the
+        # gateway's own sinks)
+        devnull = open(os.devnull, "w")
+        setup_logging(level=args.log_level, hot_path_debug=args.hot_path_debug, sink=devnull)
+
+        results: Dict[str, Any] = {
+            "meta": {
+                "created_at": int(time.time()),
+                "python": platform.python_version(),
+                "log_level": args.log_level,
+                "hot_path_debug": args.hot_path_debug,
+                "llm": {
+                    "tokens_per_second": llm.tokens_per_second,
+                    "first_token_latency": llm.first_token_latency,
+                    "response_tokens": llm.response_tokens,
+                },
+            },
+            "load": {},
+            "hot_paths": {},
+        }
+
+        async with app.router.lifespan_context(app):
+            transports = ["sse", "ws"] if args.transport == "both" else [args.transport]
+            for transport in transports:
+                report = await run_load(app, transport, args.sessions, args.concurrency)
+                results["load"][transport] = report.summary()
+
+            if args.hot_path_iterations > 0:
+                results["hot_paths"] = await run_hot_paths(llm, args.hot_path_iterations)
+
+    devnull.close()
+    return results
+
+
+def _flatten(results: Dict[str, Any]) -> Dict[str, float]:
+    """Flatten comparable metrics into `section.name.metric` keys."""
+    flat: Dict[str, float] = {}
+    for section in ("load", "hot_paths"):
+        for name, metrics in results.get(section, {}).items():
+            for metric, value in metrics.items():
+                if isinstance(value, (int, float)) and metric.endswith(
+                    HIGHER_IS_BETTER_SUFFIXES + LOWER_IS_BETTER_SUFFIXES
+                ):
+                    flat[f"{section}.{name}.{metric}"] = float(value)
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return human-readable regressions of `current` against `baseline`."""
+    regressions = []
+    now = _flatten(current)
+    for key, before in _flatten(baseline).items():
+        after = now.get(key)
+        if after is None or before <= 0:
+            continue
+        change = (after - before) / before
+        if key.endswith(HIGHER_IS_BETTER_SUFFIXES):
+            change = -change
+        if change > tolerance:
+            regressions.append(f"{key}: {before:.2f} -> {after:.2f} ({change:+.0%} worse)")
+    return regressions
+
+
+def _print_report(results: Dict[str, Any]) -> None:
+    for transport, summary in results["load"].items():
+        print(
+            f"[{transport}] sessions={summary['sessions']} concurrency={summary['concurrency']} "
+            f"errors={summary['errors']} "
+            f"ttft p50/p95/p99={summary['ttft_p50_ms']:.1f}/{summary['ttft_p95_ms']:.1f}/"
+            f"{summary['ttft_p99_ms']:.1f} ms "
+            f"events/s={summary['events_per_second']:.0f} "
+            f"cpu/stream={summary['cpu_ms_per_stream']:.2f} ms "
+            f"mem growth={summary['memory_growth_kb']:.0f} KiB"
+        )
+    for name, timing in results["hot_paths"].items():
+        print(f"[hot] {name}: mean={timing['mean_us']:.0f} us p95={timing['p95_us']:.0f} us")
+
+
+def main(argv: List[str] = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    results = asyncio.run(_run(args))
+    _print_report(results)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(results, indent=2))
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.compare}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
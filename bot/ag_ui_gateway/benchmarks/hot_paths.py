@@ -0,0 +1,88 @@
+"""
+Hot-path Micro-benchmarks
+
+Times the per-message code paths that every chat goes through:
+- `LukaAgent.run` end to end with a zero-latency fake LLM
+- `build_ui_context_event` for guests and signed-in users
+- Redis rate limiting (HTTP middleware and WebSocket check)
+"""
+import time
+from dataclasses import replace
+from typing import Any, Awaitable, Callable, Dict
+
+from ag_ui_gateway.benchmarks.stubs import FakeStreamingLLM
+
+BENCH_USER_ID = 424242
+
+
+async def _time_async(fn: Callable[[], Awaitable[Any]], iterations: int, warmup: int = 3) -> Dict[str, float]:
+    """Run `fn` repeatedly and return mean/p95 wall time in microseconds."""
+    for _ in range(warmup):
+        await fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+
+    samples.sort()
+    return {
+        "mean_us": sum(samples) / len(samples),
+        "p95_us": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+async def run_hot_paths(llm: FakeStreamingLLM, iterations: int = 200) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark hot paths in-process. Requires `local_stand_ins()` to be active
+    and the gateway database connections to be initialised.
+    """
+    from ag_ui_gateway.api.agent import LukaAgent, RunAgentInput, SimpleMessage
+    from ag_ui_gateway.middleware.rate_limit import RateLimitMiddleware, check_websocket_rate_limit
+    from ag_ui_gateway.services.ui_events import build_ui_context_event
+
+    results: Dict[str, Dict[str, float]] = {}
+
+    # Measure gateway overhead, not simulated provider latency
+    original = replace(llm)
+    llm.first_token_latency = 0.0
+    llm.tokens_per_second = 0.0
+    try:
+        agent = LukaAgent()
+
+        async def agent_run():
+            input_data = RunAgentInput(
+                messages=[SimpleMessage(role="user", content="benchmark message")],
+                user_id="guest",
+                thread_id="bench-hot-path",
+                password_authenticated=True,
+            )
+            async for _ in agent.run(input_data):
+                pass
+
+        results["luka_agent_run"] = await _time_async(agent_run, iterations)
+    finally:
+        llm.first_token_latency = original.first_token_latency
+        llm.tokens_per_second = original.tokens_per_second
+
+    results["build_ui_context_event_guest"] = await _time_async(
+        lambda: build_ui_context_event(user_id=None, active_mode="chat", is_guest=True),
+        iterations,
+    )
+    results["build_ui_context_event_user"] = await _time_async(
+        lambda: build_ui_context_event(user_id=BENCH_USER_ID, active_mode="chat", is_guest=False),
+        iterations,
+    )
+
+    middleware = RateLimitMiddleware(app=None)
+    results["rate_limit_http"] = await _time_async(
+        lambda: middleware._check_rate_limit(f"user:{BENCH_USER_ID}", False),
+        iterations,
+    )
+    results["rate_limit_websocket"] = await _time_async(
+        lambda: check_websocket_rate_limit(BENCH_USER_ID, is_guest=False),
+        iterations,
+    )
+
+    return results
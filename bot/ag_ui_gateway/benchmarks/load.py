@@ -0,0 +1,273 @@
+"""
+Concurrent Session Load Driver
+
+Drives N concurrent SSE (`/api/agent/luka/agentic_chat/`) and WebSocket
+(`/ws/chat`) sessions against the FastAPI app in-process and reports
+time-to-first-token percentiles, event throughput, CPU per stream and
+memory growth.
+"""
+import asyncio
+import json
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+SSE_PATH = "/api/agent/luka/agentic_chat/"
+WS_PATH = "/ws/chat"
+FIRST_TOKEN_EVENT = "TEXT_MESSAGE_CONTENT"
+
+
+@dataclass
+class SessionResult:
+    """Outcome of one benchmark session."""
+    ttft: Optional[float] = None
+    duration: float = 0.0
+    events: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class LoadReport:
+    """Aggregated results for one transport."""
+    transport: str
+    sessions: int
+    concurrency: int
+    results: List[SessionResult] = field(default_factory=list)
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    memory_growth_bytes: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        ok = [r for r in self.results if r.error is None]
+        ttfts = sorted(r.ttft for r in ok if r.ttft is not None)
+        total_events = sum(r.events for r in ok)
+        return {
+            "transport": self.transport,
+            "sessions": self.sessions,
+            "concurrency": self.concurrency,
+            "errors": len(self.results) - len(ok),
+            "ttft_p50_ms": _percentile(ttfts, 50) * 1000,
+            "ttft_p95_ms": _percentile(ttfts, 95) * 1000,
+            "ttft_p99_ms": _percentile(ttfts, 99) * 1000,
+            "events_per_second": total_events / self.wall_time if self.wall_time else 0.0,
+            "cpu_ms_per_stream": (self.cpu_time / len(ok) * 1000) if ok else 0.0,
+            "memory_growth_kb": self.memory_growth_bytes / 1024,
+        }
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def create_guest_token(client: httpx.AsyncClient) -> str:
+    """Create a guest session through the public auth endpoint."""
+    response = await client.post("/api/auth/guest")
+    response.raise_for_status()
+    return response.json()["token"]
+
+
+async def run_sse_session(app, token: str, message: str) -> SessionResult:
+    """
+    Run one agentic_chat request and consume the SSE stream.
+
+    Calls the ASGI app directly: httpx's ASGITransport buffers the whole
+    response body, which would hide time-to-first-token.
+    """
+    result = SessionResult()
+    body = json.dumps({
+        "messages": [{"role": "user", "content": message}],
+        "user_id": "guest",
+        "thread_id": f"bench-{uuid.uuid4().hex[:12]}",
+    }).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": SSE_PATH,
+        "raw_path": SSE_PATH.encode(),
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    buffer = b""
+    status = 0
+    start = time.perf_counter()
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal buffer, status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            return
+        if message["type"] != "http.response.body":
+            return
+        buffer += message.get("body", b"")
+        while b"\n\n" in buffer:
+            frame, buffer = buffer.split(b"\n\n", 1)
+            if not frame.startswith(b"data: "):
+                continue
+            event = json.loads(frame[6:])
+            result.events += 1
+            if result.ttft is None and event.get("type") == FIRST_TOKEN_EVENT:
+                result.ttft = time.perf_counter() - start
+
+    try:
+        await app(scope, receive, send)
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    finally:
+        disconnected.set()
+    result.duration = time.perf_counter() - start
+    return result
+
+
+class ASGIWebSocketSession:
+    """
+    Minimal in-process ASGI WebSocket client.
+
+    Speaks the ASGI websocket message protocol directly so sessions do not
+    need a network listener or an extra client library.
+    """
+
+    def __init__(self, app, path: str):
+        self.app = app
+        self.path = path
+        self._to_app: asyncio.Queue = asyncio.Queue()
+        self._from_app: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "ASGIWebSocketSession":
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": b"",
+            "headers": [],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+            "subprotocols": [],
+        }
+        self._task = asyncio.create_task(self.app(scope, self._to_app.get, self._from_app.put))
+        await self._to_app.put({"type": "websocket.connect"})
+        accepted = await self._from_app.get()
+        if accepted["type"] != "websocket.accept":
+            raise RuntimeError(f"WebSocket rejected: {accepted}")
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._to_app.put({"type": "websocket.disconnect", "code": 1000})
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, Exception):
+                self._task.cancel()
+
+    async def send_json(self, data: dict) -> None:
+        await self._to_app.put({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def receive_json(self) -> dict:
+        message = await self._from_app.get()
+        if message["type"] == "websocket.close":
+            raise ConnectionError(f"WebSocket closed: {message.get('code')}")
+        return json.loads(message.get("text") or message.get("bytes"))
+
+
+async def run_ws_session(app, token: str, message: str, timeout: float = 120.0) -> SessionResult:
+    """Authenticate over /ws/chat, send one message and wait for the answer to finish."""
+    result = SessionResult()
+    try:
+        async with ASGIWebSocketSession(app, WS_PATH) as ws:
+            await ws.send_json({"type": "auth", "token": token})
+            auth = await ws.receive_json()
+            if auth.get("type") != "auth_success":
+                raise RuntimeError(f"Auth failed: {auth}")
+
+            start = time.perf_counter()
+            await ws.send_json({
+                "type": "user_message",
+                "content": message,
+                "threadId": f"bench-{uuid.uuid4().hex[:12]}",
+            })
+            while True:
+                event = await asyncio.wait_for(ws.receive_json(), timeout=timeout)
+                result.events += 1
+                event_type = event.get("type")
+                if result.ttft is None and event_type == FIRST_TOKEN_EVENT:
+                    result.ttft = time.perf_counter() - start
+                if event_type in ("TEXT_MESSAGE_END", "error"):
+                    break
+            result.duration = time.perf_counter() - start
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+
+async def run_load(
+    app,
+    transport: str,
+    sessions: int,
+    concurrency: int,
+    message: str = "Tell me something interesting",
+) -> LoadReport:
+    """
+    Run `sessions` chats over `transport` ("sse" or "ws") with at most
+    `concurrency` in flight, measuring process CPU and traced memory growth.
+    """
+    report = LoadReport(transport=transport, sessions=sessions, concurrency=concurrency)
+    limit = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://testserver", timeout=None
+    ) as client:
+        async def one() -> SessionResult:
+            async with limit:
+                # One guest per session so the guest message cap is never hit
+                token = await create_guest_token(client)
+                if transport == "sse":
+                    return await run_sse_session(app, token, message)
+                return await run_ws_session(app, token, message)
+
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        mem_before = tracemalloc.get_traced_memory()[0]
+        cpu_before = time.process_time()
+        wall_before = time.perf_counter()
+
+        report.results = await asyncio.gather(*(one() for _ in range(sessions)))
+
+        report.wall_time = time.perf_counter() - wall_before
+        report.cpu_time = time.process_time() - cpu_before
+        report.memory_growth_bytes = tracemalloc.get_traced_memory()[0] - mem_before
+        if not tracing:
+            tracemalloc.stop()
+
+    return report
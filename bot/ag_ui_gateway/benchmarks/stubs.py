@@ -0,0 +1,218 @@
+"""
+Local Stand-ins for Benchmarks
+
+In-process replacements for external services so the gateway can be
+load-tested without Redis, Elasticsearch or a real LLM provider:
+- fakeredis instead of Redis (gateway + luka_bot clients)
+- InMemoryElasticsearch instead of AsyncElasticsearch
+- FakeStreamingLLM as a pydantic-ai FunctionModel with configurable
+  first-token latency and token rate
+"""
+import asyncio
+import os
+import sys
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from unittest.mock import patch
+
+# Minimal environment so gateway and luka_bot settings can load.
+# BOT_TOKEN must pass aiogram's token format check.
+BENCHMARK_ENV = {
+    "BOT_TOKEN": "123456789:AAbenchmarkbenchmarkbenchmarkbenchm",
+    "AUTHJWT_SECRET_KEY": "benchmark-secret",
+    "FLOW_API_URL": "http://flow-api.invalid",
+    "WAREHOUSE_WS_URL": "ws://warehouse.invalid",
+    "DEBUG": "false",
+    "LUKA_PASSWORD_ENABLED": "false",
+    "LOG_LEVEL": "WARNING",
+}
+
+
+@dataclass
+class FakeStreamingLLM:
+    """
+    Deterministic streaming LLM.
+
+    Args:
+        tokens_per_second: Token emission rate after the first token (0 = no delay)
+        first_token_latency: Seconds before the first token is emitted
+        response_tokens: Number of tokens per answer
+    """
+    tokens_per_second: float = 50.0
+    first_token_latency: float = 0.2
+    response_tokens: int = 100
+
+    async def stream(self, messages: List[Any], info: Any) -> AsyncIterator[str]:
+        """pydantic-ai FunctionModel stream function."""
+        await asyncio.sleep(self.first_token_latency)
+        delay = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        for i in range(self.response_tokens):
+            if i and delay:
+                await asyncio.sleep(delay)
+            yield f"tok{i} "
+
+    def model(self):
+        """Build a pydantic-ai model backed by this fake."""
+        from pydantic_ai.models.function import FunctionModel
+
+        return FunctionModel(stream_function=self.stream, model_name="benchmark-fake")
+
+    async def create_llm_model_with_fallback(self, *args, **kwargs):
+        """Drop-in for `luka_bot.services.llm_model_factory.create_llm_model_with_fallback`."""
+        return self.model()
+
+
+class _Namespace:
+    """Attribute namespace mimicking `client.indices` / `client.cat`."""
+
+    def __init__(self, **methods):
+        self.__dict__.update(methods)
+
+
+class InMemoryElasticsearch:
+    """
+    In-memory subset of `AsyncElasticsearch` used by the gateway and luka_bot.
+
+    Search is a naive substring match over stored documents; it only needs
+    to exercise the code paths, not reproduce relevance scoring.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._indices: Dict[str, Dict[str, dict]] = {}
+        self.indices = _Namespace(
+            exists=self._exists,
+            create=self._create,
+            delete=self._delete,
+            stats=self._stats,
+            put_index_template=self._noop,
+        )
+        self.cat = _Namespace(indices=self._cat_indices)
+
+    async def _noop(self, *args, **kwargs) -> dict:
+        return {"acknowledged": True}
+
+    async def _exists(self, index: str, **kwargs) -> bool:
+        return index in self._indices
+
+    async def _create(self, index: str, **kwargs) -> dict:
+        self._indices.setdefault(index, {})
+        return {"acknowledged": True, "index": index}
+
+    async def _delete(self, index: str, **kwargs) -> dict:
+        self._indices.pop(index, None)
+        return {"acknowledged": True}
+
+    async def _stats(self, index: str, **kwargs) -> dict:
+        count = len(self._indices.get(index, {}))
+        return {"indices": {index: {"total": {"docs": {"count": count}}}}}
+
+    async def _cat_indices(self, *args, **kwargs) -> list:
+        return [{"index": name, "docs.count": str(len(docs))} for name, docs in self._indices.items()]
+
+    async def info(self, **kwargs) -> dict:
+        return {"version": {"number": "8.11.0-inmemory"}}
+
+    async def ping(self, **kwargs) -> bool:
+        return True
+
+    async def close(self) -> None:
+        return None
+
+    async def index(self, index: str, document: Optional[dict] = None, id: Optional[str] = None,
+                    body: Optional[dict] = None, **kwargs) -> dict:
+        docs = self._indices.setdefault(index, {})
+        doc_id = id or str(len(docs) + 1)
+        docs[doc_id] = document if document is not None else (body or {})
+        return {"_id": doc_id, "result": "created"}
+
+    async def count(self, index: str, **kwargs) -> dict:
+        return {"count": len(self._indices.get(index, {}))}
+
+    async def search(self, index: str = "", body: Optional[dict] = None, size: Optional[int] = None,
+                     **kwargs) -> dict:
+        body = body or {}
+        limit = size or body.get("size", 10)
+        needle = _extract_query_text(body.get("query") or kwargs.get("query") or {}).lower()
+
+        hits = []
+        for name in index.split(","):
+            for doc_id, doc in self._indices.get(name.strip(), {}).items():
+                if needle and needle not in str(doc).lower():
+                    continue
+                hits.append({"_index": name, "_id": doc_id, "_score": 1.0, "_source": doc})
+                if len(hits) >= limit:
+                    break
+
+        return {"hits": {"total": {"value": len(hits), "relation": "eq"}, "hits": hits}}
+
+
+def _extract_query_text(query: Any) -> str:
+    """Pull the first free-text query string out of an ES query DSL tree."""
+    if isinstance(query, dict):
+        for key in ("query", "value"):
+            if isinstance(query.get(key), str):
+                return query[key]
+        for value in query.values():
+            text = _extract_query_text(value)
+            if text:
+                return text
+    elif isinstance(query, list):
+        for item in query:
+            text = _extract_query_text(item)
+            if text:
+                return text
+    return ""
+
+
+def _swap_module_attribute(name: str, original: Any, replacement: Any, stack: ExitStack) -> None:
+    """Replace every already-imported module-level binding of `original`."""
+    for module in list(sys.modules.values()):
+        module_name = getattr(module, "__name__", "") or ""
+        if not module_name.startswith(("luka_bot", "ag_ui_gateway", "luka_agent")):
+            continue
+        if getattr(module, name, None) is original:
+            stack.enter_context(patch.object(module, name, replacement))
+
+
+@contextmanager
+def local_stand_ins(llm: Optional[FakeStreamingLLM] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Patch gateway and luka_bot to use in-process stand-ins.
+
+    Must be entered before the FastAPI app starts (its lifespan opens the
+    Redis and Elasticsearch clients).
+
+    Yields:
+        Dict with the shared `redis`, `elasticsearch` and `llm` stand-ins
+    """
+    import fakeredis
+
+    for key, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(key, value)
+
+    llm = llm or FakeStreamingLLM()
+    fake_redis = fakeredis.FakeAsyncRedis()
+    fake_es = InMemoryElasticsearch()
+
+    from ag_ui_gateway import database
+    import luka_bot.core.loader as luka_loader
+    import luka_bot.services.elasticsearch_service as luka_es
+    import luka_bot.services.llm_model_factory as llm_factory
+
+    with ExitStack() as stack:
+        # Gateway lifespan builds its own clients from these names
+        stack.enter_context(patch.object(database, "Redis", lambda *a, **kw: fake_redis))
+        stack.enter_context(patch.object(database, "ConnectionPool", lambda *a, **kw: None))
+        stack.enter_context(patch.object(database, "AsyncElasticsearch", lambda *a, **kw: fake_es))
+        stack.enter_context(patch.object(luka_es, "AsyncElasticsearch", lambda *a, **kw: fake_es))
+
+        # luka_bot modules bind `redis_client` at import time
+        _swap_module_attribute("redis_client", luka_loader.redis_client, fake_redis, stack)
+        stack.enter_context(patch.object(luka_loader, "redis_client", fake_redis))
+
+        stack.enter_context(patch.object(
+            llm_factory, "create_llm_model_with_fallback", llm.create_llm_model_with_fallback
+        ))
+
+        yield {"redis": fake_redis, "elasticsearch": fake_es, "llm": llm}
@@ -96,6 +96,11 @@ class Settings(BaseSettings):
     AUTH_RATE_LIMIT_PER_MINUTE: int = 60
     GUEST_TOTAL_MESSAGES: int = 20
     
+    # WebSocket Connections
+    WS_SEND_QUEUE_SIZE: int = 256  # Outbound events buffered per connection
+    WS_SEND_TIMEOUT_SECONDS: float = 10.0  # Close connection if queue stays full this long
+    WS_MAX_CONCURRENT_TASKS: int = 4  # Concurrent handlers (run, commands, searches) per connection; further messages are rejected
+    
     # File Upload
     MAX_FILE_SIZE_MB: int = 20
     ALLOWED_FILE_TYPES: List[str] = [
@@ -117,6 +122,8 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "text"
+    LOG_ENQUEUE: bool = True  # Write log lines off the event loop
+    LOG_HOT_PATH_DEBUG: bool = False  # Per-chunk DEBUG logging in streaming code
 
 
 # Global settings instance
@@ -55,6 +55,8 @@ async def lifespan(app: FastAPI):
     await close_database_connections()
     
     logger.info("✅ AG-UI Gateway shut down successfully")
+    # Flush lines still queued for loguru's writer thread
+    await logger.complete()
 
 
 # Create FastAPI app with lifespan
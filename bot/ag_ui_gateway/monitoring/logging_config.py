@@ -7,27 +7,18 @@ import sys
 from loguru import logger
 
 from ag_ui_gateway.config.settings import settings
+from luka_bot.utils.log_budget import setup_logging as setup_loguru_sinks
 
 
 def setup_logging():
     """Configure logging with Loguru."""
-    # Remove default handler
-    logger.remove()
-    
-    # Add custom handler
-    if settings.LOG_FORMAT == "json":
-        logger.add(
-            sys.stdout,
-            format="{message}",
-            level=settings.LOG_LEVEL,
-            serialize=True
-        )
-    else:
-        logger.add(
-            sys.stdout,
-            format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
-            level=settings.LOG_LEVEL,
-            colorize=True
-        )
+    setup_loguru_sinks(
+        level=settings.LOG_LEVEL,
+        log_format=settings.LOG_FORMAT,
+        enqueue=settings.LOG_ENQUEUE,
+        hot_path_debug=settings.LOG_HOT_PATH_DEBUG,
+        sink=sys.stdout,
+        colorize=True,
+    )
     
     logger.info("Logging configured")
@@ -30,6 +30,17 @@ websocket_messages_total = Counter(
     ['direction', 'type']
 )
 
+websocket_outbound_coalesced_total = Counter(
+    'websocket_outbound_coalesced_total',
+    'Outbound WebSocket events merged into a queued event',
+    ['type']
+)
+
+websocket_runs_cancelled_total = Counter(
+    'websocket_runs_cancelled_total',
+    'In-flight WebSocket LLM runs cancelled by a new message or stop command'
+)
+
 # Authentication metrics
 auth_attempts_total = Counter(
     'auth_attempts_total',
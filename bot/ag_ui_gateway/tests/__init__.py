@@ -0,0 +1 @@
+"""Tests for ag_ui_gateway module."""
@@ -0,0 +1,16 @@
+"""
+Shared setup for ag_ui_gateway tests.
+
+The gateway and luka_bot settings are built at import time and require a
+few values; give them dummy ones so gateway modules can be imported.
+"""
+
+import os
+
+for key, value in {
+    "BOT_TOKEN": "123456:test-token",
+    "AUTHJWT_SECRET_KEY": "test-secret",
+    "FLOW_API_URL": "http://flow-api.invalid",
+    "WAREHOUSE_WS_URL": "ws://warehouse.invalid",
+}.items():
+    os.environ.setdefault(key, value)
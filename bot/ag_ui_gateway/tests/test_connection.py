@@ -0,0 +1,199 @@
+"""
+Tests for the per-connection chat WebSocket actor.
+
+Tests delta merging, run replacement and cancellation, control replies while
+the client is slow, the slow-consumer disconnect and the handler task limit,
+against a fake socket whose writes can be held back.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from ag_ui_gateway.websocket.connection import ChatConnection
+
+
+class FakeWebSocket:
+    """Client socket: messages queued by the test, writes blocked while `writable` is clear."""
+
+    client = ("127.0.0.1", 12345)
+
+    def __init__(self):
+        self.inbound = asyncio.Queue()
+        self.sent = []
+        self.writable = asyncio.Event()
+        self.writable.set()
+
+    async def receive_json(self):
+        message = await self.inbound.get()
+        if message is None:
+            raise WebSocketDisconnect()
+        return message
+
+    async def send_json(self, event):
+        await self.writable.wait()
+        self.sent.append(event)
+
+    def types(self):
+        return [event["type"] for event in self.sent]
+
+
+class StreamingHandler:
+    """Streams one text message per user_message; `hold` keeps it open until released."""
+
+    def __init__(self, hold=False):
+        self.hold = hold
+        self.release = asyncio.Event()
+        self.calls = []
+
+    async def __call__(self, connection, message, session):
+        self.calls.append(message)
+        message_id = message.get("id", "m")
+        await connection.send_json({"type": "TEXT_MESSAGE_START", "messageId": message_id})
+        for delta in message.get("deltas", []):
+            await connection.send_json({"type": "TEXT_MESSAGE_CONTENT", "messageId": message_id, "delta": delta})
+        if self.hold:
+            await self.release.wait()
+        await connection.send_json({"type": "TEXT_MESSAGE_END", "messageId": message_id})
+
+
+async def _until(condition, timeout=1.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.001)
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.fixture
+async def start():
+    servers = []
+
+    def start(handler, **kwargs):
+        socket = FakeWebSocket()
+        connection = ChatConnection(socket, {}, handler, **kwargs)
+        servers.append((socket, asyncio.create_task(connection.serve())))
+        return socket, servers[-1][1]
+
+    yield start
+    for socket, server in servers:
+        socket.writable.set()
+        socket.inbound.put_nowait(None)
+        await asyncio.wait_for(server, 1.0)
+
+
+class TestOutboundQueue:
+    """Test delivery to the client."""
+
+    @pytest.mark.asyncio
+    async def test_queued_deltas_are_merged(self, start):
+        """Test deltas queued behind a slow write reach the client as one merged delta."""
+        socket, _ = start(StreamingHandler())
+        socket.writable.clear()
+        socket.inbound.put_nowait({"type": "user_message", "deltas": ["a", "b", "c"]})
+        await asyncio.sleep(0.01)
+        socket.writable.set()
+
+        await _until(lambda: "TEXT_MESSAGE_END" in socket.types())
+        assert socket.sent == [
+            {"type": "TEXT_MESSAGE_START", "messageId": "m"},
+            {"type": "TEXT_MESSAGE_CONTENT", "messageId": "m", "delta": "abc"},
+            {"type": "TEXT_MESSAGE_END", "messageId": "m"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_is_disconnected(self, start):
+        """Test a client that doesn't read past the send timeout is disconnected."""
+        socket, server = start(StreamingHandler(), queue_size=1, send_timeout=0.05)
+        socket.writable.clear()
+        socket.inbound.put_nowait({"type": "user_message", "id": "m1"})
+        socket.inbound.put_nowait({"type": "command", "id": "m2"})
+        socket.inbound.put_nowait({"type": "command", "id": "m3"})
+
+        await asyncio.wait_for(asyncio.shield(server), 1.0)
+
+
+class TestRuns:
+    """Test run replacement, cancellation and the task limit."""
+
+    @pytest.mark.asyncio
+    async def test_new_message_replaces_run(self, start):
+        """Test a new user_message closes the streaming run before the new one starts."""
+        handler = StreamingHandler(hold=True)
+        socket, _ = start(handler)
+        socket.inbound.put_nowait({"type": "user_message", "id": "first", "deltas": ["a"]})
+        await _until(lambda: "TEXT_MESSAGE_CONTENT" in socket.types())
+
+        socket.inbound.put_nowait({"type": "user_message", "id": "second"})
+        await _until(lambda: socket.types().count("TEXT_MESSAGE_START") == 2)
+
+        assert socket.sent[2:] == [
+            {"type": "TEXT_MESSAGE_END", "messageId": "first", "timestamp": socket.sent[2]["timestamp"]},
+            {
+                "type": "stateUpdate",
+                "status": "cancelled",
+                "metadata": {"message": "Generation replaced by a new message"},
+            },
+            {"type": "TEXT_MESSAGE_START", "messageId": "second"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stop_while_client_is_slow(self, start):
+        """Test ping and stop are answered while the run is blocked on a full queue."""
+        cancelled = asyncio.Event()
+        queued = []
+
+        async def flood(connection, message, session):
+            try:
+                await connection.send_json({"type": "TEXT_MESSAGE_START", "messageId": "m"})
+                for n in range(100):
+                    await connection.send_json({"type": "TOOL_CALL_START", "toolCallId": str(n)})
+                    queued.append(n)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        socket, _ = start(flood, queue_size=2, send_timeout=5.0)
+        socket.writable.clear()
+        socket.inbound.put_nowait({"type": "user_message"})
+        # START is held by the writer, two more fill the queue, the third waits
+        await _until(lambda: len(queued) == 2)
+        await asyncio.sleep(0.01)
+        socket.inbound.put_nowait({"type": "ping"})
+        socket.inbound.put_nowait({"type": "stop"})
+
+        await asyncio.wait_for(cancelled.wait(), 1.0)
+        socket.writable.set()
+        await _until(lambda: "stateUpdate" in socket.types())
+
+        assert socket.types() == [
+            "TEXT_MESSAGE_START", "TOOL_CALL_START", "TOOL_CALL_START",
+            "pong", "TEXT_MESSAGE_END", "stateUpdate",
+        ]
+        assert socket.sent[-1]["status"] == "cancelled"
+
+    @pytest.mark.asyncio
+    async def test_stop_without_run(self, start):
+        """Test stop with nothing running is acknowledged as idle."""
+        socket, _ = start(StreamingHandler())
+        socket.inbound.put_nowait({"type": "stop"})
+        await _until(lambda: socket.sent)
+
+        assert socket.sent[0]["status"] == "idle"
+
+    @pytest.mark.asyncio
+    async def test_messages_past_task_limit_are_rejected(self, start):
+        """Test no handler task is created once the per-connection limit is reached."""
+        handler = StreamingHandler(hold=True)
+        socket, _ = start(handler, max_concurrent_tasks=2)
+        for n in range(3):
+            socket.inbound.put_nowait({"type": "command", "id": str(n)})
+        await _until(lambda: "error" in socket.types())
+
+        assert len(handler.calls) == 2
+        assert [e["code"] for e in socket.sent if e["type"] == "error"] == ["TOO_MANY_REQUESTS"]
+
+        handler.release.set()
+        await _until(lambda: socket.types().count("TEXT_MESSAGE_END") == 2)
+        socket.inbound.put_nowait({"type": "command", "id": "later"})
+        await _until(lambda: len(handler.calls) == 3)
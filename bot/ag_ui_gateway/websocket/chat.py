@@ -14,6 +14,7 @@ from ag_ui_gateway.adapters.task_adapter import get_task_adapter
 from ag_ui_gateway.adapters.catalog_adapter import get_catalog_adapter
 from ag_ui_gateway.adapters.command_adapter import get_command_adapter
 from ag_ui_gateway.services.ui_events import build_task_list_event, build_ui_context_event
+from ag_ui_gateway.websocket.connection import ChatConnection
 
 
 def _resolve_user_id(session: dict) -> tuple[int, bool]:
@@ -180,6 +181,9 @@ async def websocket_chat(websocket: WebSocket):
     - Authentication
     - Message routing
     - Event dispatching
+    
+    After authentication the socket is handed to a `ChatConnection` actor,
+    so pings, commands and searches stay responsive during a long LLM run.
     """
     await websocket.accept()
     logger.info(f"WebSocket connection accepted: {websocket.client}")
@@ -241,10 +245,8 @@ async def websocket_chat(websocket: WebSocket):
         
         logger.info(f"WebSocket authenticated: mode={session['token_type']}")
         
-        # Message loop
-        while True:
-            message = await websocket.receive_json()
-            await handle_message(websocket, message, session)
+        # Message loop (reader/writer actor)
+        await ChatConnection(websocket, session, handle_message).serve()
             
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
@@ -265,11 +267,11 @@ async def websocket_chat(websocket: WebSocket):
             pass
 
 
-async def handle_message(websocket: WebSocket, message: dict, session: dict):
+async def handle_message(websocket: ChatConnection, message: dict, session: dict):
     """Handle incoming WebSocket message."""
     message_type = message.get('type')
     
-    logger.info(f"Received message: type={message_type}")
+    logger.debug("Received message: type={}", message_type)
     
     if message_type == 'user_message':
         await handle_user_message(websocket, message, session)
@@ -289,12 +291,12 @@ async def handle_message(websocket: WebSocket, message: dict, session: dict):
         })
 
 
-async def handle_user_message(websocket: WebSocket, message: dict, session: dict):
+async def handle_user_message(websocket: ChatConnection, message: dict, session: dict):
     """
     Handle user chat message with LLM streaming.
     
     Args:
-        websocket: WebSocket connection
+        websocket: Chat connection (events are queued for the writer task)
         message: Message data with 'content' field
         session: User session with token_type, user_id, etc.
     """
@@ -349,7 +351,7 @@ async def handle_user_message(websocket: WebSocket, message: dict, session: dict
         # Get LLM adapter and stream response
         llm_adapter = get_llm_adapter()
         
-        logger.info(f"🤖 Processing message: user_id={effective_user_id}, thread={thread_id}, type={token_type}")
+        logger.debug("🤖 Processing message: user_id={}, thread={}, type={}", effective_user_id, thread_id, token_type)
         
         # Stream LLM response as AG-UI events
         async for event in llm_adapter.stream_response(
@@ -380,12 +382,12 @@ async def handle_user_message(websocket: WebSocket, message: dict, session: dict
         })
 
 
-async def handle_command(websocket: WebSocket, message: dict, session: dict):
+async def handle_command(websocket: ChatConnection, message: dict, session: dict):
     """
     Handle command execution and optional workflow triggering.
     
     Args:
-        websocket: WebSocket connection
+        websocket: Chat connection (events are queued for the writer task)
         message: Message with 'command' and optional 'parameters'
         session: User session
     """
@@ -465,12 +467,12 @@ async def handle_command(websocket: WebSocket, message: dict, session: dict):
         })
 
 
-async def handle_form_submit(websocket: WebSocket, message: dict, session: dict):
+async def handle_form_submit(websocket: ChatConnection, message: dict, session: dict):
     """
     Handle task form submission.
     
     Args:
-        websocket: WebSocket connection
+        websocket: Chat connection (events are queued for the writer task)
         message: Message with 'formId' and 'formData' fields
         session: User session with user_id
     """
@@ -568,12 +570,12 @@ async def handle_form_submit(websocket: WebSocket, message: dict, session: dict)
         })
 
 
-async def handle_search(websocket: WebSocket, message: dict, session: dict):
+async def handle_search(websocket: ChatConnection, message: dict, session: dict):
     """
     Handle knowledge base search.
     
     Args:
-        websocket: WebSocket connection
+        websocket: Chat connection (events are queued for the writer task)
         message: Message with 'query', 'kb_id', and optional 'search_method'
         session: User session
     """
@@ -0,0 +1,341 @@
+"""
+WebSocket Connection Actor
+
+Per-connection actor for the AG-UI chat socket:
+- Independent reader and writer tasks
+- Bounded outbound queue with merge/drop policies for stream deltas
+- Control replies (pong, stop acknowledgements) that never wait for queue space
+- Cancellation of the in-flight LLM run on new message or stop command; a
+  cancelled run closes its open text messages
+- A fixed limit on concurrent handler tasks; messages past it are rejected
+- Connection-level Prometheus metrics
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+
+from fastapi import WebSocket, WebSocketDisconnect
+from loguru import logger
+
+from ag_ui_gateway.config.settings import settings
+from ag_ui_gateway.monitoring.metrics import (
+    websocket_connections_active,
+    websocket_messages_total,
+    websocket_outbound_coalesced_total,
+    websocket_runs_cancelled_total,
+)
+
+# Delta events whose payload can be concatenated with a still-queued
+# event of the same type and id: {type: (id_field, payload_field)}
+MERGEABLE_DELTAS: Dict[str, tuple[str, str]] = {
+    "TEXT_MESSAGE_CONTENT": ("messageId", "delta"),
+    "TOOL_CALL_ARGS": ("toolCallId", "delta"),
+}
+
+# Progress events where only the latest still-queued value matters
+SUPERSEDABLE_TYPES = {"stateUpdate"}
+
+# Inbound message types that stop the in-flight run
+STOP_MESSAGE_TYPES = {"stop", "cancel_action"}
+
+# Inbound message types tracked in metrics (anything else is "unknown")
+KNOWN_INBOUND_TYPES = {
+    "user_message",
+    "command",
+    "form_submit",
+    "search_kb",
+    "ping",
+    "stop",
+    "cancel_action",
+}
+
+# Control replies may exceed the queue bound by this much before the client
+# is treated as a slow consumer (they are small and sent one per inbound message)
+CONTROL_HEADROOM = 64
+
+MessageHandler = Callable[["ChatConnection", dict, dict], Awaitable[None]]
+
+
+class SlowConsumerError(Exception):
+    """Raised when the client does not drain the outbound queue in time."""
+
+
+class ChatConnection:
+    """
+    Actor owning a single authenticated chat WebSocket.
+
+    Handlers receive the connection instead of the raw WebSocket and call
+    `send_json`, which enqueues the event rather than writing to the socket,
+    so a slow client never stalls handler coroutines.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        session: dict,
+        handler: MessageHandler,
+        queue_size: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+        max_concurrent_tasks: Optional[int] = None,
+    ):
+        self.websocket = websocket
+        self.session = session
+        self._handler = handler
+        self._queue_size = queue_size or settings.WS_SEND_QUEUE_SIZE
+        self._send_timeout = send_timeout or settings.WS_SEND_TIMEOUT_SECONDS
+        self._max_tasks = max_concurrent_tasks or settings.WS_MAX_CONCURRENT_TASKS
+
+        self._outbound: Deque[Dict[str, Any]] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._closed = False
+        # Set once the queue is closed, so `serve` tears down even if the
+        # writer is stuck in a socket write
+        self._queue_closed = asyncio.Event()
+
+        self._run_task: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        # Text messages each handler task has started but not ended
+        self._open_messages: Dict[asyncio.Task, Dict[str, None]] = {}
+
+    @property
+    def client(self):
+        """Remote address of the underlying socket."""
+        return self.websocket.client
+
+    # ------------------------------------------------------------------
+    # Outbound queue
+    # ------------------------------------------------------------------
+
+    async def send_json(self, event: Dict[str, Any]) -> None:
+        """
+        Enqueue an event for the writer task.
+
+        Stream deltas are merged into a still-queued delta for the same
+        message, and superseded progress events are replaced. Other events
+        wait for queue space; if the client does not drain the queue within
+        the send timeout the connection is closed as a slow consumer.
+        """
+        if self._closed:
+            return
+
+        self._track_messages(event)
+        if self._try_coalesce(event):
+            return
+
+        while len(self._outbound) >= self._queue_size:
+            self._not_full.clear()
+            try:
+                await asyncio.wait_for(self._not_full.wait(), timeout=self._send_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"⚠️  WebSocket client {self.client} too slow: "
+                    f"{len(self._outbound)} events queued for {self._send_timeout}s"
+                )
+                self._close_queue()
+                raise SlowConsumerError("Outbound queue full")
+            if self._closed:
+                return
+
+        self._outbound.append(event)
+        self._not_empty.set()
+
+    def _send_control(self, event: Dict[str, Any]) -> None:
+        """
+        Enqueue a reply without waiting for queue space.
+
+        Used by the reader, which must keep handling stop and ping while the
+        client is slow. Past CONTROL_HEADROOM extra events the connection is
+        closed as a slow consumer instead.
+        """
+        if self._closed or self._try_coalesce(event):
+            return
+        if len(self._outbound) >= self._queue_size + CONTROL_HEADROOM:
+            logger.warning(f"⚠️  WebSocket client {self.client} too slow: {len(self._outbound)} events queued")
+            self._close_queue()
+            return
+        self._outbound.append(event)
+        self._not_empty.set()
+
+    def _track_messages(self, event: Dict[str, Any]) -> None:
+        event_type = event.get("type")
+        if event_type not in ("TEXT_MESSAGE_START", "TEXT_MESSAGE_END"):
+            return
+        task = asyncio.current_task()
+        if task not in self._tasks:
+            return
+        if event_type == "TEXT_MESSAGE_START":
+            self._open_messages.setdefault(task, {})[event.get("messageId")] = None
+        else:
+            self._open_messages.get(task, {}).pop(event.get("messageId"), None)
+
+    def _try_coalesce(self, event: Dict[str, Any]) -> bool:
+        """Merge event into the queue tail when policy allows. Returns True if merged."""
+        if not self._outbound:
+            return False
+
+        event_type = event.get("type")
+        tail = self._outbound[-1]
+        if tail.get("type") != event_type:
+            return False
+
+        if event_type in MERGEABLE_DELTAS:
+            id_field, payload_field = MERGEABLE_DELTAS[event_type]
+            if tail.get(id_field) != event.get(id_field):
+                return False
+            merged = dict(tail)
+            merged[payload_field] = (tail.get(payload_field) or "") + (event.get(payload_field) or "")
+            if "timestamp" in event:
+                merged["timestamp"] = event["timestamp"]
+            self._outbound[-1] = merged
+        elif event_type in SUPERSEDABLE_TYPES:
+            self._outbound[-1] = event
+        else:
+            return False
+
+        websocket_outbound_coalesced_total.labels(type=event_type).inc()
+        return True
+
+    def _close_queue(self) -> None:
+        self._closed = True
+        self._outbound.clear()
+        # Wake up writer and any blocked producers so they can exit
+        self._not_empty.set()
+        self._not_full.set()
+        self._queue_closed.set()
+
+    async def _writer(self) -> None:
+        """Drain the outbound queue to the socket."""
+        while True:
+            await self._not_empty.wait()
+            if self._closed and not self._outbound:
+                return
+            while self._outbound:
+                event = self._outbound.popleft()
+                self._not_full.set()
+                await self.websocket.send_json(event)
+                websocket_messages_total.labels(
+                    direction="out", type=str(event.get("type", "unknown"))
+                ).inc()
+            if not self._closed:
+                self._not_empty.clear()
+
+    # ------------------------------------------------------------------
+    # Inbound dispatch
+    # ------------------------------------------------------------------
+
+    async def _reader(self) -> None:
+        """Receive client messages and dispatch them without blocking on handlers."""
+        while True:
+            message = await self.websocket.receive_json()
+            message_type = message.get("type") if isinstance(message, dict) else None
+            websocket_messages_total.labels(
+                direction="in",
+                type=message_type if message_type in KNOWN_INBOUND_TYPES else "unknown",
+            ).inc()
+
+            if message_type == "ping":
+                self._send_control({"type": "pong"})
+            elif message_type in STOP_MESSAGE_TYPES:
+                cancelled = await self.cancel_run()
+                self._send_control({
+                    "type": "stateUpdate",
+                    "status": "cancelled" if cancelled else "idle",
+                    "metadata": {"message": "Generation stopped" if cancelled else "Nothing to stop"},
+                })
+            elif message_type == "user_message":
+                if await self.cancel_run():
+                    self._send_control({
+                        "type": "stateUpdate",
+                        "status": "cancelled",
+                        "metadata": {"message": "Generation replaced by a new message"},
+                    })
+                self._run_task = self._spawn(message)
+            else:
+                self._spawn(message)
+
+    def _spawn(self, message: dict) -> Optional[asyncio.Task]:
+        """Start a handler task, or reject the message when the task limit is reached."""
+        if len(self._tasks) >= self._max_tasks:
+            logger.warning(f"⚠️  WebSocket client {self.client} has {len(self._tasks)} requests in progress, rejecting message")
+            self._send_control({
+                "type": "error",
+                "code": "TOO_MANY_REQUESTS",
+                "message": "Too many requests in progress, message dropped",
+            })
+            return None
+        task = asyncio.create_task(self._dispatch(message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _dispatch(self, message: dict) -> None:
+        task = asyncio.current_task()
+        try:
+            await self._handler(self, message, self.session)
+        except SlowConsumerError:
+            pass
+        except asyncio.CancelledError:
+            # Close what the client saw start, so it doesn't wait for the rest
+            for message_id in self._open_messages.get(task, {}):
+                self._send_control({
+                    "type": "TEXT_MESSAGE_END",
+                    "messageId": message_id,
+                    "timestamp": int(time.time() * 1000),
+                })
+            raise
+        except Exception as e:
+            logger.error(f"❌ Unhandled WebSocket handler error: {e}")
+        finally:
+            self._open_messages.pop(task, None)
+
+    async def cancel_run(self) -> bool:
+        """Cancel the in-flight user message run. Returns True if one was running."""
+        task = self._run_task
+        self._run_task = None
+        if task is None or task.done():
+            return False
+
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._tasks.discard(task)
+        websocket_runs_cancelled_total.inc()
+        logger.info(f"🛑 Cancelled in-flight run for {self.client}")
+        return True
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def serve(self) -> None:
+        """Run reader and writer until either side stops, then tear down."""
+        websocket_connections_active.inc()
+        reader = asyncio.create_task(self._reader())
+        writer = asyncio.create_task(self._writer())
+        queue_closed = asyncio.create_task(self._queue_closed.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {reader, writer, queue_closed}, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done - {queue_closed}:
+                exc = task.exception()
+                if exc is None:
+                    continue
+                if isinstance(exc, WebSocketDisconnect):
+                    logger.info("WebSocket disconnected")
+                elif isinstance(exc, SlowConsumerError):
+                    pass
+                else:
+                    logger.error(f"WebSocket error: {exc}")
+        finally:
+            self._close_queue()
+            pending = [reader, writer, queue_closed, *self._tasks]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            websocket_connections_active.dec()
@@ -3,6 +3,7 @@ import base64
 import json
 from collections.abc import Sequence
 from http import HTTPStatus
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from typing import Any, Optional, List
 from uuid import UUID
 
@@ -41,31 +42,105 @@ from .schemas import (
 from .schemas.query import FormVariablesQuerySchema, HistoryProcessInstanceQuerySchema
 
 
+def create_shared_http_client(
+        base_url: str,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+        timeout: float = 60,
+) -> httpx.AsyncClient:
+    """
+    Create one connection pool to share between per-user engine clients.
+
+    The client carries no credentials (each `CamundaEngineClient` sends its
+    own BasicAuth per request) and never stores cookies, so one user's
+    server session can't leak into another user's requests.
+    """
+    return httpx.AsyncClient(
+        base_url=base_url,
+        limits=httpx.Limits(
+            max_keepalive_connections=max_keepalive_connections,
+            max_connections=max_connections,
+        ),
+        timeout=timeout,
+        headers={"Content-Type": "application/json"},
+        cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+    )
+
+
+class _AuthenticatedClient:
+    """View of a shared `httpx.AsyncClient` that adds BasicAuth to each request."""
+
+    def __init__(self, client: httpx.AsyncClient, auth: httpx.BasicAuth) -> None:
+        self._client = client
+        self._auth = auth
+
+    @property
+    def base_url(self) -> httpx.URL:
+        return self._client.base_url
+
+    async def get(self, url, **kwargs) -> httpx.Response:
+        return await self._client.get(url, auth=self._auth, **kwargs)
+
+    async def post(self, url, **kwargs) -> httpx.Response:
+        return await self._client.post(url, auth=self._auth, **kwargs)
+
+    async def put(self, url, **kwargs) -> httpx.Response:
+        return await self._client.put(url, auth=self._auth, **kwargs)
+
+    async def delete(self, url, **kwargs) -> httpx.Response:
+        return await self._client.delete(url, auth=self._auth, **kwargs)
+
+    async def aclose(self) -> None:
+        # The shared pool is owned (and closed) by whoever created it
+        return None
+
+
 class CamundaEngineClient:
     def __init__(
             self,
             base_url: str,
             auth_data: AuthData,
-            transport: httpx.AsyncHTTPTransport,
+            transport: httpx.AsyncHTTPTransport | None = None,
             urls: CamundaUrls | None = None,
+            http_client: httpx.AsyncClient | None = None,
     ) -> None:
-        self._http_client = httpx.AsyncClient(
-            base_url=base_url,
-            transport=transport,
-            timeout=60,
-            auth=httpx.BasicAuth(
-                username=str(auth_data.username),
-                password=str(auth_data.password),
-            ),
-            headers={"Content-Type": "application/json"},
-        )
+        """
+        Args:
+            base_url: Engine REST base URL
+            auth_data: Credentials sent with every request
+            transport: Transport for a client-owned `httpx.AsyncClient`
+            urls: Endpoint builder
+            http_client: Shared pool from `create_shared_http_client`; when
+                given, this client is a lightweight per-user view of it
+        """
+        auth = httpx.BasicAuth(
+            username=str(auth_data.username),
+            password=str(auth_data.password),
+        )
+        if http_client is not None:
+            self._http_client = _AuthenticatedClient(http_client, auth)
+        else:
+            self._http_client = httpx.AsyncClient(
+                base_url=base_url,
+                transport=transport,
+                timeout=60,
+                auth=auth,
+                headers={"Content-Type": "application/json"},
+            )
         self._base_url = base_url
         self._auth_data = auth_data
         self._urls = urls or CamundaUrls()
-        self._session = aiohttp.ClientSession(
-            headers={
-                "Authorization": f"Basic {base64.b64encode(f'{auth_data.username}:{auth_data.password}'.encode()).decode()}"}
-        )
+        # Only deployments use aiohttp (multipart upload); open it on demand
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            auth_data = self._auth_data
+            self._session = aiohttp.ClientSession(
+                headers={
+                    "Authorization": f"Basic {base64.b64encode(f'{auth_data.username}:{auth_data.password}'.encode()).decode()}"}
+            )
+        return self._session
 
     async def close(self):
         """Close the HTTP client sessions"""
@@ -109,7 +184,7 @@ class CamundaEngineClient:
         if deployment_activation_time:
             form_data.add_field('deployment-activation-time', deployment_activation_time)
 
-        async with self._session.post(url, data=form_data) as response:
+        async with self._get_session().post(url, data=form_data) as response:
             response.raise_for_status()
             return await response.json()
 
@@ -28,6 +28,7 @@ class GetTasksFilterSchema(BaseSchema):
     sorting: list[SortSchema] | None = None
     task_id: str | None = None
     process_instance_id: UUID | None = None
+    process_instance_id_in: list[str] | None = None
     process_instance_business_key: str | None = None
     process_instance_business_key_in: list[str] | None = None
     process_definition_key: str | None = None
@@ -4,14 +4,18 @@ Redis checkpointer configuration for LangGraph state persistence.
 This module provides a singleton Redis checkpointer instance that is shared
 across all graph executions. It handles automatic state persistence and
 retrieval from Redis.
+
+The Redis backend is `AsyncDeltaRedisSaver` (see delta_checkpointer.py):
+non-blocking, append-only message storage with an in-process LRU in front.
 """
 
 from typing import Optional
 from loguru import logger
 
-from langgraph.checkpoint.redis import RedisSaver
 from langgraph.checkpoint.memory import MemorySaver
 
+from luka_agent.delta_checkpointer import AsyncDeltaRedisSaver
+
 # Try to import settings, but don't fail if luka_agent isn't configured
 # This allows luka_agent to work standalone (e.g., CLI usage)
 try:
@@ -24,10 +28,10 @@ except ImportError:
     _has_settings = False
 
 # Global checkpointer instance
-_checkpointer: Optional[RedisSaver | MemorySaver] = None
+_checkpointer: Optional[AsyncDeltaRedisSaver | MemorySaver] = None
 
 
-async def get_checkpointer(use_memory: bool | None = None) -> RedisSaver | MemorySaver:
+async def get_checkpointer(use_memory: bool | None = None) -> AsyncDeltaRedisSaver | MemorySaver:
     """
     Get or create the singleton checkpointer instance.
 
@@ -36,11 +40,11 @@ async def get_checkpointer(use_memory: bool | None = None) -> RedisSaver | Memor
     - Redis (production): Used when explicitly enabled via env vars or parameters
 
     Args:
-        use_memory: Optional override. If True, use MemorySaver. If False, use RedisSaver.
+        use_memory: Optional override. If True, use MemorySaver. If False, use Redis.
                    If None, use settings (defaults to True/MemorySaver).
 
     Returns:
-        RedisSaver or MemorySaver instance
+        AsyncDeltaRedisSaver or MemorySaver instance
 
     Example:
         >>> checkpointer = await get_checkpointer()  # Uses default (MemorySaver)
@@ -76,8 +80,16 @@ async def get_checkpointer(use_memory: bool | None = None) -> RedisSaver | Memor
 
     logger.debug(f"Redis URL: redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DATABASE}")
 
-    # Create RedisSaver checkpointer with URL
-    _checkpointer = RedisSaver(redis_url)
+    from redis.asyncio import Redis
+
+    _checkpointer = AsyncDeltaRedisSaver(
+        Redis.from_url(redis_url),
+        ttl_seconds=settings.LUKA_CHECKPOINT_TTL_SECONDS,
+        max_checkpoints=settings.LUKA_CHECKPOINT_MAX_PER_THREAD,
+        cache_threads=settings.LUKA_CHECKPOINT_CACHE_THREADS,
+        cache_max_messages=settings.LUKA_CHECKPOINT_CACHE_MAX_MESSAGES,
+        write_behind=settings.LUKA_CHECKPOINT_WRITE_BEHIND,
+    )
 
     return _checkpointer
 
@@ -90,9 +102,9 @@ async def close_checkpointer() -> None:
     """
     global _checkpointer
 
-    if _checkpointer is not None and isinstance(_checkpointer, RedisSaver):
-        # Close Redis connection
-        await _checkpointer.conn.aclose()
+    if _checkpointer is not None and isinstance(_checkpointer, AsyncDeltaRedisSaver):
+        # Flush queued writes, then close the Redis connection
+        await _checkpointer.aclose()
         _checkpointer = None
 
 
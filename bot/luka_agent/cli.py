@@ -483,7 +483,6 @@ async def run_agent(agent_id: str, message: str, model_override: str = None, pro
         # Stream events from graph
         print(f"🤖 {state['sub_agent_metadata']['name']}: ", end="", flush=True)
 
-        final_state = None
         async for event in graph.astream(state, config, stream_mode="updates"):
             # Extract messages from updates
             for node_name, node_output in event.items():
@@ -503,15 +502,15 @@ async def run_agent(agent_id: str, message: str, model_override: str = None, pro
                             # Show tool results
                             print(f"     ✓ Result: {msg.content[:100]}...")
 
-            # Store final state
-            final_state = node_output
-
         print()
         print()
 
-        # Show suggestions if available
-        if final_state and "conversation_suggestions" in final_state:
-            suggestions = final_state["conversation_suggestions"]
+        # Suggestions are generated after the run (not a graph step)
+        if with_suggestions:
+            from luka_agent.suggestions import generate_suggestions
+
+            snapshot = await graph.aget_state(config)
+            suggestions = await generate_suggestions(snapshot.values)
             if suggestions:
                 print("💡 Suggestions:")
                 for suggestion in suggestions:
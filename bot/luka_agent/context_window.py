@@ -0,0 +1,397 @@
+"""
+Token-budgeted context window for luka_agent.
+
+agent_node used to send the system prompt plus the thread's entire message
+history, including every past ToolMessage with full KB dumps, so prompts
+grew without bound on long threads. `build_context_window` keeps the prompt
+within a per-provider/model token budget:
+
+- tokens are estimated once per message (cached by message id)
+- tool outputs from earlier turns are elided to short stubs
+- when the window is still over budget, the oldest whole turns are folded
+  into a rolling summary (`context_summary` in AgentState), down to a lower
+  watermark so the next turns don't have to summarize again
+- the current turn is never trimmed
+
+Tokens saved per turn are logged and exported as Prometheus metrics when
+prometheus_client is installed.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable, List, Mapping, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from loguru import logger
+
+try:
+    from luka_agent.core.config import settings
+except ImportError:
+    settings = None
+
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:  # pragma: no cover - metrics optional
+    Counter = Histogram = None
+
+# Tag on LLM calls made for bookkeeping (not part of the answer); stream
+# consumers skip chat model events carrying it
+INTERNAL_LLM_TAG = "luka:internal"
+
+DEFAULT_CONTEXT_TOKEN_BUDGET = 8000
+DEFAULT_CONTEXT_SUMMARY_WATERMARK = 0.6
+DEFAULT_CONTEXT_TOOL_STUB_CHARS = 300
+DEFAULT_CONTEXT_SUMMARY_MAX_CHARS = 2000
+DEFAULT_CONTEXT_SUMMARY_TIMEOUT_SECONDS = 15.0
+
+# Rough per-message framing cost (role, separators) in chat formats
+MESSAGE_OVERHEAD_TOKENS = 4
+# Flat estimate for an image or other non-text content part
+NON_TEXT_PART_TOKENS = 256
+# ~4 bytes of UTF-8 per token; counting bytes keeps Cyrillic text honest
+BYTES_PER_TOKEN = 4
+TOKEN_CACHE_MAX_ENTRIES = 50000
+
+SUMMARY_HEADER = "## Earlier in this conversation"
+
+Summarizer = Callable[[Optional[str], Sequence[BaseMessage]], Awaitable[str]]
+
+if Counter is not None:
+    context_tokens_saved_total = Counter(
+        "luka_agent_context_tokens_saved_total",
+        "Prompt tokens saved by eliding tool outputs and summarizing old turns",
+        ["provider", "model"],
+    )
+    context_prompt_tokens = Histogram(
+        "luka_agent_context_prompt_tokens",
+        "Estimated prompt tokens sent to the LLM per agent step",
+        ["provider", "model"],
+        buckets=(500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000),
+    )
+    context_summaries_total = Counter(
+        "luka_agent_context_summaries_total",
+        "Old turns folded into the rolling summary",
+        ["status"],
+    )
+else:  # pragma: no cover - metrics optional
+    context_tokens_saved_total = context_prompt_tokens = context_summaries_total = None
+
+_token_counts: "OrderedDict[Hashable, int]" = OrderedDict()
+
+
+def _setting(name: str, default: Any) -> Any:
+    return getattr(settings, name, default) if settings is not None else default
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text without a tokenizer."""
+    return (len(text.encode("utf-8")) + BYTES_PER_TOKEN - 1) // BYTES_PER_TOKEN
+
+
+def _content_tokens(content: Any) -> int:
+    if isinstance(content, str):
+        return estimate_tokens(content)
+    tokens = 0
+    for part in content or []:
+        if isinstance(part, str):
+            tokens += estimate_tokens(part)
+        elif isinstance(part, dict) and part.get("type") == "text":
+            tokens += estimate_tokens(part.get("text", ""))
+        else:
+            tokens += NON_TEXT_PART_TOKENS
+    return tokens
+
+
+def count_tokens(message: BaseMessage) -> int:
+    """
+    Estimate a message's prompt tokens, computing it once per message.
+
+    Messages are cached by id (the checkpointer gives every message one),
+    so long histories aren't re-measured on every agent step.
+    """
+    content = message.content
+    key = (message.id, type(message).__name__, len(content)) if message.id else None
+    if key is not None:
+        cached = _token_counts.get(key)
+        if cached is not None:
+            _token_counts.move_to_end(key)
+            return cached
+
+    tokens = MESSAGE_OVERHEAD_TOKENS + _content_tokens(content)
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        tokens += estimate_tokens(json.dumps(tool_calls, default=str))
+
+    if key is not None:
+        _token_counts[key] = tokens
+        while len(_token_counts) > TOKEN_CACHE_MAX_ENTRIES:
+            _token_counts.popitem(last=False)
+    return tokens
+
+
+def token_budget(provider: str, model: str) -> int:
+    """
+    Prompt token budget for a provider/model.
+
+    Looks up LUKA_CONTEXT_TOKEN_BUDGETS by "provider/model", then model,
+    then provider, falling back to LUKA_CONTEXT_TOKEN_BUDGET.
+    """
+    budgets = _setting("LUKA_CONTEXT_TOKEN_BUDGETS", None) or {}
+    for key in (f"{provider}/{model}", model, provider):
+        if key in budgets:
+            return int(budgets[key])
+    return int(_setting("LUKA_CONTEXT_TOKEN_BUDGET", DEFAULT_CONTEXT_TOKEN_BUDGET))
+
+
+def elide_tool_output(message: ToolMessage, max_chars: int) -> ToolMessage:
+    """Replace a long tool output with a short stub (same tool_call_id and id)."""
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    if len(content) <= max_chars:
+        return message
+    stub = (
+        f"[Output of {message.name or 'tool'} from an earlier turn, shortened from "
+        f"{len(content)} chars. Call the tool again if the full result is needed.]\n"
+        f"{content[:max_chars]}…"
+    )
+    return message.model_copy(update={"content": stub})
+
+
+def _turn_starts(messages: Sequence[BaseMessage]) -> List[int]:
+    return [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+
+
+def _render(messages: Sequence[BaseMessage], chars: int = 300) -> str:
+    lines = []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            role = "User"
+        elif isinstance(message, ToolMessage):
+            role = f"Tool {message.name or ''}".strip()
+        elif isinstance(message, AIMessage):
+            role = "Assistant"
+        else:
+            continue
+        text = message.content if isinstance(message.content, str) else str(message.content)
+        if not text and getattr(message, "tool_calls", None):
+            text = "called " + ", ".join(call["name"] for call in message.tool_calls)
+        if text:
+            lines.append(f"{role}: {' '.join(text.split())[:chars]}")
+    return "\n".join(lines)
+
+
+def _clip_summary(summary: str) -> str:
+    max_chars = _setting("LUKA_CONTEXT_SUMMARY_MAX_CHARS", DEFAULT_CONTEXT_SUMMARY_MAX_CHARS)
+    # Keep the most recent part: older facts matter least
+    return summary if len(summary) <= max_chars else "…" + summary[-max_chars:]
+
+
+def extractive_summary(previous: Optional[str], messages: Sequence[BaseMessage]) -> str:
+    """Summary without an LLM: previous summary plus clipped lines per message."""
+    parts = [previous] if previous else []
+    parts.append(_render(messages, chars=150))
+    return _clip_summary("\n".join(p for p in parts if p))
+
+
+def llm_summarizer(provider: str, model: str) -> Summarizer:
+    """Summarizer using the sub-agent's own chat model."""
+
+    async def summarize(previous: Optional[str], messages: Sequence[BaseMessage]) -> str:
+        from luka_agent.registry import get_chat_model
+
+        llm = get_chat_model(provider, model, 0.2)
+        prompt = (
+            "Update the running summary of a conversation with the new messages below. "
+            "Keep facts, decisions, user preferences, names, numbers and open questions; "
+            "drop pleasantries. Write at most 10 short lines, in the conversation's language.\n\n"
+            f"Current summary:\n{previous or '(none)'}\n\n"
+            f"New messages:\n{_render(messages)}\n\n"
+            "Updated summary:"
+        )
+        # Detached from the graph run's callbacks: under astream_events the
+        # summary would otherwise stream to the user as part of the answer
+        response = await llm.ainvoke(prompt, config={"callbacks": [], "tags": [INTERNAL_LLM_TAG]})
+        return _clip_summary(str(response.content).strip())
+
+    return summarize
+
+
+@dataclass
+class ContextWindow:
+    """What agent_node sends to the LLM, plus the state updates it implies."""
+    messages: List[BaseMessage]
+    summary: Optional[str]
+    summary_upto: Optional[str]
+    tokens_before: int
+    tokens_after: int
+    budget: int
+    elided: int = 0
+    folded: int = 0
+    summary_updated: bool = field(default=False, compare=False)
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.tokens_before - self.tokens_after)
+
+    def state_updates(self) -> dict:
+        """AgentState updates to persist (only when the summary changed)."""
+        if not self.summary_updated:
+            return {}
+        return {"context_summary": self.summary, "context_summary_upto": self.summary_upto}
+
+
+def _system_message(system_prompt: str, summary: Optional[str]) -> SystemMessage:
+    # One system message: some providers reject more than one
+    if summary:
+        system_prompt = f"{system_prompt}\n\n{SUMMARY_HEADER}\n{summary}"
+    return SystemMessage(content=system_prompt)
+
+
+def _window_start(messages: Sequence[BaseMessage], summary_upto: Optional[str]) -> int:
+    if summary_upto:
+        for i, message in enumerate(messages):
+            if message.id == summary_upto:
+                return i + 1
+    return 0
+
+
+async def build_context_window(
+    state: Mapping[str, Any],
+    system_prompt: str,
+    budget: Optional[int] = None,
+    summarize: Optional[Summarizer] = None,
+) -> ContextWindow:
+    """
+    Build the token-budgeted message list for one agent step.
+
+    Args:
+        state: Agent state (messages, context_summary, llm_provider/llm_model)
+        system_prompt: Sub-agent system prompt
+        budget: Prompt token budget (None = per provider/model from settings)
+        summarize: Summarizer for folded turns (None = the state's chat model,
+            falling back to an extractive summary on error or timeout)
+
+    Returns:
+        ContextWindow; send `.messages`, persist `.state_updates()`
+    """
+    provider = state.get("llm_provider", "ollama")
+    model = state.get("llm_model", "llama3.2")
+    if budget is None:
+        budget = token_budget(provider, model)
+
+    all_messages: List[BaseMessage] = list(state.get("messages") or [])
+    summary: Optional[str] = state.get("context_summary")
+    summary_upto: Optional[str] = state.get("context_summary_upto")
+
+    start = _window_start(all_messages, summary_upto)
+    if start == 0:
+        # Summary refers to messages this history no longer has
+        summary, summary_upto = None, None
+    window = all_messages[start:]
+
+    system_tokens = count_tokens(SystemMessage(content=system_prompt))
+    summary_tokens = estimate_tokens(summary) if summary else 0
+    tokens_before = system_tokens + sum(count_tokens(m) for m in all_messages)
+
+    # Stale tool outputs: everything before the current turn
+    turn_starts = _turn_starts(window)
+    current_turn = turn_starts[-1] if turn_starts else 0
+    stub_chars = _setting("LUKA_CONTEXT_TOOL_STUB_CHARS", DEFAULT_CONTEXT_TOOL_STUB_CHARS)
+    elided = 0
+    for i in range(current_turn):
+        message = window[i]
+        if isinstance(message, ToolMessage):
+            stub = elide_tool_output(message, stub_chars)
+            if stub is not message:
+                window[i] = stub
+                elided += 1
+
+    sizes = [count_tokens(m) for m in window]
+    total = system_tokens + summary_tokens + sum(sizes)
+
+    folded = 0
+    summary_updated = False
+    if total > budget and len(turn_starts) > 1:
+        # Fold whole turns (so tool results stay with their tool calls) down to the watermark
+        target = budget * _setting("LUKA_CONTEXT_SUMMARY_WATERMARK", DEFAULT_CONTEXT_SUMMARY_WATERMARK)
+        cut = 0
+        remaining = sum(sizes)
+        for next_start in turn_starts[1:]:
+            remaining -= sum(sizes[cut:next_start])
+            cut = next_start
+            if system_tokens + summary_tokens + remaining <= target:
+                break
+
+        to_fold, window = window[:cut], window[cut:]
+        summary = await _summarize(summary, to_fold, summarize or llm_summarizer(provider, model))
+        summary_upto = all_messages[start + cut - 1].id
+        summary_updated = True
+        folded = len(to_fold)
+        total = system_tokens + estimate_tokens(summary) + sum(count_tokens(m) for m in window)
+
+    if total > budget:
+        logger.warning(f"⚠️ Context window over budget ({total}/{budget} tokens) after trimming")
+
+    result = ContextWindow(
+        messages=[_system_message(system_prompt, summary)] + window,
+        summary=summary,
+        summary_upto=summary_upto,
+        tokens_before=tokens_before,
+        tokens_after=total,
+        budget=budget,
+        elided=elided,
+        folded=folded,
+        summary_updated=summary_updated,
+    )
+    _record(result, provider, model)
+    return result
+
+
+async def _summarize(previous: Optional[str], messages: Sequence[BaseMessage], summarize: Summarizer) -> str:
+    timeout = _setting("LUKA_CONTEXT_SUMMARY_TIMEOUT_SECONDS", DEFAULT_CONTEXT_SUMMARY_TIMEOUT_SECONDS)
+    try:
+        summary = await asyncio.wait_for(summarize(previous, messages), timeout=timeout)
+        if summary:
+            if context_summaries_total is not None:
+                context_summaries_total.labels(status="llm").inc()
+            return summary
+    except asyncio.TimeoutError:
+        logger.warning(f"⏱️ Context summary exceeded {timeout:g}s, using extractive summary")
+    except Exception as e:
+        logger.warning(f"⚠️ Context summary failed, using extractive summary: {e}")
+    if context_summaries_total is not None:
+        context_summaries_total.labels(status="fallback").inc()
+    return extractive_summary(previous, messages)
+
+
+def _record(window: ContextWindow, provider: str, model: str) -> None:
+    if context_prompt_tokens is not None:
+        context_prompt_tokens.labels(provider=provider, model=model).observe(window.tokens_after)
+        if window.tokens_saved:
+            context_tokens_saved_total.labels(provider=provider, model=model).inc(window.tokens_saved)
+    if window.tokens_saved:
+        logger.info(
+            f"✂️ Context window: {window.tokens_before} → {window.tokens_after} tokens "
+            f"(saved {window.tokens_saved}, elided {window.elided} tool outputs, "
+            f"folded {window.folded} messages, budget {window.budget})"
+        )
+
+
+def clear_token_cache() -> None:
+    """Forget cached per-message token counts."""
+    _token_counts.clear()
+
+
+__all__ = [
+    "INTERNAL_LLM_TAG",
+    "ContextWindow",
+    "build_context_window",
+    "count_tokens",
+    "estimate_tokens",
+    "token_budget",
+    "elide_tool_output",
+    "extractive_summary",
+    "llm_summarizer",
+    "clear_token_cache",
+]
@@ -81,8 +81,46 @@ class LukaSettings(EnvBaseSettings):
     # YouTube Tool Configuration
     YOUTUBE_TRANSCRIPT_ENABLED: bool = True  # Enable YouTube transcript tool
 
+    # Tool Execution
+    LUKA_TOOL_TIMEOUT_SECONDS: float = 60.0  # Per-tool timeout (tools may override via metadata["timeout"])
+    LUKA_MAX_CONCURRENT_TOOLS_PER_USER: int = 4  # Tools one user may run at once across runs
+    LUKA_TOOL_CACHE_TTL_SECONDS: float = 300.0  # How long a user's built tools are reused across nodes/runs
+    LUKA_TOOL_CACHE_MAX_ENTRIES: int = 1000  # Max cached tool bundles (LRU)
+    LUKA_LLM_MAX_CONNECTIONS: int = 100  # Shared HTTP pool size per LLM base URL
+
+    # Sub-agents
+    LUKA_SUB_AGENT_RELOAD_INTERVAL_SECONDS: float = 2.0  # Min seconds between config/prompt mtime checks (-1 = never reload)
+    LUKA_INTENT_MIN_CONFIDENCE: float = 0.3  # Min router confidence to suggest a sub-agent without asking the LLM
+    LUKA_INTENT_EMBEDDING_WEIGHT: float = 0.5  # Share of embedding similarity when an embedder is configured
+
+    # Context window (prompt token budget per agent step)
+    LUKA_CONTEXT_TOKEN_BUDGET: int = 8000  # Default prompt budget in (estimated) tokens
+    LUKA_CONTEXT_TOKEN_BUDGETS: dict[str, int] = {}  # Overrides by "provider/model", model or provider (JSON in env)
+    LUKA_CONTEXT_SUMMARY_WATERMARK: float = 0.6  # Fold old turns until the prompt is this share of the budget
+    LUKA_CONTEXT_TOOL_STUB_CHARS: int = 300  # Tool outputs from earlier turns are cut to this preview
+    LUKA_CONTEXT_SUMMARY_MAX_CHARS: int = 2000  # Rolling summary length cap
+    LUKA_CONTEXT_SUMMARY_TIMEOUT_SECONDS: float = 15.0  # Slower summaries fall back to an extractive one
+
+    # Image description (describe_image tool)
+    LUKA_IMAGE_MAX_BYTES: int = 10 * 1024 * 1024  # Download cap; larger images are rejected mid-stream
+    LUKA_IMAGE_DOWNLOAD_TIMEOUT_SECONDS: float = 30.0
+    LUKA_IMAGE_CACHE_MAX_ENTRIES: int = 1000  # In-memory description LRU
+    LUKA_IMAGE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # Description cache lifetime (memory and Redis)
+    LUKA_IMAGE_CACHE_REDIS: bool = True  # Share descriptions across processes via Redis
+
+    # Suggestions (generated after the answer, off the critical path)
+    LUKA_SUGGESTIONS_TIMEOUT_SECONDS: float = 8.0  # Latency budget; slower suggestions are dropped
+    LUKA_SUGGESTIONS_MAX_IN_FLIGHT: int = 32  # Skip suggestions when this many are already generating
+    LUKA_SUGGESTIONS_CACHE_TTL_SECONDS: float = 600.0  # Cache by conversation-tail hash
+    LUKA_SUGGESTIONS_CACHE_MAX_ENTRIES: int = 5000
+
     # Checkpointer Configuration
     LUKA_USE_MEMORY_CHECKPOINTER: bool = True  # Use in-memory checkpointer (default), set to False for Redis in production
+    LUKA_CHECKPOINT_TTL_SECONDS: int = 7 * 24 * 3600  # Idle threads expire from Redis (0 = never)
+    LUKA_CHECKPOINT_MAX_PER_THREAD: int = 20  # Older checkpoints (and their messages) are compacted away
+    LUKA_CHECKPOINT_CACHE_THREADS: int = 512  # Hot threads kept in the in-process LRU
+    LUKA_CHECKPOINT_CACHE_MAX_MESSAGES: int = 50000  # Memory bound for the LRU, in messages
+    LUKA_CHECKPOINT_WRITE_BEHIND: bool = False  # Queue Redis writes instead of awaiting them per step (unwritten steps are lost on a crash)
 
 
 class Settings(
@@ -0,0 +1,660 @@
+"""
+Async Redis checkpointer with append-only message storage.
+
+`RedisSaver` is synchronous and stores a full snapshot (including the whole
+message history) after every node, so each step blocks the event loop and
+re-serializes the conversation. `AsyncDeltaRedisSaver` instead:
+
+- talks to Redis with `redis.asyncio` and pipelines each step into one round trip
+- appends only new messages to a per-thread message log; a checkpoint stores
+  the `[start, end)` slice of the log it sees, so a step costs O(new messages)
+- keeps the latest checkpoint of hot threads in a memory-bounded LRU; a
+  turn checks it is still current with one small read instead of loading
+  the whole state
+- writes each checkpoint with one Lua script that first checks the log end
+  and latest checkpoint id the cache expects; if Redis moved on (another
+  replica wrote the thread, or an earlier write failed) the step is
+  recomputed against Redis' head, so log offsets never go wrong
+- optionally (off by default) writes behind: Redis writes are queued per
+  thread (in order) and `aput` returns immediately, at the price of losing
+  steps that were acknowledged but not yet written if the process dies
+- caps each thread at a number of checkpoints, compacting the message log
+  as old checkpoints are dropped, and expires idle threads via TTL
+
+Redis layout per (thread_id, checkpoint_ns), under `{key_prefix}:{thread_id}:{ns}`:
+    :ids        ZSET  checkpoint_id scored by its log start (ties order by id)
+    :cp         HASH  checkpoint_id -> checkpoint record (without messages)
+    :log        LIST  serialized messages (append-only)
+    :base       STR   absolute log offset of :log[0] (advances on compaction)
+    :w:{id}     HASH  pending writes of one checkpoint
+"""
+
+import asyncio
+import copy
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+from redis.asyncio import Redis
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    copy_checkpoint,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+MESSAGES_CHANNEL = "messages"
+
+# (task_id, idx) -> (task_id, channel, value, task_path)
+PendingWrites = Dict[Tuple[str, int], Tuple[str, str, Any, str]]
+
+# Append a checkpoint's new messages and store its record, if Redis' head is
+# still the one the write was computed against (returns -1 otherwise).
+# KEYS: log, cp, ids, base
+# ARGV: expected log end, expected latest checkpoint id ('' if none),
+#       checkpoint id, record, log start (score), ttl, appended messages...
+WRITE_SCRIPT = """
+local log_end = tonumber(redis.call('GET', KEYS[4]) or '0') + redis.call('LLEN', KEYS[1])
+local latest = redis.call('ZREVRANGE', KEYS[3], 0, 0)[1] or ''
+if log_end ~= tonumber(ARGV[1]) or latest ~= ARGV[2] then
+    return -1
+end
+for i = 7, #ARGV, 1000 do
+    redis.call('RPUSH', KEYS[1], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+end
+redis.call('HSET', KEYS[2], ARGV[3], ARGV[4])
+redis.call('ZADD', KEYS[3], ARGV[5], ARGV[3])
+redis.call('SETNX', KEYS[4], 0)
+if tonumber(ARGV[6]) > 0 then
+    for i = 1, 4 do
+        redis.call('EXPIRE', KEYS[i], ARGV[6])
+    end
+end
+return redis.call('ZCARD', KEYS[3])
+"""
+
+
+@dataclass
+class _ThreadHead:
+    """Latest checkpoint of a thread, as cached in the LRU."""
+    checkpoint_id: str
+    checkpoint: Checkpoint
+    metadata: CheckpointMetadata
+    parent_id: Optional[str]
+    messages: List[Any]
+    msg_start: int
+    msg_end: int
+    log_end: int
+    pending_writes: PendingWrites = field(default_factory=dict)
+
+
+class AsyncDeltaRedisSaver(BaseCheckpointSaver):
+    """
+    LangGraph checkpointer for graphs driven with `ainvoke`/`astream`.
+
+    Args:
+        redis: `redis.asyncio.Redis` client (bytes responses)
+        key_prefix: Namespace for all keys
+        ttl_seconds: Idle thread expiry (0 = never expire)
+        max_checkpoints: Checkpoints kept per thread; older ones are compacted away
+        cache_threads: Max threads held in the in-process LRU
+        cache_max_messages: Max messages held across all cached threads
+        write_behind: Queue Redis writes instead of awaiting them in `aput`
+            (steps not yet written are lost if the process dies)
+        max_pending_writes: Per-thread queued writes before `aput` waits (backpressure)
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        key_prefix: str = "luka:ckpt",
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_checkpoints: int = 20,
+        cache_threads: int = 512,
+        cache_max_messages: int = 50000,
+        write_behind: bool = False,
+        max_pending_writes: int = 16,
+        serde=None,
+    ):
+        super().__init__(serde=serde)
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self.ttl_seconds = ttl_seconds
+        self.max_checkpoints = max(1, max_checkpoints)
+        self.cache_threads = max(1, cache_threads)
+        self.cache_max_messages = max(0, cache_max_messages)
+        self.write_behind = write_behind
+        self.max_pending_writes = max(1, max_pending_writes)
+
+        self._heads: "OrderedDict[Tuple[str, str], _ThreadHead]" = OrderedDict()
+        self._cached_messages = 0
+        self._queues: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._queued: Dict[Tuple[str, str], int] = {}
+        self._write_script = None
+        self.conflicts = 0
+
+    # ------------------------------------------------------------------
+    # Keys and (de)serialization
+    # ------------------------------------------------------------------
+
+    def _prefix(self, thread_id: str, checkpoint_ns: str) -> str:
+        return f"{self.key_prefix}:{thread_id}:{checkpoint_ns}"
+
+    def _dumps(self, value: Any) -> bytes:
+        type_, data = self.serde.dumps_typed(value)
+        return type_.encode() + b"\n" + data
+
+    def _loads(self, blob: bytes) -> Any:
+        type_, _, data = blob.partition(b"\n")
+        return self.serde.loads_typed((type_.decode(), data))
+
+    # ------------------------------------------------------------------
+    # In-process LRU of thread heads
+    # ------------------------------------------------------------------
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[_ThreadHead]:
+        head = self._heads.get(key)
+        if head is not None:
+            self._heads.move_to_end(key)
+        return head
+
+    def _cache_put(self, key: Tuple[str, str], head: _ThreadHead):
+        self._cache_drop(key)
+        self._heads[key] = head
+        self._cached_messages += len(head.messages)
+        while len(self._heads) > 1 and (
+            len(self._heads) > self.cache_threads or self._cached_messages > self.cache_max_messages
+        ):
+            _, evicted = self._heads.popitem(last=False)
+            self._cached_messages -= len(evicted.messages)
+
+    def _cache_drop(self, key: Tuple[str, str]):
+        head = self._heads.pop(key, None)
+        if head is not None:
+            self._cached_messages -= len(head.messages)
+
+    # ------------------------------------------------------------------
+    # Ordered per-thread write queue
+    # ------------------------------------------------------------------
+
+    async def _submit(self, key: Tuple[str, str], write) -> None:
+        """Run `write()` after earlier writes of the same thread."""
+        if not self.write_behind:
+            await self._drain(key)
+            await write()
+            return
+
+        if self._queued.get(key, 0) >= self.max_pending_writes:
+            await self._drain(key)
+
+        previous = self._queues.get(key)
+
+        async def run():
+            if previous is not None:
+                await asyncio.gather(previous, return_exceptions=True)
+            try:
+                await write()
+            except Exception as e:
+                # Redis is now behind the cache; drop the head so reads go to Redis.
+                # Writes queued behind this one see the mismatch and recompute.
+                logger.error(f"❌ Checkpoint write failed for thread {key[0]}: {e}")
+                self._cache_drop(key)
+            finally:
+                self._queued[key] -= 1
+                if not self._queued[key]:
+                    del self._queued[key]
+
+        task = asyncio.create_task(run())
+        self._queues[key] = task
+        self._queued[key] = self._queued.get(key, 0) + 1
+        task.add_done_callback(lambda t: self._queues.get(key) is t and self._queues.pop(key))
+
+    async def _drain(self, key: Tuple[str, str]) -> None:
+        task = self._queues.get(key)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def flush(self) -> None:
+        """Wait for all queued writes (call before shutdown)."""
+        if self._queues:
+            await asyncio.gather(*self._queues.values(), return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _head_tuple(self, thread_id: str, checkpoint_ns: str, head: _ThreadHead) -> CheckpointTuple:
+        # Hand out copies: the graph must not mutate the cached head in place
+        checkpoint = copy_checkpoint(head.checkpoint)
+        checkpoint["channel_values"] = {
+            channel: list(head.messages) if channel == MESSAGES_CHANNEL else copy.deepcopy(value)
+            for channel, value in head.checkpoint["channel_values"].items()
+        }
+        return self._make_tuple(
+            thread_id, checkpoint_ns, head.checkpoint_id, checkpoint,
+            head.metadata, head.parent_id, head.pending_writes,
+        )
+
+    def _make_tuple(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        checkpoint_id: str,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        parent_id: Optional[str],
+        writes: PendingWrites,
+    ) -> CheckpointTuple:
+        ordered = sorted(writes.values(), key=lambda w: (w[3], w[0]))
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+            }},
+            checkpoint=checkpoint,
+            metadata=metadata,
+            parent_config=(
+                {"configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": parent_id,
+                }}
+                if parent_id else None
+            ),
+            pending_writes=[(task_id, channel, value) for task_id, channel, value, _ in ordered],
+        )
+
+    async def _load_head(
+        self, thread_id: str, checkpoint_ns: str, checkpoint_id: Optional[str]
+    ) -> Optional[_ThreadHead]:
+        """Load one checkpoint (latest if `checkpoint_id` is None) from Redis."""
+        prefix = self._prefix(thread_id, checkpoint_ns)
+        if checkpoint_id is None:
+            latest = await self.redis.zrevrange(f"{prefix}:ids", 0, 0)
+            if not latest:
+                return None
+            checkpoint_id = latest[0].decode()
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hget(f"{prefix}:cp", checkpoint_id)
+            pipe.hgetall(f"{prefix}:w:{checkpoint_id}")
+            pipe.get(f"{prefix}:base")
+            pipe.llen(f"{prefix}:log")
+            record_blob, writes_blob, base, log_len = await pipe.execute()
+        if record_blob is None:
+            return None
+
+        record = self._loads(record_blob)
+        base = int(base or 0)
+        messages: List[Any] = []
+        if record["has_messages"] and record["msg_end"] > record["msg_start"]:
+            blobs = await self.redis.lrange(
+                f"{prefix}:log", record["msg_start"] - base, record["msg_end"] - base - 1
+            )
+            messages = [self._loads(blob) for blob in blobs]
+
+        checkpoint = record["checkpoint"]
+        if record["has_messages"]:
+            checkpoint["channel_values"][MESSAGES_CHANNEL] = messages
+
+        pending: PendingWrites = {}
+        for blob in writes_blob.values():
+            task_id, idx, channel, value, task_path = self._loads(blob)
+            pending[(task_id, idx)] = (task_id, channel, value, task_path)
+
+        return _ThreadHead(
+            checkpoint_id=checkpoint_id,
+            checkpoint=checkpoint,
+            metadata=record["metadata"],
+            parent_id=record["parent_id"],
+            messages=messages,
+            msg_start=record["msg_start"],
+            msg_end=record["msg_end"],
+            log_end=base + int(log_len),
+            pending_writes=pending,
+        )
+
+    async def _is_current(self, key: Tuple[str, str], head: _ThreadHead) -> bool:
+        """True if `head` is still the thread's latest checkpoint in Redis (one round trip)."""
+        prefix = self._prefix(*key)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zrevrange(f"{prefix}:ids", 0, 0)
+            pipe.get(f"{prefix}:base")
+            pipe.llen(f"{prefix}:log")
+            latest, base, log_len = await pipe.execute()
+        return bool(latest) and latest[0].decode() == head.checkpoint_id and int(base or 0) + log_len == head.log_end
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = get_checkpoint_id(config)
+        key = (thread_id, checkpoint_ns)
+
+        head = self._cache_get(key)
+        if head is not None and checkpoint_id in (None, head.checkpoint_id):
+            # Queued writes of our own mean Redis is legitimately behind the cache
+            if key in self._queues or await self._is_current(key, head):
+                return self._head_tuple(thread_id, checkpoint_ns, head)
+            self._cache_drop(key)
+
+        await self._drain(key)
+        loaded = await self._load_head(thread_id, checkpoint_ns, checkpoint_id)
+        if loaded is None:
+            return None
+        if checkpoint_id is None:
+            self._cache_put(key, loaded)
+        return self._head_tuple(thread_id, checkpoint_ns, loaded)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        if config is None:
+            raise ValueError("AsyncDeltaRedisSaver.alist requires a thread_id in config")
+
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        config_checkpoint_id = get_checkpoint_id(config)
+        before_checkpoint_id = get_checkpoint_id(before) if before else None
+        key = (thread_id, checkpoint_ns)
+        await self._drain(key)
+
+        ids = await self.redis.zrevrange(f"{self._prefix(thread_id, checkpoint_ns)}:ids", 0, -1)
+        for raw_id in ids:
+            checkpoint_id = raw_id.decode()
+            if config_checkpoint_id and checkpoint_id != config_checkpoint_id:
+                continue
+            if before_checkpoint_id and checkpoint_id >= before_checkpoint_id:
+                continue
+            if limit is not None and limit <= 0:
+                break
+
+            head = await self._load_head(thread_id, checkpoint_ns, checkpoint_id)
+            if head is None:
+                continue
+            if filter and not all(head.metadata.get(k) == v for k, v in filter.items()):
+                continue
+            if limit is not None:
+                limit -= 1
+            yield self._head_tuple(thread_id, checkpoint_ns, head)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_id = config["configurable"].get("checkpoint_id")
+        key = (thread_id, checkpoint_ns)
+
+        previous = self._cache_get(key)
+        if previous is None:
+            # Cold thread: the message log may already exist in Redis
+            await self._drain(key)
+            previous = await self._load_head(thread_id, checkpoint_ns, None)
+
+        full_metadata = get_checkpoint_metadata(config, metadata)
+        head, record, appended_blobs = self._prepare(previous, checkpoint, full_metadata, parent_id)
+
+        if self.write_behind:
+            # Later steps build on this head before its write lands
+            self._cache_put(key, head)
+
+            async def write():
+                written = await self._commit(key, previous, head, record, appended_blobs)
+                if written is not head and self._heads.get(key) is head:
+                    self._cache_put(key, written)
+
+            await self._submit(key, write)
+        else:
+            await self._drain(key)
+            self._cache_put(key, await self._commit(key, previous, head, record, appended_blobs))
+
+        return {"configurable": {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+        }}
+
+    def _prepare(
+        self,
+        previous: Optional[_ThreadHead],
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        parent_id: Optional[str],
+    ) -> Tuple[_ThreadHead, bytes, List[bytes]]:
+        """Place a checkpoint's messages in the log after `previous`: (new head, record, appended messages)."""
+        messages = checkpoint["channel_values"].get(MESSAGES_CHANNEL)
+        has_messages = isinstance(messages, list)
+        messages = list(messages) if has_messages else []
+        log_end = previous.log_end if previous else 0
+
+        if has_messages and previous is not None and self._extends(previous, messages):
+            # Common case: the new history is the old one plus a few messages
+            appended = messages[len(previous.messages):]
+            msg_start = previous.msg_start
+        else:
+            # First checkpoint, or history was rewritten (e.g. removed or
+            # summarized messages): start a fresh segment at the end of the log
+            appended = messages
+            msg_start = log_end
+        msg_end = msg_start + len(messages)
+
+        stored_checkpoint = dict(checkpoint)
+        stored_values = dict(checkpoint["channel_values"])
+        stored_values.pop(MESSAGES_CHANNEL, None)
+        stored_checkpoint["channel_values"] = stored_values
+
+        record = self._dumps({
+            "checkpoint": stored_checkpoint,
+            "metadata": metadata,
+            "parent_id": parent_id,
+            "has_messages": has_messages,
+            "msg_start": msg_start,
+            "msg_end": msg_end,
+        })
+
+        cached_checkpoint = copy_checkpoint(checkpoint)
+        cached_checkpoint["channel_values"] = {
+            channel: messages if channel == MESSAGES_CHANNEL else copy.deepcopy(value)
+            for channel, value in checkpoint["channel_values"].items()
+        }
+        head = _ThreadHead(
+            checkpoint_id=checkpoint["id"],
+            checkpoint=cached_checkpoint,
+            metadata=metadata,
+            parent_id=parent_id,
+            messages=messages,
+            msg_start=msg_start,
+            msg_end=msg_end,
+            log_end=log_end + len(appended),
+        )
+        return head, record, [self._dumps(message) for message in appended]
+
+    async def _commit(
+        self,
+        key: Tuple[str, str],
+        previous: Optional[_ThreadHead],
+        head: _ThreadHead,
+        record: bytes,
+        appended_blobs: List[bytes],
+    ) -> _ThreadHead:
+        """
+        Write a prepared checkpoint; returns the head as written.
+
+        If Redis' head isn't `previous` (an earlier write failed, or another
+        replica wrote the thread), the checkpoint is placed again after the
+        head loaded from Redis and written once more.
+        """
+        if self._write_script is None:
+            self._write_script = self.redis.register_script(WRITE_SCRIPT)
+        prefix = self._prefix(*key)
+        for _ in range(2):
+            count = await self._write_script(
+                keys=[f"{prefix}:{suffix}" for suffix in ("log", "cp", "ids", "base")],
+                args=[
+                    previous.log_end if previous else 0,
+                    previous.checkpoint_id if previous else "",
+                    head.checkpoint_id, record, head.msg_start, self.ttl_seconds,
+                    *appended_blobs,
+                ],
+            )
+            if count >= 0:
+                break
+            self.conflicts += 1
+            logger.warning(f"⚠️ Checkpoint head of thread {key[0]} changed in Redis, recomputing the write")
+            pending_writes = head.pending_writes
+            previous = await self._load_head(*key, None)
+            head, record, appended_blobs = self._prepare(previous, head.checkpoint, head.metadata, head.parent_id)
+            head.pending_writes = pending_writes
+        else:
+            raise RuntimeError(f"Concurrent checkpoint writes to thread {key[0]}")
+
+        if count > self.max_checkpoints:
+            await self._compact(prefix, count)
+        return head
+
+    @staticmethod
+    def _extends(previous: _ThreadHead, messages: List[Any]) -> bool:
+        """True if `messages` starts with the previous head's messages."""
+        old = previous.messages
+        if len(messages) < len(old) or previous.msg_end != previous.log_end:
+            return False
+        return all(a is b or a == b for a, b in zip(old, messages))
+
+    async def _compact(self, prefix: str, count: int) -> None:
+        """Drop checkpoints beyond `max_checkpoints` and the log prefix only they used."""
+        excess = count - self.max_checkpoints
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zrange(f"{prefix}:ids", 0, excess - 1)
+            pipe.zrange(f"{prefix}:ids", excess, excess, withscores=True)
+            pipe.get(f"{prefix}:base")
+            dropped, oldest_kept, base = await pipe.execute()
+        if not dropped or not oldest_kept:
+            return
+
+        base = int(base or 0)
+        new_base = int(oldest_kept[0][1])
+        dropped_ids = [raw.decode() for raw in dropped]
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(f"{prefix}:ids", *dropped_ids)
+            pipe.hdel(f"{prefix}:cp", *dropped_ids)
+            pipe.delete(*(f"{prefix}:w:{checkpoint_id}" for checkpoint_id in dropped_ids))
+            if new_base > base:
+                pipe.ltrim(f"{prefix}:log", new_base - base, -1)
+                pipe.set(f"{prefix}:base", new_base, keepttl=True)
+            await pipe.execute()
+
+        logger.debug(
+            f"🗜️ Compacted checkpoints {prefix}: dropped {len(dropped_ids)}, "
+            f"trimmed {max(0, new_base - base)} messages"
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        key = (thread_id, checkpoint_ns)
+
+        head = self._cache_get(key)
+        pending = head.pending_writes if head and head.checkpoint_id == checkpoint_id else None
+
+        fields: Dict[str, bytes] = {}
+        for idx, (channel, value) in enumerate(writes):
+            write_idx = WRITES_IDX_MAP.get(channel, idx)
+            if pending is not None:
+                if write_idx >= 0 and (task_id, write_idx) in pending:
+                    continue
+                pending[(task_id, write_idx)] = (task_id, channel, value, task_path)
+            fields[f"{task_id}:{write_idx}"] = self._dumps((task_id, write_idx, channel, value, task_path))
+
+        if not fields:
+            return
+
+        writes_key = f"{self._prefix(thread_id, checkpoint_ns)}:w:{checkpoint_id}"
+
+        async def write():
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hset(writes_key, mapping=fields)
+                if self.ttl_seconds > 0:
+                    pipe.expire(writes_key, self.ttl_seconds)
+                await pipe.execute()
+
+        await self._submit(key, write)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        for key in [k for k in self._heads if k[0] == thread_id]:
+            self._cache_drop(key)
+        for key in [k for k in self._queues if k[0] == thread_id]:
+            await self._drain(key)
+
+        pattern = f"{self.key_prefix}:{_escape_glob(thread_id)}:*"
+        batch = []
+        async for redis_key in self.redis.scan_iter(match=pattern, count=500):
+            batch.append(redis_key)
+            if len(batch) >= 500:
+                await self.redis.delete(*batch)
+                batch.clear()
+        if batch:
+            await self.redis.delete(*batch)
+
+    async def aclose(self) -> None:
+        await self.flush()
+        await self.redis.aclose()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "cached_threads": len(self._heads),
+            "cached_messages": self._cached_messages,
+            "queued_writes": sum(self._queued.values()),
+            "write_conflicts": self.conflicts,
+        }
+
+    # Sync API: the graph is only driven asynchronously
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        raise NotImplementedError("AsyncDeltaRedisSaver only supports the async API (ainvoke/astream)")
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        raise NotImplementedError("AsyncDeltaRedisSaver only supports the async API (ainvoke/astream)")
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        raise NotImplementedError("AsyncDeltaRedisSaver only supports the async API (ainvoke/astream)")
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        raise NotImplementedError("AsyncDeltaRedisSaver only supports the async API (ainvoke/astream)")
+
+
+def _escape_glob(value: str) -> str:
+    for char in "\\*?[]":
+        value = value.replace(char, f"\\{char}")
+    return value
+
+
+__all__ = ["AsyncDeltaRedisSaver"]
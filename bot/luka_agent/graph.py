@@ -10,7 +10,7 @@ from langgraph.graph import StateGraph, END
 from loguru import logger
 
 from luka_agent.state import AgentState
-from luka_agent.nodes import agent_node, tools_node, suggestions_node, should_continue
+from luka_agent.nodes import agent_node, tools_node, should_continue
 from luka_agent.checkpointer import get_checkpointer
 
 # Global graph instance (singleton)
@@ -141,7 +141,11 @@ async def get_unified_agent_graph(use_memory: bool | None = None):
     This function creates the LangGraph workflow with nodes and edges:
 
     Flow:
-        START → agent → [tools?] → suggestions → END
+        START → agent → [tools?] → END
+
+    Follow-up suggestions are not a graph step: integrations generate them
+    after the final answer (see luka_agent.suggestions), so they don't add
+    an LLM round-trip to the run.
 
     The graph uses checkpointing for automatic state persistence.
     By default, uses in-memory checkpointing. Set use_memory=False or
@@ -173,7 +177,6 @@ async def get_unified_agent_graph(use_memory: bool | None = None):
     # Add nodes
     workflow.add_node("agent", agent_node)
     workflow.add_node("tools", tools_node)
-    workflow.add_node("suggestions", suggestions_node)
 
     # Set entry point
     workflow.set_entry_point("agent")
@@ -184,22 +187,26 @@ async def get_unified_agent_graph(use_memory: bool | None = None):
         should_continue,
         {
             "tools": "tools",
-            "suggestions": "suggestions",
+            "end": END,
         },
     )
 
     # After tools, go back to agent for final response
     workflow.add_edge("tools", "agent")
 
-    # After suggestions, end
-    workflow.add_edge("suggestions", END)
-
     # Get checkpointer (pass use_memory parameter)
     checkpointer = await get_checkpointer(use_memory=use_memory)
 
     # Compile graph with checkpointer
     _graph_instance = workflow.compile(checkpointer=checkpointer)
 
+    # Parse sub-agent configs and prompts now, not on the first request
+    from luka_agent.sub_agents.loader import get_sub_agent_loader
+    try:
+        get_sub_agent_loader().warm()
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to warm sub-agent cache: {e}")
+
     logger.info("✅ Unified agent graph built successfully")
 
     return _graph_instance
@@ -12,6 +12,8 @@ from loguru import logger
 
 from luka_agent import get_unified_agent_graph
 from luka_agent.adapters import TelegramAdapter
+from luka_agent.context_window import INTERNAL_LLM_TAG
+from luka_agent.suggestions import start_suggestions
 from luka_agent.tools import create_tools_for_user
 
 
@@ -50,7 +52,10 @@ async def stream_telegram_response(
         Tool notification (completed):
             {"type": "tool_notification", "content": "✅ Knowledge base search complete"}
 
-        Suggestions (final):
+        Response complete (the answer is final, suggestions may follow):
+            {"type": "response_complete"}
+
+        Suggestions (late, after response_complete):
             {"type": "suggestions", "keyboard": {...}}
             The keyboard dict is compatible with aiogram's ReplyKeyboardMarkup
 
@@ -130,8 +135,10 @@ async def stream_telegram_response(
         async for event in graph.astream_events(initial_state, config=config, version="v2"):
             event_type = event.get("event")
 
-            # LLM streaming chunks
+            # LLM streaming chunks (not internal calls such as context summaries)
             if event_type == "on_chat_model_stream":
+                if INTERNAL_LLM_TAG in event.get("tags", ()):
+                    continue
                 chunk = event.get("data", {}).get("chunk")
                 if chunk and hasattr(chunk, "content"):
                     content = chunk.content
@@ -166,10 +173,18 @@ async def stream_telegram_response(
         logger.error(f"❌ Error streaming Telegram response: {e}", exc_info=True)
         raise
 
-    # Get final state for suggestions
+    yield {"type": "response_complete"}
+
+    # Suggestions are generated after the answer, in a detached task that is
+    # cancelled if the consumer goes away
+    suggestions_task = None
     try:
         final_state = await graph.aget_state(config)
-        suggestions = final_state.values.get("conversation_suggestions", [])
+        suggestions = final_state.values.get("conversation_suggestions") or []
+        if not suggestions:
+            suggestions_task = start_suggestions(final_state.values)
+            if suggestions_task is not None:
+                suggestions = await suggestions_task
 
         if suggestions:
             logger.debug(f"💡 Generated {len(suggestions)} suggestions")
@@ -181,8 +196,11 @@ async def stream_telegram_response(
             logger.debug("💡 No suggestions generated")
 
     except Exception as e:
-        logger.warning(f"⚠️ Could not get final state for suggestions: {e}")
+        logger.warning(f"⚠️ Could not generate suggestions: {e}")
         # Don't fail - just skip suggestions
+    finally:
+        if suggestions_task is not None and not suggestions_task.done():
+            suggestions_task.cancel()
 
 
 async def invoke_telegram_response(
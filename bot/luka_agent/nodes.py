@@ -20,8 +20,9 @@ async def agent_node(state: AgentState) -> dict:
     This node:
     1. Takes the current state (with messages)
     2. Hydrates state with sub-agent config if needed
-    3. Calls the LLM with tools and sub-agent system prompt
-    4. Returns the LLM's response (text or tool calls)
+    3. Fits the history into the model's token budget (see context_window)
+    4. Calls the LLM with tools and sub-agent system prompt
+    5. Returns the LLM's response (text or tool calls) and summary updates
 
     The LLM decides whether to:
     - Answer directly (text response)
@@ -33,29 +34,21 @@ async def agent_node(state: AgentState) -> dict:
     Returns:
         State update with new message
     """
-    from langchain_openai import ChatOpenAI
-    from langchain_anthropic import ChatAnthropic
-    from langchain_core.messages import SystemMessage
-    from luka_agent.tools import create_tools_for_user
+    from luka_agent.context_window import build_context_window
     from luka_agent.graph import hydrate_state_with_sub_agent
+    from luka_agent.registry import bind_tools, get_chat_model, get_tool_bundle
 
-    # Try to import settings, gracefully handle if not available (CLI mode)
-    try:
-        from luka_agent.core.config import settings
-    except Exception:
-        settings = None
-
-    logger.info(f"🤖 Agent node processing for user {state['user_id']}")
+    logger.debug("🤖 Agent node processing for user {}", state["user_id"])
 
     # Check if state needs hydration (first run or agent switch)
     if not state.get("system_prompt_content"):
-        logger.info("🔄 State not hydrated, loading sub-agent config")
+        logger.debug("🔄 State not hydrated, loading sub-agent config")
         hydration_updates = hydrate_state_with_sub_agent(state)
         # Merge updates into state (simulate state update for this turn)
         state = {**state, **hydration_updates}
 
-    # Create tools for this user (using sub-agent's enabled_tools)
-    tools = create_tools_for_user(
+    # Tools for this user (using sub-agent's enabled_tools), shared with tools_node
+    bundle = get_tool_bundle(
         user_id=state["user_id"],
         thread_id=state["thread_id"],
         knowledge_bases=state["knowledge_bases"],
@@ -63,54 +56,18 @@ async def agent_node(state: AgentState) -> dict:
         platform=state["platform"],
         language=state["language"],
     )
+    tools = bundle.tools
 
     # Select LLM provider based on sub-agent config
     llm_provider = state.get("llm_provider", "ollama")
     llm_model = state.get("llm_model", "llama3.2")
     llm_temperature = state.get("llm_temperature", 0.7)
 
-    logger.info(f"🧠 Invoking LLM: {llm_provider}/{llm_model} (temp={llm_temperature})")
-
-    if llm_provider == "ollama":
-        # Get Ollama URL from settings or environment/default
-        if settings:
-            ollama_url = settings.OLLAMA_URL.rstrip("/")
-        else:
-            import os
-            ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/")
-
-        # Use OpenAI-compatible API for Ollama (requires /v1 endpoint)
-        # This allows using models like gpt-oss that are hosted via Ollama
-        llm = ChatOpenAI(
-            model=llm_model,
-            base_url=f"{ollama_url}/v1",
-            api_key="ollama",  # Ollama doesn't require a real API key
-            temperature=llm_temperature,
-        )
-    elif llm_provider == "openai":
-        llm = ChatOpenAI(
-            model=llm_model,
-            temperature=llm_temperature,
-        )
-    elif llm_provider == "anthropic":
-        llm = ChatAnthropic(
-            model=llm_model,
-            temperature=llm_temperature,
-        )
-    else:
-        logger.error(f"Unknown LLM provider: {llm_provider}, falling back to ollama")
-        import os
-        ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/")
-        # Use OpenAI-compatible API for Ollama fallback
-        llm = ChatOpenAI(
-            model="llama3.2",
-            base_url=f"{ollama_url}/v1",
-            api_key="ollama",  # Ollama doesn't require a real API key
-            temperature=0.7,
-        )
-
-    # Bind tools to LLM
-    llm_with_tools = llm.bind_tools(tools)
+    logger.debug("🧠 Invoking LLM: {}/{} (temp={})", llm_provider, llm_model, llm_temperature)
+
+    # Cached client and pre-bound tools: no new connection pool per iteration
+    llm = get_chat_model(llm_provider, llm_model, llm_temperature)
+    llm_with_tools = bind_tools(llm, bundle)
 
     # Use sub-agent's system prompt
     system_prompt_content = state.get(
@@ -118,30 +75,34 @@ async def agent_node(state: AgentState) -> dict:
         "You are a helpful AI assistant."
     )
 
-    logger.debug(f"📝 System prompt length: {len(system_prompt_content)} chars")
-    logger.debug(f"🔧 Tools available: {len(tools)}")
-
-    # Build messages with system prompt
-    system_message = SystemMessage(content=system_prompt_content)
-    messages = [system_message] + state["messages"]
+    logger.debug("📝 System prompt length: {} chars, tools available: {}", len(system_prompt_content), len(tools))
 
-    # Invoke LLM with current message history
-    response = await llm_with_tools.ainvoke(messages)
+    # System prompt + token-budgeted history (stale tool outputs elided,
+    # old turns folded into the rolling summary)
+    window = await build_context_window(state, system_prompt_content)
 
-    logger.info(f"✅ Agent node completed, response type: {type(response).__name__}")
+    # Invoke LLM with the windowed message history
+    response = await llm_with_tools.ainvoke(window.messages)
 
     # Determine next action based on response
     next_action = None
     if hasattr(response, "tool_calls") and response.tool_calls:
         next_action = "tools"
-        logger.info(f"🔧 Agent wants to call {len(response.tool_calls)} tools")
+        tool_call_count = len(response.tool_calls)
     else:
         next_action = "end"
-        logger.info(f"💬 Agent provided text response")
+        tool_call_count = 0
+
+    # One INFO line per agent step; per-step details above are DEBUG
+    logger.info(
+        "✅ Agent step: user={}, llm={}/{}, tool_calls={}",
+        state["user_id"], llm_provider, llm_model, tool_call_count,
+    )
 
     return {
         "messages": [response],
         "next_action": next_action,
+        **window.state_updates(),
     }
 
 
@@ -150,8 +111,8 @@ async def tools_node(state: AgentState) -> dict:
 
     This node:
     1. Extracts tool calls from the last AI message
-    2. Executes each tool
-    3. Returns tool results as ToolMessages
+    2. Executes the tools concurrently (serial-only tools run alone)
+    3. Returns tool results as ToolMessages, in tool call order
 
     Args:
         state: Current agent state
@@ -159,73 +120,29 @@ async def tools_node(state: AgentState) -> dict:
     Returns:
         State update with tool results
     """
-    from langchain_core.messages import ToolMessage
-    from luka_agent.tools import create_tools_for_user
+    from luka_agent.registry import get_tool_bundle
+    from luka_agent.tool_executor import execute_tool_calls
 
-    logger.info(f"🔧 Tools node executing for user {state['user_id']}")
+    logger.debug("🔧 Tools node executing for user {}", state["user_id"])
 
-    # Create tools for this user
-    tools = create_tools_for_user(
+    # Same cached tools the agent node bound to the LLM
+    tools_by_name = get_tool_bundle(
         user_id=state["user_id"],
         thread_id=state["thread_id"],
         knowledge_bases=state["knowledge_bases"],
         enabled_tools=state["enabled_tools"],
         platform=state["platform"],
         language=state["language"],
-    )
-
-    # Create a tool lookup dict
-    tools_by_name = {tool.name: tool for tool in tools}
+    ).tools_by_name
 
     # Get tool calls from the last message
     last_message = state["messages"][-1]
     tool_calls = last_message.tool_calls if hasattr(last_message, "tool_calls") else []
 
-    # Execute each tool call
-    tool_messages = []
-    for tool_call in tool_calls:
-        tool_name = tool_call["name"]
-        tool_args = tool_call.get("args", {})
-        tool_id = tool_call.get("id", "")
-
-        # Find the tool
-        tool = tools_by_name.get(tool_name)
-        if not tool:
-            error_msg = f"Tool '{tool_name}' not found"
-            logger.error(error_msg)
-            tool_messages.append(
-                ToolMessage(
-                    content=error_msg,
-                    tool_call_id=tool_id,
-                    name=tool_name,
-                )
-            )
-            continue
-
-        # Execute the tool
-        try:
-            logger.debug(f"Executing tool: {tool_name} with args: {tool_args}")
-            result = await tool.ainvoke(tool_args)
-            tool_messages.append(
-                ToolMessage(
-                    content=str(result),
-                    tool_call_id=tool_id,
-                    name=tool_name,
-                )
-            )
-            logger.debug(f"Tool {tool_name} executed successfully")
-        except Exception as e:
-            error_msg = f"Error executing tool '{tool_name}': {str(e)}"
-            logger.error(error_msg, exc_info=True)
-            tool_messages.append(
-                ToolMessage(
-                    content=error_msg,
-                    tool_call_id=tool_id,
-                    name=tool_name,
-                )
-            )
-
-    logger.info(f"✅ Tools node completed, executed {len(tool_messages)} tools")
+    # Execute tool calls concurrently; results keep the tool call order
+    tool_messages = await execute_tool_calls(tool_calls, tools_by_name, state["user_id"])
+
+    logger.debug("✅ Tools node completed, executed {} tools", len(tool_messages))
 
     return {"messages": tool_messages}
 
@@ -233,15 +150,9 @@ async def tools_node(state: AgentState) -> dict:
 async def suggestions_node(state: AgentState) -> dict:
     """Suggestion generation node.
 
-    This node:
-    1. Analyzes the conversation history
-    2. Generates contextual suggestions for the user
-    3. Returns suggestions in the state
-
-    Suggestions are generated based on:
-    - Conversation context (last few messages)
-    - Active workflow (if any)
-    - Platform (web vs Telegram)
+    No longer part of the unified graph: integrations generate suggestions
+    after the final answer via `luka_agent.suggestions.start_suggestions`.
+    Kept for graphs that still want suggestions as a step.
 
     Args:
         state: Current agent state
@@ -249,105 +160,12 @@ async def suggestions_node(state: AgentState) -> dict:
     Returns:
         State update with suggestions
     """
-    from langchain_openai import ChatOpenAI
-    import json
-    import random
-    import os
-
-    # Try to import settings, gracefully handle if not available
-    try:
-        from luka_agent.core.config import settings
-    except Exception:
-        settings = None
-
-    logger.info(f"💡 Suggestions node generating for user {state['user_id']}")
-
-    # Check if suggestions are enabled
-    if not state.get("generate_suggestions", True):
-        logger.info("Suggestions generation disabled, skipping")
-        return {"conversation_suggestions": []}
-
-    # Check if we have an active workflow
-    active_workflow = state.get("active_workflow")
-    workflow_hints = state.get("_workflow_suggestion_hints", [])
-
-    suggestions = []
-
-    if active_workflow and workflow_hints:
-        # Generate workflow-specific suggestions using hints
-        logger.info(f"📋 Generating workflow suggestions (workflow: {active_workflow})")
-        # For now, use workflow hints directly
-        # TODO: Enhance with LLM generation based on hints
-        suggestions = workflow_hints[:3]
-    else:
-        # Generate conversational suggestions based on history
-        logger.info(f"💬 Generating conversational suggestions")
-
-        # Extract last few messages for context
-        messages = state["messages"]
-        recent_messages = messages[-5:] if len(messages) >= 5 else messages
-
-        # Build context string
-        context_parts = []
-        for msg in recent_messages:
-            if hasattr(msg, "content") and msg.content:
-                role = "User" if msg.__class__.__name__ == "HumanMessage" else "Assistant"
-                context_parts.append(f"{role}: {str(msg.content)[:100]}")
-
-        context = "\n".join(context_parts)
-
-        # Generate suggestions with LLM
-        try:
-            # Select LLM provider (use state config if available, else fallback)
-            llm_provider = state.get("llm_provider", "ollama")
-            llm_model = state.get("llm_model", "llama3.2")
-
-            if llm_provider == "ollama":
-                if settings:
-                    ollama_url = settings.OLLAMA_URL.rstrip("/")
-                else:
-                    ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/")
-
-                # Use OpenAI-compatible API for Ollama
-                llm = ChatOpenAI(
-                    model=llm_model,
-                    base_url=f"{ollama_url}/v1",
-                    api_key="ollama",  # Ollama doesn't require a real API key
-                    temperature=0.7,
-                )
-            else:
-                llm = ChatOpenAI(
-                    model=llm_model,
-                    temperature=0.7,
-                )
-
-            prompt = f"""Based on this conversation, suggest 3 short things the user might say next:
-
-{context}
-
-Generate 3 natural, short suggestions (max 50 chars each) in {state['language']} language.
-Return only the suggestions, one per line. No numbering."""
-
-            response = await llm.ainvoke(prompt)
-            suggestions_text = response.content.strip()
-
-            # Parse suggestions
-            raw_suggestions = [s.strip() for s in suggestions_text.split("\n") if s.strip()]
-            suggestions = [s.lstrip("1234567890.-•* ").strip() for s in raw_suggestions if s][:3]
-
-            logger.info(f"✅ Generated {len(suggestions)} suggestions: {suggestions}")
-
-        except Exception as e:
-            logger.warning(f"⚠️ Failed to generate suggestions: {e}")
-            # Fallback to static suggestions
-            suggestions = [
-                "Tell me more",
-                "What else can you do?",
-                "Thanks!"
-            ]
+    from luka_agent.suggestions import generate_suggestions
+
+    logger.debug("💡 Suggestions node generating for user {}", state["user_id"])
 
     return {
-        "conversation_suggestions": suggestions,
+        "conversation_suggestions": await generate_suggestions(state),
     }
 
 
@@ -358,16 +176,16 @@ def should_continue(state: AgentState) -> str:
         state: Current agent state
 
     Returns:
-        Next node name: "tools", "suggestions", or "end"
+        Next node name: "tools" or "end"
     """
     next_action = state.get("next_action")
 
     if next_action == "tools":
-        logger.info(f"🔀 Routing to tools")
+        logger.debug("🔀 Routing to tools")
         return "tools"
     else:
-        logger.info(f"🔀 Routing to suggestions")
-        return "suggestions"
+        logger.debug("🔀 Routing to end")
+        return "end"
 
 
 __all__ = [
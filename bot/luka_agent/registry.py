@@ -0,0 +1,220 @@
+"""
+Memoized LLM clients and tool bundles for luka_agent graph nodes.
+
+Nodes used to build tools and chat clients on every invocation: a
+three-iteration tool loop ran the tool factory 6+ times and created 4+ LLM
+clients (each with its own connection pool) per message. This registry keeps:
+
+- chat models per (provider, model, temperature, base_url), sharing one
+  HTTP connection pool per base URL
+- tool bundles per (user, thread, enabled tools, KBs, platform, language),
+  evicted after a TTL
+- `bind_tools` runnables per (chat model, tool bundle), stored on the bundle
+  so they expire with it
+
+Caches are per event loop, since HTTP clients can't be shared across loops.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.tools import BaseTool
+from loguru import logger
+
+try:
+    from luka_agent.core.config import settings
+except ImportError:
+    settings = None
+
+DEFAULT_TOOL_CACHE_TTL_SECONDS = 300.0
+DEFAULT_TOOL_CACHE_MAX_ENTRIES = 1000
+DEFAULT_LLM_MAX_CONNECTIONS = 100
+
+
+@dataclass
+class ToolBundle:
+    """Tools built for one user context, plus LLMs already bound to them."""
+    tools: List[BaseTool]
+    expires_at: float
+    bound: Dict[int, Any] = field(default_factory=dict)
+
+    @cached_property
+    def tools_by_name(self) -> Dict[str, BaseTool]:
+        return {tool.name: tool for tool in self.tools}
+
+
+class _Registry:
+    def __init__(self):
+        self.models: Dict[Tuple, Any] = {}
+        self.http_clients: Dict[Optional[str], Any] = {}
+        self.bundles: "OrderedDict[Tuple, ToolBundle]" = OrderedDict()
+
+
+_registries: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Registry]" = weakref.WeakKeyDictionary()
+
+
+def _registry() -> _Registry:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Sync callers (CLI, tests) get an uncached registry
+        return _Registry()
+    registry = _registries.get(loop)
+    if registry is None:
+        registry = _Registry()
+        _registries[loop] = registry
+    return registry
+
+
+def _setting(name: str, default: Any) -> Any:
+    return getattr(settings, name, default) if settings is not None else default
+
+
+def ollama_base_url() -> str:
+    """OpenAI-compatible Ollama endpoint (settings, then OLLAMA_URL env)."""
+    if settings is not None:
+        ollama_url = settings.OLLAMA_URL
+    else:
+        ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
+    return f"{ollama_url.rstrip('/')}/v1"
+
+
+def _shared_http_client(registry: _Registry, base_url: Optional[str]):
+    """One keep-alive pool per base URL for all OpenAI-compatible models."""
+    import httpx
+
+    client = registry.http_clients.get(base_url)
+    if client is None:
+        max_connections = _setting("LUKA_LLM_MAX_CONNECTIONS", DEFAULT_LLM_MAX_CONNECTIONS)
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(600.0, connect=10.0),
+        )
+        registry.http_clients[base_url] = client
+    return client
+
+
+def get_chat_model(provider: str, model: str, temperature: float):
+    """
+    Get a cached chat model client.
+
+    Unknown providers fall back to Ollama with llama3.2 (same as before).
+
+    Args:
+        provider: "ollama", "openai" or "anthropic"
+        model: Model name
+        temperature: Sampling temperature
+
+    Returns:
+        LangChain chat model
+    """
+    from langchain_openai import ChatOpenAI
+
+    if provider not in ("ollama", "openai", "anthropic"):
+        logger.error(f"Unknown LLM provider: {provider}, falling back to ollama")
+        provider, model, temperature = "ollama", "llama3.2", 0.7
+
+    base_url = ollama_base_url() if provider == "ollama" else None
+    if provider == "anthropic":
+        from langchain_anthropic import ChatAnthropic
+        model_class = ChatAnthropic
+    else:
+        model_class = ChatOpenAI
+
+    registry = _registry()
+    # The class is part of the key so patched classes (tests) get fresh entries
+    key = (model_class, provider, model, temperature, base_url)
+    llm = registry.models.get(key)
+    if llm is not None:
+        return llm
+
+    if provider == "anthropic":
+        llm = model_class(model=model, temperature=temperature)
+    elif provider == "ollama":
+        # Use OpenAI-compatible API for Ollama (requires /v1 endpoint)
+        llm = model_class(
+            model=model,
+            base_url=base_url,
+            api_key="ollama",  # Ollama doesn't require a real API key
+            temperature=temperature,
+            http_async_client=_shared_http_client(registry, base_url),
+        )
+    else:
+        llm = model_class(
+            model=model,
+            temperature=temperature,
+            http_async_client=_shared_http_client(registry, base_url),
+        )
+
+    registry.models[key] = llm
+    logger.debug(f"🧠 Created {provider}/{model} client (temp={temperature})")
+    return llm
+
+
+def get_tool_bundle(
+    user_id: int,
+    thread_id: str,
+    knowledge_bases: Sequence[str],
+    enabled_tools: Sequence[str],
+    platform: str = "telegram",
+    language: str = "en",
+) -> ToolBundle:
+    """
+    Get the user's tools, building them at most once per TTL.
+
+    Args mirror `create_tools_for_user`.
+
+    Returns:
+        ToolBundle shared by every node of the user's runs until it expires
+    """
+    from luka_agent.tools import create_tools_for_user
+
+    registry = _registry()
+    key = (user_id, thread_id, tuple(enabled_tools or ()), tuple(knowledge_bases or ()), platform, language)
+    now = time.monotonic()
+
+    bundle = registry.bundles.get(key)
+    if bundle is not None and bundle.expires_at > now:
+        registry.bundles.move_to_end(key)
+        return bundle
+
+    tools = create_tools_for_user(
+        user_id=user_id,
+        thread_id=thread_id,
+        knowledge_bases=list(knowledge_bases or []),
+        enabled_tools=list(enabled_tools or []),
+        platform=platform,
+        language=language,
+    )
+    ttl = _setting("LUKA_TOOL_CACHE_TTL_SECONDS", DEFAULT_TOOL_CACHE_TTL_SECONDS)
+    bundle = ToolBundle(tools=tools, expires_at=now + ttl)
+    registry.bundles[key] = bundle
+    registry.bundles.move_to_end(key)
+
+    max_entries = _setting("LUKA_TOOL_CACHE_MAX_ENTRIES", DEFAULT_TOOL_CACHE_MAX_ENTRIES)
+    while len(registry.bundles) > max(1, max_entries):
+        registry.bundles.popitem(last=False)
+    return bundle
+
+
+def bind_tools(llm, bundle: ToolBundle):
+    """Get `llm.bind_tools(bundle.tools)`, reusing the runnable bound earlier."""
+    bound = bundle.bound.get(id(llm))
+    if bound is None:
+        bound = llm.bind_tools(bundle.tools)
+        bundle.bound[id(llm)] = bound
+    return bound
+
+
+def clear_registry() -> None:
+    """Forget all cached models and tool bundles (e.g. after config changes)."""
+    _registries.clear()
+
+
+__all__ = ["get_chat_model", "get_tool_bundle", "bind_tools", "ollama_base_url", "clear_registry", "ToolBundle"]
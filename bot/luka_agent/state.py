@@ -53,6 +53,16 @@ class AgentState(TypedDict):
     #: - "worker": CLI, background jobs, API workers
     platform: Literal["web", "telegram", "worker"]
 
+    #: Rolling summary of turns folded out of the LLM context window
+    #: Maintained by agent_node (luka_agent.context_window); None until the
+    #: thread first exceeds its token budget. Not part of create_initial_state,
+    #: so per-turn inputs don't reset it.
+    context_summary: Optional[str]
+
+    #: ID of the last message folded into context_summary
+    #: Messages after it are sent to the LLM verbatim (within the budget)
+    context_summary_upto: Optional[str]
+
     # =========================================================================
     # KNOWLEDGE BASE & TOOLS
     # =========================================================================
@@ -165,7 +175,7 @@ class AgentState(TypedDict):
 
     #: Routing decision from agent node
     #: - "tools": Execute tools
-    #: - "end": Generate suggestions and finish
+    #: - "end": Finish (suggestions are generated after the run)
     #: - None: Not yet determined
     next_action: Optional[Literal["tools", "end"]]
 
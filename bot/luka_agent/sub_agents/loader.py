@@ -4,6 +4,11 @@ Sub-Agent Loader for luka_agent
 Loads BMAD-compatible sub-agent configurations and system prompts.
 Supports template variable substitution and multi-language prompts.
 
+Parsed configs and compiled prompt templates are kept in memory and reloaded
+when their files' mtimes change (checked at most every
+LUKA_SUB_AGENT_RELOAD_INTERVAL_SECONDS), so hydrating state costs a dict
+lookup plus joining the template parts.
+
 Usage:
     loader = SubAgentLoader()
     config = loader.load("general_luka")
@@ -11,12 +16,27 @@ Usage:
 """
 
 import re
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import yaml
 from loguru import logger
 
+try:
+    from luka_agent.core.config import settings
+except ImportError:
+    settings = None
+
+DEFAULT_RELOAD_INTERVAL_SECONDS = 2.0
+
+# Pattern: {variable} or {object.field}
+TEMPLATE_VAR_PATTERN = re.compile(r"\{([a-zA-Z0-9_.]+)\}")
+
+# Marker for template variables the config itself doesn't resolve
+_UNRESOLVED = object()
+
 
 class SubAgentConfig:
     """BMAD-compatible sub-agent configuration"""
@@ -117,6 +137,87 @@ class SubAgentConfig:
         return self.raw
 
 
+class CompiledTemplate:
+    """
+    System prompt template split into literal text and variables.
+
+    Variables resolvable from the config (metadata, persona, agent_name) are
+    resolved at compile time; runtime variables still take precedence, as
+    in `SubAgentLoader._render_template`.
+    """
+
+    def __init__(self, template: str, static_context: Dict[str, Any]):
+        # Each part is a literal string or (var_name, var_path, static_value, raw)
+        self.parts: List[Union[str, Tuple[str, str, Any, str]]] = []
+        position = 0
+        for match in TEMPLATE_VAR_PATTERN.finditer(template):
+            if match.start() > position:
+                self.parts.append(template[position:match.start()])
+            var_path = match.group(1)
+            static_value = _get_nested_value(static_context, var_path)
+            self.parts.append((
+                var_path.split(".", 1)[0],
+                var_path,
+                _UNRESOLVED if static_value is None else str(static_value),
+                match.group(0),
+            ))
+            position = match.end()
+        if position < len(template):
+            self.parts.append(template[position:])
+
+    def render(self, runtime_vars: Dict[str, Any]) -> str:
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            name, var_path, static_value, raw = part
+            if name in runtime_vars:
+                value = _get_nested_value(runtime_vars, var_path)
+                out.append(raw if value is None else str(value))
+            else:
+                out.append(raw if static_value is _UNRESOLVED else static_value)
+        return "".join(out)
+
+
+@dataclass
+class _CachedPrompt:
+    path: Path
+    mtime: Optional[int]
+    template: CompiledTemplate
+    checked_at: float
+    # Missing language variant this prompt stands in for (picked up once it appears)
+    fallback_from: Optional[Path] = None
+
+
+@dataclass
+class _CachedAgent:
+    config: "SubAgentConfig"
+    config_mtime: int
+    checked_at: float
+    prompts: Dict[str, _CachedPrompt] = field(default_factory=dict)
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _get_nested_value(obj: Dict[str, Any], path: str) -> Any:
+    parts = path.split(".")
+    current = obj
+
+    for part in parts:
+        if isinstance(current, dict) and part in current:
+            current = current[part]
+        else:
+            return None
+
+    return current
+
+
 class SubAgentLoader:
     """
     Loads sub-agent configurations from YAML files.
@@ -126,20 +227,78 @@ class SubAgentLoader:
     - Template variable substitution
     - Multi-language system prompts
     - Configuration validation
+    - In-memory cache with mtime-based hot reload
     """
 
-    def __init__(self, base_path: Optional[Path] = None):
+    def __init__(self, base_path: Optional[Path] = None, reload_interval: Optional[float] = None):
         """
         Initialize loader.
 
         Args:
             base_path: Path to sub_agents directory. If None, uses current file's parent directory.
+            reload_interval: Seconds between mtime checks of cached files (0 = every call,
+                negative = never reload). If None, uses settings.
         """
         if base_path is None:
             base_path = Path(__file__).parent
         self.base_path = Path(base_path)
+        if reload_interval is None:
+            reload_interval = getattr(
+                settings, "LUKA_SUB_AGENT_RELOAD_INTERVAL_SECONDS", DEFAULT_RELOAD_INTERVAL_SECONDS
+            )
+        self.reload_interval = reload_interval
+        self._agents: Dict[str, _CachedAgent] = {}
+        # id(config) -> cache entry, so prompts are found even if config.id != directory name
+        self._by_config: Dict[int, _CachedAgent] = {}
+        self._listing: Optional[List[Dict[str, str]]] = None
+        self._listing_key: Optional[Tuple] = None
+        self._listing_checked_at = 0.0
+        # Bumped whenever a config is (re)parsed or dropped, for derived indexes
+        self.generation = 0
         logger.debug(f"SubAgentLoader initialized with base_path: {self.base_path}")
 
+    def _should_check(self, checked_at: float, now: float) -> bool:
+        if self.reload_interval < 0:
+            return False
+        return now - checked_at >= self.reload_interval
+
+    def warm(self) -> int:
+        """
+        Load every sub-agent and compile its prompt templates.
+
+        Call at startup so the first requests don't pay for parsing.
+
+        Returns:
+            Number of sub-agents loaded
+        """
+        agents = self.list_available_agents()
+        for agent in agents:
+            try:
+                config = self.load(agent["id"])
+                for language in {"en", *config.language_variants}:
+                    self._get_compiled_prompt(config, language)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to warm sub-agent {agent['id']}: {e}")
+        logger.info(f"🔥 Warmed {len(agents)} sub-agents")
+        return len(agents)
+
+    def invalidate(self, sub_agent_id: Optional[str] = None) -> None:
+        """
+        Drop cached configs and prompts so they are re-read on next use.
+
+        Args:
+            sub_agent_id: Sub-agent to drop (None = all)
+        """
+        if sub_agent_id is None:
+            self._agents.clear()
+            self._by_config.clear()
+        else:
+            cached = self._agents.pop(sub_agent_id, None)
+            if cached is not None:
+                self._by_config.pop(id(cached.config), None)
+        self._listing = None
+        self.generation += 1
+
     def list_available_agents(self) -> List[Dict[str, str]]:
         """
         List all available sub-agents.
@@ -147,9 +306,12 @@ class SubAgentLoader:
         Returns:
             List of dicts with {id, name, description, icon}
         """
-        agents = []
+        now = time.monotonic()
+        if self._listing is not None and not self._should_check(self._listing_checked_at, now):
+            return list(self._listing)
 
-        for sub_dir in self.base_path.iterdir():
+        config_paths = []
+        for sub_dir in sorted(self.base_path.iterdir()):
             if not sub_dir.is_dir():
                 continue
 
@@ -158,11 +320,21 @@ class SubAgentLoader:
                 continue
 
             config_path = sub_dir / "config.yaml"
-            if not config_path.exists():
+            mtime = _mtime(config_path)
+            if mtime is None:
                 continue
+            config_paths.append((sub_dir.name, mtime))
 
+        # Rescan only if a config was added, removed or modified
+        listing_key = tuple(config_paths)
+        self._listing_checked_at = now
+        if self._listing is not None and listing_key == self._listing_key:
+            return list(self._listing)
+
+        agents = []
+        for sub_agent_id, _ in config_paths:
             try:
-                config = self.load(sub_dir.name)
+                config = self.load(sub_agent_id)
                 agents.append({
                     "id": config.id,
                     "name": config.name,
@@ -171,10 +343,12 @@ class SubAgentLoader:
                 })
             except Exception as e:
                 # Expected for non-BMAD format agents - use DEBUG level
-                logger.debug(f"Skipping agent {sub_dir.name} (not in BMAD format): {e}")
+                logger.debug(f"Skipping agent {sub_agent_id} (not in BMAD format): {e}")
                 continue
 
-        return agents
+        self._listing = agents
+        self._listing_key = listing_key
+        return list(agents)
 
     def load(self, sub_agent_id: str) -> SubAgentConfig:
         """
@@ -190,9 +364,22 @@ class SubAgentLoader:
             FileNotFoundError: If config.yaml doesn't exist
             ValueError: If config is invalid
         """
+        now = time.monotonic()
+        cached = self._agents.get(sub_agent_id)
+        if cached is not None:
+            if not self._should_check(cached.checked_at, now):
+                return cached.config
+            config_path = self.base_path / sub_agent_id / "config.yaml"
+            if _mtime(config_path) == cached.config_mtime:
+                cached.checked_at = now
+                return cached.config
+            logger.info(f"♻️ Sub-agent config changed, reloading: {sub_agent_id}")
+            self.invalidate(sub_agent_id)
+
         config_path = self.base_path / sub_agent_id / "config.yaml"
+        config_mtime = _mtime(config_path)
 
-        if not config_path.exists():
+        if config_mtime is None:
             raise FileNotFoundError(
                 f"Sub-agent config not found: {config_path}\n"
                 f"Available agents: {[d.name for d in self.base_path.iterdir() if d.is_dir()]}"
@@ -210,6 +397,10 @@ class SubAgentLoader:
         self._validate_config(config_dict, sub_agent_id)
 
         config = SubAgentConfig(config_dict)
+        cached = _CachedAgent(config=config, config_mtime=config_mtime, checked_at=now)
+        self._agents[sub_agent_id] = cached
+        self._by_config[id(config)] = cached
+        self.generation += 1
         logger.info(f"✅ Loaded sub-agent: {config.name} ({config.id}) v{config.version}")
 
         return config
@@ -234,8 +425,36 @@ class SubAgentLoader:
         Raises:
             FileNotFoundError: If prompt file doesn't exist
         """
+        compiled = self._get_compiled_prompt(config, language)
+        return compiled.render(template_vars or {})
+
+    def _get_compiled_prompt(self, config: SubAgentConfig, language: str) -> CompiledTemplate:
+        """
+        Get the compiled prompt template for a language, (re)compiling it if
+        it isn't cached or its file changed.
+
+        Raises:
+            FileNotFoundError: If prompt file doesn't exist
+        """
+        # Configs from an older load (or built by hand) are rendered but not cached
+        cached = self._by_config.get(id(config))
+        if cached is not None and cached.config is not config:
+            cached = None
+
+        now = time.monotonic()
+        prompt = cached.prompts.get(language) if cached is not None else None
+        if prompt is not None:
+            if not self._should_check(prompt.checked_at, now):
+                return prompt.template
+            variant_appeared = prompt.fallback_from is not None and prompt.fallback_from.exists()
+            if not variant_appeared and _mtime(prompt.path) == prompt.mtime:
+                prompt.checked_at = now
+                return prompt.template
+            logger.info(f"♻️ System prompt changed, recompiling: {prompt.path}")
+
         # Determine prompt file path
         prompt_path = self._get_prompt_path(config, language)
+        fallback_from = None
 
         if not prompt_path.exists():
             # Fall back to base prompt if language variant not found
@@ -245,22 +464,35 @@ class SubAgentLoader:
             base_path = self.base_path / config.id / config.system_prompt_base.split("/")[-1]
             if not base_path.exists():
                 raise FileNotFoundError(f"System prompt not found: {base_path}")
+            fallback_from = prompt_path
             prompt_path = base_path
 
         logger.debug(f"Loading system prompt from: {prompt_path}")
 
         try:
+            prompt_mtime = _mtime(prompt_path)
             with open(prompt_path, "r", encoding="utf-8") as f:
                 template = f.read()
         except Exception as e:
             raise FileNotFoundError(f"Failed to read system prompt from {prompt_path}: {e}")
 
-        # Render template with variables
-        rendered = self._render_template(template, config, template_vars or {})
+        compiled = CompiledTemplate(template, self._static_context(config))
+        if cached is not None:
+            cached.prompts[language] = _CachedPrompt(
+                prompt_path, prompt_mtime, compiled, now, fallback_from
+            )
 
-        logger.debug(f"✅ Loaded system prompt for {config.id} ({language}): {len(rendered)} chars")
+        logger.debug(f"✅ Compiled system prompt for {config.id} ({language}): {len(template)} chars")
 
-        return rendered
+        return compiled
+
+    @staticmethod
+    def _static_context(config: SubAgentConfig) -> Dict[str, Any]:
+        return {
+            "metadata": config.metadata,
+            "persona": config.persona,
+            "agent_name": config.name,
+        }
 
     def _get_prompt_path(self, config: SubAgentConfig, language: str) -> Path:
         """
@@ -308,24 +540,7 @@ class SubAgentLoader:
         Returns:
             Rendered string
         """
-        # Build variable context
-        context = {
-            "metadata": config.metadata,
-            "persona": config.persona,
-            "agent_name": config.name,
-            **runtime_vars,
-        }
-
-        # Replace template variables
-        def replace_var(match):
-            var_path = match.group(1)
-            value = self._get_nested_value(context, var_path)
-            return str(value) if value is not None else match.group(0)
-
-        # Pattern: {variable} or {object.field}
-        rendered = re.sub(r"\{([a-zA-Z0-9_.]+)\}", replace_var, template)
-
-        return rendered
+        return CompiledTemplate(template, self._static_context(config)).render(runtime_vars)
 
     def _get_nested_value(self, obj: Dict[str, Any], path: str) -> Any:
         """
@@ -342,16 +557,7 @@ class SubAgentLoader:
         Returns:
             Value at path, or None if not found
         """
-        parts = path.split(".")
-        current = obj
-
-        for part in parts:
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                return None
-
-        return current
+        return _get_nested_value(obj, path)
 
     def _validate_config(self, config_dict: Dict[str, Any], sub_agent_id: str) -> None:
         """
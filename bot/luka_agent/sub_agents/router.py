@@ -0,0 +1,301 @@
+"""
+Intent router for sub-agent selection.
+
+Ranks sub-agents for a user query without an LLM call. The index is compiled
+from every sub-agent's config when it is loaded (recompiled on reload):
+
+- lexical stage: an inverted token index over intent_triggers, name/title,
+  description and menu labels (weighted in that order, IDF-scaled), plus a
+  phrase index so multi-word triggers like "price notification" score as
+  phrases
+- optional embedding stage: pass an `embed` function and each sub-agent
+  gets a precomputed centroid vector; query similarity is blended into the
+  lexical score
+
+Routing is a few dict lookups per query token, so it stays well under a
+millisecond with hundreds of sub-agents.
+
+Usage:
+    router = get_intent_router()
+    matches = router.route("track trending tokens")
+    if matches and matches[0].confidence >= 0.3:
+        print(matches[0].agent_id)
+"""
+
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Container, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from luka_agent.sub_agents.loader import SubAgentConfig, SubAgentLoader, get_sub_agent_loader
+
+try:
+    from luka_agent.core.config import settings
+except ImportError:
+    settings = None
+
+Embedder = Callable[[List[str]], Sequence[Sequence[float]]]
+
+DEFAULT_EMBEDDING_WEIGHT = 0.5
+DEFAULT_MIN_CONFIDENCE = 0.3
+
+# Field weights: explicit triggers beat names, names beat free text
+TRIGGER_WEIGHT = 3.0
+NAME_WEIGHT = 2.0
+TEXT_WEIGHT = 1.0
+# Extra weight when all tokens of a multi-word trigger appear in order
+PHRASE_BONUS = 2.0
+# Added to the score total so weak, lone matches don't get full confidence
+CONFIDENCE_SMOOTHING = 2.0
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from",
+    "get", "help", "how", "i", "in", "is", "it", "me", "my", "of", "on", "or",
+    "please", "the", "to", "what", "with", "you", "your", "want", "need",
+})
+
+
+def _stem(token: str) -> str:
+    """Crude suffix stripping so "tokens"/"token" and "alerts"/"alert" match."""
+    if len(token) <= 3:
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    if token.endswith(("sses", "xes", "zes", "ches", "shes")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    if token.endswith("ing") and len(token) >= 6:
+        return token[:-3]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-word characters, drop stopwords and stem."""
+    return [
+        _stem(token)
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOPWORDS and len(token) > 1
+    ]
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    """A ranked routing candidate."""
+    agent_id: str
+    score: float
+    confidence: float
+
+
+@dataclass
+class IntentDocument:
+    """What the router indexes for one sub-agent (or workflow)."""
+    agent_id: str
+    triggers: List[str] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    texts: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_config(cls, config: SubAgentConfig) -> "IntentDocument":
+        """Index intent_triggers, name/title/id, description and menu items."""
+        texts = [config.description]
+        for item in config.menu or []:
+            if isinstance(item, dict):
+                texts.extend(item[key] for key in ("label", "description", "trigger") if isinstance(item.get(key), str))
+            elif isinstance(item, str):
+                texts.append(item)
+        return cls(
+            agent_id=config.id,
+            triggers=list(config.intent_triggers or []),
+            names=[config.name, config.title, config.id.replace("_", " ")],
+            texts=[t for t in texts if t],
+        )
+
+
+def _normalize(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+class IntentRouter:
+    """Lexical (and optionally embedding) index over sub-agent configs."""
+
+    def __init__(
+        self,
+        documents: Sequence[IntentDocument],
+        embed: Optional[Embedder] = None,
+        embedding_weight: Optional[float] = None,
+    ):
+        """
+        Compile the routing index.
+
+        Args:
+            documents: Sub-agents to route between (see IntentDocument.from_config)
+            embed: Optional function embedding a batch of texts (enables the embedding stage)
+            embedding_weight: Share of the embedding similarity in the final confidence (0-1).
+                If None, uses settings.
+        """
+        if embedding_weight is None:
+            embedding_weight = getattr(settings, "LUKA_INTENT_EMBEDDING_WEIGHT", DEFAULT_EMBEDDING_WEIGHT)
+        self.embed = embed
+        self.embedding_weight = embedding_weight if embed is not None else 0.0
+        self.agent_ids: List[str] = []
+
+        # token -> {agent_id: weight}
+        self._tokens: Dict[str, Dict[str, float]] = defaultdict(dict)
+        # first token -> [(phrase tokens, agent_id)]
+        self._phrases: Dict[str, List[Tuple[Tuple[str, ...], str]]] = defaultdict(list)
+        self._centroids: Dict[str, List[float]] = {}
+
+        for document in documents:
+            agent_id = document.agent_id
+            self.agent_ids.append(agent_id)
+
+            for trigger in document.triggers:
+                tokens = tuple(tokenize(trigger))
+                self._add_tokens(agent_id, tokens, TRIGGER_WEIGHT)
+                if len(tokens) > 1:
+                    self._phrases[tokens[0]].append((tokens, agent_id))
+            for name in document.names:
+                self._add_tokens(agent_id, tokenize(name), NAME_WEIGHT)
+            for text in document.texts:
+                self._add_tokens(agent_id, tokenize(text), TEXT_WEIGHT)
+
+        # IDF: tokens shared by many sub-agents say little about which one to pick
+        total = max(len(self.agent_ids), 1)
+        for token, postings in self._tokens.items():
+            idf = math.log(1.0 + total / len(postings))
+            for agent_id in postings:
+                postings[agent_id] *= idf
+
+        self._tokens = dict(self._tokens)
+        self._phrases = dict(self._phrases)
+
+        if embed is not None:
+            self._build_centroids(documents)
+
+        logger.debug(
+            f"🧭 Intent router compiled: {len(self.agent_ids)} sub-agents, "
+            f"{len(self._tokens)} tokens, {sum(len(p) for p in self._phrases.values())} phrases"
+        )
+
+    def _add_tokens(self, agent_id: str, tokens: Iterable[str], weight: float) -> None:
+        for token in set(tokens):
+            postings = self._tokens[token]
+            # A token's weight is its strongest field, not the sum of repeats
+            postings[agent_id] = max(postings.get(agent_id, 0.0), weight)
+
+    def _build_centroids(self, documents: Sequence[IntentDocument]) -> None:
+        for document in documents:
+            texts = [t for t in (*document.triggers, *document.names[:1], *document.texts) if t]
+            if not texts:
+                continue
+            vectors = [_normalize(v) for v in self.embed(texts)]
+            centroid = [sum(column) / len(vectors) for column in zip(*vectors)]
+            self._centroids[document.agent_id] = _normalize(centroid)
+
+    def _lexical_scores(self, query_tokens: List[str]) -> Dict[str, float]:
+        scores: Dict[str, float] = defaultdict(float)
+        for token in set(query_tokens):
+            for agent_id, weight in self._tokens.get(token, {}).items():
+                scores[agent_id] += weight
+
+        for i, token in enumerate(query_tokens):
+            for phrase, agent_id in self._phrases.get(token, ()):
+                if tuple(query_tokens[i:i + len(phrase)]) == phrase:
+                    scores[agent_id] += PHRASE_BONUS * len(phrase)
+        return scores
+
+    def route(self, query: str, limit: int = 3) -> List[IntentMatch]:
+        """
+        Rank sub-agents for a query.
+
+        Args:
+            query: User query
+            limit: Max candidates to return
+
+        Returns:
+            Candidates sorted by confidence (0-1), best first; empty if nothing matches
+        """
+        query_tokens = tokenize(query)
+        scores = self._lexical_scores(query_tokens)
+
+        total = sum(scores.values()) + CONFIDENCE_SMOOTHING
+        confidences = {agent_id: score / total for agent_id, score in scores.items()}
+
+        if self._centroids:
+            query_vector = _normalize(self.embed([query])[0])
+            w = self.embedding_weight
+            for agent_id, centroid in self._centroids.items():
+                similarity = max(0.0, sum(q * c for q, c in zip(query_vector, centroid)))
+                confidences[agent_id] = (1 - w) * confidences.get(agent_id, 0.0) + w * similarity
+
+        ranked = sorted(
+            (IntentMatch(agent_id, scores.get(agent_id, 0.0), confidence)
+             for agent_id, confidence in confidences.items() if confidence > 0),
+            key=lambda match: match.confidence,
+            reverse=True,
+        )
+        return ranked[:limit]
+
+    def best_match(
+        self,
+        query: str,
+        allowed: Optional[Container[str]] = None,
+        min_confidence: Optional[float] = None,
+    ) -> Optional[IntentMatch]:
+        """
+        Get the top candidate if it is confident enough.
+
+        Args:
+            query: User query
+            allowed: Only consider these sub-agent ids (None = all)
+            min_confidence: Minimum confidence (None = settings)
+
+        Returns:
+            Best IntentMatch, or None if no candidate clears the threshold
+        """
+        if min_confidence is None:
+            min_confidence = getattr(settings, "LUKA_INTENT_MIN_CONFIDENCE", DEFAULT_MIN_CONFIDENCE)
+        for match in self.route(query, limit=len(self.agent_ids)):
+            if allowed is not None and match.agent_id not in allowed:
+                continue
+            return match if match.confidence >= min_confidence else None
+        return None
+
+
+_router: Optional[IntentRouter] = None
+_router_generation: Optional[Tuple[int, int]] = None
+
+
+def get_intent_router(loader: Optional[SubAgentLoader] = None) -> IntentRouter:
+    """
+    Get the intent router for the loader's sub-agents.
+
+    The index is recompiled when the loader reloads a sub-agent config.
+
+    Args:
+        loader: Loader to index (default: singleton loader)
+
+    Returns:
+        IntentRouter instance
+    """
+    global _router, _router_generation
+
+    loader = loader or get_sub_agent_loader()
+    # Rescans (and reloads changed configs) at most once per reload interval
+    agents = loader.list_available_agents()
+
+    generation = (id(loader), loader.generation)
+    if _router is None or _router_generation != generation:
+        _router = IntentRouter([IntentDocument.from_config(loader.load(agent["id"])) for agent in agents])
+        _router_generation = generation
+    return _router
+
+
+__all__ = ["IntentRouter", "IntentDocument", "IntentMatch", "get_intent_router", "tokenize"]
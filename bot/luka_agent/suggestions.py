@@ -0,0 +1,217 @@
+"""
+Follow-up suggestions for luka_agent, generated off the critical path.
+
+Suggestions used to be a graph node after the final answer, so every run
+waited for a second LLM call before completing. They are now generated
+after the run, in a detached task the integrations stream as a late event:
+
+- `start_suggestions(state)` starts the task for a finished turn; callers
+  cancel it when the client disconnects
+- results are cached by a hash of the conversation tail, so retries and
+  repeated questions don't pay for another LLM call
+- under load (too many suggestion tasks in flight) or past the latency
+  budget, suggestions are skipped rather than delaying anything
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, List, Mapping, Optional, Tuple
+
+from loguru import logger
+
+try:
+    from luka_agent.core.config import settings
+except ImportError:
+    settings = None
+
+DEFAULT_SUGGESTIONS_TIMEOUT_SECONDS = 8.0
+DEFAULT_SUGGESTIONS_MAX_IN_FLIGHT = 32
+DEFAULT_SUGGESTIONS_CACHE_TTL_SECONDS = 600.0
+DEFAULT_SUGGESTIONS_CACHE_MAX_ENTRIES = 5000
+
+# Messages (and characters per message) the suggestions prompt looks at
+TAIL_MESSAGES = 5
+TAIL_CHARS = 100
+
+FALLBACK_SUGGESTIONS = [
+    "Tell me more",
+    "What else can you do?",
+    "Thanks!"
+]
+
+_cache: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+_in_flight = 0
+
+
+def _setting(name: str, default: Any) -> Any:
+    return getattr(settings, name, default) if settings is not None else default
+
+
+def _conversation_tail(state: Mapping[str, Any]) -> List[str]:
+    tail = []
+    for msg in (state.get("messages") or [])[-TAIL_MESSAGES:]:
+        if hasattr(msg, "content") and msg.content:
+            role = "User" if msg.__class__.__name__ == "HumanMessage" else "Assistant"
+            tail.append(f"{role}: {str(msg.content)[:TAIL_CHARS]}")
+    return tail
+
+
+def tail_hash(state: Mapping[str, Any]) -> str:
+    """Cache key: everything the suggestions prompt depends on."""
+    parts = [
+        state.get("language", "en"),
+        state.get("llm_provider", "ollama"),
+        state.get("llm_model", "llama3.2"),
+        *_conversation_tail(state),
+    ]
+    return hashlib.sha256("\n".join(map(str, parts)).encode()).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[List[str]]:
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    expires_at, suggestions = entry
+    if expires_at <= time.monotonic():
+        del _cache[key]
+        return None
+    _cache.move_to_end(key)
+    return list(suggestions)
+
+
+def _cache_put(key: str, suggestions: List[str]) -> None:
+    ttl = _setting("LUKA_SUGGESTIONS_CACHE_TTL_SECONDS", DEFAULT_SUGGESTIONS_CACHE_TTL_SECONDS)
+    _cache[key] = (time.monotonic() + ttl, list(suggestions))
+    _cache.move_to_end(key)
+    max_entries = _setting("LUKA_SUGGESTIONS_CACHE_MAX_ENTRIES", DEFAULT_SUGGESTIONS_CACHE_MAX_ENTRIES)
+    while len(_cache) > max(1, max_entries):
+        _cache.popitem(last=False)
+
+
+async def _generate_with_llm(state: Mapping[str, Any], context: str) -> List[str]:
+    from luka_agent.registry import get_chat_model
+
+    # Select LLM provider (use state config if available, else fallback)
+    llm_provider = state.get("llm_provider", "ollama")
+    llm_model = state.get("llm_model", "llama3.2")
+
+    # Suggestions always use an OpenAI-compatible client
+    llm = get_chat_model(
+        "ollama" if llm_provider == "ollama" else "openai",
+        llm_model,
+        0.7,
+    )
+
+    prompt = f"""Based on this conversation, suggest 3 short things the user might say next:
+
+{context}
+
+Generate 3 natural, short suggestions (max 50 chars each) in {state.get('language', 'en')} language.
+Return only the suggestions, one per line. No numbering."""
+
+    response = await llm.ainvoke(prompt)
+    suggestions_text = response.content.strip()
+
+    # Parse suggestions
+    raw_suggestions = [s.strip() for s in suggestions_text.split("\n") if s.strip()]
+    return [s.lstrip("1234567890.-•* ").strip() for s in raw_suggestions if s][:3]
+
+
+async def generate_suggestions(state: Mapping[str, Any]) -> List[str]:
+    """
+    Generate follow-up suggestions for a finished turn.
+
+    Workflow hints are used as-is; otherwise the conversation tail is sent
+    to the LLM (cached by `tail_hash`). LLM errors fall back to static
+    suggestions; running past the latency budget returns no suggestions.
+
+    Args:
+        state: Agent state values after the final answer
+
+    Returns:
+        Up to 3 suggestion strings
+    """
+    if not state.get("generate_suggestions", True):
+        logger.info("Suggestions generation disabled, skipping")
+        return []
+
+    # Check if we have an active workflow
+    active_workflow = state.get("active_workflow")
+    workflow_hints = state.get("_workflow_suggestion_hints", [])
+    if active_workflow and workflow_hints:
+        logger.info(f"📋 Generating workflow suggestions (workflow: {active_workflow})")
+        return list(workflow_hints[:3])
+
+    context_parts = _conversation_tail(state)
+    if not context_parts:
+        return []
+
+    key = tail_hash(state)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.debug(f"💡 Suggestions cache hit ({key[:8]})")
+        return cached
+
+    logger.debug("💬 Generating conversational suggestions")
+    timeout = _setting("LUKA_SUGGESTIONS_TIMEOUT_SECONDS", DEFAULT_SUGGESTIONS_TIMEOUT_SECONDS)
+    try:
+        suggestions = await asyncio.wait_for(
+            _generate_with_llm(state, "\n".join(context_parts)), timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"⏱️ Suggestions exceeded {timeout:g}s budget, skipping")
+        return []
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to generate suggestions: {e}")
+        return list(FALLBACK_SUGGESTIONS)
+
+    _cache_put(key, suggestions)
+    logger.info(f"✅ Generated {len(suggestions)} suggestions: {suggestions}")
+    return suggestions
+
+
+def start_suggestions(state: Mapping[str, Any]) -> Optional["asyncio.Task[List[str]]"]:
+    """
+    Start generating suggestions in a detached task.
+
+    Args:
+        state: Agent state values after the final answer
+
+    Returns:
+        Task resolving to the suggestions (cancel it if the client goes
+        away), or None if suggestions are disabled or shed under load
+    """
+    global _in_flight
+
+    if not state.get("generate_suggestions", True):
+        return None
+
+    max_in_flight = _setting("LUKA_SUGGESTIONS_MAX_IN_FLIGHT", DEFAULT_SUGGESTIONS_MAX_IN_FLIGHT)
+    if _in_flight >= max_in_flight:
+        logger.info(f"💡 Skipping suggestions: {_in_flight} already in flight")
+        return None
+
+    _in_flight += 1
+
+    def _done(_task: asyncio.Task) -> None:
+        global _in_flight
+        _in_flight -= 1
+
+    task = asyncio.create_task(generate_suggestions(dict(state)))
+    task.add_done_callback(_done)
+    return task
+
+
+def clear_suggestions_cache() -> None:
+    """Drop all cached suggestions."""
+    _cache.clear()
+
+
+__all__ = [
+    "generate_suggestions",
+    "start_suggestions",
+    "tail_hash",
+    "clear_suggestions_cache",
+]
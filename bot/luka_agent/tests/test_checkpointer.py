@@ -140,7 +140,7 @@ class TestCheckpointerMode:
     @pytest.mark.asyncio
     async def test_redis_checkpointer_in_production_mode(self):
         """Test Redis checkpointer is created when not in test mode."""
-        from langgraph.checkpoint.redis import RedisSaver
+        from luka_agent.delta_checkpointer import AsyncDeltaRedisSaver
         from redis.asyncio import ConnectionPool, Redis
 
         # Mock Redis components
@@ -163,8 +163,8 @@ class TestCheckpointerMode:
 
                     checkpointer = await get_checkpointer()
 
-                    # Should be RedisSaver in production mode
-                    assert isinstance(checkpointer, RedisSaver)
+                    # Should be the async Redis saver in production mode
+                    assert isinstance(checkpointer, AsyncDeltaRedisSaver)
 
 
 class TestCheckpointerConfiguration:
@@ -202,3 +202,222 @@ class TestCheckpointerConfiguration:
                     assert call_kwargs["port"] == 6380
                     assert call_kwargs["db"] == 5
                     assert call_kwargs["password"] == "test-pass"
+
+
+def _message_graph(checkpointer):
+    """Minimal graph: each run appends the user message and an AI reply."""
+    from typing import Annotated, List, TypedDict
+
+    from langchain_core.messages import AIMessage, BaseMessage
+    from langgraph.graph import StateGraph, START, END
+    from langgraph.graph.message import add_messages
+
+    class State(TypedDict):
+        messages: Annotated[List[BaseMessage], add_messages]
+        turns: int
+
+    def reply(state: State):
+        return {
+            "messages": [AIMessage(content=f"reply {len(state['messages'])}")],
+            "turns": state.get("turns", 0) + 1,
+        }
+
+    builder = StateGraph(State)
+    builder.add_node("reply", reply)
+    builder.add_edge(START, "reply")
+    builder.add_edge("reply", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+class TestAsyncDeltaRedisSaver:
+    """Test the async, append-only Redis checkpointer."""
+
+    @pytest.fixture
+    def redis(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return fakeredis.FakeAsyncRedis()
+
+    @pytest.mark.asyncio
+    async def test_state_round_trips_through_redis(self, redis):
+        """Test a cold saver restores the state written by another instance."""
+        from langchain_core.messages import HumanMessage
+        from luka_agent.delta_checkpointer import AsyncDeltaRedisSaver
+
+        saver = AsyncDeltaRedisSaver(redis)
+        graph = _message_graph(saver)
+        config = {"configurable": {"thread_id": "t1"}}
+
+        await graph.ainvoke({"messages": [HumanMessage(content="hi")]}, config)
+        await graph.ainvoke({"messages": [HumanMessage(content="again")]}, config)
+        await saver.flush()
+
+        cold = _message_graph(AsyncDeltaRedisSaver(redis))
+        state = await cold.aget_state(config)
+
+        assert [m.content for m in state.values["messages"]] == ["hi", "reply 1", "again", "reply 3"]
+        assert state.values["turns"] == 2
+
+    @pytest.mark.asyncio
+    async def test_messages_are_appended_not_rewritten(self, redis):
+        """Test each step only appends new messages to the log."""
+        from langchain_core.messages import HumanMessage
+        from luka_agent.delta_checkpointer import AsyncDeltaRedisSaver
+
+        saver = AsyncDeltaRedisSaver(redis, write_behind=False)
+        graph = _message_graph(saver)
+        config = {"configurable": {"thread_id": "t2"}}
+
+        for i in range(5):
+            await graph.ainvoke({"messages": [HumanMessage(content=f"m{i}")]}, config)
+
+        # 5 turns x (user + reply), each message stored once
+        assert await redis.llen("luka:ckpt:t2::log") == 10
+
+    @pytest.mark.asyncio
+    async def test_compaction_caps_checkpoints_per_thread(self, redis):
+        """Test old checkpoints and the log prefix they used are dropped."""
+        from langchain_core.messages import HumanMessage, RemoveMessage
+        from luka_agent.delta_checkpointer import AsyncDeltaRedisSaver
+
+        saver = AsyncDeltaRedisSaver(redis, max_checkpoints=3, write_behind=False)
+        graph = _message_graph(saver)
+        config = {"configurable": {"thread_id": "t3"}}
+
+        for i in range(4):
+            await graph.ainvoke({"messages": [HumanMessage(content=f"m{i}")]}, config)
+
+        # Rewrite history so earlier log segments become unreachable
+        state = await graph.aget_state(config)
+        await graph.aupdate_state(config, {"messages": [RemoveMessage(id=state.values["messages"][0].id)]})
+        for i in range(3):
+            await graph.ainvoke({"messages": [HumanMessage(content=f"n{i}")]}, config)
+
+        assert await redis.zcard("luka:ckpt:t3::ids") == 3
+        assert int(await redis.get("luka:ckpt:t3::base")) > 0
+
+        cold = _message_graph(AsyncDeltaRedisSaver(redis))
+        restored = await cold.aget_state(config)
+        assert restored.values["messages"] == (await graph.aget_state(config)).values["messages"]
+
+    @pytest.mark.asyncio
+    async def test_lru_is_bounded(self, redis):
+        """Test the in-process cache evicts threads beyond its limit."""
+        from langchain_core.messages import HumanMessage
+        from luka_agent.delta_checkpointer import AsyncDeltaRedisSaver
+
+        saver = AsyncDeltaRedisSaver(redis, cache_threads=2)
+        graph = _message_graph(saver)
+
+        for thread in ("a", "b", "c"):
+            await graph.ainvoke(
+                {"messages": [HumanMessage(content=thread)]},
+                {"configurable": {"thread_id": thread}},
+            )
+        await saver.flush()
+
+        assert saver.get_stats()["cached_threads"] == 2
+        state = await graph.aget_state({"configurable": {"thread_id": "a"}})
+        assert state.values["messages"][0].content == "a"
+
+    @pytest.mark.asyncio
+    async def test_delete_thread(self, redis):
+        """Test adelete_thread removes cached and stored state."""
+        from langchain_core.messages import HumanMessage
+        from luka_agent.delta_checkpointer import AsyncDeltaRedisSaver
+
+        saver = AsyncDeltaRedisSaver(redis)
+        graph = _message_graph(saver)
+        config = {"configurable": {"thread_id": "gone"}}
+
+        await graph.ainvoke({"messages": [HumanMessage(content="hi")]}, config)
+        await saver.adelete_thread("gone")
+
+        assert await saver.aget_tuple(config) is None
+        assert not await redis.keys("luka:ckpt:gone:*")
+
+    @staticmethod
+    def _fail_once(saver, fail_on_call):
+        """Make the `fail_on_call`-th checkpoint write raise, as if Redis dropped the connection."""
+        from luka_agent.delta_checkpointer import WRITE_SCRIPT
+
+        script = saver.redis.register_script(WRITE_SCRIPT)
+        calls = []
+
+        async def flaky(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == fail_on_call:
+                raise ConnectionError("connection lost")
+            return await script(**kwargs)
+
+        saver._write_script = flaky
+
+    @pytest.mark.asyncio
+    async def test_failed_write_behind_write_recomputes_queued_writes(self, redis):
+        """Test writes queued behind a failed one are placed after Redis' real head."""
+        from langchain_core.messages import HumanMessage
+        from luka_agent.delta_checkpointer import AsyncDeltaRedisSaver
+
+        saver = AsyncDeltaRedisSaver(redis, write_behind=True)
+        graph = _message_graph(saver)
+        config = {"configurable": {"thread_id": "flaky"}}
+
+        await graph.ainvoke({"messages": [HumanMessage(content="hi")]}, config)
+        await saver.flush()
+        self._fail_once(saver, fail_on_call=2)
+        await graph.ainvoke({"messages": [HumanMessage(content="again")]}, config)
+        await graph.ainvoke({"messages": [HumanMessage(content="third")]}, config)
+        await saver.flush()
+
+        assert saver.get_stats()["write_conflicts"] >= 1
+        cold = _message_graph(AsyncDeltaRedisSaver(redis))
+        state = await cold.aget_state(config)
+        assert [m.content for m in state.values["messages"]] == [
+            "hi", "reply 1", "again", "reply 3", "third", "reply 5",
+        ]
+        assert state.values["turns"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_sync_write_keeps_previous_head(self, redis):
+        """Test a failed write raises and leaves the cache on the last written checkpoint."""
+        from langchain_core.messages import HumanMessage
+        from luka_agent.delta_checkpointer import AsyncDeltaRedisSaver
+
+        saver = AsyncDeltaRedisSaver(redis)
+        graph = _message_graph(saver)
+        config = {"configurable": {"thread_id": "sync"}}
+
+        await graph.ainvoke({"messages": [HumanMessage(content="hi")]}, config)
+        self._fail_once(saver, fail_on_call=1)
+        with pytest.raises(ConnectionError):
+            await graph.ainvoke({"messages": [HumanMessage(content="lost")]}, config)
+
+        state = await graph.aget_state(config)
+        assert [m.content for m in state.values["messages"]] == ["hi", "reply 1"]
+        await graph.ainvoke({"messages": [HumanMessage(content="again")]}, config)
+        cold = _message_graph(AsyncDeltaRedisSaver(redis))
+        state = await cold.aget_state(config)
+        assert [m.content for m in state.values["messages"]] == ["hi", "reply 1", "again", "reply 3"]
+
+    @pytest.mark.asyncio
+    async def test_cached_head_is_checked_against_redis(self, redis):
+        """Test a replica's cached head is replaced once another replica writes the thread."""
+        from langchain_core.messages import HumanMessage
+        from luka_agent.delta_checkpointer import AsyncDeltaRedisSaver
+
+        replica_a = _message_graph(AsyncDeltaRedisSaver(redis))
+        replica_b = _message_graph(AsyncDeltaRedisSaver(redis))
+        config = {"configurable": {"thread_id": "shared"}}
+
+        await replica_a.ainvoke({"messages": [HumanMessage(content="to a")]}, config)
+        await replica_b.ainvoke({"messages": [HumanMessage(content="to b")]}, config)
+
+        state = await replica_a.aget_state(config)
+        assert [m.content for m in state.values["messages"]] == ["to a", "reply 1", "to b", "reply 3"]
+
+        await replica_a.ainvoke({"messages": [HumanMessage(content="a again")]}, config)
+        cold = _message_graph(AsyncDeltaRedisSaver(redis))
+        state = await cold.aget_state(config)
+        assert [m.content for m in state.values["messages"]] == [
+            "to a", "reply 1", "to b", "reply 3", "a again", "reply 5",
+        ]
+        assert state.values["turns"] == 3
@@ -0,0 +1,171 @@
+"""
+Tests for the token-budgeted context window.
+
+Tests tool output elision, folding old turns into the rolling summary,
+the summary fallback and per-model budgets.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from luka_agent import context_window
+from luka_agent.context_window import (
+    SUMMARY_HEADER,
+    build_context_window,
+    clear_token_cache,
+    count_tokens,
+    token_budget,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    clear_token_cache()
+    yield
+    clear_token_cache()
+
+
+def _turn(n, tool_output="", answer="ok"):
+    messages = [HumanMessage(content=f"question {n}", id=f"h{n}")]
+    if tool_output:
+        call = {"name": "search_knowledge_base", "args": {"query": f"q{n}"}, "id": f"call{n}"}
+        messages += [
+            AIMessage(content="", tool_calls=[call], id=f"c{n}"),
+            ToolMessage(content=tool_output, tool_call_id=f"call{n}", name="search_knowledge_base", id=f"t{n}"),
+        ]
+    messages.append(AIMessage(content=answer, id=f"a{n}"))
+    return messages
+
+
+def _state(messages, **overrides):
+    state = {"messages": messages, "llm_provider": "ollama", "llm_model": "llama3.2"}
+    state.update(overrides)
+    return state
+
+
+class TestTokenCounting:
+    """Test token estimates."""
+
+    def test_count_cached_per_message(self):
+        """Test a message is measured once."""
+        message = HumanMessage(content="hello " * 100, id="m1")
+        with patch.object(context_window, "_content_tokens", wraps=context_window._content_tokens) as measure:
+            first = count_tokens(message)
+            second = count_tokens(message)
+
+        assert first == second > 100
+        assert measure.call_count == 1
+
+    def test_budget_per_model(self):
+        """Test provider/model overrides beat the default budget."""
+        budgets = {"LUKA_CONTEXT_TOKEN_BUDGETS": {"openai/gpt-4o": 32000, "ollama": 4000}}
+        with patch.object(context_window, "_setting", side_effect=lambda name, default: budgets.get(name, default)):
+            assert token_budget("openai", "gpt-4o") == 32000
+            assert token_budget("ollama", "llama3.2") == 4000
+            assert token_budget("anthropic", "claude") == context_window.DEFAULT_CONTEXT_TOKEN_BUDGET
+
+
+class TestBuildContextWindow:
+    """Test window construction."""
+
+    @pytest.mark.asyncio
+    async def test_small_history_sent_verbatim(self):
+        """Test nothing changes under budget."""
+        messages = _turn(1) + _turn(2)
+        window = await build_context_window(_state(messages), "system", budget=10000)
+
+        assert isinstance(window.messages[0], SystemMessage)
+        assert window.messages[1:] == messages
+        assert window.tokens_saved == 0
+        assert window.state_updates() == {}
+
+    @pytest.mark.asyncio
+    async def test_stale_tool_outputs_elided(self):
+        """Test earlier turns' tool outputs become stubs, the current turn's don't."""
+        dump = "kb result " * 500
+        messages = _turn(1, tool_output=dump) + _turn(2, tool_output=dump)[:-1]
+        window = await build_context_window(_state(messages), "system", budget=100000)
+
+        old_tool, current_tool = window.messages[3], window.messages[-1]
+        assert isinstance(old_tool, ToolMessage) and old_tool.tool_call_id == "call1"
+        assert len(old_tool.content) < 600
+        assert current_tool.content == dump
+        assert window.elided == 1
+        assert window.tokens_saved > 1000
+
+    @pytest.mark.asyncio
+    async def test_old_turns_folded_into_summary(self):
+        """Test over-budget history folds whole old turns into the summary."""
+        messages = [m for n in range(10) for m in _turn(n, answer="answer " * 200)]
+        messages.append(HumanMessage(content="latest question", id="latest"))
+        summarize = AsyncMock(return_value="User asked ten questions.")
+
+        window = await build_context_window(_state(messages), "system", budget=1500, summarize=summarize)
+
+        assert summarize.await_count == 1
+        assert window.folded > 0
+        assert window.messages[-1].content == "latest question"
+        assert isinstance(window.messages[1], HumanMessage)
+        assert SUMMARY_HEADER in window.messages[0].content
+        assert window.tokens_after <= 1500
+        assert window.state_updates()["context_summary"] == "User asked ten questions."
+
+        # The next step starts after the folded messages and doesn't summarize again
+        upto = window.state_updates()["context_summary_upto"]
+        again = await build_context_window(
+            _state(messages, context_summary=window.summary, context_summary_upto=upto),
+            "system",
+            budget=1500,
+            summarize=summarize,
+        )
+        assert summarize.await_count == 1
+        assert again.messages == window.messages
+
+    @pytest.mark.asyncio
+    async def test_summary_not_streamed_with_answer(self):
+        """Test a fold inside a graph run doesn't stream the summary as answer chunks."""
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from langgraph.graph import END, START, MessagesState, StateGraph
+
+        async def agent(state):
+            window = await build_context_window(_state(state["messages"]), "system", budget=1500)
+            assert window.folded > 0
+            answer_model = GenericFakeChatModel(messages=iter([AIMessage(content="final answer")]))
+            return {"messages": [await answer_model.ainvoke(window.messages)]}
+
+        graph = StateGraph(MessagesState)
+        graph.add_node("agent", agent)
+        graph.add_edge(START, "agent")
+        graph.add_edge("agent", END)
+        graph = graph.compile()
+
+        messages = [m for n in range(10) for m in _turn(n, answer="answer " * 200)]
+        messages.append(HumanMessage(content="latest question", id="latest"))
+        summary_model = GenericFakeChatModel(messages=iter([AIMessage(content="folded summary")]))
+
+        chunks = []
+        with patch("luka_agent.registry.get_chat_model", return_value=summary_model):
+            async for event in graph.astream_events({"messages": messages}, version="v2"):
+                if event["event"] == "on_chat_model_stream":
+                    chunks.append(event["data"]["chunk"].content)
+
+        assert "".join(chunks) == "final answer"
+
+    @pytest.mark.asyncio
+    async def test_summary_timeout_falls_back_to_extractive(self):
+        """Test a slow summarizer doesn't block the turn."""
+        async def slow(previous, messages):
+            await asyncio.sleep(10)
+
+        messages = [m for n in range(10) for m in _turn(n, answer="answer " * 200)]
+        messages.append(HumanMessage(content="latest question", id="latest"))
+        with patch.object(
+            context_window, "_setting",
+            side_effect=lambda name, default: 0.05 if name == "LUKA_CONTEXT_SUMMARY_TIMEOUT_SECONDS" else default,
+        ):
+            window = await build_context_window(_state(messages), "system", budget=1500, summarize=slow)
+
+        assert window.summary.startswith("User: question 0")
@@ -91,7 +91,7 @@ class TestGraphStructure:
 
     @pytest.mark.asyncio
     async def test_graph_has_required_nodes(self):
-        """Test graph has agent, tools, and suggestions nodes."""
+        """Test graph has agent and tools nodes."""
         with patch('luka_agent.graph.get_checkpointer') as mock_checkpointer:
             mock_checkpointer.return_value = AsyncMock()
 
@@ -10,6 +10,7 @@ import pytest
 from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from langchain_core.messages import HumanMessage, AIMessage
 
+from luka_agent.context_window import INTERNAL_LLM_TAG
 from luka_agent.integration.telegram import (
     stream_telegram_response,
     invoke_telegram_response,
@@ -66,6 +67,42 @@ class TestStreamTelegramResponse:
         assert text_chunks[0]["content"] == "Hello "
         assert text_chunks[1]["content"] == "world!"
 
+    @pytest.mark.asyncio
+    async def test_skips_internal_llm_chunks(self):
+        """Test chunks of internal LLM calls (context summaries) are not streamed."""
+        mock_graph = AsyncMock()
+
+        async def mock_stream_events(*args, **kwargs):
+            yield {
+                "event": "on_chat_model_stream",
+                "tags": [INTERNAL_LLM_TAG],
+                "data": {"chunk": Mock(content="summary of old turns")}
+            }
+            yield {
+                "event": "on_chat_model_stream",
+                "tags": ["seq:step:1"],
+                "data": {"chunk": Mock(content="Answer")}
+            }
+
+        mock_graph.astream_events = mock_stream_events
+
+        async def mock_get_graph():
+            return mock_graph
+
+        with patch('luka_agent.integration.telegram.get_unified_agent_graph', side_effect=mock_get_graph):
+            with patch('luka_agent.integration.telegram.create_tools_for_user', return_value=[]):
+                events = [
+                    event async for event in stream_telegram_response(
+                        user_message="Test message",
+                        user_id=123,
+                        thread_id="test_thread",
+                        knowledge_bases=[],
+                    )
+                ]
+
+        text_chunks = [e["content"] for e in events if e.get("type") == "text_chunk"]
+        assert text_chunks == ["Answer"]
+
     @pytest.mark.asyncio
     async def test_streams_tool_notifications(self):
         """Test that tool notifications are emitted."""
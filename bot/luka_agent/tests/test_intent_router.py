@@ -0,0 +1,84 @@
+"""
+Tests for the sub-agent intent router.
+
+Tests lexical ranking, phrase triggers, confidence thresholds and the
+optional embedding stage.
+"""
+
+import pytest
+
+from luka_agent.sub_agents.router import IntentDocument, IntentRouter, tokenize
+
+
+@pytest.fixture
+def router():
+    return IntentRouter([
+        IntentDocument(
+            agent_id="crypto_analyst",
+            triggers=["crypto", "token", "price", "bitcoin"],
+            names=["Crypto Analyst"],
+            texts=["Market analysis and token prices"],
+        ),
+        IntentDocument(
+            agent_id="defi_onboarding",
+            triggers=["price notification", "trending token", "defi alert"],
+            names=["DeFi Alert Bot"],
+            texts=["Real-time mindshare tracking with price alerts"],
+        ),
+        IntentDocument(
+            agent_id="meta_prompting",
+            triggers=["create prompt", "optimize prompt"],
+            names=["Meta Prompting"],
+            texts=["Prompt engineering assistant"],
+        ),
+    ], embedding_weight=0.0)
+
+
+class TestIntentRouter:
+    """Test routing between sub-agents."""
+
+    def test_tokenize_stems_and_drops_stopwords(self):
+        """Test plural/singular forms produce the same tokens."""
+        assert tokenize("What are the Tokens prices?") == ["token", "price"]
+        assert tokenize("token price") == ["token", "price"]
+
+    def test_triggers_rank_best_agent_first(self, router):
+        """Test single-word triggers route to their sub-agent."""
+        matches = router.route("what's the bitcoin price today")
+
+        assert matches[0].agent_id == "crypto_analyst"
+        assert 0 < matches[0].confidence <= 1
+
+    def test_phrase_trigger_beats_shared_words(self, router):
+        """Test a multi-word trigger outranks agents matching single words."""
+        matches = router.route("set up a price notification for trending tokens")
+
+        assert matches[0].agent_id == "defi_onboarding"
+        assert matches[0].confidence > matches[1].confidence
+
+    def test_no_match_returns_nothing(self, router):
+        """Test unrelated queries return no candidates."""
+        assert router.route("hello there") == []
+        assert router.best_match("hello there") is None
+
+    def test_best_match_applies_threshold_and_filter(self, router):
+        """Test best_match honours min_confidence and allowed ids."""
+        assert router.best_match("optimize prompt", min_confidence=0.3).agent_id == "meta_prompting"
+        assert router.best_match("optimize prompt", min_confidence=0.99) is None
+        assert router.best_match("optimize prompt", allowed={"crypto_analyst"}) is None
+
+    def test_embedding_stage_routes_without_lexical_match(self):
+        """Test centroid similarity finds agents when no token matches."""
+        vectors = {"travel": [1.0, 0.0], "money": [0.0, 1.0]}
+
+        def embed(texts):
+            return [vectors["travel"] if "trip" in t or "vacation" in t else vectors["money"] for t in texts]
+
+        router = IntentRouter([
+            IntentDocument(agent_id="trip_planner", triggers=["trip"], names=["trip planner"]),
+            IntentDocument(agent_id="crypto_analyst", triggers=["crypto"], names=["crypto"]),
+        ], embed=embed, embedding_weight=1.0)
+
+        matches = router.route("planning a vacation")
+        assert matches[0].agent_id == "trip_planner"
+        assert matches[0].confidence == pytest.approx(1.0)
@@ -0,0 +1,89 @@
+"""
+Tests for the LLM client and tool bundle registry.
+
+Tests client reuse, tool bundle TTL and bound-runnable reuse.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from luka_agent import registry
+from luka_agent.registry import bind_tools, clear_registry, get_chat_model, get_tool_bundle
+
+
+@pytest.fixture(autouse=True)
+def _clean_registry():
+    clear_registry()
+    yield
+    clear_registry()
+
+
+def _bundle_args(**overrides):
+    args = dict(
+        user_id=1,
+        thread_id="thread",
+        knowledge_bases=[],
+        enabled_tools=["youtube"],
+        platform="web",
+        language="en",
+    )
+    args.update(overrides)
+    return args
+
+
+class TestChatModels:
+    """Test chat model reuse."""
+
+    @pytest.mark.asyncio
+    async def test_same_config_returns_same_client(self):
+        """Test one client per (provider, model, temperature)."""
+        llm = get_chat_model("ollama", "llama3.2", 0.2)
+
+        assert get_chat_model("ollama", "llama3.2", 0.2) is llm
+        assert get_chat_model("ollama", "llama3.2", 0.5) is not llm
+
+    @pytest.mark.asyncio
+    async def test_ollama_clients_share_http_pool(self):
+        """Test models behind one base URL share one HTTP client."""
+        first = get_chat_model("ollama", "llama3.2", 0.7)
+        second = get_chat_model("ollama", "qwen2.5", 0.7)
+
+        assert first is not second
+        assert first.http_async_client is second.http_async_client
+
+
+class TestToolBundles:
+    """Test tool bundle caching."""
+
+    @pytest.mark.asyncio
+    async def test_bundle_reused_within_ttl(self):
+        """Test tools are built once per user context."""
+        with patch("luka_agent.tools.create_tools_for_user", return_value=[]) as create:
+            first = get_tool_bundle(**_bundle_args())
+            second = get_tool_bundle(**_bundle_args())
+            other = get_tool_bundle(**_bundle_args(enabled_tools=["knowledge_base"]))
+
+        assert first is second
+        assert other is not first
+        assert create.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_bundle_rebuilt_after_ttl(self):
+        """Test an expired bundle is rebuilt."""
+        with patch.object(registry, "_setting", side_effect=lambda name, default: 0.0 if "TTL" in name else default), \
+                patch("luka_agent.tools.create_tools_for_user", return_value=[]) as create:
+            get_tool_bundle(**_bundle_args())
+            get_tool_bundle(**_bundle_args())
+
+        assert create.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_bind_tools_reused_per_bundle(self):
+        """Test binding tools to the same LLM happens once per bundle."""
+        llm = MagicMock()
+        with patch("luka_agent.tools.create_tools_for_user", return_value=[]):
+            bundle = get_tool_bundle(**_bundle_args())
+
+        assert bind_tools(llm, bundle) is bind_tools(llm, bundle)
+        llm.bind_tools.assert_called_once_with([])
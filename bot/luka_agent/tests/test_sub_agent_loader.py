@@ -0,0 +1,136 @@
+"""
+Tests for the SubAgentLoader cache.
+
+Tests that parsed configs and compiled prompts are reused, reloaded when
+their files change, and render the same as the regex-based renderer.
+"""
+
+import os
+
+import pytest
+import yaml
+
+from luka_agent.sub_agents.loader import SubAgentLoader
+
+
+def _write_agent(base, agent_id, name="Test Agent", prompt="You are {agent_name}. User: {user_name}. {unknown}"):
+    agent_dir = base / agent_id
+    agent_dir.mkdir(exist_ok=True)
+    config = {
+        "agent": {
+            "metadata": {
+                "id": agent_id,
+                "name": name,
+                "title": name,
+                "icon": "🤖",
+                "version": "1.0.0",
+                "description": "Test",
+            },
+            "persona": {
+                "role": "Tester",
+                "identity": "Test identity",
+                "communication_style": "Brief",
+                "principles": [],
+            },
+        },
+        "luka_extensions": {
+            "system_prompt": {"base": f"{base.name}/{agent_id}/system_prompt.md"},
+            "enabled_tools": [],
+            "knowledge_bases": [],
+        },
+    }
+    (agent_dir / "config.yaml").write_text(yaml.safe_dump(config), encoding="utf-8")
+    (agent_dir / "system_prompt.md").write_text(prompt, encoding="utf-8")
+    return agent_dir
+
+
+def _touch_later(path):
+    """Bump mtime explicitly so coarse filesystem timestamps still change."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def base(tmp_path):
+    base = tmp_path / "sub_agents"
+    base.mkdir()
+    return base
+
+
+class TestSubAgentLoaderCache:
+    """Test caching and hot reload."""
+
+    def test_load_returns_cached_config(self, base):
+        """Test repeated loads reuse the parsed config."""
+        _write_agent(base, "tester")
+        loader = SubAgentLoader(base, reload_interval=0)
+
+        assert loader.load("tester") is loader.load("tester")
+
+    def test_config_reloaded_on_mtime_change(self, base):
+        """Test an edited config is picked up without restarting."""
+        agent_dir = _write_agent(base, "tester")
+        loader = SubAgentLoader(base, reload_interval=0)
+        first = loader.load("tester")
+
+        _write_agent(base, "tester", name="Renamed")
+        _touch_later(agent_dir / "config.yaml")
+
+        second = loader.load("tester")
+        assert second is not first
+        assert second.name == "Renamed"
+
+    def test_no_reload_within_interval(self, base):
+        """Test files aren't re-checked before the reload interval passes."""
+        agent_dir = _write_agent(base, "tester")
+        loader = SubAgentLoader(base, reload_interval=3600)
+        first = loader.load("tester")
+
+        _write_agent(base, "tester", name="Renamed")
+        _touch_later(agent_dir / "config.yaml")
+
+        assert loader.load("tester") is first
+
+    def test_prompt_recompiled_on_change(self, base):
+        """Test an edited prompt is recompiled and rendered like before."""
+        agent_dir = _write_agent(base, "tester")
+        loader = SubAgentLoader(base, reload_interval=0)
+        config = loader.load("tester")
+
+        rendered = loader.load_system_prompt(config, template_vars={"user_name": "Bob"})
+        assert rendered == "You are Test Agent. User: Bob. {unknown}"
+
+        (agent_dir / "system_prompt.md").write_text("Hi {user_name} from {metadata.id}", encoding="utf-8")
+        _touch_later(agent_dir / "system_prompt.md")
+
+        rendered = loader.load_system_prompt(config, template_vars={"user_name": "Ann"})
+        assert rendered == "Hi Ann from tester"
+
+    def test_compiled_template_matches_render_template(self, base):
+        """Test runtime vars override config vars, as in the regex renderer."""
+        _write_agent(base, "tester")
+        loader = SubAgentLoader(base, reload_interval=0)
+        config = loader.load("tester")
+        template = "{agent_name} {persona.role} {metadata.name} {missing.path}"
+        runtime_vars = {"agent_name": "Override"}
+
+        loader.load_system_prompt(config)  # compile and cache
+        assert loader._render_template(template, config, runtime_vars) == "Override Tester Test Agent {missing.path}"
+
+    def test_listing_picks_up_new_agents(self, base):
+        """Test list_available_agents rescans once configs change."""
+        _write_agent(base, "first")
+        loader = SubAgentLoader(base, reload_interval=0)
+        assert [a["id"] for a in loader.list_available_agents()] == ["first"]
+
+        _write_agent(base, "second")
+        assert [a["id"] for a in loader.list_available_agents()] == ["first", "second"]
+
+    def test_warm_loads_all_agents(self, base):
+        """Test warm() parses every agent up front."""
+        _write_agent(base, "first")
+        _write_agent(base, "second")
+        loader = SubAgentLoader(base, reload_interval=-1)
+
+        assert loader.warm() == 2
+        assert set(loader._agents) == {"first", "second"}
@@ -0,0 +1,111 @@
+"""
+Tests for detached suggestion generation.
+
+Tests the conversation-tail cache, load shedding, the latency budget and
+cancellation.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from luka_agent import suggestions as suggestions_module
+from luka_agent.suggestions import (
+    clear_suggestions_cache,
+    generate_suggestions,
+    start_suggestions,
+    tail_hash,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    clear_suggestions_cache()
+    yield
+    clear_suggestions_cache()
+
+
+def _state(question="What is DeFi?", **overrides):
+    state = {
+        "messages": [HumanMessage(content=question), AIMessage(content="DeFi is...")],
+        "language": "en",
+        "llm_provider": "ollama",
+        "llm_model": "llama3.2",
+        "generate_suggestions": True,
+    }
+    state.update(overrides)
+    return state
+
+
+class TestGenerateSuggestions:
+    """Test suggestion generation."""
+
+    @pytest.mark.asyncio
+    async def test_cached_by_conversation_tail(self):
+        """Test the same conversation tail calls the LLM once."""
+        llm = AsyncMock(return_value=["A", "B"])
+        with patch.object(suggestions_module, "_generate_with_llm", llm):
+            first = await generate_suggestions(_state())
+            second = await generate_suggestions(_state())
+            await generate_suggestions(_state("Something else"))
+
+        assert first == second == ["A", "B"]
+        assert llm.await_count == 2
+        assert tail_hash(_state()) != tail_hash(_state(language="ru"))
+
+    @pytest.mark.asyncio
+    async def test_latency_budget_skips_suggestions(self):
+        """Test slow suggestions are dropped, not awaited."""
+        async def slow(state, context):
+            await asyncio.sleep(1.0)
+            return ["late"]
+
+        with patch.object(suggestions_module, "_generate_with_llm", slow), \
+                patch.object(suggestions_module, "_setting", side_effect=lambda name, default: 0.05 if "TIMEOUT" in name else default):
+            assert await generate_suggestions(_state()) == []
+
+    @pytest.mark.asyncio
+    async def test_workflow_hints_skip_llm(self):
+        """Test active workflows use their hints directly."""
+        llm = AsyncMock()
+        with patch.object(suggestions_module, "_generate_with_llm", llm):
+            result = await generate_suggestions(
+                _state(active_workflow="onboarding", _workflow_suggestion_hints=["1", "2", "3", "4"])
+            )
+
+        assert result == ["1", "2", "3"]
+        llm.assert_not_awaited()
+
+
+class TestStartSuggestions:
+    """Test the detached task."""
+
+    @pytest.mark.asyncio
+    async def test_skipped_under_load(self):
+        """Test no task is started once too many are in flight."""
+        started = asyncio.Event()
+
+        async def slow(state, context):
+            started.set()
+            await asyncio.sleep(5.0)
+            return []
+
+        with patch.object(suggestions_module, "_generate_with_llm", slow), \
+                patch.object(suggestions_module, "_setting", side_effect=lambda name, default: 1 if "IN_FLIGHT" in name else default):
+            task = start_suggestions(_state())
+            await started.wait()
+
+            assert start_suggestions(_state("Other")) is None
+
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert suggestions_module._in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_suggestions_start_nothing(self):
+        """Test generate_suggestions=False starts no task."""
+        assert start_suggestions(_state(generate_suggestions=False)) is None
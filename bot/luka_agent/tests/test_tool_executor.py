@@ -0,0 +1,139 @@
+"""
+Tests for concurrent tool execution.
+
+Tests ordering, concurrency, timeouts, serial-only tools, the per-user cap
+and cancellation.
+"""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.tools import StructuredTool
+
+from luka_agent.tool_executor import execute_tool_calls, is_serial_only
+
+
+def _sleep_tool(name, delay, log=None, serial_only=False, timeout=None):
+    """Tool that sleeps `delay` seconds and records start/end events."""
+    async def run(value: str = "") -> str:
+        if log is not None:
+            log.append(("start", name))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", name))
+        return f"{name}:{value}"
+
+    metadata = {}
+    if serial_only:
+        metadata["serial_only"] = True
+    if timeout is not None:
+        metadata["timeout"] = timeout
+    return StructuredTool.from_function(
+        name=name, description=name, func=lambda value="": None, coroutine=run, metadata=metadata
+    )
+
+
+def _call(name, call_id, value=""):
+    return {"name": name, "args": {"value": value}, "id": call_id}
+
+
+class TestToolExecution:
+    """Test concurrent execution semantics."""
+
+    @pytest.mark.asyncio
+    async def test_tools_run_concurrently(self):
+        """Test a multi-tool turn takes about as long as the slowest tool."""
+        tools = {name: _sleep_tool(name, 0.2) for name in ("a", "b", "c")}
+
+        start = time.perf_counter()
+        messages = await execute_tool_calls(
+            [_call("a", "1"), _call("b", "2"), _call("c", "3")], tools, user_id=1
+        )
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.5
+        assert len(messages) == 3
+
+    @pytest.mark.asyncio
+    async def test_messages_keep_tool_call_order(self):
+        """Test ToolMessages follow the tool call order, not completion order."""
+        tools = {"slow": _sleep_tool("slow", 0.1), "fast": _sleep_tool("fast", 0.0)}
+
+        messages = await execute_tool_calls(
+            [_call("slow", "1", "x"), _call("fast", "2", "y")], tools, user_id=1
+        )
+
+        assert [m.tool_call_id for m in messages] == ["1", "2"]
+        assert [m.content for m in messages] == ["slow:x", "fast:y"]
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_unknown_tool_become_error_messages(self):
+        """Test failures are reported as ToolMessages without failing the turn."""
+        tools = {"slow": _sleep_tool("slow", 1.0, timeout=0.05)}
+
+        messages = await execute_tool_calls(
+            [_call("slow", "1"), _call("missing", "2")], tools, user_id=1
+        )
+
+        assert "timed out" in messages[0].content
+        assert messages[1].content == "Tool 'missing' not found"
+
+    @pytest.mark.asyncio
+    async def test_serial_only_tool_runs_alone(self):
+        """Test a serial-only tool never overlaps other tools of the turn."""
+        log = []
+        tools = {
+            "a": _sleep_tool("a", 0.05, log),
+            "side_effect": _sleep_tool("side_effect", 0.05, log, serial_only=True),
+            "b": _sleep_tool("b", 0.05, log),
+        }
+
+        await execute_tool_calls(
+            [_call("a", "1"), _call("side_effect", "2"), _call("b", "3")], tools, user_id=1
+        )
+
+        index = log.index(("start", "side_effect"))
+        assert log[index - 1] == ("end", "a")
+        assert log[index + 1] == ("end", "side_effect")
+        assert is_serial_only(tools["side_effect"])
+        assert not is_serial_only(tools["a"])
+
+    @pytest.mark.asyncio
+    async def test_per_user_concurrency_cap(self):
+        """Test no more than max_concurrency tools of one user run at once."""
+        running = 0
+        peak = 0
+
+        async def run(value: str = "") -> str:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return value
+
+        tool = StructuredTool.from_function(
+            name="t", description="t", func=lambda value="": None, coroutine=run
+        )
+        calls = [_call("t", str(i)) for i in range(6)]
+
+        await execute_tool_calls(calls, {"t": tool}, user_id=7, max_concurrency=2)
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelling_the_run_cancels_tools(self):
+        """Test aborting the run cancels in-flight tools."""
+        log = []
+        tools = {"a": _sleep_tool("a", 5.0, log), "b": _sleep_tool("b", 5.0, log)}
+
+        task = asyncio.create_task(
+            execute_tool_calls([_call("a", "1"), _call("b", "2")], tools, user_id=1)
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert ("end", "a") not in log and ("end", "b") not in log
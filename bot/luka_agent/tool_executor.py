@@ -0,0 +1,152 @@
+"""
+Concurrent tool execution for luka_agent.
+
+When the LLM returns several tool calls in one turn they run concurrently,
+so a multi-tool turn takes as long as its slowest tool:
+
+- each call has a timeout (settings default, overridable per tool via
+  `tool.metadata["timeout"]`)
+- a per-user semaphore caps how many tools one user runs at once, across
+  all of that user's concurrent runs
+- tools with side effects declare `tool.metadata["serial_only"] = True`;
+  they run alone, in call order, between the concurrent batches around them
+- ToolMessages are returned in the order of the AI message's tool calls
+- cancelling the run (client abort) cancels every in-flight tool
+"""
+
+import asyncio
+import weakref
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool
+from loguru import logger
+
+try:
+    from luka_agent.core.config import settings
+except ImportError:
+    settings = None
+
+SERIAL_ONLY = "serial_only"
+TIMEOUT = "timeout"
+
+DEFAULT_TOOL_TIMEOUT_SECONDS = 60.0
+DEFAULT_MAX_CONCURRENT_TOOLS_PER_USER = 4
+
+# Semaphores are dropped automatically once no run of the user holds one
+_user_semaphores: "weakref.WeakValueDictionary[int, asyncio.Semaphore]" = weakref.WeakValueDictionary()
+
+
+def is_serial_only(tool: Optional[BaseTool]) -> bool:
+    """True if the tool declared it must not run alongside other tools."""
+    return bool(tool is not None and (tool.metadata or {}).get(SERIAL_ONLY))
+
+
+def _tool_timeout(tool: BaseTool, default: float) -> float:
+    return float((tool.metadata or {}).get(TIMEOUT, default))
+
+
+def _user_semaphore(user_id: int, limit: int) -> asyncio.Semaphore:
+    semaphore = _user_semaphores.get(user_id)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(limit)
+        _user_semaphores[user_id] = semaphore
+    return semaphore
+
+
+async def _run_tool_call(
+    tool_call: Mapping[str, Any],
+    tool: Optional[BaseTool],
+    semaphore: asyncio.Semaphore,
+    default_timeout: float,
+) -> ToolMessage:
+    tool_name = tool_call["name"]
+    tool_args = tool_call.get("args", {})
+    tool_id = tool_call.get("id", "")
+
+    if tool is None:
+        error_msg = f"Tool '{tool_name}' not found"
+        logger.error(error_msg)
+        return ToolMessage(content=error_msg, tool_call_id=tool_id, name=tool_name)
+
+    timeout = _tool_timeout(tool, default_timeout)
+    try:
+        async with semaphore:
+            logger.debug(f"Executing tool: {tool_name} with args: {tool_args}")
+            result = await asyncio.wait_for(tool.ainvoke(tool_args), timeout=timeout)
+        logger.debug(f"Tool {tool_name} executed successfully")
+        return ToolMessage(content=str(result), tool_call_id=tool_id, name=tool_name)
+    except asyncio.TimeoutError:
+        error_msg = f"Tool '{tool_name}' timed out after {timeout:g}s"
+        logger.warning(error_msg)
+        return ToolMessage(content=error_msg, tool_call_id=tool_id, name=tool_name)
+    except Exception as e:
+        error_msg = f"Error executing tool '{tool_name}': {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        return ToolMessage(content=error_msg, tool_call_id=tool_id, name=tool_name)
+
+
+async def execute_tool_calls(
+    tool_calls: Sequence[Mapping[str, Any]],
+    tools_by_name: Dict[str, BaseTool],
+    user_id: int,
+    *,
+    timeout: Optional[float] = None,
+    max_concurrency: Optional[int] = None,
+) -> List[ToolMessage]:
+    """
+    Execute tool calls concurrently and return their ToolMessages in call order.
+
+    Args:
+        tool_calls: Tool calls from the AI message (`name`, `args`, `id`)
+        tools_by_name: Available tools for this user
+        user_id: User whose concurrency budget the calls use
+        timeout: Default per-tool timeout in seconds (settings if None)
+        max_concurrency: Per-user concurrent tool limit (settings if None)
+
+    Returns:
+        One ToolMessage per tool call, in the same order as `tool_calls`
+
+    Raises:
+        asyncio.CancelledError: If the run is cancelled; in-flight tools are cancelled too
+    """
+    if timeout is None:
+        timeout = getattr(settings, "LUKA_TOOL_TIMEOUT_SECONDS", DEFAULT_TOOL_TIMEOUT_SECONDS)
+    if max_concurrency is None:
+        max_concurrency = getattr(
+            settings, "LUKA_MAX_CONCURRENT_TOOLS_PER_USER", DEFAULT_MAX_CONCURRENT_TOOLS_PER_USER
+        )
+    semaphore = _user_semaphore(user_id, max(1, max_concurrency))
+
+    results: List[Optional[ToolMessage]] = [None] * len(tool_calls)
+    batch: List[int] = []
+
+    async def run_batch():
+        # TaskGroup cancels the remaining tools if this node is cancelled
+        async with asyncio.TaskGroup() as group:
+            tasks = {
+                index: group.create_task(_run_tool_call(
+                    tool_calls[index], tools_by_name.get(tool_calls[index]["name"]), semaphore, timeout
+                ))
+                for index in batch
+            }
+        for index, task in tasks.items():
+            results[index] = task.result()
+        batch.clear()
+
+    for index, tool_call in enumerate(tool_calls):
+        tool = tools_by_name.get(tool_call["name"])
+        if not is_serial_only(tool):
+            batch.append(index)
+            continue
+        if batch:
+            await run_batch()
+        results[index] = await _run_tool_call(tool_call, tool, semaphore, timeout)
+
+    if batch:
+        await run_batch()
+
+    return results
+
+
+__all__ = ["execute_tool_calls", "is_serial_only", "SERIAL_ONLY", "TIMEOUT"]
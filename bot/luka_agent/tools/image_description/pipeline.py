@@ -0,0 +1,368 @@
+"""
+Image pipeline for the describe_image tool.
+
+- `fetch_image`: streaming download with a byte cap, rejecting non-image
+  content types and oversized Content-Length before reading the body
+- `prepare_image`: downscale/re-encode to the vision model's working
+  resolution for the detail level (in a worker thread; needs Pillow, else
+  the original bytes are sent)
+- `DescriptionCache`: descriptions keyed by content hash (and a perceptual
+  hash, so re-encoded copies of the same image hit), detail level, prompt
+  and model; LRU in memory, shared through Redis. A perceptual hit is only
+  served after comparing a small thumbnail of both images, since look-alike
+  images (one meme template, different captions) share a difference hash
+"""
+
+import asyncio
+import hashlib
+import io
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from loguru import logger
+
+try:
+    from luka_agent.core.config import settings
+except ImportError:
+    settings = None
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_DOWNLOAD_TIMEOUT_SECONDS = 30.0
+DEFAULT_CACHE_MAX_ENTRIES = 1000
+DEFAULT_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# Longest side sent to the vision model per detail level
+MAX_SIDE_BY_DETAIL = {"low": 512, "standard": 1024, "high": 2048}
+JPEG_QUALITY = 85
+
+# Content types servers commonly use for images without saying so
+GENERIC_CONTENT_TYPES = ("application/octet-stream", "binary/octet-stream")
+
+_MAGIC_MIME_TYPES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+REDIS_KEY_PREFIX = "luka:image_description"
+
+# Perceptual matches are confirmed on a THUMBNAIL_SIZE² grayscale thumbnail:
+# every pixel within THUMBNAIL_MAX_DIFF levels and aspect ratios within
+# ASPECT_TOLERANCE (re-encoding and resizing stay well inside these)
+THUMBNAIL_SIZE = 32
+THUMBNAIL_MAX_DIFF = 16
+ASPECT_TOLERANCE = 0.02
+
+
+class ImageFetchError(Exception):
+    """Image could not be downloaded or is not an acceptable image."""
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default) if settings is not None else default
+
+
+def sniff_mime_type(data: bytes) -> Optional[str]:
+    """Detect JPEG/PNG/GIF/WebP from magic bytes."""
+    for magic, mime in _MAGIC_MIME_TYPES:
+        if data.startswith(magic):
+            return mime
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+@dataclass
+class FetchedImage:
+    data: bytes
+    content_type: str
+
+
+@dataclass(frozen=True)
+class PerceptualHash:
+    """Difference hash (the cache key) plus what is needed to confirm a match."""
+    dhash: str
+    aspect: float
+    thumbnail: bytes
+
+    def encode(self) -> str:
+        return f"{self.aspect:.4f}:{self.thumbnail.hex()}"
+
+    def matches(self, encoded: str) -> bool:
+        """True if `encoded` (from `encode`) describes the same image."""
+        try:
+            aspect, thumbnail = encoded.split(":", 1)
+            aspect, thumbnail = float(aspect), bytes.fromhex(thumbnail)
+        except ValueError:
+            return False
+        if len(thumbnail) != len(self.thumbnail) or abs(aspect - self.aspect) > ASPECT_TOLERANCE * self.aspect:
+            return False
+        return all(abs(a - b) <= THUMBNAIL_MAX_DIFF for a, b in zip(thumbnail, self.thumbnail))
+
+
+async def fetch_image(url: str, max_bytes: Optional[int] = None, timeout: Optional[float] = None) -> FetchedImage:
+    """
+    Download an image, streaming, without buffering more than `max_bytes`.
+
+    Args:
+        url: Image URL
+        max_bytes: Size cap (settings if None)
+        timeout: Request timeout in seconds (settings if None)
+
+    Returns:
+        FetchedImage with the body and its content type
+
+    Raises:
+        ImageFetchError: If the response isn't an image or exceeds the cap
+        httpx.HTTPStatusError / httpx.TimeoutException: On HTTP failures
+    """
+    import httpx
+
+    if max_bytes is None:
+        max_bytes = _setting("LUKA_IMAGE_MAX_BYTES", DEFAULT_MAX_BYTES)
+    if timeout is None:
+        timeout = _setting("LUKA_IMAGE_DOWNLOAD_TIMEOUT_SECONDS", DEFAULT_DOWNLOAD_TIMEOUT_SECONDS)
+
+    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+
+            content_type = (response.headers.get("content-type") or "").split(";")[0].strip().lower()
+            if content_type and not content_type.startswith("image/") and content_type not in GENERIC_CONTENT_TYPES:
+                raise ImageFetchError(f"URL returned '{content_type}', not an image")
+
+            content_length = response.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                raise ImageFetchError(f"Image is {int(content_length)} bytes, limit is {max_bytes}")
+
+            chunks: List[bytes] = []
+            received = 0
+            async for chunk in response.aiter_bytes():
+                received += len(chunk)
+                if received > max_bytes:
+                    raise ImageFetchError(f"Image exceeds {max_bytes} bytes")
+                chunks.append(chunk)
+
+    data = b"".join(chunks)
+    return FetchedImage(data=data, content_type=sniff_mime_type(data) or content_type or "image/jpeg")
+
+
+def _prepare_image_sync(data: bytes, mime_type: str, max_side: int) -> Tuple[bytes, str, Optional[PerceptualHash]]:
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return data, mime_type, None
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            perceptual = _perceptual_hash(image)
+
+            if max(image.size) <= max_side and mime_type in ("image/jpeg", "image/png"):
+                return data, mime_type, perceptual
+
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_side, max_side))
+
+            out = io.BytesIO()
+            has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+            if has_alpha:
+                image.save(out, format="PNG", optimize=True)
+                prepared, prepared_mime = out.getvalue(), "image/png"
+            else:
+                image.convert("RGB").save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+                prepared, prepared_mime = out.getvalue(), "image/jpeg"
+    except Exception as e:
+        # Let the vision model decide what to do with it
+        logger.debug(f"Image preprocessing skipped: {e}")
+        return data, mime_type, None
+
+    if len(prepared) >= len(data) and mime_type in ("image/jpeg", "image/png"):
+        return data, mime_type, perceptual
+    return prepared, prepared_mime, perceptual
+
+
+def _perceptual_hash(image) -> PerceptualHash:
+    from PIL import Image
+
+    gray = image.convert("L")
+    thumbnail = gray.resize((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.Resampling.LANCZOS)
+    return PerceptualHash(
+        dhash=_difference_hash(gray),
+        aspect=image.width / max(1, image.height),
+        thumbnail=thumbnail.tobytes(),
+    )
+
+
+def _difference_hash(image, size: int = 16) -> str:
+    """256-bit difference hash: stable across re-encoding and resizing."""
+    from PIL import Image
+
+    gray = image.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS)
+    pixels = list(gray.getdata())
+    bits = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return f"{bits:0{size * size // 4}x}"
+
+
+async def prepare_image(data: bytes, mime_type: str, detail_level: str) -> Tuple[bytes, str, Optional[PerceptualHash]]:
+    """
+    Downscale/re-encode an image for the vision model, off the event loop.
+
+    Args:
+        data: Image bytes
+        mime_type: Image MIME type
+        detail_level: 'low', 'standard' or 'high' (sets the max side)
+
+    Returns:
+        (bytes to send, their MIME type, perceptual hash or None)
+    """
+    max_side = MAX_SIDE_BY_DETAIL.get(detail_level, MAX_SIDE_BY_DETAIL["standard"])
+    return await asyncio.to_thread(_prepare_image_sync, data, mime_type, max_side)
+
+
+class DescriptionCache:
+    """Image descriptions, LRU in memory and shared through Redis."""
+
+    def __init__(
+        self,
+        redis=None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[int] = None,
+        use_redis: Optional[bool] = None,
+    ):
+        """
+        Args:
+            redis: Async Redis client (default: luka_agent.core.loader.redis_client, if available)
+            max_entries: In-memory entries (settings if None)
+            ttl: Entry lifetime in seconds (settings if None)
+            use_redis: Share entries through Redis (settings if None)
+        """
+        if use_redis is None:
+            use_redis = _setting("LUKA_IMAGE_CACHE_REDIS", True)
+        self._redis = redis if use_redis else None
+        self._redis_resolved = redis is not None or not use_redis
+        self.max_entries = max_entries or _setting("LUKA_IMAGE_CACHE_MAX_ENTRIES", DEFAULT_CACHE_MAX_ENTRIES)
+        self.ttl = ttl or _setting("LUKA_IMAGE_CACHE_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Perceptual hits rejected because the images differ
+        self.rejected = 0
+
+    def _get_redis(self):
+        if not self._redis_resolved:
+            self._redis_resolved = True
+            try:
+                from luka_agent.core.loader import redis_client
+                self._redis = redis_client
+            except Exception as exc:  # pragma: no cover - redis optional
+                logger.debug(f"Image description cache running without Redis: {exc}")
+        return self._redis
+
+    @staticmethod
+    def make_key(image_hash: str, detail_level: str, prompt: str, model: str) -> str:
+        prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()[:16]
+        return f"{REDIS_KEY_PREFIX}:{model}:{detail_level}:{prompt_hash}:{image_hash}"
+
+    async def get(self, keys: List[str]) -> Optional[str]:
+        """Return the first cached description among `keys`."""
+        description = await self._lookup(keys)
+        if description is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return description
+
+    async def get_similar(self, key: str, perceptual: PerceptualHash) -> Optional[str]:
+        """Return the description stored under a perceptual key, if it was stored for this image."""
+        stored = await self._lookup([key])
+        if stored is not None:
+            encoded, _, description = stored.partition("\n")
+            if perceptual.matches(encoded):
+                self.hits += 1
+                return description
+            self.rejected += 1
+        self.misses += 1
+        return None
+
+    async def set_similar(self, key: str, perceptual: PerceptualHash, description: str) -> None:
+        """Store a description under a perceptual key, with the image's thumbnail to confirm hits."""
+        await self.set([key], f"{perceptual.encode()}\n{description}")
+
+    async def _lookup(self, keys: List[str]) -> Optional[str]:
+        now = time.monotonic()
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                values = await redis.mget(keys)
+            except Exception as exc:  # pragma: no cover - redis optional
+                logger.debug(f"Skipping Redis image description cache: {exc}")
+                self._redis = None
+                values = []
+            for key, value in zip(keys, values):
+                if value:
+                    description = value.decode() if isinstance(value, bytes) else value
+                    self._remember(key, description)
+                    return description
+        return None
+
+    async def set(self, keys: List[str], description: str) -> None:
+        """Store a description under every key."""
+        for key in keys:
+            self._remember(key, description)
+
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                pipe = redis.pipeline()
+                for key in keys:
+                    pipe.set(key, description, ex=int(self.ttl))
+                await pipe.execute()
+            except Exception as exc:  # pragma: no cover - redis optional
+                logger.debug(f"Skipping Redis image description cache: {exc}")
+                self._redis = None
+
+    def _remember(self, key: str, description: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, description)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_description_cache: Optional[DescriptionCache] = None
+
+
+def get_description_cache() -> DescriptionCache:
+    """Get the shared DescriptionCache instance."""
+    global _description_cache
+    if _description_cache is None:
+        _description_cache = DescriptionCache()
+    return _description_cache
+
+
+__all__ = [
+    "ImageFetchError",
+    "FetchedImage",
+    "PerceptualHash",
+    "fetch_image",
+    "prepare_image",
+    "sniff_mime_type",
+    "DescriptionCache",
+    "get_description_cache",
+]
@@ -3,9 +3,12 @@ Workflow context service for Luka bot.
 Provides rich workflow summaries and step guidance for dialog agents.
 """
 
-from typing import Dict, Optional
+import dataclasses
+from typing import Dict, Optional, Tuple
 from loguru import logger
 
+from luka_agent.sub_agents.loader import get_sub_agent_loader
+from luka_agent.sub_agents.router import IntentDocument, IntentRouter
 from luka_agent.tools.sub_agent.discovery_service import (
     WorkflowDiscoveryService,
     WorkflowDefinition,
@@ -19,6 +22,8 @@ class WorkflowContextService:
     def __init__(self, discovery_service: Optional[WorkflowDiscoveryService] = None):
         self._discovery_service = discovery_service or get_workflow_discovery_service()
         self._context_cache: Dict[str, str] = {}
+        self._intent_router: Optional[IntentRouter] = None
+        self._intent_router_key: Optional[Tuple] = None
 
     async def ensure_discovery_initialized(self) -> None:
         """Initialize discovery service if not already run."""
@@ -108,7 +113,7 @@ class WorkflowContextService:
         return "\n".join(summary_parts)
 
     async def get_workflow_for_user_intent(self, user_query: str) -> Optional[str]:
-        """Suggest workflow based on user query/intent."""
+        """Suggest workflow based on user query/intent (sub-agent intent router, no LLM call)."""
         if not self._discovery_service:
             return None
 
@@ -118,29 +123,48 @@ class WorkflowContextService:
         if not workflows:
             return None
 
-        query_lower = user_query.lower()
-        workflow_keywords = {
-            "development": ["develop", "project", "plan", "architecture", "code", "programming", "software"],
-            "psychology": ["reflect", "goal", "personal", "growth", "therapy", "coaching", "values"],
-            "defi_onboarding": ["defi", "wallet", "crypto", "dex", "onboard"],
-        }
-
-        best_match = None
-        best_score = 0
-
-        for domain, keywords in workflow_keywords.items():
-            if domain not in workflows:
-                continue
-            score = sum(1 for keyword in keywords if keyword in query_lower)
-            if score > best_score:
-                best_score = score
-                best_match = domain
-
+        best_match = self._get_intent_router(workflows).best_match(user_query)
         if best_match:
-            return await self.get_workflow_context(best_match, include_documentation=True)
+            logger.debug(f"🧭 Routed intent to '{best_match.agent_id}' (confidence {best_match.confidence:.2f})")
+            return await self.get_workflow_context(best_match.agent_id, include_documentation=True)
 
         return None
 
+    def _get_intent_router(self, workflows: Dict[str, WorkflowDefinition]) -> IntentRouter:
+        """Intent index over the discovered workflows, rebuilt when they or sub-agent configs change."""
+        loader = get_sub_agent_loader()
+        loader.list_available_agents()  # reloads changed sub-agent configs
+
+        key = (tuple(sorted(workflows)), id(loader), loader.generation)
+        if self._intent_router is None or self._intent_router_key != key:
+            documents = []
+            for domain, workflow in workflows.items():
+                try:
+                    # Sub-agent configs carry intent_triggers and menus
+                    document = IntentDocument.from_config(loader.load(domain))
+                    documents.append(dataclasses.replace(document, agent_id=domain))
+                except Exception:
+                    documents.append(self._workflow_intent_document(domain, workflow))
+            self._intent_router = IntentRouter(documents)
+            self._intent_router_key = key
+
+        return self._intent_router
+
+    @staticmethod
+    def _workflow_intent_document(domain: str, workflow: WorkflowDefinition) -> IntentDocument:
+        metadata = workflow.metadata
+        steps = workflow.tool_chain.get("steps", [])
+        return IntentDocument(
+            agent_id=domain,
+            triggers=[t for t in metadata.get("intent_triggers", []) if isinstance(t, str)],
+            names=[workflow.name, domain.replace("_", " ")],
+            texts=[
+                workflow.description,
+                *(c for c in metadata.get("entry_conditions", []) if isinstance(c, str)),
+                *(step.get("name", "") for step in steps if isinstance(step, dict)),
+            ],
+        )
+
     def clear_cache(self) -> None:
         """Clear the context cache."""
         self._context_cache.clear()
@@ -157,10 +157,17 @@ async def suggest_sub_agent_impl(user_query: str) -> str:
     except (ImportError, Exception) as exc:
         logger.debug(f"luka_bot service not available, using standalone mode: {exc}")
 
-    # Step 2: Fallback to standalone mode (just list available sub-agents)
+    # Step 2: Fallback to standalone mode (intent router over SubAgentLoader configs)
     try:
+        from luka_agent.sub_agents.router import get_intent_router
+
+        best_match = get_intent_router().best_match(user_query)
+        if best_match:
+            details = await get_sub_agent_details_impl(best_match.agent_id, include_full_documentation=False)
+            return f"Based on your query, I recommend this sub-agent:\n\n{details}"
+
         all_agents = await get_available_sub_agents_impl()
-        return f"Here are the available sub-agents (intent matching not available in standalone mode):\n\n{all_agents}"
+        return f"I couldn't find a perfect match. Here are available sub-agents:\n\n{all_agents}"
 
     except Exception as exc:
         logger.error(f"Error suggesting sub-agent for query '{user_query}': {exc}")
@@ -454,6 +461,8 @@ def create_sub_agent_tools(
                 "a structured process or guided experience."
             ),
             args_schema=ExecuteSubAgentInput,
+            # Switches the thread's active sub-agent: never run alongside other tools
+            metadata={"serial_only": True},
             func=lambda domain: execute_sub_agent_impl(
                 domain=domain,
                 user_id=user_id,
@@ -7,6 +7,7 @@ from loguru import logger
 # luka_bot core
 from luka_bot.core.config import settings
 from luka_bot.core.loader import app, bot, dp
+from luka_bot.utils.log_budget import setup_logging
 
 # handlers
 from luka_bot.handlers import get_llm_bot_router
@@ -265,7 +266,10 @@ async def on_startup() -> None:
             logger.info("")
             logger.info("🔌 WebSocket Task Notifications:")
             logger.info(f"   Warehouse URL: {settings.WAREHOUSE_WS_URL}")
-            logger.info("   Per-user connections will be established on first interaction")
+            if settings.WAREHOUSE_WS_MULTIPLEXED:
+                logger.info(f"   Multiplexed: {settings.WAREHOUSE_WS_POOL_SIZE} shared connection(s), users subscribe on first interaction")
+            else:
+                logger.info("   Per-user connections will be established on first interaction")
             logger.info("   Real-time task notifications enabled ✅")
             
         except Exception as e:
@@ -276,6 +280,14 @@ async def on_startup() -> None:
         logger.info("ℹ️  WebSocket disabled (WAREHOUSE_ENABLED=False)")
         logger.info("   Using polling mode for task detection")
     
+    # Background job queue (thread naming, conversation summaries, group welcome and tagline)
+    if settings.JOB_QUEUE_ENABLED:
+        try:
+            from luka_bot.services.job_queue import get_job_queue
+            await get_job_queue().start()
+        except Exception as e:
+            logger.warning(f"⚠️  Job queue failed to start, running jobs in-process: {e}")
+    
     # Log metrics availability summary
     if settings.METRICS_ENABLED:
         logger.info("")
@@ -296,6 +308,13 @@ async def on_shutdown() -> None:
     """Bot shutdown cleanup."""
     logger.info("🛑 luka_bot stopping...")
     
+    # Stop taking queued jobs (unfinished ones are reclaimed by another replica or on restart)
+    try:
+        from luka_bot.services.job_queue import get_job_queue
+        await get_job_queue().stop()
+    except Exception as e:
+        logger.warning(f"⚠️ Error stopping job queue: {e}")
+    
     # Cancel all background tasks (Moderation)
     try:
         from luka_bot.utils.background_tasks import cancel_all_background_tasks
@@ -312,6 +331,14 @@ async def on_shutdown() -> None:
         except Exception as e:
             logger.warning(f"⚠️  Error shutting down WebSocket manager: {e}")
     
+    # Close the shared Camunda connection pool (if the service was used)
+    from luka_bot.services.camunda_service import CamundaService
+    if CamundaService._instance is not None:
+        try:
+            await CamundaService._instance.close_all_clients()
+        except Exception as e:
+            logger.warning(f"⚠️  Error closing Camunda clients: {e}")
+    
     # Stop metrics server (polling mode only)
     await stop_metrics_server()
     
@@ -331,6 +358,8 @@ async def on_shutdown() -> None:
     await dp.fsm.storage.close()
     
     logger.info("✅ luka_bot stopped")
+    # Flush lines still queued for loguru's writer thread
+    await logger.complete()
 
 
 async def setup_webhook() -> None:
@@ -416,6 +445,12 @@ async def setup_webhook() -> None:
 
 async def main() -> None:
     """Main entry point."""
+    setup_logging(
+        level=settings.LOG_LEVEL,
+        log_format=settings.LOG_FORMAT,
+        enqueue=settings.LOG_ENQUEUE,
+        hot_path_debug=settings.LOG_HOT_PATH_DEBUG,
+    )
     # Register startup/shutdown handlers
     dp.startup.register(on_startup)
     dp.shutdown.register(on_shutdown)
@@ -23,7 +23,7 @@ async def get_language_instruction_for_user(user_id: int) -> str:
         # Get user language from profile service
         profile = await UserProfileService.get_user_profile(user_id)
         language_code = profile.language if profile else "en"
-        logger.info(f"🌐 User {user_id} language preference: {language_code}")
+        logger.debug("🌐 User {} language preference: {}", user_id, language_code)
         
         if language_code == 'ru':
             return "\n\n**IMPORTANT LANGUAGE INSTRUCTION**: Always respond in Russian language (русский язык). Use Russian for all your responses unless the user explicitly requests another language. Note: This instruction applies only to your response language, not to content retrieval (e.g., YouTube captions should still prefer English by default)."
@@ -240,7 +240,7 @@ Only add date filters when user says: "last week", "yesterday", "in March", etc.
 
 async def create_static_agent_with_basic_tools(user_id: int) -> Agent:
     """Create a fast agent with only static tools (no dynamic task tools)."""
-    logger.info("Creating static agent with basic tools for immediate response")
+    logger.debug("Creating static agent with basic tools for immediate response")
     
     # Create model with automatic provider fallback (Ollama → OpenAI)
     try:
@@ -295,7 +295,7 @@ async def create_static_agent_with_basic_tools(user_id: int) -> Agent:
     ]
     
     # Minimal default agent with KB search + support only
-    logger.info(f"Creating MINIMAL DEFAULT agent with {len(static_tools)} tools (KB search + support only)")
+    logger.debug("Creating MINIMAL DEFAULT agent with {} tools (KB search + support only)", len(static_tools))
     
     # Create agent WITH tools
     try:
@@ -307,7 +307,7 @@ async def create_static_agent_with_basic_tools(user_id: int) -> Agent:
             end_strategy='exhaustive',  # Allow both text and tool execution
             retries=0  # Disable automatic retries to prevent duplicate tool calls
         )
-        logger.info("Agent created successfully with tools")
+        logger.debug("Agent created successfully with tools")
     except Exception as e:
         logger.warning(f"Agent creation with tools failed: {e}")
         # Fallback: create agent without tools
@@ -320,7 +320,7 @@ async def create_static_agent_with_basic_tools(user_id: int) -> Agent:
         )
         logger.info("Created fallback agent without tools")
     
-    logger.info("Static agent created successfully")
+    logger.debug("Static agent created successfully")
     return agent
 
 async def create_agent_with_user_tasks(ctx: ConversationContext) -> Agent:
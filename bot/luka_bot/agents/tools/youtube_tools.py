@@ -7,7 +7,6 @@ from loguru import logger
 from luka_bot.agents.context import ConversationContext
 from luka_bot.core.config import settings  # added
 
-from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import (
 	TranscriptsDisabled,
 	NoTranscriptFound,
@@ -17,8 +16,7 @@ from youtube_transcript_api._errors import (
 )
 
 
-from googleapiclient.discovery import build
-google_client_available = True
+from luka_bot.services.youtube_transcript_service import get_youtube_transcript_service
 
 
 def _extract_video_id(video_url: str) -> Optional[str]:
@@ -38,31 +36,6 @@ def _extract_video_id(video_url: str) -> Optional[str]:
 		return None
 
 
-def _get_video_info(video_id: str) -> Optional[dict]:
-	"""Fetch video metadata using YouTube Data API if API key is configured."""
-	api_key = getattr(settings, 'YOUTUBE_API_KEY', None)
-	if not api_key or not google_client_available:
-		return None
-	try:
-		youtube = build('youtube', 'v3', developerKey=api_key)
-		resp = youtube.videos().list(part='snippet,contentDetails', id=video_id).execute()
-		items = resp.get('items') or []
-		if not items:
-			return None
-		item = items[0]
-		snippet = item.get('snippet', {})
-		cd = item.get('contentDetails', {})
-		return {
-			'title': snippet.get('title', ''),
-			'channel_title': snippet.get('channelTitle', ''),
-			'published_at': snippet.get('publishedAt', ''),
-			'duration': cd.get('duration', ''),
-		}
-	except Exception as e:
-		logger.warning(f"YouTube API get_video_info failed: {e}")
-		return None
-
-
 async def get_youtube_transcript(
 	ctx: ConversationContext,
 	video_url: str = Field(description="YouTube video URL to get transcript from"),
@@ -89,74 +62,14 @@ async def get_youtube_transcript(
 		if not video_id:
 			return _("youtube.error_invalid_url", user_lang)
 		
-		# Optionally fetch video info (title, channel, published, duration)
-		video_info = _get_video_info(video_id)
-		
-		languages_order = [language] if language else []
-		if 'en' not in languages_order:
-			languages_order.append('en')
-		for code in ['en-US', 'en-GB']:
-			if code not in languages_order:
-				languages_order.append(code)
-		
-		segments = None
-		last_error: Optional[str] = None
-		api = YouTubeTranscriptApi()
-		
-		# Preferred: list transcripts and fetch
-		try:
-			try:
-				transcript_list_obj = api.list_transcripts(video_id)  # newer API
-			except AttributeError:
-				transcript_list_obj = api.list(video_id)  # older API fallback
-			
-			transcript = None
-			# Try manual first
-			try:
-				transcript = transcript_list_obj.find_manually_created_transcript(languages_order)
-			except Exception:
-				pass
-			# Then generated
-			if not transcript:
-				try:
-					transcript = transcript_list_obj.find_generated_transcript(languages_order)
-				except Exception:
-					pass
-			# Then any preferred
-			if not transcript:
-				try:
-					transcript = transcript_list_obj.find_transcript(languages_order)
-				except Exception:
-					pass
-			# Fetch content
-			if transcript:
-				segments = transcript.fetch()
-		except Exception as e:
-			last_error = f"list/fetch failed: {e}"
-			# Fallback to direct fetch
-			try:
-				segments = api.fetch(video_id, languages=languages_order)
-			except Exception as ee:
-				last_error = f"direct fetch failed: {ee}"
-				segments = None
-		
-		if not segments:
-			logger.info(f"YouTube transcript not available for {video_id}: {last_error}")
+		# Transcript and video info (title, channel, published, duration) are
+		# fetched off the event loop and cached per video
+		transcript = await get_youtube_transcript_service().get_transcript(video_id, language)
+		if transcript is None:
 			return _("youtube.error_not_available", user_lang)
 		
-		# Concatenate segments
-		if isinstance(segments, list):
-			text = " ".join(s.get('text', '') for s in segments if isinstance(s, dict) and s.get('text'))
-		else:
-			# Some implementations return iterable custom objects
-			parts = []
-			for s in segments:
-				try:
-					parts.append(getattr(s, 'text', '') or '')
-				except Exception:
-					continue
-			text = " ".join(p for p in parts if p)
-		text = ' '.join(text.split())
+		video_info = transcript.video_info
+		text = transcript.text
 		
 		if not text:
 			return _("youtube.error_empty", user_lang)
@@ -165,6 +78,7 @@ async def get_youtube_transcript(
 		# The full transcript will be available in ctx.metadata['youtube_full_transcript']
 		# and should be stored as a system/assistant message in thread history by the caller
 		ctx.metadata['youtube_full_transcript'] = text
+		ctx.metadata['youtube_transcript_chunks'] = transcript.chunks
 		ctx.metadata['youtube_video_id'] = video_id
 		if video_info:
 			ctx.metadata['youtube_video_info'] = video_info
@@ -65,6 +65,18 @@ class CamundaSettings(EnvBaseSettings):
     CAMUNDA_MESSAGE_CORRELATION_ENABLED: bool = True
     CAMUNDA_TIMEOUT: int = 30
 
+    # Shared engine connection pool (all users) and per-user client/credential cache
+    CAMUNDA_MAX_CONNECTIONS: int = 20
+    CAMUNDA_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    CAMUNDA_USER_CACHE_SIZE: int = 1000
+
+    # Read-through cache TTLs in seconds (0 disables caching for that endpoint)
+    CAMUNDA_CACHE_TASKS_TTL: float = 5.0
+    CAMUNDA_CACHE_TASK_VARIABLES_TTL: float = 30.0
+    CAMUNDA_CACHE_DEFINITION_TTL: float = 300.0
+    CAMUNDA_CACHE_START_FORM_TTL: float = 300.0
+    CAMUNDA_CACHE_MAX_ENTRIES: int = 10000
+
 
 class S3Settings(EnvBaseSettings):
     """
@@ -253,6 +265,17 @@ IMPORTANT: The user prefers to communicate in {language}. Please respond in {lan
     # YouTube Tool Configuration (Phase 4+)
     YOUTUBE_API_KEY: str | None = None  # Set via env: YOUTUBE_API_KEY=...
     YOUTUBE_TRANSCRIPT_ENABLED: bool = True  # Enable YouTube transcript tool
+    YOUTUBE_FETCH_WORKERS: int = 4  # Thread pool for blocking YouTube API calls
+    YOUTUBE_FETCH_TIMEOUT_SECONDS: float = 20.0  # Per fetch (transcript or metadata)
+    YOUTUBE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # Transcript/metadata cache in Redis
+    YOUTUBE_TRANSCRIPT_CHUNK_CHARS: int = 4000  # Pre-chunk size for summarization
+    
+    # Background job queue (Redis Streams) for LLM side-work
+    JOB_QUEUE_ENABLED: bool = True  # False = run jobs in-process as plain background tasks
+    JOB_QUEUE_CONCURRENCY: dict[str, int] = {"high": 4, "normal": 2, "low": 1}  # Running jobs per priority class
+    JOB_QUEUE_CLAIM_IDLE_SECONDS: float = 300.0  # Reclaim jobs left pending by a dead replica after this
+    JOB_QUEUE_RETRY_BACKOFF_SECONDS: float = 5.0  # First retry delay, doubled per attempt
+    JOB_QUEUE_FOREGROUND_MAX_DEFER_SECONDS: float = 30.0  # Max wait of normal/low jobs for user replies
     
     # Legacy KB Settings (kept for backward compatibility)
     ELASTICSEARCH_INDEX: str = "knowledge_base"
@@ -294,6 +317,16 @@ class MetricsSettings(EnvBaseSettings):
     METRICS_HOST: str = "0.0.0.0"
 
 
+class LoggingSettings(EnvBaseSettings):
+    """Loguru sink settings (see luka_bot/utils/log_budget.py)."""
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # "text" or "json"
+    # Write log lines on loguru's worker thread instead of the event loop
+    LOG_ENQUEUE: bool = True
+    # Per-chunk / per-step DEBUG logging in streaming code (hot.debug); off = no-op
+    LOG_HOT_PATH_DEBUG: bool = False
+
+
 class WarehouseSettings(EnvBaseSettings):
     """Warehouse API settings for task event subscriptions via WebSocket."""
     WAREHOUSE_API_URL: str = "http://localhost:8001"
@@ -305,6 +338,14 @@ class WarehouseSettings(EnvBaseSettings):
     WAREHOUSE_WS_HEARTBEAT_INTERVAL: int = 30  # Ping interval in seconds
     WAREHOUSE_WS_RECONNECT_DELAY: int = 5  # Initial reconnect delay in seconds
     WAREHOUSE_WS_MAX_RECONNECT_ATTEMPTS: int = -1  # -1 = infinite reconnection attempts
+    
+    # Multiplexed task events: a small pool of service-authenticated sockets with
+    # per-user subscribe frames instead of one socket per user (server must support
+    # it and acknowledge subscribe frames; unacknowledged users fall back to polling)
+    WAREHOUSE_WS_MULTIPLEXED: bool = False
+    WAREHOUSE_WS_POOL_SIZE: int = 2  # Sockets per bot replica; users are sharded across them
+    WAREHOUSE_WS_SERVICE_TOKEN: str = ""  # Bearer token for the pool (falls back to FLOW_API_SYS_KEY)
+    WAREHOUSE_WS_MAX_RECONNECT_DELAY: int = 60  # Cap for jittered reconnect backoff in seconds
 
 
 class AGUISettings(EnvBaseSettings):
@@ -362,6 +403,7 @@ class Settings(
     FlowAPISettings,
     WebhookSettings,
     MetricsSettings,
+    LoggingSettings,
     WarehouseSettings,
     AGUISettings,
 ):
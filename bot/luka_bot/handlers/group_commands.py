@@ -45,7 +45,7 @@ async def handle_help_in_group(message: Message):
         
         from luka_bot.services.moderation_service import get_moderation_service
         from luka_bot.services.elasticsearch_service import get_elasticsearch_service
-        from luka_bot.services.group_description_generator import generate_group_description
+        from luka_bot.services.group_description_generator import get_placeholder_description
         
         moderation_service = await get_moderation_service()
         settings_obj = await moderation_service.get_group_settings(group_id)
@@ -63,25 +63,18 @@ async def handle_help_in_group(message: Message):
         elif settings_obj and settings_obj.generated_tagline:
             description = settings_obj.generated_tagline
         else:
-            # Generate new description
+            # Show a placeholder now; the tagline is generated in the background
+            # and shown from the next /help on
             metadata_dict = {
                 "description": metadata.description,
                 "member_count": metadata.total_member_count,
                 "message_count": metadata.total_messages_received,
                 "group_type": metadata.group_type,
             }
-            description = await generate_group_description(
-                group_title,
-                metadata_dict,
-                language
-            )
-            
-            # Cache it
+            description = get_placeholder_description(metadata_dict, language)
             if settings_obj:
-                settings_obj.generated_tagline = description
-                from datetime import datetime
-                settings_obj.generated_tagline_updated = datetime.utcnow()
-                await moderation_service.save_group_settings(settings_obj)
+                from luka_bot.services.background_jobs import enqueue_group_tagline
+                await enqueue_group_tagline(group_id, group_title, metadata_dict, language)
         
         # ===================================================================
         # 2. GROUP STATISTICS (Same format as stats page)
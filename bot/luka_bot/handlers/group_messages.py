@@ -23,9 +23,13 @@ from luka_bot.utils.content_detection import (
     is_service_message
 )
 from luka_bot.core.config import settings
+from luka_bot.utils.log_budget import log_sampled
 
 router = Router()
 
+# Per-message INFO lines are logged for one message out of this many
+MESSAGE_LOG_SAMPLE_EVERY = 50
+
 
 @router.my_chat_member(ChatMemberUpdatedFilter(IS_NOT_MEMBER >> IS_MEMBER))
 async def handle_bot_added_to_group(event: ChatMemberUpdated) -> None:
@@ -168,9 +172,6 @@ async def handle_bot_added_to_group(event: ChatMemberUpdated) -> None:
         # Get LLM-generated personalized welcome ONLY if AI assistant is enabled AND silent mode is OFF
         if not silent_mode and group_settings.ai_assistant_enabled:
             try:
-                from luka_bot.services.llm_service import get_llm_service
-                llm_service = get_llm_service()
-                
                 # Create a prompt for the LLM using bot personality from settings
                 # Include language instruction based on group settings
                 language_instruction = ""
@@ -187,44 +188,18 @@ Write a SHORT (2-3 sentences max), friendly welcome message that:
 
 Be conversational, brief, and friendly. No bullet points or technical details.{language_instruction}"""
                 
-                # Generate welcome from LLM (simple request, no streaming needed)
-                from luka_bot.agents.context import ConversationContext
-                
-                # Create minimal context for welcome message
-                ctx = ConversationContext(
-                    user_id=user_id,
+                # Generated and sent by a background job (the handler doesn't wait on the LLM)
+                from luka_bot.services.background_jobs import enqueue_group_welcome
+                await enqueue_group_welcome(
+                    group_id,
+                    user_id,
+                    llm_prompt,
                     thread_id=thread.thread_id,
-                    thread_knowledge_bases=thread.knowledge_bases
+                    knowledge_bases=thread.knowledge_bases,
                 )
                 
-                # Get agent and generate response
-                from luka_bot.agents.agent_factory import create_static_agent_with_basic_tools
-                agent = await create_static_agent_with_basic_tools(user_id)
-                
-                result = await agent.run(llm_prompt, deps=ctx)
-                
-                # Extract text from AgentRunResult properly
-                if hasattr(result, 'data'):
-                    llm_welcome = str(result.data)
-                elif hasattr(result, 'output'):
-                    llm_welcome = str(result.output)
-                else:
-                    llm_welcome = str(result)
-                
-                # Clean up the text (remove AgentRunResult wrapper if present)
-                if llm_welcome.startswith("AgentRunResult("):
-                    import re
-                    match = re.search(r"output='([^']*(?:\\.[^']*)*)'", llm_welcome)
-                    if match:
-                        llm_welcome = match.group(1).replace("\\'", "'").replace("\\n", "\n")
-                
-                # Send LLM-generated welcome (just the message, no prefix)
-                await event.answer(llm_welcome, parse_mode="HTML")
-                
-                logger.info(f"✅ Sent AI-generated welcome to group {group_id}")
-                
             except Exception as e:
-                logger.warning(f"⚠️  Failed to generate LLM welcome: {e}")
+                logger.warning(f"⚠️  Failed to queue LLM welcome: {e}")
                 # Non-critical, continue without LLM welcome
         else:
             logger.info(f"ℹ️ Skipped AI welcome for group {group_id} (AI assistant disabled in settings)")
@@ -679,13 +654,9 @@ async def handle_group_message(message: Message) -> None:
                 else:
                     logger.info(f"🔇 Silent mode ON - skipping welcome message for auto-init group {group_id}")
                 
-                # Try to get LLM welcome (non-blocking, only if silent mode is OFF)
+                # Queue LLM welcome (non-blocking, only if silent mode is OFF)
                 if not silent_mode:
                     try:
-                        from luka_bot.services.llm_service import get_llm_service
-                        from luka_bot.agents.context import ConversationContext
-                        from luka_bot.agents.agent_factory import create_static_agent_with_basic_tools
-                        
                         # Include language instruction based on group settings
                         language_instruction = ""
                         if group_language == "ru":
@@ -701,37 +672,11 @@ Write a SHORT (2-3 sentences max), friendly welcome message that:
 
 Be conversational, brief, and friendly. No bullet points or technical details.{language_instruction}"""
                         
-                        ctx = ConversationContext(
-                            user_id=user_id,
-                            thread_id=None,
-                            thread_knowledge_bases=[kb_index]
-                        )
-                        
-                        agent = await create_static_agent_with_basic_tools(user_id)
-                        result = await agent.run(llm_prompt, deps=ctx)
-                        
-                        # Extract text from AgentRunResult properly
-                        if hasattr(result, 'data'):
-                            llm_welcome = str(result.data)
-                        elif hasattr(result, 'output'):
-                            llm_welcome = str(result.output)
-                        else:
-                            llm_welcome = str(result)
-                        
-                        # Clean up the text (remove AgentRunResult wrapper if present)
-                        if llm_welcome.startswith("AgentRunResult("):
-                            # Extract just the output text
-                            import re
-                            match = re.search(r"output='([^']*(?:\\.[^']*)*)'", llm_welcome)
-                            if match:
-                                llm_welcome = match.group(1).replace("\\'", "'").replace("\\n", "\n")
-                        
-                        # Send LLM welcome directly without prefix
-                        await message.answer(llm_welcome, parse_mode="HTML")
-                        logger.info(f"✅ Sent AI welcome for auto-initialized group {group_id}")
+                        from luka_bot.services.background_jobs import enqueue_group_welcome
+                        await enqueue_group_welcome(group_id, user_id, llm_prompt, knowledge_bases=[kb_index])
                         
                     except Exception as e:
-                        logger.warning(f"⚠️  Failed to generate LLM welcome: {e}")
+                        logger.warning(f"⚠️  Failed to queue LLM welcome: {e}")
                 
                 # Note: Admin controls are available via /groups command
                 logger.info(f"✅ Auto-initialization complete for group {group_id}")
@@ -900,7 +845,11 @@ Keep it brief and professional."""
         
         # Debug logging for bot info
         logger.debug(f"🔍 Bot info: ID={bot_info.id}, username=@{bot_username}, first_name={bot_info.first_name}")
-        logger.info(f"🔍 GROUP_MESSAGES handler processing: chat_id={message.chat.id}, chat_type={message.chat.type}, text='{message_text[:50]}...'")
+        log_sampled(
+            "INFO", MESSAGE_LOG_SAMPLE_EVERY,
+            "🔍 GROUP_MESSAGES handler processing: chat_id={}, chat_type={}, text='{}...'",
+            message.chat.id, message.chat.type, message_text[:50],
+        )
 
         is_mentioned = False
         is_reply_to_bot = False
@@ -948,13 +897,12 @@ Keep it brief and professional."""
             if "@" in message_text:
                 logger.debug(f"🔍 Message contains @ but no bot mention found. Bot username: @{bot_username}")
         
-        # Enhanced debug logging for mention detection
-        logger.info(f"🔍 Group {group_id} message analysis:")
-        logger.info(f"  - Message: '{message_text[:50]}...'")
-        logger.info(f"  - Bot username: @{bot_username}")
-        logger.info(f"  - Is mentioned: {is_mentioned}")
-        logger.info(f"  - Is reply to bot: {is_reply_to_bot}")
-        logger.info(f"  - Entities: {[e.type for e in (message.entities or [])]}")
+        # Mention detection result (mentions and replies are also logged below when handled)
+        log_sampled(
+            "INFO", MESSAGE_LOG_SAMPLE_EVERY,
+            "🔍 Group {} message analysis: bot=@{}, mentioned={}, reply_to_bot={}, entities={}",
+            group_id, bot_username, is_mentioned, is_reply_to_bot, [e.type for e in (message.entities or [])],
+        )
         
         # Additional safety check: Only respond if we have a valid bot username
         if (is_mentioned or is_reply_to_bot) and not bot_username:
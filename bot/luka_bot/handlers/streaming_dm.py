@@ -27,7 +27,7 @@ from luka_bot.services.group_thread_service import get_group_thread_service
 from luka_bot.services.llm_service import get_llm_service
 from luka_bot.services.message_state_service import get_message_state_service
 from luka_bot.services.messaging_service import edit_and_send_parts
-from luka_bot.services.thread_name_generator import generate_thread_name
+from luka_bot.services.background_jobs import enqueue_thread_name
 from luka_bot.services.thread_service import get_thread_service
 from luka_bot.services.user_profile_service import get_user_profile_service
 from luka_bot.utils.formatting import escape_html
@@ -588,19 +588,14 @@ async def handle_streaming_message(message: Message, state: FSMContext) -> None:
         # FIX 4: Generate thread name AFTER streaming completes (for first messages)
         # This avoids interference with the LLM streaming process
         # Note: We check the thread name instead of FSM state since state was cleared earlier
+        # Naming runs as a queued background job; the keyboard shows it on the next refresh
         try:
             thread = await thread_service.get_thread(thread_id)
             if thread and thread.name == "New Chat":
-                # Generate proper thread name from first message
-                thread_name = await generate_thread_name(text, language="en")
-                logger.info(f"📝 Generated thread name AFTER streaming: '{thread_name}' from '{text[:30]}...'")
-
-                # Update thread with real name
-                thread.name = thread_name
-                await thread_service.update_thread(thread)
-                logger.info(f"✅ Updated thread {thread_id} with generated name")
+                await enqueue_thread_name(thread_id, text, language="en")
+                logger.info(f"📝 Queued thread naming for {thread_id} from '{text[:30]}...'")
         except Exception as e:
-            logger.warning(f"⚠️  Failed to generate/update thread name: {e}")
+            logger.warning(f"⚠️  Failed to queue thread naming: {e}")
 
         # Update thread activity and keyboard
         try:
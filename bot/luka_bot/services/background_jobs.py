@@ -0,0 +1,164 @@
+"""
+Background LLM jobs run through the job queue.
+
+Each job re-reads what it needs (thread, messages) from storage, so payloads
+stay small and a retried or reclaimed job sees current data.
+
+- thread_name: name a "New Chat" thread from its first message
+- conversation_summary: refresh a thread's rolling conversation summary
+- group_welcome: send the AI-written welcome after the bot joins a group
+- group_tagline: generate and store a group's /help tagline
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from luka_bot.services.job_queue import enqueue_job, job_handler
+
+DEFAULT_THREAD_NAME = "New Chat"
+
+
+@job_handler("thread_name", priority="normal", max_attempts=3, timeout=60.0)
+async def name_thread(payload: Dict[str, Any]) -> None:
+    from luka_bot.services.thread_name_generator import generate_thread_name
+    from luka_bot.services.thread_service import get_thread_service
+
+    thread_service = get_thread_service()
+    thread = await thread_service.get_thread(payload["thread_id"])
+    if not thread or thread.name != DEFAULT_THREAD_NAME:
+        return
+
+    thread_name = await generate_thread_name(payload["text"], language=payload.get("language", "en"))
+
+    # Re-read: the user may have renamed the thread meanwhile
+    thread = await thread_service.get_thread(payload["thread_id"])
+    if thread and thread.name == DEFAULT_THREAD_NAME:
+        thread.name = thread_name
+        await thread_service.update_thread(thread)
+        logger.info(f"📝 Named thread {thread.thread_id}: '{thread_name}'")
+
+
+@job_handler("conversation_summary", priority="low", max_attempts=2, timeout=180.0)
+async def update_conversation_summary(payload: Dict[str, Any]) -> None:
+    from luka_bot.services.conversation_summary_service import get_conversation_summary_service
+    from luka_bot.services.thread_service import get_thread_service
+
+    thread = await get_thread_service().get_thread(payload["thread_id"])
+    if not thread:
+        return
+
+    # Update summary if needed (will check interval internally)
+    new_summary = await get_conversation_summary_service().update_summary_if_needed(payload["user_id"], thread)
+    if new_summary:
+        logger.info(f"📝 Background job updated summary for thread {thread.thread_id}")
+
+
+@job_handler("group_welcome", priority="normal", max_attempts=2, timeout=120.0)
+async def send_group_welcome(payload: Dict[str, Any]) -> None:
+    from luka_bot.agents.agent_factory import create_static_agent_with_basic_tools
+    from luka_bot.agents.context import ConversationContext
+    from luka_bot.core.loader import bot
+
+    ctx = ConversationContext(
+        user_id=payload["user_id"],
+        thread_id=payload.get("thread_id"),
+        thread_knowledge_bases=payload.get("knowledge_bases") or [],
+    )
+    agent = await create_static_agent_with_basic_tools(payload["user_id"])
+    result = await agent.run(payload["prompt"], deps=ctx)
+
+    await bot.send_message(payload["chat_id"], _agent_output(result), parse_mode="HTML")
+    logger.info(f"✅ Sent AI-generated welcome to group {payload['chat_id']}")
+
+
+@job_handler("group_tagline", priority="low", max_attempts=2, timeout=60.0)
+async def generate_group_tagline(payload: Dict[str, Any]) -> None:
+    from datetime import datetime
+
+    from luka_bot.services.group_description_generator import generate_group_description
+    from luka_bot.services.moderation_service import get_moderation_service
+
+    moderation_service = await get_moderation_service()
+    settings_obj = await moderation_service.get_group_settings(payload["group_id"])
+    if not settings_obj or settings_obj.custom_description or settings_obj.generated_tagline:
+        return
+
+    tagline = await generate_group_description(
+        payload["group_title"], payload["metadata"], payload.get("language", "en")
+    )
+
+    # Re-read: an admin may have set a custom description meanwhile
+    settings_obj = await moderation_service.get_group_settings(payload["group_id"])
+    if settings_obj and not settings_obj.custom_description and not settings_obj.generated_tagline:
+        settings_obj.generated_tagline = tagline
+        settings_obj.generated_tagline_updated = datetime.utcnow()
+        await moderation_service.save_group_settings(settings_obj)
+        logger.info(f"📝 Stored tagline for group {payload['group_id']}")
+
+
+def _agent_output(result: Any) -> str:
+    """Text of an AgentRunResult (older pydantic-ai exposes `data`, newer `output`)."""
+    if hasattr(result, "data"):
+        text = str(result.data)
+    elif hasattr(result, "output"):
+        text = str(result.output)
+    else:
+        text = str(result)
+
+    # Clean up the text (remove AgentRunResult wrapper if present)
+    if text.startswith("AgentRunResult("):
+        match = re.search(r"output='([^']*(?:\\.[^']*)*)'", text)
+        if match:
+            text = match.group(1).replace("\\'", "'").replace("\\n", "\n")
+    return text
+
+
+async def enqueue_thread_name(thread_id: str, text: str, language: str = "en") -> Optional[str]:
+    """Queue naming a new thread (one pending job per thread)."""
+    return await enqueue_job(
+        "thread_name",
+        {"thread_id": thread_id, "text": text[:1000], "language": language},
+        dedupe_key=f"thread_name:{thread_id}",
+    )
+
+
+async def enqueue_conversation_summary(user_id: int, thread_id: str) -> Optional[str]:
+    """Queue a summary refresh (one pending job per thread)."""
+    return await enqueue_job(
+        "conversation_summary",
+        {"user_id": user_id, "thread_id": thread_id},
+        dedupe_key=f"conversation_summary:{thread_id}",
+    )
+
+
+async def enqueue_group_welcome(
+    chat_id: int,
+    user_id: int,
+    prompt: str,
+    thread_id: Optional[str] = None,
+    knowledge_bases: Optional[List[str]] = None,
+) -> Optional[str]:
+    """Queue the AI welcome for a group (one pending job per group)."""
+    return await enqueue_job(
+        "group_welcome",
+        {
+            "chat_id": chat_id,
+            "user_id": user_id,
+            "prompt": prompt,
+            "thread_id": thread_id,
+            "knowledge_bases": [kb for kb in knowledge_bases or [] if kb],
+        },
+        dedupe_key=f"group_welcome:{chat_id}",
+    )
+
+
+async def enqueue_group_tagline(
+    group_id: int, group_title: str, metadata: Dict[str, Any], language: str = "en"
+) -> Optional[str]:
+    """Queue tagline generation for a group's /help (one pending job per group)."""
+    return await enqueue_job(
+        "group_tagline",
+        {"group_id": group_id, "group_title": group_title, "metadata": metadata, "language": language},
+        dedupe_key=f"group_tagline:{group_id}",
+    )
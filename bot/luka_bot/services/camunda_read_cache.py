@@ -0,0 +1,123 @@
+"""
+Read-through cache for Camunda read APIs.
+
+Keyboards, task lists and form flows re-read the same Camunda data many
+times per interaction. This cache keeps results for a short, per-endpoint
+TTL and coalesces concurrent identical reads (single-flight), so N UI
+refreshes in flight cost one engine round trip.
+
+Keys are tuples whose first two items are `(endpoint, telegram_user_id)`,
+which lets writes and task events drop everything for one user/endpoint.
+"""
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from luka_bot.utils.single_flight import SingleFlight
+
+CacheKey = Tuple[Hashable, ...]
+
+
+class CamundaReadCache:
+    """
+    In-process TTL cache with single-flight loading.
+
+    Args:
+        max_entries: Upper bound on cached results; oldest entries are dropped first
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max(1, max_entries)
+        self._entries: Dict[CacheKey, Tuple[float, Any]] = {}
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(
+        self,
+        key: CacheKey,
+        ttl: float,
+        loader: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Return a cached value or load it once for all concurrent callers.
+
+        Args:
+            key: Cache key, `(endpoint, telegram_user_id, ...)`
+            ttl: Seconds to keep the loaded value (<= 0 disables caching)
+            loader: Coroutine factory fetching the value from Camunda
+            cache_if: Optional predicate; values failing it are returned but not stored
+
+        Returns:
+            The cached or freshly loaded value (errors propagate to every waiter)
+        """
+        if ttl <= 0:
+            return await loader()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self.hits += 1
+                return value
+            self._entries.pop(key, None)
+
+        async def load() -> Any:
+            self.misses += 1
+            return await loader()
+
+        def store(value: Any) -> None:
+            if cache_if is None or cache_if(value):
+                self._store(key, ttl, value)
+
+        # A write invalidating this key while loading detaches the load: it is
+        # served to its callers, but not stored
+        return await self._flight.do(key, load, on_loaded=store)
+
+    def _store(self, key: CacheKey, ttl: float, value: Any):
+        if len(self._entries) >= self.max_entries:
+            self._evict_expired()
+            while len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order: drop the oldest entry
+                self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + ttl, value)
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+
+    def invalidate(self, endpoint: Optional[str] = None, telegram_user_id: Optional[int] = None,
+                   *rest: Hashable):
+        """
+        Drop cached values (and detach in-flight loads) matching a key prefix.
+
+        `invalidate("tasks", 42)` drops every task list of user 42;
+        `invalidate(None, 42)` drops everything for user 42;
+        `invalidate("task_variables", 42, task_id)` drops one task's variables.
+        """
+        def matches(key: CacheKey) -> bool:
+            if endpoint is not None and key[0] != endpoint:
+                return False
+            if telegram_user_id is not None and key[1] != telegram_user_id:
+                return False
+            return key[2:2 + len(rest)] == rest
+
+        for key in [k for k in self._entries if matches(k)]:
+            del self._entries[key]
+        # In-flight loads started before the write must not repopulate the cache
+        self._flight.forget(matches)
+
+    def clear(self):
+        self._entries.clear()
+        self._flight.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self._flight.coalesced,
+        }
+
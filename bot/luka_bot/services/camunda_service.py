@@ -3,11 +3,13 @@ Camunda Engine integration service for luka_bot.
 Manages Camunda connections, process instances, and tasks.
 """
 import asyncio
+import json
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 from loguru import logger
 
-from camunda_client.clients.engine.client import CamundaEngineClient
+from camunda_client.clients.engine.client import CamundaEngineClient, create_shared_http_client
 from camunda_client.clients.dto import AuthData
 from camunda_client.clients.engine.schemas.response import (
     TaskSchema,
@@ -17,7 +19,7 @@ from camunda_client.clients.engine.schemas.response import (
 from camunda_client.clients.engine.schemas import GetTasksFilterSchema
 from camunda_client.exceptions import CamundaClientError
 from luka_bot.core.config import settings
-import httpx
+from luka_bot.services.camunda_read_cache import CamundaReadCache
 
 
 @dataclass
@@ -35,12 +37,19 @@ class CamundaService:
     
     def __init__(self):
         self._client: Optional[CamundaEngineClient] = None
-        self._transport = httpx.AsyncHTTPTransport(
-            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
+        # One pool for every user; credentials are applied per request
+        self.http_client = create_shared_http_client(
+            base_url=settings.ENGINE_URL,
+            max_connections=settings.CAMUNDA_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CAMUNDA_MAX_KEEPALIVE_CONNECTIONS,
         )
-        self._user_mappings: Dict[int, CamundaUserMapping] = {}
-        # Cache clients per user to reuse sessions and prevent resource leaks
-        self._clients: Dict[int, CamundaEngineClient] = {}
+        # LRU caches bounded by CAMUNDA_USER_CACHE_SIZE; evicted users are
+        # re-resolved from the session cache / UserProfile on next access
+        self._user_cache_size = max(1, settings.CAMUNDA_USER_CACHE_SIZE)
+        self._user_mappings: "OrderedDict[int, CamundaUserMapping]" = OrderedDict()
+        self._clients: "OrderedDict[int, CamundaEngineClient]" = OrderedDict()
+        # Short-TTL, single-flight cache for hot read paths (task lists, forms)
+        self.read_cache = CamundaReadCache(max_entries=settings.CAMUNDA_CACHE_MAX_ENTRIES)
         
     @classmethod
     def get_instance(cls) -> 'CamundaService':
@@ -50,11 +59,20 @@ class CamundaService:
             logger.info("✅ CamundaService singleton created")
         return cls._instance
     
+    def _remember(self, cache: OrderedDict, telegram_user_id: int, value: Any):
+        """Insert into an LRU cache, evicting the least recently used user."""
+        cache[telegram_user_id] = value
+        cache.move_to_end(telegram_user_id)
+        while len(cache) > self._user_cache_size:
+            cache.popitem(last=False)
+    
     async def _get_client(self, telegram_user_id: int) -> CamundaEngineClient:
         """Get or create cached Camunda client for user"""
         # Return cached client if exists
-        if telegram_user_id in self._clients:
-            return self._clients[telegram_user_id]
+        client = self._clients.get(telegram_user_id)
+        if client is not None:
+            self._clients.move_to_end(telegram_user_id)
+            return client
         
         # Get or create user mapping
         mapping = await self._get_or_create_user_mapping(telegram_user_id)
@@ -64,26 +82,47 @@ class CamundaService:
             password=mapping.camunda_password
         )
         
-        # Create and cache new client
+        # Per-user clients are thin views over the shared pool, so
+        # evicting one never closes connections other users rely on
         client = CamundaEngineClient(
             base_url=settings.ENGINE_URL,
             auth_data=auth_data,
-            transport=self._transport
+            http_client=self.http_client
         )
-        self._clients[telegram_user_id] = client
+        self._remember(self._clients, telegram_user_id, client)
         
         logger.debug(f"🔧 Created Camunda client for user {telegram_user_id}")
         return client
     
+    def invalidate_user(self, telegram_user_id: int):
+        """Forget cached credentials and client (e.g. after credentials change)."""
+        self._clients.pop(telegram_user_id, None)
+        self._user_mappings.pop(telegram_user_id, None)
+        self.read_cache.invalidate(None, telegram_user_id)
+    
+    def invalidate_tasks(self, telegram_user_id: int, task_id: Optional[str] = None):
+        """
+        Drop cached task reads for a user after a write or a task event.
+        
+        Args:
+            telegram_user_id: Telegram user ID
+            task_id: Also drop this task's cached form variables
+        """
+        self.read_cache.invalidate("tasks", telegram_user_id)
+        if task_id:
+            self.read_cache.invalidate("task_variables", telegram_user_id, str(task_id))
+    
     async def close_all_clients(self):
-        """Close all cached clients (call on shutdown)"""
+        """Close all cached clients and the shared pool (call on shutdown)"""
         for user_id, client in list(self._clients.items()):
             try:
                 await client.close()
-                logger.debug(f"🔒 Closed Camunda client for user {user_id}")
             except Exception as e:
                 logger.warning(f"Failed to close client for user {user_id}: {e}")
         self._clients.clear()
+        self._user_mappings.clear()
+        await self.http_client.aclose()
+        logger.debug("🔒 Closed Camunda connection pool")
     
     async def _get_or_create_user_mapping(self, telegram_user_id: int) -> CamundaUserMapping:
         """
@@ -95,8 +134,10 @@ class CamundaService:
         3. UserProfile (fallback, persistent storage)
         """
         # Check in-memory cache first
-        if telegram_user_id in self._user_mappings:
-            return self._user_mappings[telegram_user_id]
+        mapping = self._user_mappings.get(telegram_user_id)
+        if mapping is not None:
+            self._user_mappings.move_to_end(telegram_user_id)
+            return mapping
         
         # Try session cache (from Flow API auth middleware)
         from luka_bot.services.user_session_cache import get_cached_user_info
@@ -112,7 +153,7 @@ class CamundaService:
                     camunda_user_id=camunda_user_id,
                     camunda_password=camunda_key
                 )
-                self._user_mappings[telegram_user_id] = mapping
+                self._remember(self._user_mappings, telegram_user_id, mapping)
                 
                 logger.info(
                     f"🔐 Created Camunda mapping from session cache: "
@@ -131,7 +172,7 @@ class CamundaService:
                 camunda_user_id=profile.camunda_user_id,
                 camunda_password=profile.camunda_key
             )
-            self._user_mappings[telegram_user_id] = mapping
+            self._remember(self._user_mappings, telegram_user_id, mapping)
             
             logger.info(
                 f"🔐 Created Camunda mapping from UserProfile: "
@@ -156,7 +197,7 @@ class CamundaService:
                         camunda_user_id=user_data.camunda_user_id,
                         camunda_password=user_data.camunda_key
                     )
-                    self._user_mappings[telegram_user_id] = mapping
+                    self._remember(self._user_mappings, telegram_user_id, mapping)
                     
                     # Cache in UserProfile for next time
                     from luka_bot.models.user_profile import UserProfile
@@ -216,6 +257,7 @@ class CamundaService:
                 business_key=business_key,
                 variables=camunda_vars
             )
+            self.invalidate_tasks(telegram_user_id)
             logger.info(
                 f"🚀 Started process {process_key} for user {telegram_user_id}: {process_instance.id} "
                 f"with {len(variables or {})} variables (business_key={business_key})"
@@ -281,8 +323,20 @@ class CamundaService:
         Returns:
             List of tasks matching the criteria
         """
+        tasks = await self.read_cache.get_or_load(
+            ("tasks", telegram_user_id, process_definition_key),
+            settings.CAMUNDA_CACHE_TASKS_TTL,
+            lambda: self._fetch_user_tasks(telegram_user_id, process_definition_key),
+        )
+        return list(tasks)
+    
+    async def _fetch_user_tasks(
+        self,
+        telegram_user_id: int,
+        process_definition_key: Optional[str] = None
+    ) -> List[TaskSchema]:
         client = await self._get_client(telegram_user_id)
-        mapping = self._user_mappings[telegram_user_id]
+        mapping = await self._get_or_create_user_mapping(telegram_user_id)
 
         # Special handling for chatbot_start: include sub-process tasks
         if process_definition_key == "chatbot_start":
@@ -294,15 +348,12 @@ class CamundaService:
                 logger.debug(f"📋 No chatbot_start process found for user {telegram_user_id}")
                 return []
             
-            # Collect tasks from all process instances (root + sub-processes)
-            all_tasks = []
-            for process_instance in process_instances:
-                filter_schema = GetTasksFilterSchema(
-                    assignee=mapping.camunda_user_id,
-                    process_instance_id=process_instance.id
-                )
-                tasks = await client.get_tasks(schema=filter_schema)
-                all_tasks.extend(tasks)
+            # One query for the root and all sub-processes
+            filter_schema = GetTasksFilterSchema(
+                assignee=mapping.camunda_user_id,
+                process_instance_id_in=[str(instance.id) for instance in process_instances]
+            )
+            all_tasks = await client.get_tasks(schema=filter_schema)
             
             logger.debug(
                 f"📋 Retrieved {len(all_tasks)} tasks for user {telegram_user_id} "
@@ -431,6 +482,19 @@ class CamundaService:
             List of variable dicts with keys: name, value, type, writable, valueInfo
             Returns empty list if task has no form (404 error).
         """
+        variables = await self.read_cache.get_or_load(
+            ("task_variables", telegram_user_id, str(task_id)),
+            settings.CAMUNDA_CACHE_TASK_VARIABLES_TTL,
+            lambda: self._fetch_task_variables(telegram_user_id, task_id),
+        )
+        # Callers may edit values before rendering; keep the cached copy intact
+        return [dict(var) for var in variables]
+    
+    async def _fetch_task_variables(
+        self,
+        telegram_user_id: int,
+        task_id: str
+    ) -> List[Dict[str, Any]]:
         client = await self._get_client(telegram_user_id)
         
         try:
@@ -483,6 +547,21 @@ class CamundaService:
         Returns:
             Dict with process definition details or None if not found
         """
+        # Keyed per user: the definition is read with the user's credentials
+        definition = await self.read_cache.get_or_load(
+            ("process_definition", telegram_user_id, process_key),
+            settings.CAMUNDA_CACHE_DEFINITION_TTL,
+            lambda: self._fetch_process_definition(telegram_user_id, process_key),
+            # Don't pin the key-derived fallback used when Camunda is unreachable
+            cache_if=lambda result: result.get("id") is not None,
+        )
+        return dict(definition)
+    
+    async def _fetch_process_definition(
+        self,
+        telegram_user_id: int,
+        process_key: str
+    ) -> Dict[str, Any]:
         from camunda_client.clients.engine.schemas.query import ProcessDefinitionQuerySchema
         
         client = await self._get_client(telegram_user_id)
@@ -545,11 +624,26 @@ class CamundaService:
         Returns:
             Tuple of (variables_list, error_message)
             - If successful: (variables, None)
-            - If no start form: ([], None)
-            - If error: ([], error_message)
+            - If no start form (404): ([], None)
+            - If error (server, permission or connection failure): ([], error_message)
         
         Each variable dict contains: name, value, type, label, valueInfo
         """
+        # Keyed per user: the form is read with the user's credentials
+        variables, error = await self.read_cache.get_or_load(
+            ("start_form", telegram_user_id, process_key),
+            settings.CAMUNDA_CACHE_START_FORM_TTL,
+            lambda: self._fetch_start_form_variables(telegram_user_id, process_key),
+            # Only a form or a definite "no form" is cached; failures are reported
+            cache_if=lambda result: result[1] is None,
+        )
+        return ([dict(var) for var in variables], error)
+    
+    async def _fetch_start_form_variables(
+        self,
+        telegram_user_id: int,
+        process_key: str
+    ) -> tuple[List[Dict[str, Any]], Optional[str]]:
         client = await self._get_client(telegram_user_id)
         try:
             # get_process_definition_start_form returns a dict[str, VariableValueSchema]
@@ -571,28 +665,21 @@ class CamundaService:
             
             logger.info(f"📝 Retrieved {len(variables_list)} start form variables for {process_key}")
             return (variables_list, None)
-        except Exception as e:
-            error_str = str(e)
-            
-            # Extract response data if present (for better debugging)
+        except CamundaClientError as e:
+            if e.status_code == 404:
+                logger.debug(f"No start form for process {process_key}: {e}")
+                return ([], None)
+
+            # Parse the response body for better debugging
             response_data = None
-            if "RESPONSE DATA:" in error_str:
-                try:
-                    # Extract the response data part
-                    response_part = error_str.split("RESPONSE DATA:")[1].strip()
-                    # Try to parse as JSON for better formatting
-                    import json
-                    if response_part.startswith("b'") or response_part.startswith('b"'):
-                        # It's a bytes string representation
-                        response_part = response_part[2:-1]  # Remove b' and '
-                    response_data = json.loads(response_part)
-                except:
-                    pass
-            
-            # Check if it's a real error (500) vs. just no form (404)
-            if "500" in error_str or "Internal Server Error" in error_str:
+            try:
+                response_data = json.loads(e.response_data) if e.response_data else None
+            except (TypeError, ValueError):
+                pass
+
+            if e.status_code >= 500:
                 logger.error(
-                    f"❌ Camunda 500 Error fetching start form for process '{process_key}':\n"
+                    f"❌ Camunda {e.status_code} Error fetching start form for process '{process_key}':\n"
                     f"   Error: {e}\n"
                     f"   Response Data: {json.dumps(response_data, indent=2) if response_data else 'N/A'}"
                 )
@@ -603,12 +690,16 @@ class CamundaService:
                     error_path = response_data.get('path', 'Unknown')
                     user_msg = f"Camunda server error: {error_detail} (path: {error_path})"
                 else:
-                    user_msg = f"Camunda server error: {error_str[:100]}"
+                    user_msg = f"Camunda server error: {str(e)[:100]}"
                 
                 return ([], user_msg)
-            else:
-                logger.debug(f"No start form for process {process_key}: {e}")
-                return ([], None)
+
+            logger.warning(f"⚠️ Camunda {e.status_code} fetching start form for process '{process_key}': {e}")
+            return ([], f"Camunda request failed (HTTP {e.status_code})")
+        except Exception as e:
+            # Timeouts, connection errors: not "no form", and not to be cached as such
+            logger.warning(f"⚠️ Could not fetch start form for process '{process_key}': {e}")
+            return ([], f"Camunda unavailable: {str(e)[:100]}")
     
     async def complete_task(
         self,
@@ -628,7 +719,11 @@ class CamundaService:
         payload = {"variables": camunda_vars}
         logger.debug(f"📤 Complete task payload: {payload}")
         
-        await client.complete_task(task_id, variables=payload)
+        try:
+            await client.complete_task(task_id, variables=payload)
+        finally:
+            # Even a failed completion may have changed the engine state
+            self.invalidate_tasks(telegram_user_id, task_id)
         logger.info(f"✅ Completed task {task_id} for user {telegram_user_id} with {len(variables or {})} variables")
     
     def _format_variables(self, variables: Dict[str, Any]) -> Dict:
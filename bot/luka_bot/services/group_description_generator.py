@@ -50,13 +50,10 @@ async def generate_group_description(
         Engaging group description
     """
     # 1. Try existing Telegram description
-    if group_metadata.get("description"):
-        desc = group_metadata["description"].strip()
-        if desc and len(desc) >= 10:
-            if len(desc) > max_length:
-                desc = desc[:max_length-3] + "..."
-            logger.info(f"✅ Using Telegram description for '{group_title}'")
-            return desc
+    desc = _get_telegram_description(group_metadata, max_length)
+    if desc:
+        logger.info(f"✅ Using Telegram description for '{group_title}'")
+        return desc
     
     # 2. Try LLM generation
     try:
@@ -78,6 +75,29 @@ async def generate_group_description(
     return fallback
 
 
+def get_placeholder_description(
+    group_metadata: Dict[str, Any],
+    language: str = "en",
+    max_length: int = 120
+) -> str:
+    """
+    Description to show while a tagline is generated in the background.
+
+    Telegram description if usable, otherwise a generic fallback (no LLM call).
+    """
+    return _get_telegram_description(group_metadata, max_length) or _get_fallback_description(language, group_metadata)
+
+
+def _get_telegram_description(group_metadata: Dict[str, Any], max_length: int) -> Optional[str]:
+    """Existing Telegram description, truncated, or None if missing or too short."""
+    desc = (group_metadata.get("description") or "").strip()
+    if len(desc) < 10:
+        return None
+    if len(desc) > max_length:
+        desc = desc[:max_length-3] + "..."
+    return desc
+
+
 async def _generate_with_llm(
     group_title: str,
     group_metadata: Dict[str, Any],
@@ -0,0 +1,586 @@
+"""
+Durable background job queue on Redis Streams.
+
+LLM side-work (thread naming, conversation summaries, ...) used to run as
+ad-hoc `asyncio.create_task` calls: lost on restart, unbounded under load
+and competing with user-facing LLM calls. Jobs now go through this queue:
+
+- jobs are a registered type name plus a JSON payload (`@job_handler`)
+- one stream per priority class (high/normal/low), each with its own
+  concurrency limit (JOB_QUEUE_CONCURRENCY)
+- consumer groups, so several bot replicas share the work; entries a dead
+  replica left pending are requeued after JOB_QUEUE_CLAIM_IDLE_SECONDS,
+  counting as a failed attempt (a job that kills its worker ends up in the
+  dead-letter stream instead of being reclaimed forever)
+- failures retry with exponential backoff through a delayed-job sorted set,
+  then land in a dead-letter stream
+- `dedupe_key` keeps at most one pending job per key (e.g. one summary
+  job per thread); the key is claimed in the same Lua script that adds the
+  job, so a failed add never leaves a key blocking the job for an hour
+- normal/low jobs don't start while user replies are being generated
+  (`foreground()`), for at most JOB_QUEUE_FOREGROUND_MAX_DEFER_SECONDS
+- Prometheus queue depth, wait time, run time and outcome metrics
+
+Without a started queue (tests, scripts, the gateway), `enqueue` runs the
+job in-process as a background task, as before.
+
+Usage:
+    @job_handler("thread_name", priority="normal")
+    async def name_thread(payload: dict) -> None: ...
+
+    await get_job_queue().enqueue("thread_name", {"thread_id": tid}, dedupe_key=f"thread_name:{tid}")
+"""
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+import prometheus_client
+from loguru import logger
+
+PRIORITIES = ("high", "normal", "low")
+# Classes that wait for user-facing LLM calls to finish before starting
+DEFERRED_PRIORITIES = ("normal", "low")
+
+STREAM_PREFIX = "luka:jobs"
+CONSUMER_GROUP = "luka-bot-workers"
+DEAD_LETTER_MAXLEN = 10000
+# How long an idle worker waits on its stream before re-checking for shutdown
+READ_BLOCK_MS = 2000
+
+# Claim the dedupe key and add the job atomically; checks before writing, since
+# a script's earlier writes aren't rolled back when a later command fails.
+# KEYS: stream, dedupe key. ARGV: dedupe TTL, job id, field/value pairs.
+ENQUEUE_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
+redis.call('XADD', KEYS[1], '*', unpack(ARGV, 3))
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[1])
+return 1
+"""
+
+# Move one due retry from the delayed set to its stream; only one replica wins.
+# KEYS: delayed set, stream. ARGV: member, field/value pairs.
+MOVE_DELAYED_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return 0
+end
+redis.call('XADD', KEYS[2], '*', unpack(ARGV, 2))
+redis.call('ZREM', KEYS[1], ARGV[1])
+return 1
+"""
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+jobs_total = prometheus_client.Counter(
+    'luka_bot_jobs_total',
+    'Background jobs by type and outcome',
+    ['job', 'status']
+)
+
+job_queue_depth = prometheus_client.Gauge(
+    'luka_bot_job_queue_depth',
+    'Background jobs waiting or running, by priority class (and delayed retries)',
+    ['priority']
+)
+
+job_wait_seconds = prometheus_client.Histogram(
+    'luka_bot_job_wait_seconds',
+    'Time from enqueue to start of a background job',
+    ['job'],
+    buckets=(0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+)
+
+job_duration_seconds = prometheus_client.Histogram(
+    'luka_bot_job_duration_seconds',
+    'Background job run time',
+    ['job']
+)
+
+
+@dataclass(frozen=True)
+class JobType:
+    """A registered job: handler plus scheduling policy."""
+    name: str
+    handler: JobHandler
+    priority: str = "normal"
+    max_attempts: int = 3
+    timeout: float = 120.0
+
+
+_job_types: Dict[str, JobType] = {}
+
+
+def job_handler(name: str, priority: str = "normal", max_attempts: int = 3, timeout: float = 120.0):
+    """
+    Register an async function as the handler of a job type.
+
+    Args:
+        name: Job type name used by `enqueue`
+        priority: "high", "normal" or "low"
+        max_attempts: Runs before the job goes to the dead-letter stream
+        timeout: Seconds one run may take
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown job priority: {priority}")
+
+    def decorator(func: JobHandler) -> JobHandler:
+        _job_types[name] = JobType(name, func, priority, max(1, max_attempts), timeout)
+        return func
+
+    return decorator
+
+
+def get_job_type(name: str) -> Optional[JobType]:
+    return _job_types.get(name)
+
+
+class JobQueue:
+    """
+    Redis Streams job queue with priority classes.
+
+    Args:
+        redis: Async Redis client
+        concurrency: Max running jobs per priority class
+        consumer: Consumer name in the group (default: host-pid)
+        claim_idle: Seconds before another replica's pending job is reclaimed
+        backoff_base: First retry delay in seconds (doubles per attempt)
+        backoff_max: Retry delay cap in seconds
+        foreground_max_defer: Max seconds normal/low jobs wait for user replies
+        dedupe_ttl: Seconds a dedupe key can block new jobs (safety net)
+    """
+
+    def __init__(
+        self,
+        redis,
+        concurrency: Optional[Dict[str, int]] = None,
+        consumer: Optional[str] = None,
+        claim_idle: float = 300.0,
+        backoff_base: float = 5.0,
+        backoff_max: float = 600.0,
+        foreground_max_defer: float = 30.0,
+        dedupe_ttl: int = 3600,
+    ):
+        self.redis = redis
+        self.concurrency = {p: max(1, (concurrency or {}).get(p, 1)) for p in PRIORITIES}
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.claim_idle = claim_idle
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.foreground_max_defer = foreground_max_defer
+        self.dedupe_ttl = dedupe_ttl
+
+        self._semaphores = {p: asyncio.Semaphore(self.concurrency[p]) for p in PRIORITIES}
+        self._loops: List[asyncio.Task] = []
+        self._running: Set[asyncio.Task] = set()
+        self._started = False
+        self._foreground = 0
+        self._foreground_idle = asyncio.Event()
+        self._foreground_idle.set()
+        # In-process fallback dedupe (queue not started)
+        self._local_keys: Set[str] = set()
+        self._enqueue_script = redis.register_script(ENQUEUE_SCRIPT)
+        self._move_delayed_script = redis.register_script(MOVE_DELAYED_SCRIPT)
+
+    # ---- keys ----
+
+    @staticmethod
+    def stream_key(priority: str) -> str:
+        return f"{STREAM_PREFIX}:{priority}"
+
+    delayed_key = f"{STREAM_PREFIX}:delayed"
+    dead_key = f"{STREAM_PREFIX}:dead"
+
+    @staticmethod
+    def dedupe_redis_key(dedupe_key: str) -> str:
+        return f"{STREAM_PREFIX}:dedupe:{dedupe_key}"
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    # ---- lifecycle ----
+
+    async def start(self) -> None:
+        """Create consumer groups and start worker, retry and metrics loops."""
+        if self._started:
+            return
+        for priority in PRIORITIES:
+            try:
+                await self.redis.xgroup_create(self.stream_key(priority), CONSUMER_GROUP, id="0", mkstream=True)
+            except Exception as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        self._started = True
+        self._loops = [
+            *(asyncio.create_task(self._worker_loop(p), name=f"jobs_{p}") for p in PRIORITIES),
+            asyncio.create_task(self._delayed_loop(), name="jobs_delayed"),
+            asyncio.create_task(self._maintenance_loop(), name="jobs_maintenance"),
+        ]
+        logger.info(
+            f"✅ Job queue started (consumer {self.consumer}, concurrency "
+            + ", ".join(f"{p}={n}" for p, n in self.concurrency.items()) + ")"
+        )
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop taking jobs and wait for running ones (unfinished jobs stay pending for reclaim)."""
+        if not self._started:
+            return
+        self._started = False
+        workers, others = self._loops[:len(PRIORITIES)], self._loops[len(PRIORITIES):]
+        for task in others:
+            task.cancel()
+        # Workers exit after their current blocking read, so no command is cut mid-flight
+        _, stuck = await asyncio.wait(workers, timeout=READ_BLOCK_MS / 1000 + 1)
+        for task in stuck:
+            task.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+        if self._running:
+            done, pending = await asyncio.wait(self._running, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(f"⚠️ {len(pending)} jobs cancelled at shutdown; another replica will reclaim them")
+        logger.info("✅ Job queue stopped")
+
+    # ---- producer ----
+
+    async def enqueue(
+        self,
+        name: str,
+        payload: Dict[str, Any],
+        dedupe_key: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Queue a job.
+
+        Args:
+            name: Registered job type
+            payload: JSON-serializable job arguments
+            dedupe_key: Skip if a job with this key is already pending
+            priority: Override the job type's priority class
+
+        Returns:
+            Job id, or None if deduplicated
+        """
+        job_type = _job_types.get(name)
+        if job_type is None:
+            raise ValueError(f"Unknown job type: {name}")
+        priority = priority or job_type.priority
+        job_id = uuid.uuid4().hex
+
+        if not self._started:
+            return self._run_in_process(job_type, payload, dedupe_key, job_id)
+
+        fields = {
+            "id": job_id,
+            "name": name,
+            "payload": json.dumps(payload, default=str),
+            "attempt": "0",
+            "enqueued_at": repr(time.time()),
+            "dedupe_key": dedupe_key or "",
+        }
+        if dedupe_key:
+            added = await self._enqueue_script(
+                keys=[self.stream_key(priority), self.dedupe_redis_key(dedupe_key)],
+                args=[self.dedupe_ttl, job_id, *_flatten(fields)],
+            )
+            if not added:
+                jobs_total.labels(job=name, status="deduplicated").inc()
+                return None
+        else:
+            await self.redis.xadd(self.stream_key(priority), fields)
+        jobs_total.labels(job=name, status="enqueued").inc()
+        return job_id
+
+    def _run_in_process(
+        self, job_type: JobType, payload: Dict[str, Any], dedupe_key: Optional[str], job_id: str
+    ) -> Optional[str]:
+        from luka_bot.utils.background_tasks import create_background_task
+
+        if dedupe_key:
+            if dedupe_key in self._local_keys:
+                jobs_total.labels(job=job_type.name, status="deduplicated").inc()
+                return None
+            self._local_keys.add(dedupe_key)
+
+        async def run() -> None:
+            try:
+                await asyncio.wait_for(job_type.handler(payload), timeout=job_type.timeout)
+            finally:
+                if dedupe_key:
+                    self._local_keys.discard(dedupe_key)
+
+        create_background_task(run(), name=f"job_{job_type.name}_{job_id[:8]}")
+        return job_id
+
+    # ---- foreground priority ----
+
+    @asynccontextmanager
+    async def foreground(self) -> AsyncIterator[None]:
+        """Mark a user-facing LLM call; normal/low jobs hold off while any is active."""
+        self._foreground += 1
+        self._foreground_idle.clear()
+        try:
+            yield
+        finally:
+            self._foreground -= 1
+            if self._foreground == 0:
+                self._foreground_idle.set()
+
+    async def _yield_to_foreground(self) -> None:
+        if self._foreground:
+            try:
+                await asyncio.wait_for(self._foreground_idle.wait(), timeout=self.foreground_max_defer)
+            except asyncio.TimeoutError:
+                pass
+
+    # ---- consumers ----
+
+    async def _worker_loop(self, priority: str) -> None:
+        stream = self.stream_key(priority)
+        semaphore = self._semaphores[priority]
+        while self._started:
+            await semaphore.acquire()
+            try:
+                if priority in DEFERRED_PRIORITIES:
+                    await self._yield_to_foreground()
+                response = await self.redis.xreadgroup(
+                    CONSUMER_GROUP, self.consumer, {stream: ">"}, count=1, block=READ_BLOCK_MS
+                )
+            except asyncio.CancelledError:
+                semaphore.release()
+                raise
+            except Exception as e:
+                semaphore.release()
+                logger.warning(f"⚠️ Job queue read failed ({priority}): {e}")
+                await asyncio.sleep(1.0)
+                continue
+
+            entries = [entry for _, stream_entries in response or [] for entry in stream_entries]
+            if not entries:
+                semaphore.release()
+                continue
+            for entry_id, fields in entries:
+                self._spawn(priority, entry_id, fields, semaphore)
+
+    def _spawn(self, priority: str, entry_id, fields, semaphore: asyncio.Semaphore) -> None:
+        async def run() -> None:
+            try:
+                await self._process(priority, entry_id, fields)
+            except Exception as e:
+                # Redis hiccup while acking/retrying: the entry stays pending and is reclaimed
+                logger.error(f"❌ Job bookkeeping failed for {entry_id!r}: {e}")
+            finally:
+                semaphore.release()
+
+        task = asyncio.create_task(run())
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _process(self, priority: str, entry_id, raw_fields: Dict) -> None:
+        fields = {_text(k): _text(v) for k, v in raw_fields.items()}
+        name = fields.get("name", "")
+        job_type = _job_types.get(name)
+        if job_type is None:
+            logger.error(f"❌ Unknown job type '{name}', moving {entry_id!r} to dead letters")
+            await self._finish(priority, entry_id, fields, dead=True, error="unknown job type")
+            return
+
+        attempt = int(fields.get("attempt") or 0) + 1
+        job_wait_seconds.labels(job=name).observe(max(0.0, time.time() - float(fields.get("enqueued_at") or time.time())))
+        if fields.get("dedupe_key"):
+            # Free the key as the job starts: requests arriving now need a fresh run
+            await self._release_dedupe(fields)
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(job_type.handler(json.loads(fields.get("payload") or "{}")), timeout=job_type.timeout)
+        except asyncio.CancelledError:
+            # Shutdown: leave the entry pending so it is reclaimed
+            raise
+        except Exception as e:
+            job_duration_seconds.labels(job=name).observe(time.monotonic() - started)
+            if attempt < job_type.max_attempts:
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+                logger.warning(f"⚠️ Job {name} failed (attempt {attempt}/{job_type.max_attempts}), retrying in {delay:g}s: {e!r}")
+                jobs_total.labels(job=name, status="retried").inc()
+                await self._retry(priority, entry_id, fields, attempt, delay)
+            else:
+                logger.error(f"❌ Job {name} failed after {attempt} attempts: {e!r}")
+                jobs_total.labels(job=name, status="failed").inc()
+                await self._finish(priority, entry_id, fields, dead=True, error=repr(e))
+            return
+
+        job_duration_seconds.labels(job=name).observe(time.monotonic() - started)
+        jobs_total.labels(job=name, status="succeeded").inc()
+        await self._finish(priority, entry_id, fields)
+
+    async def _retry(self, priority: str, entry_id, fields: Dict[str, str], attempt: int, delay: float) -> None:
+        retry = {**fields, "attempt": str(attempt), "priority": priority}
+        pipe = self.redis.pipeline()
+        pipe.zadd(self.delayed_key, {json.dumps(retry): time.time() + delay})
+        pipe.xack(self.stream_key(priority), CONSUMER_GROUP, entry_id)
+        pipe.xdel(self.stream_key(priority), entry_id)
+        await pipe.execute()
+
+    async def _finish(
+        self, priority: str, entry_id, fields: Dict[str, str], dead: bool = False, error: str = ""
+    ) -> None:
+        pipe = self.redis.pipeline()
+        if dead:
+            pipe.xadd(self.dead_key, {**fields, "error": error[:1000]}, maxlen=DEAD_LETTER_MAXLEN, approximate=True)
+        pipe.xack(self.stream_key(priority), CONSUMER_GROUP, entry_id)
+        # Acked entries are deleted, so the stream length is the queue depth
+        pipe.xdel(self.stream_key(priority), entry_id)
+        await pipe.execute()
+
+    async def _release_dedupe(self, fields: Dict[str, str]) -> None:
+        key = self.dedupe_redis_key(fields["dedupe_key"])
+        try:
+            # Only release our own claim (a newer job may hold the key after a TTL expiry)
+            if _text(await self.redis.get(key)) == fields.get("id"):
+                await self.redis.delete(key)
+        except Exception as e:
+            logger.debug(f"Job dedupe key release failed: {e}")
+
+    # ---- retries, reclaim, metrics ----
+
+    async def _delayed_loop(self) -> None:
+        while True:
+            try:
+                due = await self.redis.zrangebyscore(self.delayed_key, 0, time.time(), start=0, num=100)
+                for member in due:
+                    fields = json.loads(member)
+                    priority = fields.pop("priority", "normal")
+                    await self._move_delayed_script(
+                        keys=[self.delayed_key, self.stream_key(priority)],
+                        args=[member, *_flatten(fields)],
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Job retry scheduling failed: {e}")
+            await asyncio.sleep(1.0)
+
+    async def _maintenance_loop(self) -> None:
+        interval = max(5.0, min(60.0, self.claim_idle / 2))
+        next_claim = time.monotonic() + interval
+        while True:
+            try:
+                await self._update_depth()
+                if time.monotonic() >= next_claim:
+                    next_claim = time.monotonic() + interval
+                    await self._reclaim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Job queue maintenance failed: {e}")
+            await asyncio.sleep(15.0)
+
+    async def _update_depth(self) -> None:
+        pipe = self.redis.pipeline()
+        for priority in PRIORITIES:
+            pipe.xlen(self.stream_key(priority))
+        pipe.zcard(self.delayed_key)
+        lengths = await pipe.execute()
+        for label, length in zip((*PRIORITIES, "delayed"), lengths):
+            job_queue_depth.labels(priority=label).set(length)
+
+    async def _reclaim(self) -> None:
+        """
+        Requeue entries another (dead) consumer left pending.
+
+        The interrupted run counts as an attempt, so a job that crashes its
+        worker goes to the dead-letter stream after `max_attempts` reclaims.
+        """
+        for priority in PRIORITIES:
+            start_id = "0-0"
+            while True:
+                result = await self.redis.xautoclaim(
+                    self.stream_key(priority), CONSUMER_GROUP, self.consumer,
+                    min_idle_time=int(self.claim_idle * 1000), start_id=start_id, count=100,
+                )
+                if not result:
+                    break
+                for entry_id, raw_fields in result[1]:
+                    if raw_fields:
+                        await self._requeue_stale(priority, entry_id, raw_fields)
+                start_id = _text(result[0])
+                if start_id == "0-0":
+                    break
+
+    async def _requeue_stale(self, priority: str, entry_id, raw_fields: Dict) -> None:
+        fields = {_text(k): _text(v) for k, v in raw_fields.items()}
+        name = fields.get("name", "")
+        job_type = _job_types.get(name)
+        attempt = int(fields.get("attempt") or 0) + 1
+        if job_type is None or attempt >= job_type.max_attempts:
+            logger.error(f"❌ Stale job {name} {entry_id!r} abandoned after {attempt} attempts, moving to dead letters")
+            jobs_total.labels(job=name, status="failed").inc()
+            await self._finish(priority, entry_id, fields, dead=True, error="worker stopped during the job")
+            return
+
+        logger.info(f"♻️ Requeued stale job {name} {entry_id!r} ({priority}, attempt {attempt}/{job_type.max_attempts})")
+        jobs_total.labels(job=name, status="reclaimed").inc()
+        pipe = self.redis.pipeline()
+        pipe.xadd(self.stream_key(priority), {**fields, "attempt": str(attempt)})
+        pipe.xack(self.stream_key(priority), CONSUMER_GROUP, entry_id)
+        pipe.xdel(self.stream_key(priority), entry_id)
+        await pipe.execute()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "started": self._started,
+            "running": len(self._running),
+            "foreground": self._foreground,
+            "concurrency": dict(self.concurrency),
+        }
+
+
+def _text(value: Any) -> Any:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _flatten(fields: Dict[str, str]) -> List[str]:
+    """Stream fields as the flat field/value list XADD takes in a script."""
+    return [item for pair in fields.items() for item in pair]
+
+
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get or create the JobQueue singleton (not started until `start()`)."""
+    global _job_queue
+    if _job_queue is None:
+        from luka_bot.core.config import settings
+        from luka_bot.core.loader import redis_client
+        import luka_bot.services.background_jobs  # noqa: F401 - registers job handlers
+
+        _job_queue = JobQueue(
+            redis=redis_client,
+            concurrency=settings.JOB_QUEUE_CONCURRENCY,
+            claim_idle=settings.JOB_QUEUE_CLAIM_IDLE_SECONDS,
+            backoff_base=settings.JOB_QUEUE_RETRY_BACKOFF_SECONDS,
+            foreground_max_defer=settings.JOB_QUEUE_FOREGROUND_MAX_DEFER_SECONDS,
+        )
+    return _job_queue
+
+
+async def enqueue_job(
+    name: str,
+    payload: Dict[str, Any],
+    dedupe_key: Optional[str] = None,
+    priority: Optional[str] = None,
+) -> Optional[str]:
+    """Queue a job on the shared queue (see JobQueue.enqueue)."""
+    return await get_job_queue().enqueue(name, payload, dedupe_key=dedupe_key, priority=priority)
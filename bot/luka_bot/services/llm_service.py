@@ -15,6 +15,7 @@ import re
 from luka_bot.core.config import settings
 from luka_bot.core.loader import redis_client
 from luka_bot.utils.i18n_helper import get_user_language
+from luka_bot.utils.log_budget import hot, log_throttled
 from luka_bot.agents import (
     ConversationContext,
     create_static_agent_with_basic_tools,
@@ -95,6 +96,31 @@ class LLMService:
         thread: Optional["Thread"] = None,
         system_prompt: Optional[str] = None,
         save_history: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Stream LLM response (see `_stream_response`).
+        
+        Marks the call as user-facing, so queued background LLM jobs
+        hold off until the reply is done.
+        """
+        from contextlib import aclosing
+        from luka_bot.services.job_queue import get_job_queue
+        
+        async with get_job_queue().foreground():
+            async with aclosing(self._stream_response(
+                user_message, user_id, thread_id, thread, system_prompt, save_history
+            )) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+    
+    async def _stream_response(
+        self,
+        user_message: str,
+        user_id: int,
+        thread_id: Optional[str] = None,
+        thread: Optional["Thread"] = None,
+        system_prompt: Optional[str] = None,
+        save_history: bool = True
     ) -> AsyncIterator[str]:
         """
         Stream LLM response using pydantic-ai agent.
@@ -113,8 +139,8 @@ class LLMService:
         Yields:
             Chunks of response text as they arrive from agent
         """
-        logger.info(f"🚀🚀🚀 stream_response() ENTERED: user_id={user_id}, thread_id={thread_id}, message_len={len(user_message)}")
-        logger.debug(f"   thread={thread}, save_history={save_history}")
+        logger.debug("🚀 stream_response() entered: user_id={}, thread_id={}, message_len={}", user_id, thread_id, len(user_message))
+        logger.debug("   thread={}, save_history={}", thread, save_history)
         
         try:
             logger.debug("📦 Inside try block, about to get user profile service...")
@@ -215,7 +241,7 @@ class LLMService:
             except Exception as e:
                 logger.warning(f"⚠️  Heuristic YouTube transcript fallback failed: {e}")
             
-            logger.info(f"🤖 Creating agent for user {user_id}, thread {thread_id}")
+            logger.debug("🤖 Creating agent for user {}, thread {}", user_id, thread_id)
             
             # Create agent (Phase 4: static agent with support tools)
             # Phase 5: Will use create_agent_with_user_tasks for Camunda integration
@@ -281,62 +307,63 @@ class LLMService:
                 logger.error(f"❌ FATAL: Message conversion failed: {conversion_error}", exc_info=True)
                 raise
             
-            logger.info(f"🧠 LLM request: user={user_id}, thread={thread_id}")
-            logger.info(f"📚 Context KB indices: {ctx.thread_knowledge_bases}")
-            logger.info(f"🔧 Context enabled tools: {ctx.enabled_tools}")
+            logger.debug("🧠 LLM request: user={}, thread={}, history={} messages", user_id, thread_id, len(model_messages))
+            logger.debug("📚 Context KB indices: {}", ctx.thread_knowledge_bases)
+            logger.debug("🔧 Context enabled tools: {}", ctx.enabled_tools)
             
-            # Log agent's actual tools for debugging
-            try:
-                # Check various possible tool storage locations in pydantic-ai
-                tool_count = 0
-                tool_names = []
+            # Log agent's actual tools for debugging (hot-path debug only:
+            # introspecting the toolset costs time on every request)
+            if hot.enabled:
+                try:
+                    # Check various possible tool storage locations in pydantic-ai
+                    tool_count = 0
+                    tool_names = []
                 
-                if hasattr(agent, '_function_toolset'):
-                    toolset = agent._function_toolset
-                    logger.info(f"🔍 Agent._function_toolset exists: {type(toolset)}")
+                    if hasattr(agent, '_function_toolset'):
+                        toolset = agent._function_toolset
+                        hot.debug("🔍 Agent._function_toolset exists: {}", type(toolset))
                     
-                    # Check toolset for tools
-                    for attr in ['_tools', 'tools', '_tool_defs']:
-                        if hasattr(toolset, attr):
-                            tools_dict = getattr(toolset, attr)
-                            if isinstance(tools_dict, dict):
-                                tool_count = len(tools_dict)
-                                tool_names = list(tools_dict.keys())
-                                logger.info(f"🛠️  Agent has {tool_count} tools via toolset.{attr}: {tool_names}")
-                                break
+                        # Check toolset for tools
+                        for attr in ['_tools', 'tools', '_tool_defs']:
+                            if hasattr(toolset, attr):
+                                tools_dict = getattr(toolset, attr)
+                                if isinstance(tools_dict, dict):
+                                    tool_count = len(tools_dict)
+                                    tool_names = list(tools_dict.keys())
+                                    hot.debug("🛠️  Agent has {} tools via toolset.{}: {}", tool_count, attr, tool_names)
+                                    break
                 
-                if tool_count == 0:
-                    # Try direct agent attributes
-                    if hasattr(agent, 'tools') and agent.tools:
-                        tool_count = len(agent.tools)
-                        tool_names = [str(t) for t in agent.tools]
-                        logger.info(f"🛠️  Agent has {tool_count} tools via agent.tools: {tool_names}")
-                    else:
-                        logger.warning(f"⚠️  Could not detect tools on agent (but they may still work)")
-            except Exception as e:
-                logger.warning(f"⚠️  Error checking agent tools: {e}")
+                    if tool_count == 0:
+                        # Try direct agent attributes
+                        if hasattr(agent, 'tools') and agent.tools:
+                            tool_count = len(agent.tools)
+                            tool_names = [str(t) for t in agent.tools]
+                            hot.debug("🛠️  Agent has {} tools via agent.tools: {}", tool_count, tool_names)
+                        else:
+                            logger.warning(f"⚠️  Could not detect tools on agent (but they may still work)")
+                except Exception as e:
+                    logger.warning(f"⚠️  Error checking agent tools: {e}")
             
             full_response = ""
             
             # FIX 21: Use stream() instead of stream_text() to expose tool calls
             # Based on working old bot pattern (bot_server/services/streaming_service.py:152-299)
-            logger.debug(f"🚀 Starting agent.run_stream for user_id={user_id}, thread_id={thread_id}")
-            logger.debug(f"   user_message: {user_message[:100]}...")
-            logger.debug(f"   message_history: {len(model_messages)} messages")
+            logger.debug("🚀 Starting agent.run_stream for user_id={}, thread_id={}", user_id, thread_id)
+            hot.debug("   user_message: {}...", user_message[:100])
             
             async with agent.run_stream(
                 user_prompt=user_message,
                 deps=ctx,
                 message_history=model_messages  # Add history to agent context
             ) as stream:
-                logger.debug(f"✅ run_stream context entered, starting execution...")
+                logger.debug("✅ run_stream context entered, starting execution...")
                 
                 # Initialize variables for both streaming and non-streaming modes
                 tool_notification_shown = False
                 
                 if settings.STREAMING_ENABLED:
                     # STREAMING ENABLED: Try streaming first
-                    logger.info("🔄 Streaming mode enabled - attempting to stream response")
+                    logger.debug("🔄 Streaming mode enabled - attempting to stream response")
                     
                     try:
                         # Use stream() to see ALL message parts (text + tool calls)
@@ -358,19 +385,13 @@ class LLMService:
                         # IMPORTANT: Both OpenAI and Ollama use cumulative streaming
                         # (each chunk contains the full response so far, not just new text)
                         is_cumulative_streaming = True  # Always use delta extraction
-                        logger.info(f"🔄 Streaming mode: cumulative (both providers) [actual_provider={actual_provider}, ctx_provider={ctx.llm_provider}]")
-                        
-                        logger.debug("🔍 About to iterate stream.stream()...")
+                        logger.debug("🔄 Streaming mode: cumulative (both providers) [actual_provider={}, ctx_provider={}]", actual_provider, ctx.llm_provider)
                         async for chunk in stream.stream():  # FIX 21: Changed from stream_text()
                             chunk_count += 1
                             chunk_type = chunk.__class__.__name__
                             
-                            # Log tool calls and first few chunks
-                            if chunk_count <= 3 or chunk_type == 'ToolCallPart':
-                                logger.info(f"📦 Chunk {chunk_count}: {chunk_type}")
-                            
-                            if chunk_count == 1:
-                                logger.debug(f"🎉 First chunk received! Type: {chunk_type}, Content: {str(chunk)[:200]}")
+                            # Per-chunk logging is hot-path debug only (no-op otherwise)
+                            hot.debug("📦 Chunk {}: {}", chunk_count, chunk_type)
                             
                             # FIX 22/24: Handle both message parts AND plain strings
                             # stream() can return either ModelResponse parts or strings depending on the model
@@ -387,9 +408,12 @@ class LLMService:
                                                 yield delta
                                         else:
                                             # Fallback: if logic fails, treat as delta
-                                            logger.warning(f"⚠️ Cumulative chunk doesn't start with previous response, treating as delta")
-                                            logger.warning(f"   Previous: {full_response[:50]}...")
-                                            logger.warning(f"   Current: {chunk[:50]}...")
+                                            log_throttled(
+                                                "WARNING", 10.0,
+                                                "⚠️ Cumulative chunk doesn't start with previous response, treating as delta "
+                                                "(previous: {!r}..., current: {!r}...)",
+                                                full_response[:50], chunk[:50],
+                                            )
                                             full_response += chunk
                                             yield chunk
                                     else:
@@ -400,11 +424,11 @@ class LLMService:
                             # Case 2: ToolCallPart - show notification
                             elif chunk_type == 'ToolCallPart':
                                 tool_name = chunk.tool_name if hasattr(chunk, 'tool_name') else 'unknown'
-                                logger.info(f"🔧 ✅ TOOL CALLED: {tool_name}")
+                                logger.info("🔧 Tool called: {}", tool_name)
                                 
                                 if not tool_notification_shown:
                                     notification_dict = _get_tool_notification(tool_name)
-                                    logger.info(f"🔧 Showing tool notification: {tool_name}")
+                                    hot.debug("🔧 Showing tool notification: {}", tool_name)
                                     yield notification_dict  # Yield dict to enable message editing
                                     tool_notification_shown = True
                             
@@ -442,7 +466,7 @@ class LLMService:
                             elif chunk_type in ('RetryPromptPart', 'UserPromptPart'):
                                 pass  # Skip silently
                         
-                        logger.info(f"✅ Streaming complete: {chunk_count} chunks, {len(full_response)} chars")
+                        logger.debug("✅ Streaming complete: {} chunks, {} chars", chunk_count, len(full_response))
                         
                     except Exception as stream_error:
                         # Log but don't crash - partial response is OK
@@ -456,12 +480,12 @@ class LLMService:
                         # Don't call get_output() - we have a complete response from streaming
                     else:
                         # Streaming produced no content - fallback to get_output()
-                        logger.info("⚠️ Streaming produced no content, falling back to get_output()")
+                        logger.debug("⚠️ Streaming produced no content, falling back to get_output()")
                         try:
                             final_output = await stream.get_output()
                             if final_output:
                                 full_response = str(final_output)
-                                logger.info(f"✅ get_output() fallback successful: {len(full_response)} chars")
+                                logger.debug("✅ get_output() fallback successful: {} chars", len(full_response))
                                 yield full_response
                             else:
                                 logger.warning("⚠️ get_output() also returned empty")
@@ -470,7 +494,7 @@ class LLMService:
                 
                 else:
                     # STREAMING DISABLED: Still need to iterate stream to trigger execution
-                    logger.info("🔄 Streaming disabled - executing agent without streaming")
+                    logger.debug("🔄 Streaming disabled - executing agent without streaming")
                     
                     try:
                         # CRITICAL: Must iterate through stream to trigger agent execution
@@ -487,14 +511,14 @@ class LLMService:
                                 if chunk_type == 'TextPart' and hasattr(chunk, 'content'):
                                     full_response += str(chunk.content)
                         
-                        logger.info(f"✅ Agent execution complete: {len(full_response)} chars")
+                        logger.debug("✅ Agent execution complete: {} chars", len(full_response))
                         
                         # Only call get_output() if we didn't accumulate text from stream
                         if not full_response:
                             final_output = await stream.get_output()
                             if final_output:
                                 full_response = str(final_output)
-                                logger.info(f"✅ Got response from get_output(): {len(full_response)} chars")
+                                logger.debug("✅ Got response from get_output(): {} chars", len(full_response))
                         
                         # Yield the complete response once
                         if full_response:
@@ -509,10 +533,10 @@ class LLMService:
                 # pydantic-ai handles this automatically and reliably via get_output()
                 
                 # Check if any tools were called
-                logger.info(f"🔍 Checking if KB tool was called (tool_notification_shown={tool_notification_shown})")
-                logger.info(f"🔍 Total response length after streaming: {len(full_response)} chars")
+                logger.debug("🔍 Checking if KB tool was called (tool_notification_shown={})", tool_notification_shown)
+                logger.debug("🔍 Total response length after streaming: {} chars", len(full_response))
                 if full_response:
-                    logger.info(f"🔍 Response preview: {full_response[:200]}...")
+                    hot.debug("🔍 Response preview: {}...", full_response[:200])
                 else:
                     logger.warning(f"⚠️  LLM produced NO text output!")
                 
@@ -526,7 +550,7 @@ class LLMService:
                     all_msgs = stream.all_messages()
                     kb_tool_results = []
                     
-                    logger.info(f"🔍 KB snippets not in response, scanning {len(all_msgs)} messages for tool results...")
+                    logger.debug("🔍 KB snippets not in response, scanning {} messages for tool results...", len(all_msgs))
                     
                     # Also check if tool was actually called
                     tool_was_called = False
@@ -536,10 +560,10 @@ class LLMService:
                                 if part.__class__.__name__ == 'ToolCallPart':
                                     tool_name = getattr(part, 'tool_name', '')
                                     tool_was_called = True
-                                    logger.info(f"  ✅ Found ToolCallPart: {tool_name}")
+                                    hot.debug("  ✅ Found ToolCallPart: {}", tool_name)
                     
                     if not tool_was_called:
-                        logger.warning(f"⚠️  LLM did NOT call any tools (answered from memory/history)")
+                        logger.debug("⚠️  LLM did NOT call any tools (answered from memory/history)")
                     
                     # Track unique results to avoid duplicates
                     seen_results = set()
@@ -562,22 +586,22 @@ class LLMService:
 
                                     if result and '[No messages found in knowledge base' in result:
                                         kb_empty_result_found = True
-                                        logger.info(f"📚 KB returned empty result instruction")
+                                        logger.debug("📚 KB returned empty result instruction")
                                     elif result and '━━━━━━━━━━━━━━━━━━━━' in result:
                                         # Found formatted KB snippets - deduplicate by content
                                         result_hash = hash(result)
                                         if result_hash not in seen_results:
                                             kb_tool_results.append(result)
                                             seen_results.add(result_hash)
-                                            logger.info(f"📚 Found KB snippets in tool result: {len(result)} chars")
+                                            logger.debug("📚 Found KB snippets in tool result: {} chars", len(result))
                                         else:
-                                            logger.info(f"⚠️  Skipping duplicate KB result: {len(result)} chars")
+                                            hot.debug("⚠️  Skipping duplicate KB result: {} chars", len(result))
                                     elif result:
                                         # Track last non-KB tool output (e.g., workflow execution) for fallback
                                         last_non_kb_tool_result = result
-                                        logger.info(
-                                            "🧩 Captured tool result for fallback: "
-                                            f"{tool_name or 'unknown'} ({len(result)} chars)"
+                                        hot.debug(
+                                            "🧩 Captured tool result for fallback: {} ({} chars)",
+                                            tool_name or 'unknown', len(result)
                                         )
                     
                     # Handle empty KB result - provide helpful default response
@@ -685,7 +709,7 @@ Generate ONLY the summary text (no formatting, no extra text)."""
                             yield kb_result
                             full_response += kb_result
                     else:
-                        logger.info("📚 No KB snippets found in tool results")
+                        logger.debug("📚 No KB snippets found in tool results")
 
                     # If LLM produced no text but a tool returned rich output, use it as response
                     if (not full_response or not full_response.strip()) and last_non_kb_tool_result:
@@ -693,7 +717,7 @@ Generate ONLY the summary text (no formatting, no extra text)."""
                         yield last_non_kb_tool_result
                         full_response = last_non_kb_tool_result
                 else:
-                    logger.info("✅ KB snippets already present in LLM response")
+                    logger.debug("✅ KB snippets already present in LLM response")
             
             # Save to history after completion
             if save_history and thread_id:
@@ -710,9 +734,9 @@ Generate ONLY the summary text (no formatting, no extra text)."""
                     youtube_video_title=youtube_video_title
                 )
                 
-                # Update conversation summary in background (non-blocking)
+                # Update conversation summary in background (queued, one job per thread)
                 if save_history and thread:
-                    asyncio.create_task(self._update_summary_async(user_id, thread))
+                    await self._update_summary_async(user_id, thread)
                 
                 # Phase 5: Index ASSISTANT message to KB after LLM response
                 if kb_index and settings.ELASTICSEARCH_ENABLED:
@@ -882,7 +906,7 @@ Generate ONLY the summary text (no formatting, no extra text)."""
                 yield fallback_message
                 full_response = fallback_message
             
-            logger.info(f"✅ Response complete: {len(full_response)} chars")
+            logger.info("✅ Response complete: user={}, thread={}, {} chars", user_id, thread_id, len(full_response))
             
             # Clear KB search cache after conversation turn completes
             try:
@@ -974,7 +998,7 @@ Generate ONLY the summary text (no formatting, no extra text)."""
                 except:
                     continue
             
-            logger.info(f"📚 Loaded {len(history)} messages from history")
+            logger.debug("📚 Loaded {} messages from history", len(history))
             return history
             
         except Exception as e:
@@ -1048,7 +1072,7 @@ Generate ONLY the summary text (no formatting, no extra text)."""
             # Set expiry (7 days)
             await redis_client.expire(key, 7 * 24 * 60 * 60)
             
-            logger.info(f"💾 Saved conversation turn to history")
+            logger.debug("💾 Saved conversation turn to history")
             
         except Exception as e:
             logger.warning(f"⚠️  Failed to save history: {e}")
@@ -1069,26 +1093,20 @@ Generate ONLY the summary text (no formatting, no extra text)."""
     
     async def _update_summary_async(self, user_id: int, thread: "Thread"):
         """
-        Background task to update conversation summary.
+        Queue a conversation summary update.
         
-        This is called asynchronously after saving history to update
-        the conversation summary if needed (every N messages).
+        The background job updates the conversation summary if needed
+        (every N messages); pending jobs are deduplicated per thread.
         
         Args:
             user_id: User ID
             thread: Thread object to update
         """
         try:
-            from luka_bot.services.conversation_summary_service import get_conversation_summary_service
-            summary_service = get_conversation_summary_service()
-            
-            # Update summary if needed (will check interval internally)
-            new_summary = await summary_service.update_summary_if_needed(user_id, thread)
-            
-            if new_summary:
-                logger.info(f"📝 Background task updated summary for thread {thread.thread_id}")
+            from luka_bot.services.background_jobs import enqueue_conversation_summary
+            await enqueue_conversation_summary(user_id, thread.thread_id)
         except Exception as e:
-            logger.warning(f"Failed to update conversation summary in background: {e}")
+            logger.warning(f"Failed to queue conversation summary update: {e}")
     
     def _get_default_system_prompt(self, language: str = "en") -> str:
         """
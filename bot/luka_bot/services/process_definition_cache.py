@@ -58,7 +58,7 @@ class ProcessDefinitionCache:
         from camunda_client.clients.dto import AuthData
         from camunda_client.clients.engine.schemas.query import ProcessDefinitionQuerySchema
         from luka_bot.core.config import settings
-        import httpx
+        from luka_bot.services.camunda_service import get_camunda_service
 
         try:
             # Use system admin credentials for loading process definitions
@@ -67,14 +67,10 @@ class ProcessDefinitionCache:
                 password=settings.ENGINE_PASSWORD
             )
             
-            transport = httpx.AsyncHTTPTransport(
-                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-            )
-            
             client = CamundaEngineClient(
                 base_url=settings.ENGINE_URL,
                 auth_data=auth_data,
-                transport=transport
+                http_client=get_camunda_service().http_client
             )
 
             # Query for all latest versions of process definitions
@@ -0,0 +1,433 @@
+"""
+Multiplexed task event channel to Warehouse API.
+
+Instead of one WebSocket per Telegram user, a small pool of
+service-authenticated connections carries events for all users. Users are
+sharded across the pool and subscribed with control frames; incoming
+events are dispatched to per-user handlers through an in-process router.
+
+Protocol (client → server):
+    {"type": "subscribe", "user_ids": [922705, ...]}
+    {"type": "unsubscribe", "user_ids": [922705, ...]}
+
+Acknowledgements (server → client):
+    {"type": "subscribed", "user_ids": [922705, ...]}
+    {"type": "unsubscribed", "user_ids": [922705, ...]}
+
+A user counts as connected only once the server has acknowledged their
+subscription on the current socket; until then callers keep their polling
+fallback. Events (server → client) use the same payload as per-user
+connections and are routed by their "assignee" (telegram_user_id).
+"""
+import asyncio
+import json
+import random
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set
+
+from websockets import connect, WebSocketClientProtocol
+from websockets.exceptions import ConnectionClosed
+from loguru import logger
+
+from luka_bot.core.config import settings
+from luka_bot.services.task_websocket_connection import process_task_event
+
+TaskEventHandler = Callable[[Dict[str, Any], int], Awaitable[None]]
+
+# Max user ids per subscribe frame when (re)subscribing a whole shard
+SUBSCRIBE_BATCH_SIZE = 500
+
+# Events queued for one user before newer ones are dropped
+MAX_PENDING_EVENTS_PER_USER = 100
+
+
+class TaskEventRouter:
+    """
+    Maps Telegram user IDs to event handlers.
+
+    Events are queued per user and handled by a worker task that only exists
+    while the user has events pending. A slow handler (task service calls,
+    Telegram sends) delays only its own user's events; the channel keeps
+    reading and other users keep getting theirs. Events for one user are
+    handled in order.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING_EVENTS_PER_USER):
+        self.max_pending = max(1, max_pending)
+        self._handlers: Dict[int, TaskEventHandler] = {}
+        self._pending: Dict[int, Deque[Dict[str, Any]]] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        self.dropped = 0
+
+    def add(self, user_id: int, handler: TaskEventHandler):
+        self._handlers[user_id] = handler
+
+    def remove(self, user_id: int):
+        self._handlers.pop(user_id, None)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._handlers
+
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    def dispatch(self, event: Dict[str, Any]):
+        """Queue event for the assignee's handler (no-op if not subscribed)."""
+        assignee = event.get('assignee')
+        try:
+            user_id = int(assignee)
+        except (TypeError, ValueError):
+            logger.debug(f"Task event without numeric assignee: {assignee}")
+            return
+
+        if user_id not in self._handlers:
+            return
+
+        pending = self._pending.setdefault(user_id, deque())
+        if len(pending) >= self.max_pending:
+            self.dropped += 1
+            logger.warning(f"⚠️  Task events for user {user_id} backed up ({len(pending)} pending), dropping event")
+            return
+        pending.append(event)
+        if user_id not in self._workers:
+            self._workers[user_id] = asyncio.create_task(self._drain(user_id, pending))
+
+    async def _drain(self, user_id: int, pending: Deque[Dict[str, Any]]):
+        try:
+            while pending:
+                event = pending.popleft()
+                handler = self._handlers.get(user_id)
+                if handler is None:
+                    # Unsubscribed while events were queued
+                    pending.clear()
+                    break
+                try:
+                    await handler(event, user_id)
+                except Exception as e:
+                    logger.error(f"❌ Task event handler failed for user {user_id}: {e}")
+        finally:
+            self._workers.pop(user_id, None)
+            if not pending:
+                self._pending.pop(user_id, None)
+
+    async def join(self):
+        """Wait until every queued event has been handled."""
+        while self._workers:
+            await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+
+    async def close(self):
+        """Cancel queued events and running handlers."""
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+        self._pending.clear()
+
+    @property
+    def pending_events(self) -> int:
+        return sum(len(pending) for pending in self._pending.values())
+
+
+class TaskEventChannel:
+    """
+    One shared WebSocket carrying task events for a shard of users.
+
+    Keepalive uses the websockets library's built-in ping, so each channel
+    runs a single background task regardless of how many users it serves.
+    """
+
+    def __init__(self, shard: int, router: TaskEventRouter):
+        self.shard = shard
+        self.router = router
+        self.websocket: Optional[WebSocketClientProtocol] = None
+        self.is_connected = False
+        self.reconnect_attempts = 0
+
+        self._user_ids: Set[int] = set()
+        # Users the server acknowledged on the current socket
+        self._acked: Set[int] = set()
+        self._acks = asyncio.Condition()
+        self._run_task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+
+    @property
+    def user_count(self) -> int:
+        return len(self._user_ids)
+
+    @property
+    def acked_count(self) -> int:
+        return len(self._acked)
+
+    def is_subscribed(self, user_id: int) -> bool:
+        """True once the server acknowledged the user's subscription on the current socket."""
+        return self.is_connected and user_id in self._acked
+
+    def start(self):
+        """Start the connect/listen/reconnect loop (idempotent)."""
+        if self._run_task is None or self._run_task.done():
+            self._run_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the channel and close its socket."""
+        if self._run_task and not self._run_task.done():
+            self._run_task.cancel()
+            try:
+                await self._run_task
+            except asyncio.CancelledError:
+                pass
+        self._run_task = None
+        await self._close_socket()
+
+    async def wait_connected(self, timeout: float) -> bool:
+        """Wait until the channel is connected. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def wait_subscribed(self, user_id: int, timeout: float) -> bool:
+        """Wait until the user's subscription is acknowledged. Returns False on timeout."""
+        try:
+            async with self._acks:
+                await asyncio.wait_for(self._acks.wait_for(lambda: self.is_subscribed(user_id)), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def subscribe(self, user_id: int):
+        if user_id in self._user_ids:
+            return
+        self._user_ids.add(user_id)
+        # While disconnected the user is picked up by the resubscribe on connect
+        await self._send_control("subscribe", [user_id])
+
+    async def unsubscribe(self, user_id: int):
+        if user_id not in self._user_ids:
+            return
+        self._user_ids.discard(user_id)
+        self._acked.discard(user_id)
+        await self._send_control("unsubscribe", [user_id])
+
+    async def _send_control(self, frame_type: str, user_ids: List[int]):
+        if not (self.is_connected and self.websocket):
+            return
+        try:
+            await self.websocket.send(json.dumps({"type": frame_type, "user_ids": user_ids}))
+        except Exception as e:
+            # Connection is going away; the listen loop reconnects and resubscribes
+            logger.warning(f"⚠️  Task channel {self.shard}: {frame_type} failed: {e}")
+
+    async def _resubscribe_all(self):
+        user_ids = sorted(self._user_ids)
+        for i in range(0, len(user_ids), SUBSCRIBE_BATCH_SIZE):
+            await self._send_control("subscribe", user_ids[i:i + SUBSCRIBE_BATCH_SIZE])
+
+    def _backoff_delay(self) -> float:
+        """Full-jitter exponential backoff, so replicas don't reconnect in lockstep."""
+        cap = settings.WAREHOUSE_WS_MAX_RECONNECT_DELAY
+        ceiling = min(cap, settings.WAREHOUSE_WS_RECONNECT_DELAY * (2 ** min(self.reconnect_attempts, 10)))
+        return random.uniform(0, ceiling)
+
+    async def _run(self):
+        ws_url = f"{settings.WAREHOUSE_WS_URL}/api/ws/tasks"
+        token = settings.WAREHOUSE_WS_SERVICE_TOKEN or settings.FLOW_API_SYS_KEY
+        headers = {"Authorization": f"Bearer {token}"}
+        max_attempts = settings.WAREHOUSE_WS_MAX_RECONNECT_ATTEMPTS
+
+        while True:
+            try:
+                self.websocket = await connect(
+                    ws_url,
+                    additional_headers=headers,
+                    ping_interval=settings.WAREHOUSE_WS_HEARTBEAT_INTERVAL,
+                )
+                self.is_connected = True
+                self.reconnect_attempts = 0
+                self._connected.set()
+                logger.info(f"✅ Task channel {self.shard} connected → {ws_url} ({self.user_count} users)")
+
+                await self._resubscribe_all()
+                await self._listen()
+
+            except asyncio.CancelledError:
+                raise
+            except ConnectionClosed:
+                logger.warning(f"⚠️  Task channel {self.shard} closed")
+            except Exception as e:
+                logger.error(f"❌ Task channel {self.shard} error: {e}")
+            finally:
+                self.is_connected = False
+                self._connected.clear()
+                # Subscriptions are per socket; the next connection resubscribes
+                self._acked.clear()
+                await self._close_socket()
+
+            if max_attempts >= 0 and self.reconnect_attempts >= max_attempts:
+                logger.error(f"❌ Task channel {self.shard}: max reconnect attempts ({max_attempts}) reached")
+                return
+
+            delay = self._backoff_delay()
+            self.reconnect_attempts += 1
+            logger.info(
+                f"🔄 Reconnecting task channel {self.shard} "
+                f"(attempt {self.reconnect_attempts}, delay {delay:.1f}s)"
+            )
+            await asyncio.sleep(delay)
+
+    async def _listen(self):
+        async for message in self.websocket:
+            try:
+                event = json.loads(message)
+            except (TypeError, json.JSONDecodeError):
+                logger.warning(f"⚠️  Invalid JSON on task channel {self.shard}: {str(message)[:200]}")
+                continue
+            if not isinstance(event, dict):
+                continue
+            frame_type = event.get("type")
+            if frame_type in ("subscribed", "unsubscribed"):
+                await self._on_ack(frame_type, event.get("user_ids") or [])
+            else:
+                self.router.dispatch(event)
+
+    async def _on_ack(self, frame_type: str, user_ids: Iterable[Any]):
+        acked = set()
+        for user_id in user_ids:
+            try:
+                acked.add(int(user_id))
+            except (TypeError, ValueError):
+                continue
+        if frame_type == "subscribed":
+            # Ignore acks for users unsubscribed since the frame was sent
+            self._acked |= acked & self._user_ids
+        else:
+            self._acked -= acked
+        async with self._acks:
+            self._acks.notify_all()
+
+    async def _close_socket(self):
+        if self.websocket:
+            try:
+                await self.websocket.close()
+            except Exception as e:
+                logger.warning(f"⚠️  Error closing task channel {self.shard}: {e}")
+            self.websocket = None
+
+
+class TaskEventSubscription:
+    """
+    Per-user handle on the multiplexed channel.
+
+    Mirrors the parts of TaskWebSocketConnection that callers use
+    (`is_connected`, `jwt_token`, `update_jwt_token`, `disconnect`,
+    `get_status`) without owning a socket or background task.
+    """
+
+    def __init__(self, multiplexer: "TaskEventMultiplexer", user_id: int, jwt_token: str):
+        self._multiplexer = multiplexer
+        self.user_id = user_id
+        self.jwt_token = jwt_token
+
+    @property
+    def is_connected(self) -> bool:
+        return self._multiplexer.is_user_connected(self.user_id)
+
+    def update_jwt_token(self, new_token: str):
+        # The shared channel authenticates with the service token
+        self.jwt_token = new_token
+
+    async def disconnect(self):
+        await self._multiplexer.unsubscribe(self.user_id)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "is_connected": self.is_connected,
+            "multiplexed": True,
+            "shard": self._multiplexer.shard_for(self.user_id),
+        }
+
+
+class TaskEventMultiplexer:
+    """
+    Pool of task event channels with a lazy subscribe/unsubscribe API.
+
+    Channels are created on first subscription to their shard, so sockets
+    and timers scale with WAREHOUSE_WS_POOL_SIZE per replica, not with users.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None):
+        self.pool_size = max(1, pool_size or settings.WAREHOUSE_WS_POOL_SIZE)
+        self.router = TaskEventRouter()
+        self._channels: Dict[int, TaskEventChannel] = {}
+
+    def shard_for(self, user_id: int) -> int:
+        return user_id % self.pool_size
+
+    def _channel_for(self, user_id: int) -> TaskEventChannel:
+        shard = self.shard_for(user_id)
+        channel = self._channels.get(shard)
+        if channel is None:
+            channel = TaskEventChannel(shard, self.router)
+            self._channels[shard] = channel
+        channel.start()
+        return channel
+
+    def is_user_connected(self, user_id: int) -> bool:
+        channel = self._channels.get(self.shard_for(user_id))
+        return bool(channel and channel.is_subscribed(user_id) and user_id in self.router)
+
+    async def subscribe(
+        self,
+        user_id: int,
+        handler: TaskEventHandler = process_task_event,
+        connect_timeout: float = 0.0,
+    ) -> bool:
+        """
+        Route the user's task events to `handler`.
+
+        Args:
+            user_id: Telegram user ID
+            handler: Coroutine called with (event, user_id)
+            connect_timeout: Seconds to wait for the server to acknowledge the
+                subscription (0 = don't wait)
+
+        Returns:
+            True if the server acknowledged the user's subscription
+        """
+        self.router.add(user_id, handler)
+        channel = self._channel_for(user_id)
+        await channel.subscribe(user_id)
+        if connect_timeout > 0 and not channel.is_subscribed(user_id):
+            await channel.wait_subscribed(user_id, connect_timeout)
+        return self.is_user_connected(user_id)
+
+    async def unsubscribe(self, user_id: int):
+        self.router.remove(user_id)
+        channel = self._channels.get(self.shard_for(user_id))
+        if channel:
+            await channel.unsubscribe(user_id)
+
+    async def close(self):
+        for channel in self._channels.values():
+            await channel.stop()
+        self._channels.clear()
+        await self.router.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self.pool_size,
+            "subscribed_users": len(self.router),
+            "pending_events": self.router.pending_events,
+            "dropped_events": self.router.dropped,
+            "channels": {
+                shard: {
+                    "connected": ch.is_connected,
+                    "users": ch.user_count,
+                    "acked_users": ch.acked_count,
+                    "reconnect_attempts": ch.reconnect_attempts,
+                }
+                for shard, ch in self._channels.items()
+            },
+        }
@@ -4,6 +4,7 @@ Handles authentication, reconnection, and event processing for task notification
 """
 import asyncio
 import json
+import random
 import time
 from typing import Optional, Dict, Any
 from websockets import connect, WebSocketClientProtocol
@@ -155,13 +156,13 @@ class TaskWebSocketConnection:
         
         self.reconnect_attempts += 1
         
-        # Exponential backoff: 5s, 10s, 20s, 40s, 80s, then cap at 160s
+        # Exponential backoff: 5s, 10s, 20s, 40s, 80s, then cap at 160s (minus up to 50% jitter)
         # Add extra delay if we've been getting server errors
         base_delay = self.reconnect_delay * (2 ** min(self.reconnect_attempts - 1, 5))
         if self.server_error_count >= self.max_server_errors:
-            delay = max(base_delay, self.server_error_backoff)
-        else:
-            delay = base_delay
+            base_delay = max(base_delay, self.server_error_backoff)
+        # Jitter so users don't reconnect in lockstep after a Flow API restart
+        delay = round(random.uniform(base_delay / 2, base_delay), 1)
         
         logger.info(
             f"🔄 Reconnecting WebSocket for user {self.user_id} "
@@ -205,63 +206,9 @@ class TaskWebSocketConnection:
             logger.error(f"❌ Error handling WebSocket message for user {self.user_id}: {e}")
     
     async def _process_task_event(self, event: Dict[str, Any]):
-        """
-        Process task event and trigger appropriate action.
-        
-        Event structure:
-        {
-            "eventType": "create" | "complete" | "update" | "delete",
-            "taskId": "task-uuid",
-            "taskName": "Task Name",
-            "assignee": "922705",  # telegram_user_id
-            "processInstanceId": "process-uuid",
-            "processDefinitionKey": "chatbot_group_import_history",
-            "timestamp": 1234567890,
-            "variables": {...}
-        }
-        """
-        event_type = event.get('eventType', '').lower()
-        task_id = event.get('taskId')
-        task_name = event.get('taskName', 'Unknown Task')
-        assignee = event.get('assignee')
-        process_id = event.get('processInstanceId')
-        process_definition_key = event.get('processDefinitionKey')
-        
-        # Filter: Only process tasks from chatbot_* process definitions
-        if not process_definition_key or not process_definition_key.startswith('chatbot_'):
-            logger.info(
-                f"🚫 Skipping task from non-chatbot process\n"
-                f"   Task: {task_name} ({task_id})\n"
-                f"   Process Definition: {process_definition_key}"
-            )
-            return
-        
-        logger.info(
-            f"📬 Task Event: {event_type.upper()}\n"
-            f"   Task: {task_name} ({task_id})\n"
-            f"   Process: {process_id}\n"
-            f"   Process Definition: {process_definition_key}\n"
-            f"   User: {assignee}"
-        )
-        
-        # Route to appropriate handler
+        """Route task event to TaskService (see `process_task_event`)."""
         # Pass self.user_id (Telegram user ID) since this connection is authenticated for this user
-        from luka_bot.services.task_service import get_task_service
-        task_service = get_task_service()
-        
-        try:
-            if event_type == 'create':
-                await task_service.handle_task_created_event(event, self.user_id)
-            elif event_type == 'complete':
-                await task_service.handle_task_completed_event(event, self.user_id)
-            elif event_type == 'update':
-                await task_service.handle_task_updated_event(event, self.user_id)
-            elif event_type == 'delete':
-                await task_service.handle_task_deleted_event(event, self.user_id)
-            else:
-                logger.warning(f"⚠️  Unknown event type: {event_type}")
-        except Exception as e:
-            logger.error(f"❌ Error processing {event_type} event for task {task_id}: {e}")
+        await process_task_event(event, self.user_id)
     
     def update_jwt_token(self, new_token: str):
         """
@@ -292,3 +239,71 @@ class TaskWebSocketConnection:
             "heartbeat_task_running": self._heartbeat_task and not self._heartbeat_task.done() if self._heartbeat_task else False,
         }
 
+
+async def process_task_event(event: Dict[str, Any], user_id: int):
+    """
+    Process task event and trigger appropriate action.
+    
+    Shared by per-user connections and the multiplexed task event channel.
+    
+    Event structure:
+    {
+        "eventType": "create" | "complete" | "update" | "delete",
+        "taskId": "task-uuid",
+        "taskName": "Task Name",
+        "assignee": "922705",  # telegram_user_id
+        "processInstanceId": "process-uuid",
+        "processDefinitionKey": "chatbot_group_import_history",
+        "timestamp": 1234567890,
+        "variables": {...}
+    }
+    
+    Args:
+        event: Task event payload
+        user_id: Telegram user ID the event is delivered to
+    """
+    event_type = event.get('eventType', '').lower()
+    task_id = event.get('taskId')
+    task_name = event.get('taskName', 'Unknown Task')
+    assignee = event.get('assignee')
+    process_id = event.get('processInstanceId')
+    process_definition_key = event.get('processDefinitionKey')
+    
+    # Any task change makes cached task lists stale, chatbot process or not
+    from luka_bot.services.camunda_service import get_camunda_service
+    get_camunda_service().invalidate_tasks(user_id, task_id)
+    
+    # Filter: Only process tasks from chatbot_* process definitions
+    if not process_definition_key or not process_definition_key.startswith('chatbot_'):
+        logger.info(
+            f"🚫 Skipping task from non-chatbot process\n"
+            f"   Task: {task_name} ({task_id})\n"
+            f"   Process Definition: {process_definition_key}"
+        )
+        return
+    
+    logger.info(
+        f"📬 Task Event: {event_type.upper()}\n"
+        f"   Task: {task_name} ({task_id})\n"
+        f"   Process: {process_id}\n"
+        f"   Process Definition: {process_definition_key}\n"
+        f"   User: {assignee}"
+    )
+    
+    # Route to appropriate handler
+    from luka_bot.services.task_service import get_task_service
+    task_service = get_task_service()
+    
+    try:
+        if event_type == 'create':
+            await task_service.handle_task_created_event(event, user_id)
+        elif event_type == 'complete':
+            await task_service.handle_task_completed_event(event, user_id)
+        elif event_type == 'update':
+            await task_service.handle_task_updated_event(event, user_id)
+        elif event_type == 'delete':
+            await task_service.handle_task_deleted_event(event, user_id)
+        else:
+            logger.warning(f"⚠️  Unknown event type: {event_type}")
+    except Exception as e:
+        logger.error(f"❌ Error processing {event_type} event for task {task_id}: {e}")
@@ -1,14 +1,19 @@
 """
 Global WebSocket connection manager.
-Maintains per-user WebSocket connections with thread-safe access.
+Maintains per-user WebSocket connections with thread-safe access, or
+per-user subscriptions on a shared multiplexed channel when
+WAREHOUSE_WS_MULTIPLEXED is enabled.
 """
 import asyncio
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from loguru import logger
 
+from luka_bot.services.task_event_channel import TaskEventMultiplexer, TaskEventSubscription
 from luka_bot.services.task_websocket_connection import TaskWebSocketConnection
 from luka_bot.core.config import settings
 
+TaskEventConnection = Union[TaskWebSocketConnection, TaskEventSubscription]
+
 
 class WebSocketManager:
     """
@@ -18,12 +23,17 @@ class WebSocketManager:
     
     def __init__(self):
         """Initialize WebSocket manager."""
-        # user_id → WebSocket connection
-        self._connections: Dict[int, TaskWebSocketConnection] = {}
+        # user_id → WebSocket connection (or subscription handle in multiplexed mode)
+        self._connections: Dict[int, TaskEventConnection] = {}
         
         # Per-user locks for thread-safe connection creation
         self._locks: Dict[int, asyncio.Lock] = {}
         
+        # Shared channel pool (multiplexed mode only)
+        self._multiplexer: Optional[TaskEventMultiplexer] = (
+            TaskEventMultiplexer() if settings.WAREHOUSE_WS_MULTIPLEXED else None
+        )
+        
         logger.debug("WebSocketManager initialized")
     
     def _get_lock(self, user_id: int) -> asyncio.Lock:
@@ -44,7 +54,7 @@ class WebSocketManager:
         self, 
         user_id: int, 
         jwt_token: str
-    ) -> TaskWebSocketConnection:
+    ) -> Optional[TaskEventConnection]:
         """
         Get existing WebSocket connection or create new one.
         Thread-safe and idempotent.
@@ -54,13 +64,17 @@ class WebSocketManager:
             jwt_token: JWT token for authentication
             
         Returns:
-            TaskWebSocketConnection instance
+            TaskWebSocketConnection, or TaskEventSubscription in multiplexed mode
         """
         # Check if WebSocket connections are disabled
         from luka_bot.core.config import settings
         if not settings.WAREHOUSE_WS_ENABLED:
             logger.debug(f"WebSocket connections disabled, skipping for user {user_id}")
             return None
+        
+        if self._multiplexer is not None:
+            return await self._get_or_create_subscription(user_id, jwt_token)
+        
         lock = self._get_lock(user_id)
         
         async with lock:
@@ -95,7 +109,20 @@ class WebSocketManager:
             
             return conn
     
-    def get_connection(self, user_id: int) -> Optional[TaskWebSocketConnection]:
+    async def _get_or_create_subscription(self, user_id: int, jwt_token: str) -> TaskEventSubscription:
+        """Subscribe user on the shared channel (no per-user socket, task or lock)."""
+        sub = self._connections.get(user_id)
+        if sub is not None:
+            sub.update_jwt_token(jwt_token)
+            return sub
+        
+        sub = TaskEventSubscription(self._multiplexer, user_id, jwt_token)
+        self._connections[user_id] = sub
+        await self._multiplexer.subscribe(user_id)
+        logger.debug(f"🔔 Subscribed user {user_id} to task channel {self._multiplexer.shard_for(user_id)}")
+        return sub
+    
+    def get_connection(self, user_id: int) -> Optional[TaskEventConnection]:
         """
         Get existing connection without creating new one.
         
@@ -145,6 +172,9 @@ class WebSocketManager:
             except Exception as e:
                 logger.error(f"❌ Error disconnecting user {user_id}: {e}")
         
+        if self._multiplexer is not None:
+            await self._multiplexer.close()
+        
         logger.info("✅ All WebSocket connections disconnected")
     
     def get_stats(self) -> Dict[str, any]:
@@ -156,13 +186,16 @@ class WebSocketManager:
         """
         active_connections = sum(1 for conn in self._connections.values() if conn.is_connected)
         
-        return {
+        stats = {
             "total_connections": len(self._connections),
             "active_connections": active_connections,
             "users": list(self._connections.keys()),
             "warehouse_enabled": settings.WAREHOUSE_ENABLED,
             "warehouse_ws_url": settings.WAREHOUSE_WS_URL,
         }
+        if self._multiplexer is not None:
+            stats["multiplexed"] = self._multiplexer.get_stats()
+        return stats
     
     def get_connection_status(self, user_id: int) -> Optional[Dict[str, any]]:
         """
@@ -292,7 +292,7 @@ class ThreadService:
             # Sort by updated_at (newest first)
             threads.sort(key=lambda t: t.updated_at, reverse=True)
             
-            logger.info(f"📚 Listed {len(threads)} threads for user {user_id} (excluded group threads: {exclude_group_threads})")
+            logger.debug("📚 Listed {} threads for user {} (excluded group threads: {})", len(threads), user_id, exclude_group_threads)
             return threads
             
         except Exception as e:
@@ -308,7 +308,7 @@ class ThreadService:
         """
         thread.updated_at = datetime.utcnow()
         await self._save_thread(thread)
-        logger.info(f"💾 Updated thread {thread.thread_id}")
+        logger.debug("💾 Updated thread {}", thread.thread_id)
     
     async def delete_thread(self, thread_id: str, user_id: int) -> bool:
         """
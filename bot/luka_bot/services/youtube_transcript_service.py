@@ -0,0 +1,322 @@
+"""
+YouTube transcript service.
+
+youtube-transcript-api and the Google API client are synchronous; calling
+them from the bot's handlers blocked the event loop for seconds per video,
+and every user sharing the same link paid for the same fetch. This service:
+
+- runs fetches in a bounded thread pool, each with a timeout
+- reuses the YouTube Data API client (one per worker thread, since the
+  underlying httplib2 transport isn't thread-safe)
+- caches transcripts per (video id, language) and metadata per video id
+  in Redis, zlib-compressed
+- coalesces concurrent requests for the same video (single-flight)
+- stores transcripts pre-chunked, so summarization can work chunk by chunk
+"""
+import asyncio
+import json
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from luka_bot.core.config import settings
+from luka_bot.utils.single_flight import SingleFlight
+
+REDIS_KEY_PREFIX = "youtube"
+
+
+@dataclass
+class YouTubeTranscript:
+    """A fetched (or cached) transcript, split into summarization-sized chunks."""
+    video_id: str
+    language: str
+    chunks: List[str]
+    video_info: Optional[Dict[str, str]] = None
+    from_cache: bool = field(default=False, compare=False)
+
+    @property
+    def text(self) -> str:
+        # Chunks are split on single spaces of whitespace-normalized text
+        return " ".join(self.chunks)
+
+
+def chunk_text(text: str, max_chars: int) -> List[str]:
+    """
+    Split whitespace-normalized text into chunks of at most `max_chars`.
+
+    Splits at the last sentence end in the chunk when there is one, otherwise
+    at the last space, so `" ".join(chunks) == text` (unless a single word
+    is longer than `max_chars`).
+    """
+    chunks: List[str] = []
+    while len(text) > max_chars:
+        window = text[:max_chars + 1]
+        cut = max(window.rfind(". "), window.rfind("? "), window.rfind("! "))
+        cut = cut + 1 if cut > max_chars // 2 else window.rfind(" ")
+        if cut <= 0:
+            cut = max_chars
+            chunks.append(text[:cut])
+            text = text[cut:]
+            continue
+        chunks.append(text[:cut])
+        text = text[cut + 1:]
+    if text:
+        chunks.append(text)
+    return chunks
+
+
+def _segments_to_text(segments) -> str:
+    if isinstance(segments, list):
+        text = " ".join(s.get('text', '') for s in segments if isinstance(s, dict) and s.get('text'))
+    else:
+        # Some implementations return iterable custom objects
+        parts = []
+        for s in segments:
+            try:
+                parts.append(getattr(s, 'text', '') or '')
+            except Exception:
+                continue
+        text = " ".join(p for p in parts if p)
+    return ' '.join(text.split())
+
+
+def _languages_order(language: str) -> List[str]:
+    languages_order = [language] if language else []
+    if 'en' not in languages_order:
+        languages_order.append('en')
+    for code in ['en-US', 'en-GB']:
+        if code not in languages_order:
+            languages_order.append(code)
+    return languages_order
+
+
+class YouTubeTranscriptService:
+    """
+    Off-loop, cached YouTube transcript and metadata fetching.
+
+    Args:
+        redis: Async Redis client for the shared cache (None = no Redis cache)
+        max_workers: Fetch thread pool size
+        timeout: Seconds to wait for one fetch
+        cache_ttl: Seconds to keep transcripts and metadata in Redis
+        chunk_chars: Max characters per transcript chunk
+    """
+
+    def __init__(
+        self,
+        redis=None,
+        max_workers: int = 4,
+        timeout: float = 20.0,
+        cache_ttl: int = 7 * 24 * 3600,
+        chunk_chars: int = 4000,
+    ):
+        self.redis = redis
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.chunk_chars = max(1, chunk_chars)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="youtube")
+        self._local = threading.local()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    # ---- blocking fetchers (worker threads) ----
+
+    def _youtube_client(self):
+        client = getattr(self._local, "youtube", None)
+        if client is None:
+            from googleapiclient.discovery import build
+            client = build('youtube', 'v3', developerKey=settings.YOUTUBE_API_KEY, cache_discovery=False)
+            self._local.youtube = client
+        return client
+
+    def _fetch_video_info_sync(self, video_id: str) -> Optional[Dict[str, str]]:
+        resp = self._youtube_client().videos().list(part='snippet,contentDetails', id=video_id).execute()
+        items = resp.get('items') or []
+        if not items:
+            return None
+        item = items[0]
+        snippet = item.get('snippet', {})
+        cd = item.get('contentDetails', {})
+        return {
+            'title': snippet.get('title', ''),
+            'channel_title': snippet.get('channelTitle', ''),
+            'published_at': snippet.get('publishedAt', ''),
+            'duration': cd.get('duration', ''),
+        }
+
+    def _fetch_transcript_sync(self, video_id: str, language: str) -> str:
+        from youtube_transcript_api import YouTubeTranscriptApi
+
+        languages_order = _languages_order(language)
+        segments = None
+        last_error: Optional[str] = None
+        api = getattr(self._local, "transcript_api", None)
+        if api is None:
+            api = self._local.transcript_api = YouTubeTranscriptApi()
+
+        # Preferred: list transcripts and fetch
+        try:
+            try:
+                transcript_list_obj = api.list_transcripts(video_id)  # newer API
+            except AttributeError:
+                transcript_list_obj = api.list(video_id)  # older API fallback
+
+            transcript = None
+            # Manual first, then generated, then any preferred
+            for finder in ("find_manually_created_transcript", "find_generated_transcript", "find_transcript"):
+                try:
+                    transcript = getattr(transcript_list_obj, finder)(languages_order)
+                    break
+                except Exception:
+                    continue
+            if transcript:
+                segments = transcript.fetch()
+        except Exception as e:
+            last_error = f"list/fetch failed: {e}"
+            # Fallback to direct fetch
+            try:
+                segments = api.fetch(video_id, languages=languages_order)
+            except Exception as ee:
+                last_error = f"direct fetch failed: {ee}"
+                segments = None
+
+        if not segments:
+            logger.info(f"YouTube transcript not available for {video_id}: {last_error}")
+            return ""
+        return _segments_to_text(segments)
+
+    async def _run(self, func: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(loop.run_in_executor(self._executor, func, *args), timeout=self.timeout)
+
+    # ---- Redis cache ----
+
+    async def _cache_get(self, key: str) -> Optional[Any]:
+        if self.redis is None:
+            return None
+        try:
+            raw = await self.redis.get(key)
+            return json.loads(zlib.decompress(raw)) if raw else None
+        except Exception as e:
+            logger.warning(f"⚠️ YouTube cache read failed for {key}: {e}")
+            return None
+
+    async def _cache_set(self, key: str, value: Any) -> None:
+        if self.redis is None:
+            return
+        try:
+            payload = zlib.compress(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+            await self.redis.set(key, payload, ex=self.cache_ttl)
+        except Exception as e:
+            logger.warning(f"⚠️ YouTube cache write failed for {key}: {e}")
+
+    # ---- public API ----
+
+    async def get_video_info(self, video_id: str) -> Optional[Dict[str, str]]:
+        """
+        Get video metadata (title, channel, published, duration).
+
+        Returns:
+            Metadata dict, or None if no API key is configured or the lookup fails
+        """
+        if not getattr(settings, 'YOUTUBE_API_KEY', None):
+            return None
+
+        key = f"{REDIS_KEY_PREFIX}:info:{video_id}"
+
+        async def load() -> Optional[Dict[str, str]]:
+            cached = await self._cache_get(key)
+            if cached is not None:
+                return cached
+            try:
+                info = await self._run(self._fetch_video_info_sync, video_id)
+            except Exception as e:
+                logger.warning(f"YouTube API get_video_info failed: {e!r}")
+                return None
+            if info:
+                await self._cache_set(key, info)
+            return info
+
+        return await self._flight.do(("info", video_id), load)
+
+    async def get_transcript(self, video_id: str, language: str = "en") -> Optional[YouTubeTranscript]:
+        """
+        Get a video's transcript (and metadata), from cache or YouTube.
+
+        Tries the requested language, then English, then any available.
+
+        Args:
+            video_id: YouTube video id
+            language: Preferred transcript language
+
+        Returns:
+            YouTubeTranscript, or None if the video has no usable transcript
+
+        Raises:
+            youtube_transcript_api errors (TranscriptsDisabled, NoTranscriptFound, ...)
+            asyncio.TimeoutError: If YouTube doesn't answer within the timeout
+        """
+        key = f"{REDIS_KEY_PREFIX}:transcript:{video_id}:{language}"
+
+        async def load() -> Optional[YouTubeTranscript]:
+            cached = await self._cache_get(key)
+            if cached is not None:
+                self.hits += 1
+                return YouTubeTranscript(**cached, from_cache=True)
+
+            self.misses += 1
+            text, video_info = await asyncio.gather(
+                self._run(self._fetch_transcript_sync, video_id, language),
+                self.get_video_info(video_id),
+            )
+            if not text:
+                return None
+
+            transcript = YouTubeTranscript(
+                video_id=video_id,
+                language=language,
+                chunks=chunk_text(text, self.chunk_chars),
+                video_info=video_info,
+            )
+            record = asdict(transcript)
+            record.pop("from_cache")
+            await self._cache_set(key, record)
+            logger.info(f"📺 Fetched transcript for {video_id} ({len(text)} chars, {len(transcript.chunks)} chunks)")
+            return transcript
+
+        return await self._flight.do(("transcript", video_id, language), load)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "inflight": len(self._flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self._flight.coalesced,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_youtube_transcript_service: Optional[YouTubeTranscriptService] = None
+
+
+def get_youtube_transcript_service() -> YouTubeTranscriptService:
+    """Get or create the YouTubeTranscriptService singleton."""
+    global _youtube_transcript_service
+    if _youtube_transcript_service is None:
+        from luka_bot.core.loader import redis_client
+        _youtube_transcript_service = YouTubeTranscriptService(
+            redis=redis_client,
+            max_workers=settings.YOUTUBE_FETCH_WORKERS,
+            timeout=settings.YOUTUBE_FETCH_TIMEOUT_SECONDS,
+            cache_ttl=settings.YOUTUBE_CACHE_TTL_SECONDS,
+            chunk_chars=settings.YOUTUBE_TRANSCRIPT_CHUNK_CHARS,
+        )
+        logger.info("✅ YouTubeTranscriptService singleton created")
+    return _youtube_transcript_service
@@ -0,0 +1 @@
+"""Tests for luka_bot module."""
@@ -0,0 +1,10 @@
+"""
+Shared setup for luka_bot tests.
+
+luka_bot.core.config builds its settings at import time and requires a bot
+token; give it a dummy one so service modules can be imported.
+"""
+
+import os
+
+os.environ.setdefault("BOT_TOKEN", "123456:test-token")
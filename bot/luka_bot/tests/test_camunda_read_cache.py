@@ -0,0 +1,160 @@
+"""
+Tests for the Camunda read cache.
+
+Tests TTL expiry, invalidation and the `cache_if` filter of CamundaReadCache,
+and which definition and start form results CamundaService caches, per user.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from camunda_client.exceptions import CamundaClientError
+from luka_bot.services import camunda_read_cache
+from luka_bot.services.camunda_read_cache import CamundaReadCache
+from luka_bot.services.camunda_service import CamundaService
+
+
+class Loader:
+    """Counts loads and returns the next value."""
+
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.values.pop(0)
+
+
+class TestCamundaReadCache:
+    """Test caching rules."""
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self):
+        """Test a value is served until its TTL passes, then loaded again."""
+        cache = CamundaReadCache()
+        loader = Loader("first", "second")
+        now = [100.0]
+
+        with patch.object(camunda_read_cache.time, "monotonic", lambda: now[0]):
+            assert await cache.get_or_load(("tasks", 1), 30, loader) == "first"
+            now[0] += 29
+            assert await cache.get_or_load(("tasks", 1), 30, loader) == "first"
+            now[0] += 2
+            assert await cache.get_or_load(("tasks", 1), 30, loader) == "second"
+
+        assert loader.calls == 2
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_by_prefix(self):
+        """Test invalidation drops matching entries only."""
+        cache = CamundaReadCache()
+        for key in [("tasks", 1), ("tasks", 2), ("task_variables", 1, "t1"), ("task_variables", 1, "t2")]:
+            await cache.get_or_load(key, 60, Loader(key))
+
+        cache.invalidate("task_variables", 1, "t1")
+        cache.invalidate("tasks", 1)
+
+        assert set(cache._entries) == {("tasks", 2), ("task_variables", 1, "t2")}
+        cache.invalidate(None, 1)
+        assert set(cache._entries) == {("tasks", 2)}
+
+    @pytest.mark.asyncio
+    async def test_invalidate_while_loading_is_not_stored(self):
+        """Test a load that started before an invalidation is returned but not cached."""
+        cache = CamundaReadCache()
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "stale"
+
+        load = asyncio.create_task(cache.get_or_load(("tasks", 1), 60, slow))
+        await asyncio.sleep(0)
+        cache.invalidate("tasks", 1)
+        release.set()
+
+        assert await load == "stale"
+        assert await cache.get_or_load(("tasks", 1), 60, Loader("fresh")) == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_cache_if_filters_values(self):
+        """Test values failing `cache_if` are returned but loaded again next time."""
+        cache = CamundaReadCache()
+        loader = Loader(([], "error"), (["form"], None))
+
+        def ok(result):
+            return result[1] is None
+
+        assert await cache.get_or_load(("start_form", 1), 60, loader, cache_if=ok) == ([], "error")
+        assert await cache.get_or_load(("start_form", 1), 60, loader, cache_if=ok) == (["form"], None)
+        assert await cache.get_or_load(("start_form", 1), 60, loader, cache_if=ok) == (["form"], None)
+        assert loader.calls == 2
+
+
+class TestCamundaServiceCaching:
+    """Test which definition and start form results are cached, and for whom."""
+
+    @pytest.fixture
+    def service(self):
+        service = CamundaService()
+        self.client = SimpleNamespace(
+            get_process_definition_start_form=AsyncMock(),
+            get_process_definitions=AsyncMock(),
+        )
+        with patch.object(service, "_get_client", AsyncMock(return_value=self.client)):
+            yield service
+
+    @pytest.mark.asyncio
+    async def test_form_and_missing_form_are_cached_per_user(self, service):
+        """Test a form and a 404 are cached, separately for each user."""
+        field = SimpleNamespace(value=None, type="String", label="Name", value_info=None)
+        self.client.get_process_definition_start_form.side_effect = [
+            {"name": field},
+            CamundaClientError(404, b'{"type": "InvalidRequestException"}'),
+        ]
+
+        variables, error = await service.get_start_form_variables(1, "proc")
+        assert error is None and variables[0]["label"] == "Name"
+        assert await service.get_start_form_variables(2, "proc") == ([], None)
+
+        assert (await service.get_start_form_variables(1, "proc"))[0][0]["name"] == "name"
+        assert await service.get_start_form_variables(2, "proc") == ([], None)
+        assert self.client.get_process_definition_start_form.await_count == 2
+
+    @pytest.mark.parametrize("failure", [
+        CamundaClientError(403, b'{"type": "AuthorizationException"}'),
+        CamundaClientError(500, b'{"error": "boom", "path": "/x"}'),
+        httpx.ConnectTimeout("timed out"),
+    ])
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_not_cached(self, service, failure):
+        """Test permission, server and connection failures return an error and aren't cached."""
+        self.client.get_process_definition_start_form.side_effect = [failure, {}]
+
+        variables, error = await service.get_start_form_variables(1, "proc")
+        assert variables == [] and error
+
+        assert await service.get_start_form_variables(1, "proc") == ([], None)
+        assert self.client.get_process_definition_start_form.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_definitions_are_cached_per_user(self, service):
+        """Test one user's definition (or fallback after a failure) isn't served to another."""
+        definition = SimpleNamespace(id="proc:1", key="proc", name="Proc", description=None, version=1)
+        self.client.get_process_definitions.side_effect = [
+            CamundaClientError(403, b""),
+            [definition],
+            [definition],
+        ]
+
+        assert (await service.get_process_definition(1, "proc")).get("id") is None
+        assert (await service.get_process_definition(2, "proc"))["id"] == "proc:1"
+        assert (await service.get_process_definition(1, "proc"))["id"] == "proc:1"
+        assert (await service.get_process_definition(2, "proc"))["id"] == "proc:1"
+        assert self.client.get_process_definitions.await_count == 3
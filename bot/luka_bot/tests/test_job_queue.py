@@ -0,0 +1,133 @@
+"""
+Tests for the Redis Streams job queue.
+
+Tests dedupe, retries into the dead-letter stream and reclaiming jobs a dead
+replica left pending, against fakeredis.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+
+from luka_bot.services import job_queue
+from luka_bot.services.job_queue import CONSUMER_GROUP, PRIORITIES, JobQueue, job_handler
+
+runs = []
+
+
+@job_handler("test_record", priority="low")
+async def record_job(payload: dict) -> None:
+    runs.append(payload["n"])
+
+
+@job_handler("test_fail", priority="high", max_attempts=2)
+async def fail_job(payload: dict) -> None:
+    runs.append(payload["n"])
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis()
+
+
+@pytest.fixture
+async def queue(redis):
+    runs.clear()
+    queue = JobQueue(redis, backoff_base=0.0, foreground_max_defer=5.0)
+    with patch.object(job_queue, "READ_BLOCK_MS", 50):
+        await queue.start()
+        yield queue
+        await queue.stop()
+
+
+async def _until(condition, timeout=5.0):
+    async def poll():
+        while not await condition():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+class TestEnqueue:
+    """Test the producer side."""
+
+    @pytest.mark.asyncio
+    async def test_dedupe_key_allows_one_pending_job(self, queue, redis):
+        """Test a second job with the same key is skipped until the first starts."""
+        stream = JobQueue.stream_key("low")
+        async with queue.foreground():
+            first = await queue.enqueue("test_record", {"n": 1}, dedupe_key="k")
+            second = await queue.enqueue("test_record", {"n": 2}, dedupe_key="k")
+            assert first and second is None
+            assert await redis.xlen(stream) == 1
+            assert (await redis.get(JobQueue.dedupe_redis_key("k"))).decode() == first
+
+        async def ran():
+            return runs == [1]
+        await _until(ran)
+
+        assert await redis.get(JobQueue.dedupe_redis_key("k")) is None
+        assert await queue.enqueue("test_record", {"n": 3}, dedupe_key="k")
+
+    @pytest.mark.asyncio
+    async def test_failed_add_leaves_no_dedupe_key(self, queue, redis):
+        """Test the dedupe key isn't claimed when adding the job fails."""
+        stream = JobQueue.stream_key("high")
+        await redis.delete(stream)
+        await redis.set(stream, "not a stream")
+
+        with pytest.raises(Exception, match="WRONGTYPE"):
+            await queue.enqueue("test_fail", {"n": 1}, dedupe_key="k")
+        assert await redis.get(JobQueue.dedupe_redis_key("k")) is None
+
+
+class TestRetries:
+    """Test failing jobs."""
+
+    @pytest.mark.asyncio
+    async def test_retry_then_dead_letter(self, queue, redis):
+        """Test a failing job is retried through the delayed set, then dead-lettered."""
+        await queue.enqueue("test_fail", {"n": 1})
+
+        async def dead():
+            return await redis.xlen(JobQueue.dead_key) == 1
+        await _until(dead)
+
+        assert runs == [1, 1]
+        [(_, fields)] = await redis.xrange(JobQueue.dead_key)
+        assert fields[b"attempt"] == b"1"
+        assert b"boom" in fields[b"error"]
+        assert await redis.xlen(JobQueue.stream_key("high")) == 0
+        assert await redis.zcard(JobQueue.delayed_key) == 0
+
+
+class TestReclaim:
+    """Test jobs left pending by a dead replica."""
+
+    @pytest.mark.asyncio
+    async def test_reclaim_counts_attempts(self, redis):
+        """Test each reclaim requeues with one more attempt, until the job is dead-lettered."""
+        stream = JobQueue.stream_key("high")
+        queue = JobQueue(redis, consumer="alive", claim_idle=0)
+        for priority in PRIORITIES:
+            await redis.xgroup_create(JobQueue.stream_key(priority), CONSUMER_GROUP, id="0", mkstream=True)
+        await redis.xadd(stream, {"id": "j1", "name": "test_fail", "payload": "{}", "attempt": "0"})
+
+        # A replica takes the job and dies without acking it
+        await redis.xreadgroup(CONSUMER_GROUP, "dead", {stream: ">"}, count=1)
+        await queue._reclaim()
+
+        [(_, fields)] = await redis.xrange(stream)
+        assert fields[b"id"] == b"j1" and fields[b"attempt"] == b"1"
+        assert (await redis.xpending(stream, CONSUMER_GROUP))["pending"] == 0
+
+        # The requeued run dies too: max_attempts (2) reached
+        await redis.xreadgroup(CONSUMER_GROUP, "dead", {stream: ">"}, count=1)
+        await queue._reclaim()
+
+        assert await redis.xlen(stream) == 0
+        [(_, fields)] = await redis.xrange(JobQueue.dead_key)
+        assert fields[b"id"] == b"j1"
+        assert (await redis.xpending(stream, CONSUMER_GROUP))["pending"] == 0
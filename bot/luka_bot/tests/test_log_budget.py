@@ -0,0 +1,75 @@
+"""
+Tests for hot-path logging helpers.
+
+Tests the per-call-site sampling rate of log_sampled, the throttle window of
+log_throttled, and the no-op hot.debug.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from loguru import logger
+
+from luka_bot.utils import log_budget
+from luka_bot.utils.log_budget import hot, log_sampled, log_throttled
+
+
+@pytest.fixture
+def records():
+    """Capture emitted records (message and `suppressed` count)."""
+    captured = []
+    handler_id = logger.add(
+        lambda message: captured.append((message.record["message"], message.record["extra"].get("suppressed"))),
+        level="DEBUG",
+        format="{message}",
+    )
+    yield captured
+    logger.remove(handler_id)
+
+
+class TestLogSampled:
+    """Test sampling."""
+
+    def test_logs_one_call_in_every(self, records):
+        """Test the first call and then one call in `every` are logged, with the skipped count."""
+        for n in range(10):
+            log_sampled("INFO", 3, "call {}", n)
+
+        assert records == [("call 0", 0), ("call 3", 2), ("call 6", 2), ("call 9", 2)]
+
+    def test_call_sites_are_sampled_separately(self, records):
+        """Test each call site keeps its own count."""
+        for n in range(4):
+            log_sampled("INFO", 4, "first {}", n)
+            log_sampled("INFO", 2, "second {}", n)
+
+        assert [message for message, _ in records] == ["first 0", "second 0", "second 2"]
+
+
+class TestLogThrottled:
+    """Test throttling."""
+
+    def test_logs_once_per_window(self, records):
+        """Test calls inside the window are dropped and counted on the next logged line."""
+        for now in [100.0, 101.0, 109.9, 110.0, 115.0, 125.0]:
+            with patch.object(log_budget.time, "monotonic", return_value=now):
+                log_throttled("WARNING", 10.0, "at {}", now)
+
+        assert records == [("at 100.0", 0), ("at 110.0", 2), ("at 125.0", 1)]
+
+
+class TestHotPathLogger:
+    """Test hot-path DEBUG switching."""
+
+    def test_debug_is_noop_until_enabled(self, records):
+        """Test hot.debug only reaches loguru while enabled."""
+        enabled = hot.enabled
+        try:
+            hot.enable(False)
+            hot.debug("dropped")
+            hot.enable(True)
+            hot.debug("kept {}", 1)
+        finally:
+            hot.enable(enabled)
+
+        assert [message for message, _ in records] == ["kept 1"]
@@ -0,0 +1,114 @@
+"""
+Tests for single-flight loading.
+
+Tests coalescing, error propagation, forgetting in-flight loads, and that
+waiters survive the loading caller being cancelled.
+"""
+
+import asyncio
+
+import pytest
+
+from luka_bot.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test SingleFlight.do."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_load(self):
+        """Test concurrent callers for one key run the loader once."""
+        flight = SingleFlight()
+        calls = 0
+        loaded = []
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(flight.do("key", loader, on_loaded=loaded.append) for _ in range(5)))
+
+        assert results == ["value"] * 5
+        assert calls == 1
+        assert loaded == ["value"]
+        assert flight.coalesced == 4
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self):
+        """Test a loader error is raised to the loading caller and all waiters."""
+        flight = SingleFlight()
+
+        async def loader():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(flight.do("key", loader) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_waiters_reload_when_loading_caller_is_cancelled(self):
+        """Test cancelling the loading caller doesn't cancel the waiters."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return calls
+
+        leader = asyncio.create_task(flight.do("key", loader))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(flight.do("key", loader)) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+        assert await asyncio.gather(*waiters) == [2, 2, 2]
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_load(self):
+        """Test cancelling a waiter leaves the shared load running."""
+        flight = SingleFlight()
+
+        async def loader():
+            await asyncio.sleep(0.02)
+            return "value"
+
+        leader = asyncio.create_task(flight.do("key", loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("key", loader))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert await leader == "value"
+
+    @pytest.mark.asyncio
+    async def test_forgotten_load_is_served_but_not_stored(self):
+        """Test a forgotten load still returns, skips on_loaded, and new callers load again."""
+        flight = SingleFlight()
+        loaded = []
+        release = asyncio.Event()
+
+        async def loader():
+            await release.wait()
+            return "stale"
+
+        first = asyncio.create_task(flight.do(("tasks", 42), loader, on_loaded=loaded.append))
+        await asyncio.sleep(0)
+        flight.forget(lambda key: key[1] == 42)
+        assert len(flight) == 0
+
+        release.set()
+        assert await first == "stale"
+        assert loaded == []
@@ -0,0 +1,213 @@
+"""
+Tests for the multiplexed task event channel.
+
+Tests per-user dispatch in the router, subscription acknowledgements and
+reconnects, against a fake Warehouse WebSocket server.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from luka_bot.services import task_event_channel
+from luka_bot.services.task_event_channel import (
+    TaskEventMultiplexer,
+    TaskEventRouter,
+    TaskEventSubscription,
+)
+
+
+class FakeWebSocket:
+    """One client socket: frames sent by the channel, messages queued by the server."""
+
+    def __init__(self, server):
+        self.server = server
+        self.incoming = asyncio.Queue()
+        self.sent = []
+
+    async def send(self, message):
+        frame = json.loads(message)
+        self.sent.append(frame)
+        self.server.on_frame(self, frame)
+
+    async def close(self):
+        self.incoming.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+class FakeServer:
+    """Warehouse task socket endpoint; acknowledges subscribe frames when `ack` is set."""
+
+    def __init__(self, ack=True):
+        self.ack = ack
+        self.sockets = []
+
+    async def connect(self, url, **kwargs):
+        websocket = FakeWebSocket(self)
+        self.sockets.append(websocket)
+        return websocket
+
+    def on_frame(self, websocket, frame):
+        if self.ack and frame["type"] in ("subscribe", "unsubscribe"):
+            reply = {"type": frame["type"] + "d", "user_ids": frame["user_ids"]}
+            websocket.incoming.put_nowait(json.dumps(reply))
+
+    def push(self, event):
+        self.sockets[-1].incoming.put_nowait(json.dumps(event))
+
+    def drop(self):
+        self.sockets[-1].incoming.put_nowait(None)
+
+
+@pytest.fixture
+def server():
+    server = FakeServer()
+    with patch.object(task_event_channel, "connect", server.connect), \
+            patch.object(task_event_channel.settings, "WAREHOUSE_WS_RECONNECT_DELAY", 0):
+        yield server
+
+
+async def _until(condition, timeout=1.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.001)
+    await asyncio.wait_for(poll(), timeout)
+
+
+class TestTaskEventRouter:
+    """Test per-user dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_slow_user_does_not_block_others(self):
+        """Test a handler stuck on one user doesn't delay another user's events."""
+        router = TaskEventRouter()
+        release = asyncio.Event()
+        handled = []
+
+        async def slow(event, user_id):
+            await release.wait()
+            handled.append((user_id, event["taskId"]))
+
+        async def fast(event, user_id):
+            handled.append((user_id, event["taskId"]))
+
+        router.add(1, slow)
+        router.add(2, fast)
+        router.dispatch({"assignee": "1", "taskId": "a"})
+        router.dispatch({"assignee": "2", "taskId": "b"})
+
+        await _until(lambda: handled)
+        assert handled == [(2, "b")]
+
+        release.set()
+        await router.join()
+        assert handled == [(2, "b"), (1, "a")]
+
+    @pytest.mark.asyncio
+    async def test_in_order_and_bounded_per_user(self):
+        """Test one user's events are handled in order, and drop past the bound."""
+        router = TaskEventRouter(max_pending=3)
+        handled = []
+
+        async def handler(event, user_id):
+            handled.append(event["taskId"])
+
+        router.add(1, handler)
+        for task_id in range(5):
+            router.dispatch({"assignee": 1, "taskId": task_id})
+        router.dispatch({"assignee": 99, "taskId": "not subscribed"})
+        router.dispatch({"assignee": None, "taskId": "no assignee"})
+        await router.join()
+
+        assert handled == [0, 1, 2]
+        assert router.dropped == 2
+        assert router.pending_events == 0
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_are_contained(self):
+        """Test a failing handler doesn't stop the user's later events."""
+        router = TaskEventRouter()
+        handled = []
+
+        async def handler(event, user_id):
+            if event["taskId"] == "bad":
+                raise RuntimeError("boom")
+            handled.append(event["taskId"])
+
+        router.add(1, handler)
+        router.dispatch({"assignee": 1, "taskId": "bad"})
+        router.dispatch({"assignee": 1, "taskId": "good"})
+        await router.join()
+
+        assert handled == ["good"]
+
+
+class TestTaskEventMultiplexer:
+    """Test subscriptions over the fake server."""
+
+    @pytest.mark.asyncio
+    async def test_connected_only_after_ack(self, server):
+        """Test a user counts as connected once the server acknowledges them."""
+        multiplexer = TaskEventMultiplexer(pool_size=1)
+        handled = []
+
+        async def handler(event, user_id):
+            handled.append((user_id, event["taskId"]))
+
+        try:
+            assert await multiplexer.subscribe(42, handler, connect_timeout=1.0)
+            assert TaskEventSubscription(multiplexer, 42, "jwt").is_connected
+            assert {"type": "subscribe", "user_ids": [42]} in server.sockets[0].sent
+
+            server.push({"assignee": 42, "taskId": "t1", "eventType": "created"})
+            await _until(lambda: handled)
+            assert handled == [(42, "t1")]
+        finally:
+            await multiplexer.close()
+
+    @pytest.mark.asyncio
+    async def test_unacknowledged_subscription_not_connected(self, server):
+        """Test a server that never acknowledges leaves users on the polling fallback."""
+        server.ack = False
+        multiplexer = TaskEventMultiplexer(pool_size=1)
+        try:
+            assert not await multiplexer.subscribe(42, connect_timeout=0.05)
+            channel = multiplexer._channels[0]
+            assert channel.is_connected
+            assert not TaskEventSubscription(multiplexer, 42, "jwt").is_connected
+        finally:
+            await multiplexer.close()
+
+    @pytest.mark.asyncio
+    async def test_reconnect_resubscribes_and_waits_for_ack(self, server):
+        """Test after a reconnect, users are resubscribed and connected again once acknowledged."""
+        multiplexer = TaskEventMultiplexer(pool_size=1)
+        try:
+            assert await multiplexer.subscribe(1, connect_timeout=1.0)
+            assert await multiplexer.subscribe(2, connect_timeout=1.0)
+
+            server.ack = False
+            server.drop()
+            await _until(lambda: len(server.sockets) == 2 and multiplexer._channels[0].is_connected)
+
+            assert {"type": "subscribe", "user_ids": [1, 2]} in server.sockets[1].sent
+            assert not multiplexer.is_user_connected(1)
+
+            server.push({"type": "subscribed", "user_ids": [1, 2]})
+            await _until(lambda: multiplexer.is_user_connected(1) and multiplexer.is_user_connected(2))
+
+            await multiplexer.unsubscribe(2)
+            assert not multiplexer.is_user_connected(2)
+            assert {"type": "unsubscribe", "user_ids": [2]} in server.sockets[1].sent
+        finally:
+            await multiplexer.close()
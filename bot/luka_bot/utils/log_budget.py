@@ -0,0 +1,140 @@
+"""
+Log Budget - Cheap logging for streaming and message hot paths.
+
+Per-chunk and per-message logging with eagerly built f-strings costs CPU on
+every streamed token, whether or not anyone reads the line. This module keeps
+that cost near zero:
+
+- `hot.debug(...)`: hot-path DEBUG that is a bound no-op unless hot-path
+  debugging is switched on (LOG_HOT_PATH_DEBUG) - no formatting, no level check
+- `log_sampled(...)` / `log_throttled(...)`: per-call-site sampling and rate
+  limiting, with the number of suppressed lines attached as `suppressed`
+- `setup_logging(...)`: loguru sinks with `enqueue=True`, so writing the line
+  (terminal/file/pipe I/O) happens on loguru's worker thread, never blocking
+  the event loop
+
+Prefer loguru's own brace formatting over f-strings everywhere else:
+`logger.debug("Loaded {} messages", len(history))` is only formatted when a
+sink accepts DEBUG, `logger.debug(f"Loaded {len(history)} messages")` always is.
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TextIO, Tuple, Union
+
+from loguru import logger
+
+HOT_PATH_DEBUG_ENV = "LOG_HOT_PATH_DEBUG"
+
+TEXT_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>"
+)
+
+
+def _noop(*args: Any, **kwargs: Any) -> None:
+    return None
+
+
+class HotPathLogger:
+    """
+    DEBUG logging for code that runs per chunk / per token.
+
+    `debug` is rebound by `enable()`: while disabled it is a plain no-op
+    function, so a call costs one attribute lookup and one call, with the
+    arguments passed through untouched (keep them cheap).
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.debug: Callable[..., None] = _noop
+
+    def enable(self, enabled: bool = True) -> None:
+        """Switch hot-path DEBUG logging on or off."""
+        self.enabled = enabled
+        # Bound straight to loguru: callers are reported as the log location
+        self.debug = logger.debug if enabled else _noop
+
+
+hot = HotPathLogger()
+hot.enable(os.getenv(HOT_PATH_DEBUG_ENV, "").lower() in ("1", "true", "yes"))
+
+
+# Per-call-site state: (code object, line) -> [calls or last emit time, suppressed]
+_call_sites: Dict[Tuple[Any, int], list] = {}
+_call_sites_lock = threading.Lock()
+
+
+def _call_site_state(initial: float) -> list:
+    frame = sys._getframe(2)
+    key = (frame.f_code, frame.f_lineno)
+    state = _call_sites.get(key)
+    if state is None:
+        with _call_sites_lock:
+            state = _call_sites.setdefault(key, [initial, 0])
+    return state
+
+
+def log_sampled(level: Union[str, int], every: int, message: str, *args: Any, **kwargs: Any) -> None:
+    """
+    Log one out of every `every` calls from this call site.
+
+    The first call is always logged; later logged lines carry the number of
+    calls skipped since the previous one as `suppressed` in `extra`.
+    """
+    state = _call_site_state(0)
+    count = state[0]
+    state[0] = count + 1
+    if count % every:
+        state[1] += 1
+        return
+    suppressed, state[1] = state[1], 0
+    logger.opt(depth=1).bind(suppressed=suppressed).log(level, message, *args, **kwargs)
+
+
+def log_throttled(level: Union[str, int], interval: float, message: str, *args: Any, **kwargs: Any) -> None:
+    """
+    Log at most once per `interval` seconds from this call site.
+
+    Lines carry the number of calls dropped since the previous one as
+    `suppressed` in `extra`.
+    """
+    state = _call_site_state(float("-inf"))
+    now = time.monotonic()
+    if now - state[0] < interval:
+        state[1] += 1
+        return
+    suppressed = state[1]
+    state[0], state[1] = now, 0
+    logger.opt(depth=1).bind(suppressed=suppressed).log(level, message, *args, **kwargs)
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_format: str = "text",
+    enqueue: bool = True,
+    hot_path_debug: Optional[bool] = None,
+    sink: Optional[TextIO] = None,
+    colorize: Optional[bool] = None,
+) -> None:
+    """
+    Replace loguru's default DEBUG-level stderr handler with production sinks.
+
+    Args:
+        level: Minimum level written (DEBUG lines below it are never formatted)
+        log_format: "text" for colored lines, "json" for serialized records
+        enqueue: Write on loguru's worker thread instead of the calling thread
+        hot_path_debug: Switch `hot.debug` on/off (None = leave as configured)
+        sink: Stream to write to (default: stderr)
+        colorize: Color text lines (None = only when the sink is a TTY)
+    """
+    logger.remove()
+    sink = sink or sys.stderr
+    if log_format == "json":
+        logger.add(sink, format="{message}", level=level, serialize=True, enqueue=enqueue)
+    else:
+        logger.add(sink, format=TEXT_FORMAT, level=level, enqueue=enqueue, colorize=colorize)
+    if hot_path_debug is not None:
+        hot.enable(hot_path_debug)
@@ -0,0 +1,93 @@
+"""
+Single-flight loading: concurrent callers asking for the same key share one load.
+
+Used by the read-through caches (Camunda reads, YouTube transcripts) so N
+identical requests in flight cost one backend round trip.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent loads of the same key.
+
+    The first caller for a key runs the loader; callers arriving while it
+    runs wait for its result, or its error. A cancelled waiter doesn't cancel
+    the shared load, and if the loading caller itself is cancelled, the
+    waiters don't fail with it: one of them loads again and the others wait
+    for that load.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        on_loaded: Optional[Callable[[Any], None]] = None,
+    ) -> Any:
+        """
+        Load `key` once for all concurrent callers.
+
+        Args:
+            key: What is being loaded
+            loader: Coroutine factory doing the load
+            on_loaded: Called with the loaded value before waiters get it, unless
+                the key was forgotten while loading (e.g. to fill a cache)
+
+        Returns:
+            The loaded value (loader errors propagate to every waiter)
+        """
+        while True:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                # Shield so one cancelled waiter doesn't cancel the shared load
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The loading caller was cancelled; load again ourselves
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody waited on isn't logged as lost
+            future.exception()
+            raise
+        finally:
+            forgotten = self._inflight.get(key) is not future
+            if not forgotten:
+                del self._inflight[key]
+
+        if on_loaded is not None and not forgotten:
+            on_loaded(value)
+        future.set_result(value)
+        return value
+
+    def forget(self, matches: Callable[[Hashable], bool]) -> None:
+        """
+        Detach in-flight loads whose key matches.
+
+        Their callers still get the result, but `on_loaded` isn't called and
+        new callers start a fresh load.
+        """
+        for key in [k for k in self._inflight if matches(k)]:
+            del self._inflight[key]
+
+    def clear(self) -> None:
+        self._inflight.clear()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -14,6 +14,7 @@ from ag_ui.core import (
     RunStartedEvent, RunFinishedEvent, RunErrorEvent,
     ToolCallEndEvent, SystemMessage,ToolCallResultEvent
 )
+from ag_ui.streaming import DEFAULT_MAX_EVENTS, DEFAULT_MAX_TOOL_RESULT_CHARS, EventBridge
 
 from google.adk import Runner
 from google.adk.agents import BaseAgent, RunConfig as ADKRunConfig
@@ -71,6 +72,11 @@ class ADKAgent:
         tool_timeout_seconds: int = 300,  # 5 minutes
         max_concurrent_executions: int = 10,
         
+        # Event stream configuration
+        max_queued_events: int = DEFAULT_MAX_EVENTS,
+        stream_stall_timeout_seconds: int = 120,  # 2 minutes
+        max_tool_result_chars: Optional[int] = DEFAULT_MAX_TOOL_RESULT_CHARS,
+        
         # Session cleanup configuration
         cleanup_interval_seconds: int = 300  # 5 minutes default
     ):
@@ -91,6 +97,12 @@ class ADKAgent:
             execution_timeout_seconds: Timeout for entire execution
             tool_timeout_seconds: Timeout for individual tool calls
             max_concurrent_executions: Maximum concurrent background executions
+            max_queued_events: Events buffered per execution for a slow client before
+                deltas are coalesced and the agent waits (backpressure)
+            stream_stall_timeout_seconds: Executions whose client hasn't read queued
+                events for this long are reaped with stale executions
+            max_tool_result_chars: Longest serialized tool result sent to the client;
+                longer results are truncated (None: no limit)
         """
         if app_name and app_name_extractor:
             raise ValueError("Cannot specify both 'app_name' and 'app_name_extractor'")
@@ -138,6 +150,9 @@ class ADKAgent:
         self._execution_timeout = execution_timeout_seconds
         self._tool_timeout = tool_timeout_seconds
         self._max_concurrent = max_concurrent_executions
+        self._max_queued_events = max_queued_events
+        self._stream_stall_timeout = stream_stall_timeout_seconds
+        self._max_tool_result_chars = max_tool_result_chars
         self._execution_lock = asyncio.Lock()
 
         # Session lookup cache for efficient session ID to metadata mapping
@@ -359,12 +374,18 @@ class ADKAgent:
         # Check if this is a tool result submission for an existing execution
         if self._is_tool_result_submission(input):
             # Handle tool results for existing execution
-            async for event in self._handle_tool_result_submission(input):
-                yield event
+            events = self._handle_tool_result_submission(input)
         else:
             # Start new execution for regular requests
-            async for event in self._start_new_execution(input):
+            events = self._start_new_execution(input)
+        
+        # Close the inner generator with ours, so a client disconnect reaches
+        # _start_new_execution's cleanup right away rather than at GC time
+        try:
+            async for event in events:
                 yield event
+        finally:
+            await events.aclose()
     
     async def _ensure_session_exists(self, app_name: str, user_id: str, session_id: str, initial_state: dict):
         """Ensure a session exists, creating it if necessary via session manager."""
@@ -466,8 +487,12 @@ class ADKAgent:
             # Since all tools are long-running, all tool results are standalone
             # and should start new executions with the tool results
             logger.info(f"Starting new execution for tool result in thread {thread_id}")
-            async for event in self._start_new_execution(input):
-                yield event
+            events = self._start_new_execution(input)
+            try:
+                async for event in events:
+                    yield event
+            finally:
+                await events.aclose()
                 
         except Exception as e:
             logger.error(f"Error handling tool results: {e}", exc_info=True)
@@ -534,7 +559,7 @@ class ADKAgent:
         
         while True:
             try:
-                logger.debug(f"Waiting for event from queue (thread {execution.thread_id}, queue size: {execution.event_queue.qsize()})")
+                logger.debug("Waiting for event from queue (thread %s, queue size: %d)", execution.thread_id, execution.event_queue.qsize())
                 
                 # Wait for event with timeout
                 event = await asyncio.wait_for(
@@ -543,7 +568,7 @@ class ADKAgent:
                 )
                 
                 event_count += 1
-                logger.debug(f"Got event #{event_count} from queue: {type(event).__name__ if event else 'None'} (thread {execution.thread_id})")
+                logger.debug("Got event #%d from queue: %s (thread %s)", event_count, type(event).__name__ if event else 'None', execution.thread_id)
                 
                 if event is None:
                     # Execution complete
@@ -551,7 +576,7 @@ class ADKAgent:
                     logger.debug(f"Execution complete for thread {execution.thread_id} after {event_count} events")
                     break
                 
-                logger.debug(f"Streaming event #{event_count}: {type(event).__name__} (thread {execution.thread_id})")
+                logger.debug("Streaming event #%d: %s (thread %s)", event_count, type(event).__name__, execution.thread_id)
                 yield event
                 
             except asyncio.TimeoutError:
@@ -599,6 +624,8 @@ class ADKAgent:
         Yields:
             AG-UI events from the execution
         """
+        execution = None
+        stream_finished = False
         try:
             # Emit RUN_STARTED
             logger.debug(f"Emitting RUN_STARTED for thread {input.thread_id}, run {input.run_id}")
@@ -657,9 +684,10 @@ class ADKAgent:
                     tool_call_ids.remove(event.tool_call_id)
                 
                 
-                logger.debug(f"Yielding event: {type(event).__name__}")
+                logger.debug("Yielding event: %s", type(event).__name__)
                 yield event
                 
+            stream_finished = True
             logger.debug(f"Finished iterating over _stream_events for execution {execution.thread_id}")
             
             # If we found tool calls, add them to session state BEFORE cleanup
@@ -688,6 +716,12 @@ class ADKAgent:
                 code="EXECUTION_ERROR"
             )
         finally:
+            # The client went away mid-stream: stop the agent instead of letting it
+            # keep producing into a queue nobody reads
+            if execution is not None and not stream_finished and not execution.task.done():
+                logger.info(f"Client disconnected, cancelling execution for thread {input.thread_id}")
+                await execution.cancel()
+            
             # Clean up execution if complete and no pending tool calls (HITL scenarios)
             async with self._execution_lock:
                 if input.thread_id in self._active_executions:
@@ -714,7 +748,7 @@ class ADKAgent:
         Returns:
             ExecutionState tracking the background execution
         """
-        event_queue = asyncio.Queue()
+        event_queue = EventBridge(maxsize=self._max_queued_events)
         logger.debug(f"Created event queue {id(event_queue)} for thread {input.thread_id}")
         # Extract necessary information
         user_id = self._get_user_id(input)
@@ -809,6 +843,7 @@ class ADKAgent:
                 event_queue=event_queue
             )
         )
+        event_queue.attach(task)
         logger.debug(f"Background task created for thread {input.thread_id}: {task}")
         
         return ExecutionState(
@@ -823,7 +858,7 @@ class ADKAgent:
         adk_agent: BaseAgent,
         user_id: str,
         app_name: str,
-        event_queue: asyncio.Queue
+        event_queue: EventBridge
     ):
         """Run ADK agent in background, emitting events to queue.
         
@@ -903,7 +938,7 @@ class ADKAgent:
                     parts.append(updated_function_response_part)
                 new_message = types.Content(parts=parts, role='user')
             # Create event translator
-            event_translator = EventTranslator()
+            event_translator = EventTranslator(max_tool_result_chars=self._max_tool_result_chars)
             
             # Run ADK agent
             is_long_running_tool = False
@@ -1011,17 +1046,17 @@ class ADKAgent:
                         )
     
     async def _cleanup_stale_executions(self):
-        """Clean up stale executions."""
+        """Clean up stale executions, and executions whose client stopped reading."""
         stale_threads = []
         
         for thread_id, execution in self._active_executions.items():
-            if execution.is_stale(self._execution_timeout):
+            if execution.is_stale(self._execution_timeout, self._stream_stall_timeout):
                 stale_threads.append(thread_id)
         
         for thread_id in stale_threads:
             execution = self._active_executions.pop(thread_id)
             await execution.cancel()
-            logger.info(f"Cleaned up stale execution for thread {thread_id}")
+            logger.info(f"Cleaned up stale execution for thread {thread_id} (stream: {execution.get_stream_stats()})")
 
     async def close(self):
         """Clean up resources including active executions."""
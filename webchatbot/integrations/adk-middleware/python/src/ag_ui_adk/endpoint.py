@@ -39,7 +39,7 @@ def add_adk_fastapi_endpoint(app: FastAPI, agent: ADKAgent, path: str = "/"):
                 async for event in agent.run(input_data):
                     try:
                         encoded = encoder.encode(event)
-                        logger.debug(f"HTTP Response: {encoded}")
+                        logger.debug("HTTP Response: %s", encoded)
                         yield encoded
                     except Exception as encoding_error:
                         # Handle encoding-specific errors
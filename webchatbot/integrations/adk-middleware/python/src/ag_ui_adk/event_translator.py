@@ -16,15 +16,37 @@ from ag_ui.core import (
     ToolCallResultEvent, StateSnapshotEvent, StateDeltaEvent,
     CustomEvent
 )
+from ag_ui.streaming import (
+    DEFAULT_MAX_TOOL_RESULT_CHARS,
+    IdentityCache,
+    serialize_tool_result,
+    tool_call_args_delta,
+)
 import json
 from google.adk.events import Event as ADKEvent
 
 import logging
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+
+def _log_emitted(label: str, event: BaseEvent) -> None:
+    """Debug-log an emitted text event; serialized only when DEBUG is on (runs per token)."""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📤 " + label + ": %s", event.model_dump_json())
+
+
+def _coerce_tool_response(
+    value: Any,
+    _visited: Optional[set[int]] = None,
+    _cache: Optional[IdentityCache] = None,
+) -> Any:
+    """Recursively convert arbitrary tool responses into JSON-serializable structures.
 
-def _coerce_tool_response(value: Any, _visited: Optional[set[int]] = None) -> Any:
-    """Recursively convert arbitrary tool responses into JSON-serializable structures."""
+    With ``_cache``, objects already coerced in this run are not coerced again.
+    Mappings and collections are always walked, since they may change.
+    """
 
     if isinstance(value, (str, int, float, bool)) or value is None:
         return value
@@ -35,6 +57,12 @@ def _coerce_tool_response(value: Any, _visited: Optional[set[int]] = None) -> An
         except Exception:
             return list(value)
 
+    cache = None if isinstance(value, (Mapping, list, tuple, set, frozenset)) else _cache
+    if cache is not None:
+        cached = cache.get(value, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
     if _visited is None:
         _visited = set()
 
@@ -44,80 +72,97 @@ def _coerce_tool_response(value: Any, _visited: Optional[set[int]] = None) -> An
 
     _visited.add(obj_id)
     try:
-        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        coerced = _coerce_object(value, _visited, _cache)
+    finally:
+        _visited.discard(obj_id)
+
+    if cache is not None:
+        cache.set(value, coerced)
+    return coerced
+
+
+def _coerce_object(value: Any, _visited: set[int], _cache: Optional[IdentityCache]) -> Any:
+    """Coerce one non-primitive value; its members go back through _coerce_tool_response."""
+
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {
+            field.name: _coerce_tool_response(getattr(value, field.name), _visited, _cache)
+            for field in dataclasses.fields(value)
+        }
+
+    if hasattr(value, "_asdict") and callable(getattr(value, "_asdict")):
+        try:
             return {
-                field.name: _coerce_tool_response(getattr(value, field.name), _visited)
-                for field in dataclasses.fields(value)
+                str(k): _coerce_tool_response(v, _visited, _cache)
+                for k, v in value._asdict().items()  # type: ignore[attr-defined]
             }
+        except Exception:
+            pass
 
-        if hasattr(value, "_asdict") and callable(getattr(value, "_asdict")):
+    for method_name in ("model_dump", "to_dict"):
+        method = getattr(value, method_name, None)
+        if callable(method):
             try:
-                return {
-                    str(k): _coerce_tool_response(v, _visited)
-                    for k, v in value._asdict().items()  # type: ignore[attr-defined]
-                }
-            except Exception:
-                pass
-
-        for method_name in ("model_dump", "to_dict"):
-            method = getattr(value, method_name, None)
-            if callable(method):
+                dumped = method()
+            except TypeError:
                 try:
-                    dumped = method()
-                except TypeError:
-                    try:
-                        dumped = method(exclude_none=False)
-                    except Exception:
-                        continue
+                    dumped = method(exclude_none=False)
                 except Exception:
                     continue
+            except Exception:
+                continue
 
-                return _coerce_tool_response(dumped, _visited)
-
-        if isinstance(value, Mapping):
-            return {
-                str(k): _coerce_tool_response(v, _visited)
-                for k, v in value.items()
-            }
+            return _coerce_tool_response(dumped, _visited, _cache)
 
-        if isinstance(value, (list, tuple, set, frozenset)):
-            return [_coerce_tool_response(item, _visited) for item in value]
+    if isinstance(value, Mapping):
+        return {
+            str(k): _coerce_tool_response(v, _visited, _cache)
+            for k, v in value.items()
+        }
 
-        if isinstance(value, Iterable):
-            try:
-                return [_coerce_tool_response(item, _visited) for item in list(value)]
-            except TypeError:
-                pass
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_coerce_tool_response(item, _visited, _cache) for item in value]
 
+    if isinstance(value, Iterable):
         try:
-            obj_vars = vars(value)
+            return [_coerce_tool_response(item, _visited, _cache) for item in list(value)]
         except TypeError:
-            obj_vars = None
+            pass
 
-        if obj_vars:
-            coerced = {
-                key: _coerce_tool_response(val, _visited)
-                for key, val in obj_vars.items()
-                if not key.startswith("_")
-            }
-            if coerced:
-                return coerced
+    try:
+        obj_vars = vars(value)
+    except TypeError:
+        obj_vars = None
 
-        return str(value)
-    finally:
-        _visited.discard(obj_id)
+    if obj_vars:
+        coerced = {
+            key: _coerce_tool_response(val, _visited, _cache)
+            for key, val in obj_vars.items()
+            if not key.startswith("_")
+        }
+        if coerced:
+            return coerced
+
+    return str(value)
 
 
-def _serialize_tool_response(response: Any) -> str:
-    """Serialize a tool response into a JSON string."""
+def _serialize_tool_response(
+    response: Any,
+    cache: Optional[IdentityCache] = None,
+    max_chars: Optional[int] = DEFAULT_MAX_TOOL_RESULT_CHARS,
+) -> str:
+    """Serialize a tool response into a JSON string of at most ``max_chars`` characters."""
 
     try:
-        coerced = _coerce_tool_response(response)
-        return json.dumps(coerced, ensure_ascii=False)
+        return serialize_tool_result(
+            response,
+            coerce=lambda value: _coerce_tool_response(value, _cache=cache),
+            max_chars=max_chars,
+        )
     except Exception as exc:
         logger.warning("Failed to coerce tool response to JSON: %s", exc, exc_info=True)
         try:
-            return json.dumps(str(response), ensure_ascii=False)
+            return serialize_tool_result(str(response), max_chars=max_chars)
         except Exception:
             logger.warning("Failed to stringify tool response; returning empty string.")
             return json.dumps("", ensure_ascii=False)
@@ -130,8 +175,16 @@ class EventTranslator:
     managing streaming sequences and maintaining event consistency.
     """
     
-    def __init__(self):
-        """Initialize the event translator."""
+    def __init__(self, max_tool_result_chars: Optional[int] = DEFAULT_MAX_TOOL_RESULT_CHARS):
+        """Initialize the event translator.
+
+        Args:
+            max_tool_result_chars: Longest serialized tool result sent to the client;
+                longer results are truncated (None: no limit)
+        """
+        self._max_tool_result_chars = max_tool_result_chars
+        # Tool response objects already coerced to JSON-safe values in this run
+        self._json_cache = IdentityCache()
         # Track tool call IDs for consistency 
         self._active_tool_calls: Dict[str, str] = {}  # Tool call ID -> Tool call ID (for consistency)
         # Track streaming message state
@@ -170,8 +223,8 @@ class EventTranslator:
             # Determine action based on ADK streaming pattern
             should_send_end = turn_complete and not is_partial
             
-            logger.debug(f"📥 ADK Event: partial={is_partial}, turn_complete={turn_complete}, "
-                       f"is_final_response={is_final_response}, should_send_end={should_send_end}")
+            logger.debug("📥 ADK Event: partial=%s, turn_complete=%s, is_final_response=%s, should_send_end=%s",
+                         is_partial, turn_complete, is_final_response, should_send_end)
             
             # Skip user events (already in the conversation)
             if hasattr(adk_event, 'author') and adk_event.author == "user":
@@ -198,7 +251,7 @@ class EventTranslator:
                     non_lro_calls = [fc for fc in function_calls if getattr(fc, 'id', None) not in lro_ids]
 
                     if non_lro_calls:
-                        logger.debug(f"ADK function calls detected (non-LRO): {len(non_lro_calls)} of {len(function_calls)} total")
+                        logger.debug("ADK function calls detected (non-LRO): %d of %d total", len(non_lro_calls), len(function_calls))
                         # CRITICAL FIX: End any active text message stream before starting tool calls
                         # Per AG-UI protocol: TEXT_MESSAGE_END must be sent before TOOL_CALL_START
                         async for event in self.force_close_streaming_message():
@@ -282,16 +335,16 @@ class EventTranslator:
             or (has_finish_reason and self._is_streaming)
         )
 
-        logger.info(f"📥 Text event - partial={is_partial}, turn_complete={turn_complete}, "
-                    f"is_final_response={is_final_response}, has_finish_reason={has_finish_reason}, "
-                    f"should_send_end={should_send_end}, currently_streaming={self._is_streaming}")
+        logger.debug("📥 Text event - partial=%s, turn_complete=%s, is_final_response=%s, "
+                     "has_finish_reason=%s, should_send_end=%s, currently_streaming=%s",
+                     is_partial, turn_complete, is_final_response, has_finish_reason,
+                     should_send_end, self._is_streaming)
 
         if is_final_response:
 
             # If a final text response wasn't streamed (not generated by an LLM) then deliver it in 3 events
             if not self._is_streaming and not adk_event.usage_metadata and should_send_end:
-                logger.info(f"⏭️ Deliver non-llm response via message events "
-                            f"event_id={adk_event.id}")
+                logger.debug("⏭️ Deliver non-llm response via message events event_id=%s", adk_event.id)
 
                 combined_text = "".join(text_parts)
                 message_events = [
@@ -313,7 +366,7 @@ class EventTranslator:
                 for msg in message_events:
                     yield msg
 
-            logger.info("⏭️ Skipping final response event (content already streamed)")
+            logger.debug("⏭️ Skipping final response event (content already streamed)")
             
             # If we're currently streaming, this final response means we should end the stream
             if self._is_streaming and self._streaming_message_id:
@@ -321,13 +374,13 @@ class EventTranslator:
                     type=EventType.TEXT_MESSAGE_END,
                     message_id=self._streaming_message_id
                 )
-                logger.info(f"📤 TEXT_MESSAGE_END (from final response): {end_event.model_dump_json()}")
+                _log_emitted("TEXT_MESSAGE_END (from final response)", end_event)
                 yield end_event
                 
                 # Reset streaming state
                 self._streaming_message_id = None
                 self._is_streaming = False
-                logger.info("🏁 Streaming completed via final response")
+                logger.debug("🏁 Streaming completed via final response")
             
             return
         
@@ -344,7 +397,7 @@ class EventTranslator:
                 message_id=self._streaming_message_id,
                 role="assistant"
             )
-            logger.info(f"📤 TEXT_MESSAGE_START: {start_event.model_dump_json()}")
+            _log_emitted("TEXT_MESSAGE_START", start_event)
             yield start_event
         
         # Always emit content (unless empty)
@@ -354,7 +407,7 @@ class EventTranslator:
                 message_id=self._streaming_message_id,
                 delta=combined_text
             )
-            logger.info(f"📤 TEXT_MESSAGE_CONTENT: {content_event.model_dump_json()}")
+            _log_emitted("TEXT_MESSAGE_CONTENT", content_event)
             yield content_event
         
         # If turn is complete and not partial, emit END event
@@ -363,13 +416,13 @@ class EventTranslator:
                 type=EventType.TEXT_MESSAGE_END,
                 message_id=self._streaming_message_id
             )
-            logger.info(f"📤 TEXT_MESSAGE_END: {end_event.model_dump_json()}")
+            _log_emitted("TEXT_MESSAGE_END", end_event)
             yield end_event
             
             # Reset streaming state
             self._streaming_message_id = None
             self._is_streaming = False
-            logger.info("🏁 Streaming completed, state reset")
+            logger.debug("🏁 Streaming completed, state reset")
     
     async def translate_lro_function_calls(self,adk_event: ADKEvent)-> AsyncGenerator[BaseEvent, None]:
         """Translate long running function calls from ADK event to AG-UI tool call events.
@@ -396,13 +449,10 @@ class EventTranslator:
                             parent_message_id=None
                         )
                         if hasattr(long_running_function_call, 'args') and long_running_function_call.args:
-                            # Convert args to string (JSON format)
-                            import json
-                            args_str = json.dumps(long_running_function_call.args) if isinstance(long_running_function_call.args, dict) else str(long_running_function_call.args)
                             yield ToolCallArgsEvent(
                                 type=EventType.TOOL_CALL_ARGS,
                                 tool_call_id=long_running_function_call.id,
-                                delta=args_str
+                                delta=tool_call_args_delta(long_running_function_call.args)
                             )
                         
                         # Emit TOOL_CALL_END
@@ -448,14 +498,10 @@ class EventTranslator:
             
             # Emit TOOL_CALL_ARGS if we have arguments
             if hasattr(func_call, 'args') and func_call.args:
-                # Convert args to string (JSON format)
-                import json
-                args_str = json.dumps(func_call.args) if isinstance(func_call.args, dict) else str(func_call.args)
-                
                 yield ToolCallArgsEvent(
                     type=EventType.TOOL_CALL_ARGS,
                     tool_call_id=tool_call_id,
-                    delta=args_str
+                    delta=tool_call_args_delta(func_call.args)
                 )
             
             # Emit TOOL_CALL_END
@@ -492,7 +538,11 @@ class EventTranslator:
                     message_id=str(uuid.uuid4()),
                     type=EventType.TOOL_CALL_RESULT,
                     tool_call_id=tool_call_id,
-                    content=_serialize_tool_response(func_response.response)
+                    content=_serialize_tool_response(
+                        func_response.response,
+                        cache=self._json_cache,
+                        max_chars=self._max_tool_result_chars,
+                    )
                 )
             else:
                 logger.debug(f"Skipping ToolCallResultEvent for long-running tool: {tool_call_id}")
@@ -561,13 +611,13 @@ class EventTranslator:
                 type=EventType.TEXT_MESSAGE_END,
                 message_id=self._streaming_message_id
             )
-            logger.info(f"📤 TEXT_MESSAGE_END (forced): {end_event.model_dump_json()}")
+            _log_emitted("TEXT_MESSAGE_END (forced)", end_event)
             yield end_event
             
             # Reset streaming state
             self._streaming_message_id = None
             self._is_streaming = False
-            logger.info("🔄 Streaming state reset after force-close")
+            logger.debug("🔄 Streaming state reset after force-close")
 
     def reset(self):
         """Reset the translator state.
@@ -579,4 +629,5 @@ class EventTranslator:
         self._streaming_message_id = None
         self._is_streaming = False
         self.long_running_tool_ids.clear()
+        self._json_cache.clear()
         logger.debug("Reset EventTranslator state (including streaming state)")
@@ -4,9 +4,11 @@
 
 import asyncio
 import time
-from typing import Optional, Set
+from typing import Any, Dict, Optional, Set, Union
 import logging
 
+from ag_ui.streaming import EventBridge
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,7 +17,7 @@ class ExecutionState:
 
     This class tracks:
     - The background asyncio task running the ADK agent
-    - Event queue for streaming results to the client
+    - Event queue (normally a bounded EventBridge) for streaming results to the client
     - Execution timing and completion state
     """
 
@@ -23,7 +25,7 @@ class ExecutionState:
         self,
         task: asyncio.Task,
         thread_id: str,
-        event_queue: asyncio.Queue
+        event_queue: Union[EventBridge, asyncio.Queue]
     ):
         """Initialize execution state.
 
@@ -41,22 +43,49 @@ class ExecutionState:
 
         logger.debug(f"Created execution state for thread {thread_id}")
 
-    def is_stale(self, timeout_seconds: int) -> bool:
+    def is_stale(self, timeout_seconds: int, stall_timeout_seconds: Optional[float] = None) -> bool:
         """Check if this execution has been running too long.
 
         Args:
             timeout_seconds: Maximum execution time in seconds
+            stall_timeout_seconds: Also stale once the client hasn't read queued
+                events for this long (None = don't check)
 
         Returns:
             True if execution has exceeded timeout
         """
-        return time.time() - self.start_time > timeout_seconds
+        if time.time() - self.start_time > timeout_seconds:
+            return True
+        return stall_timeout_seconds is not None and self.is_stalled(stall_timeout_seconds)
+
+    def is_stalled(self, timeout_seconds: float) -> bool:
+        """Check if the client stopped reading events from this execution.
+
+        Args:
+            timeout_seconds: How long queued events may wait for the client
+
+        Returns:
+            True if events have been waiting longer than the timeout
+        """
+        return isinstance(self.event_queue, EventBridge) and self.event_queue.is_stalled(timeout_seconds)
+
+    def get_stream_stats(self) -> Optional[Dict[str, Any]]:
+        """Get queue depth, lag and coalescing counters for the event stream.
+
+        Returns:
+            The EventBridge stats, or None for a plain queue
+        """
+        if isinstance(self.event_queue, EventBridge):
+            return self.event_queue.stats()
+        return None
 
     async def cancel(self):
         """Cancel the execution and clean up resources."""
         logger.info(f"Cancelling execution for thread {self.thread_id}")
 
-        # Cancel the background task
+        # Stop the stream, then cancel the background task
+        if isinstance(self.event_queue, EventBridge):
+            self.event_queue.cancel()
         if not self.task.done():
             self.task.cancel()
             try:
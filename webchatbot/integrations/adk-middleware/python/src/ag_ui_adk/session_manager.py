@@ -2,13 +2,17 @@
 
 """Session manager that adds production features to ADK's native session service."""
 
-from typing import Dict, Optional, Set, Any, Union
+from typing import Dict, List, Optional, Set, Any, Tuple, Union
 import asyncio
+import heapq
 import logging
 import time
 
 logger = logging.getLogger(__name__)
 
+# State key ADKAgent uses for outstanding client-side tool calls (HITL)
+PENDING_TOOL_CALLS_KEY = "pending_tool_calls"
+
 
 class SessionManager:
     """Session manager that wraps ADK's session service.
@@ -17,7 +21,7 @@ class SessionManager:
     - Timeout monitoring based on ADK's lastUpdateTime
     - Cross-user/app session enumeration
     - Per-user session limits
-    - Automatic cleanup of expired sessions
+    - Automatic cleanup of expired sessions (expiry heap, batched deletes)
     - Optional automatic session memory on deletion
     - State management and updates
     """
@@ -38,7 +42,8 @@ class SessionManager:
         session_timeout_seconds: int = 1200,  # 20 minutes default
         cleanup_interval_seconds: int = 300,  # 5 minutes
         max_sessions_per_user: Optional[int] = None,
-        auto_cleanup: bool = True
+        auto_cleanup: bool = True,
+        cleanup_batch_size: int = 50
     ):
         """Initialize the session manager.
         
@@ -49,6 +54,7 @@ class SessionManager:
             cleanup_interval_seconds: Interval between cleanup cycles
             max_sessions_per_user: Maximum concurrent sessions per user (None = unlimited)
             auto_cleanup: Enable automatic session cleanup task
+            cleanup_batch_size: Expired sessions checked/deleted concurrently per batch
         """
         if self._initialized:
             return
@@ -63,10 +69,19 @@ class SessionManager:
         self._cleanup_interval = cleanup_interval_seconds
         self._max_per_user = max_sessions_per_user
         self._auto_cleanup = auto_cleanup
+        self._cleanup_batch_size = max(1, cleanup_batch_size)
         
         # Minimal tracking: just keys and user counts
         self._session_keys: Set[str] = set()  # "app_name:session_id" keys
         self._user_sessions: Dict[str, Set[str]] = {}  # user_id -> set of session_keys
+        self._session_users: Dict[str, str] = {}  # session_key -> user_id
+        
+        # Expiry tracking: last known update time per session, and a min-heap
+        # of (update_time, session_key). Heap entries whose time no longer
+        # matches _last_update are stale and skipped when popped.
+        self._last_update: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._pending_hitl: Set[str] = set()  # session_keys with pending tool calls
         
         self._cleanup_task: Optional[asyncio.Task] = None
         self._initialized = True
@@ -136,7 +151,7 @@ class SessionManager:
             logger.debug(f"Retrieved existing session: {session_key}")
         
         # Track the session key
-        self._track_session(session_key, user_id)
+        self._track_session(session_key, user_id, _last_update_time(session))
         
         # Start cleanup if needed
         if self._auto_cleanup and not self._cleanup_task:
@@ -206,6 +221,15 @@ class SessionManager:
             # Apply changes through ADK's event system
             await self._session_service.append_event(session, event)
             
+            session_key = f"{app_name}:{session_id}"
+            if session_key in self._session_keys:
+                self._touch_session(session_key, event.timestamp)
+                if PENDING_TOOL_CALLS_KEY in state_updates:
+                    if state_updates[PENDING_TOOL_CALLS_KEY]:
+                        self._pending_hitl.add(session_key)
+                    else:
+                        self._pending_hitl.discard(session_key)
+            
             logger.info(f"Updated state for session {app_name}:{session_id}")
             logger.debug(f"State updates: {state_updates}")
             
@@ -501,9 +525,16 @@ class SessionManager:
     
     # ===== EXISTING METHODS (unchanged) =====
     
-    def _track_session(self, session_key: str, user_id: str):
-        """Track a session key for enumeration."""
+    def _track_session(self, session_key: str, user_id: str, last_update_time: Optional[float] = None):
+        """Track a session key for enumeration and expiry.
+        
+        Without a known last_update_time the session is due for a check on
+        the next cleanup pass, which reads the real time from the backend.
+        """
+        if session_key not in self._session_keys or last_update_time is not None:
+            self._touch_session(session_key, last_update_time or 0.0)
         self._session_keys.add(session_key)
+        self._session_users[session_key] = user_id
         
         if user_id not in self._user_sessions:
             self._user_sessions[user_id] = set()
@@ -512,12 +543,36 @@ class SessionManager:
     def _untrack_session(self, session_key: str, user_id: str):
         """Remove session tracking."""
         self._session_keys.discard(session_key)
+        self._session_users.pop(session_key, None)
+        self._last_update.pop(session_key, None)
+        self._pending_hitl.discard(session_key)
         
         if user_id in self._user_sessions:
             self._user_sessions[user_id].discard(session_key)
             if not self._user_sessions[user_id]:
                 del self._user_sessions[user_id]
     
+    def _touch_session(self, session_key: str, update_time: float):
+        """Record a session's last update time and (re)schedule its expiry check."""
+        self._last_update[session_key] = update_time
+        heapq.heappush(self._expiry_heap, (update_time, session_key))
+        
+        # Stale entries pile up for busy sessions; rebuild once they dominate
+        if len(self._expiry_heap) > 2 * len(self._last_update) + 1024:
+            self._expiry_heap = [(t, key) for key, t in self._last_update.items()]
+            heapq.heapify(self._expiry_heap)
+    
+    def _pop_due_sessions(self, cutoff: float) -> List[str]:
+        """Pop the sessions whose last known update is at or before cutoff."""
+        due = []
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= cutoff:
+            update_time, session_key = heapq.heappop(heap)
+            if self._last_update.get(session_key) == update_time:
+                del self._last_update[session_key]
+                due.append(session_key)
+        return due
+    
     async def _remove_oldest_user_session(self, user_id: str):
         """Remove the oldest session for a user based on lastUpdateTime."""
         if user_id not in self._user_sessions:
@@ -605,50 +660,88 @@ class SessionManager:
                 logger.error(f"Cleanup error: {e}", exc_info=True)
     
     async def _cleanup_expired_sessions(self):
-        """Find and remove expired sessions based on lastUpdateTime."""
+        """Find and remove expired sessions based on lastUpdateTime.
+        
+        Only sessions whose last known update is older than the timeout are
+        looked at, so a pass costs O(expired) rather than O(tracked). Those
+        are re-read from the backend (the runner appends events without
+        going through this manager) and checked/deleted concurrently in
+        batches of cleanup_batch_size.
+        """
         current_time = time.time()
+        due = self._pop_due_sessions(current_time - self._timeout)
+        if not due:
+            return
+        
+        # HITL sessions stay, without a backend read; check again next timeout
+        candidates = []
+        for session_key in due:
+            if session_key in self._pending_hitl:
+                logger.info(f"Preserving expired session {session_key} - has pending tool calls (HITL)")
+                self._touch_session(session_key, current_time)
+            else:
+                candidates.append(session_key)
+        
         expired_count = 0
+        for i in range(0, len(candidates), self._cleanup_batch_size):
+            batch = candidates[i:i + self._cleanup_batch_size]
+            results = await asyncio.gather(
+                *(self._expire_session(session_key, current_time) for session_key in batch)
+            )
+            expired_count += sum(results)
         
-        # Check all tracked sessions
-        for session_key in list(self._session_keys):  # Copy to avoid modification during iteration
-            app_name, session_id = session_key.split(':', 1)
+        if expired_count > 0:
+            logger.info(f"Cleaned up {expired_count} expired sessions")
+    
+    async def _expire_session(self, session_key: str, current_time: float) -> bool:
+        """Delete a due session if the backend agrees it expired.
+        
+        Returns:
+            True if the session was deleted
+        """
+        user_id = self._session_users.get(session_key)
+        if not user_id:
+            return False
+        app_name, session_id = session_key.split(':', 1)
+        
+        try:
+            session = await self._session_service.get_session(
+                session_id=session_id,
+                app_name=app_name,
+                user_id=user_id
+            )
             
-            # Find user_id for this session
-            user_id = None
-            for uid, keys in self._user_sessions.items():
-                if session_key in keys:
-                    user_id = uid
-                    break
+            if not session:
+                # Session doesn't exist, just untrack it
+                self._untrack_session(session_key, user_id)
+                return False
             
-            if not user_id:
-                continue
+            update_time = _last_update_time(session)
+            if update_time is None:
+                # No timestamp to go by; look again next timeout
+                self._touch_session(session_key, current_time)
+                return False
             
-            try:
-                session = await self._session_service.get_session(
-                    session_id=session_id,
-                    app_name=app_name,
-                    user_id=user_id
-                )
-                
-                if session and hasattr(session, 'last_update_time'):
-                    age = current_time - session.last_update_time
-                    if age > self._timeout:
-                        # Check for pending tool calls before deletion (HITL scenarios)
-                        pending_calls = session.state.get("pending_tool_calls", []) if session.state else []
-                        if pending_calls:
-                            logger.info(f"Preserving expired session {session_key} - has {len(pending_calls)} pending tool calls (HITL)")
-                        else:
-                            await self._delete_session(session)
-                            expired_count += 1
-                elif not session:
-                    # Session doesn't exist, just untrack it
-                    self._untrack_session(session_key, user_id)
-                    
-            except Exception as e:
-                logger.error(f"Error checking session {session_key}: {e}")
-        
-        if expired_count > 0:
-            logger.info(f"Cleaned up {expired_count} expired sessions")
+            if current_time - update_time <= self._timeout:
+                # Updated behind our back (e.g. by the runner); reschedule
+                self._touch_session(session_key, update_time)
+                return False
+            
+            # Check for pending tool calls before deletion (HITL scenarios)
+            pending_calls = session.state.get(PENDING_TOOL_CALLS_KEY, []) if session.state else []
+            if pending_calls:
+                logger.info(f"Preserving expired session {session_key} - has {len(pending_calls)} pending tool calls (HITL)")
+                self._pending_hitl.add(session_key)
+                self._touch_session(session_key, current_time)
+                return False
+            
+            await self._delete_session(session)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error checking session {session_key}: {e}")
+            self._touch_session(session_key, current_time)
+            return False
     
     def get_session_count(self) -> int:
         """Get total number of tracked sessions."""
@@ -666,4 +759,12 @@ class SessionManager:
                 await self._cleanup_task
             except asyncio.CancelledError:
                 pass
-            self._cleanup_task = None
\ No newline at end of file
+            self._cleanup_task = None
+
+
+def _last_update_time(session) -> Optional[float]:
+    """ADK's last_update_time for a session, or None if it doesn't have one."""
+    update_time = getattr(session, 'last_update_time', None)
+    if isinstance(update_time, (int, float)) and not isinstance(update_time, bool):
+        return float(update_time)
+    return None
@@ -179,6 +179,47 @@ class TestEventTranslatorComprehensive:
         assert content["result"]["structuredContent"] is None
         assert [item["text"] for item in content["result"]["content"]] == repeated_text_entries
 
+    @pytest.mark.asyncio
+    async def test_translate_function_response_truncates_large_results(self):
+        """Results longer than max_tool_result_chars are cut with a marker."""
+        translator = EventTranslator(max_tool_result_chars=50)
+        function_response = SimpleNamespace(id="tool-large", response={"text": "x" * 500})
+
+        events = [event async for event in translator._translate_function_response([function_response])]
+
+        assert events[0].content.startswith('{"text": "xxx')
+        assert events[0].content.endswith("…[truncated 462 chars]")
+        assert len(events[0].content) < 100
+
+    @pytest.mark.asyncio
+    async def test_translate_function_response_coerces_shared_objects_once(self, translator):
+        """Objects repeated across a run's tool results are coerced once."""
+
+        class Document:
+            dumps = 0
+
+            def model_dump(self):
+                Document.dumps += 1
+                return {"title": "KB article", "body": "text"}
+
+        document = Document()
+        responses = [
+            SimpleNamespace(id=f"tool-{i}", response={"documents": [document]})
+            for i in range(3)
+        ]
+
+        events = [event async for event in translator._translate_function_response(responses)]
+
+        assert [json.loads(event.content) for event in events] == [
+            {"documents": [{"title": "KB article", "body": "text"}]}
+        ] * 3
+        assert Document.dumps == 1
+
+        translator.reset()
+        async for _ in translator._translate_function_response(responses[:1]):
+            pass
+        assert Document.dumps == 2
+
     @pytest.mark.asyncio
     async def test_translate_state_delta_event(self, translator, mock_adk_event):
         """Test state delta event creation."""
@@ -761,12 +802,11 @@ class TestEventTranslatorComprehensive:
             debug_calls = [str(call) for call in mock_logger.debug.call_args_list]
             assert any("ADK Event:" in call for call in debug_calls)
 
-            # Text event logging remains in info
-            mock_logger.info.assert_called()
-            info_calls = [str(call) for call in mock_logger.info.call_args_list]
-            assert any("Text event -" in call for call in info_calls)
-            assert any("TEXT_MESSAGE_START:" in call for call in info_calls)
-            assert any("TEXT_MESSAGE_CONTENT:" in call for call in info_calls)
+            # Per-token text event logging is debug too
+            mock_logger.info.assert_not_called()
+            assert any("Text event -" in call for call in debug_calls)
+            assert any("TEXT_MESSAGE_START:" in call for call in debug_calls)
+            assert any("TEXT_MESSAGE_CONTENT:" in call for call in debug_calls)
             # No TEXT_MESSAGE_END unless is_final_response=True
 
     @pytest.mark.asyncio
@@ -6,6 +6,8 @@ import asyncio
 import time
 from unittest.mock import MagicMock
 
+from ag_ui.core import StepStartedEvent
+from ag_ui.streaming import EventBridge
 from ag_ui_adk.execution_state import ExecutionState
 
 
@@ -130,4 +132,36 @@ class TestExecutionState:
         time.sleep(0.01)  # Small delay
         time2 = execution_state.get_execution_time()
 
-        assert time2 > time1
\ No newline at end of file
+        assert time2 > time1
+
+    def test_stall_check_ignores_plain_queue(self, execution_state):
+        """Test only an EventBridge reports a stalled client."""
+        assert execution_state.is_stalled(0) is False
+        assert execution_state.is_stale(600, 0) is False
+        assert execution_state.get_stream_stats() is None
+
+    @pytest.mark.asyncio
+    async def test_stalled_client_makes_execution_stale(self, mock_task):
+        """Test an unread EventBridge makes the execution stale."""
+        bridge = EventBridge(maxsize=10)
+        await bridge.put(StepStartedEvent(step_name="step"))
+        execution_state = ExecutionState(task=mock_task, thread_id="t", event_queue=bridge)
+        await asyncio.sleep(0.01)
+
+        assert execution_state.is_stale(600) is False
+        assert execution_state.is_stale(600, 60) is False
+        assert execution_state.is_stale(600, 0.005) is True
+        assert execution_state.get_stream_stats()["queued"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancel_closes_bridge(self, mock_task):
+        """Test cancelling an execution drops its queued events."""
+        bridge = EventBridge(maxsize=10)
+        await bridge.put(StepStartedEvent(step_name="step"))
+        execution_state = ExecutionState(task=mock_task, thread_id="t", event_queue=bridge)
+        mock_task.done.return_value = True
+
+        await execution_state.cancel()
+
+        assert bridge.cancelled is True
+        assert await bridge.get() is None
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""Test the expiry-heap session reaper in SessionManager."""
+
+import pytest
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+from ag_ui_adk import SessionManager
+
+
+def make_session(session_id, user_id="user", app_name="app", age=0.0, state=None):
+    session = MagicMock()
+    session.id = session_id
+    session.app_name = app_name
+    session.user_id = user_id
+    session.last_update_time = time.time() - age
+    session.state = state or {}
+    return session
+
+
+class TestSessionExpiry:
+    """Test cases for expired session cleanup."""
+
+    @pytest.fixture(autouse=True)
+    def reset_session_manager(self):
+        """Reset session manager before each test."""
+        SessionManager.reset_instance()
+        yield
+        SessionManager.reset_instance()
+
+    @pytest.fixture
+    def sessions(self):
+        """Backend sessions by session_id."""
+        return {}
+
+    @pytest.fixture
+    def mock_session_service(self, sessions):
+        """Create a session service backed by the sessions dict."""
+        async def get_session(session_id, app_name, user_id):
+            return sessions.get(session_id)
+
+        async def create_session(session_id, app_name, user_id, state):
+            sessions[session_id] = make_session(session_id, user_id, app_name, state=state)
+            return sessions[session_id]
+
+        service = AsyncMock()
+        service.get_session = AsyncMock(side_effect=get_session)
+        service.create_session = AsyncMock(side_effect=create_session)
+        service.delete_session = AsyncMock()
+        service.append_event = AsyncMock()
+        return service
+
+    @pytest.fixture
+    def manager(self, mock_session_service):
+        return SessionManager.get_instance(
+            session_service=mock_session_service,
+            session_timeout_seconds=60,
+            auto_cleanup=False,
+            cleanup_batch_size=2
+        )
+
+    @pytest.mark.asyncio
+    async def test_only_expired_sessions_are_read(self, manager, mock_session_service, sessions):
+        """Test a cleanup pass doesn't touch the backend for fresh sessions."""
+        for i in range(5):
+            sessions[f"old_{i}"] = make_session(f"old_{i}", age=120)
+            await manager.get_or_create_session(f"old_{i}", "app", "user")
+        for i in range(20):
+            await manager.get_or_create_session(f"new_{i}", "app", f"user_{i}")
+        mock_session_service.get_session.reset_mock()
+
+        await manager._cleanup_expired_sessions()
+
+        read = {call.kwargs["session_id"] for call in mock_session_service.get_session.call_args_list}
+        assert read == {f"old_{i}" for i in range(5)}
+        assert mock_session_service.delete_session.call_count == 5
+        assert manager.get_session_count() == 20
+        assert manager.get_user_session_count("user") == 0
+
+    @pytest.mark.asyncio
+    async def test_backend_activity_reschedules(self, manager, mock_session_service, sessions):
+        """Test a session updated outside the manager is kept and rescheduled."""
+        sessions["s1"] = make_session("s1", age=120)
+        await manager.get_or_create_session("s1", "app", "user")
+        sessions["s1"].last_update_time = time.time()  # e.g. the runner appended events
+
+        await manager._cleanup_expired_sessions()
+        mock_session_service.delete_session.assert_not_called()
+        assert manager.get_session_count() == 1
+
+        mock_session_service.get_session.reset_mock()
+        await manager._cleanup_expired_sessions()
+        mock_session_service.get_session.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_state_update_touches_session(self, manager, mock_session_service, sessions):
+        """Test update_session_state pushes the expiry back."""
+        sessions["s1"] = make_session("s1", age=120)
+        await manager.get_or_create_session("s1", "app", "user")
+        await manager.update_session_state("s1", "app", "user", {"k": "v"})
+        mock_session_service.get_session.reset_mock()
+
+        await manager._cleanup_expired_sessions()
+
+        mock_session_service.get_session.assert_not_called()
+        mock_session_service.delete_session.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_hitl_sessions_exempt_without_backend_read(self, manager, mock_session_service, sessions):
+        """Test sessions with pending tool calls are kept without loading them."""
+        sessions["s1"] = make_session("s1", age=120)
+        await manager.get_or_create_session("s1", "app", "user")
+        await manager.set_state_value("s1", "app", "user", "pending_tool_calls", ["call_1"])
+        manager._touch_session("app:s1", time.time() - 120)
+        mock_session_service.get_session.reset_mock()
+
+        await manager._cleanup_expired_sessions()
+
+        mock_session_service.get_session.assert_not_called()
+        mock_session_service.delete_session.assert_not_called()
+
+        # Once the tool calls are answered the session can expire again
+        await manager.set_state_value("s1", "app", "user", "pending_tool_calls", [])
+        manager._touch_session("app:s1", time.time() - 120)
+        await manager._cleanup_expired_sessions()
+        mock_session_service.delete_session.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_hitl_state_found_on_read(self, manager, mock_session_service, sessions):
+        """Test pending tool calls set elsewhere still preserve the session."""
+        sessions["s1"] = make_session("s1", age=120, state={"pending_tool_calls": ["call_1"]})
+        await manager.get_or_create_session("s1", "app", "user")
+
+        await manager._cleanup_expired_sessions()
+
+        mock_session_service.delete_session.assert_not_called()
+        assert "app:s1" in manager._pending_hitl
+
+    @pytest.mark.asyncio
+    async def test_missing_backend_session_untracked(self, manager, sessions):
+        """Test sessions gone from the backend are dropped from tracking."""
+        sessions["s1"] = make_session("s1", age=120)
+        await manager.get_or_create_session("s1", "app", "user")
+        del sessions["s1"]
+
+        await manager._cleanup_expired_sessions()
+
+        assert manager.get_session_count() == 0
+        assert manager._session_users == {}
@@ -36,6 +36,7 @@ from ag_ui.core.events import (
   CustomEvent,
 )
 from ag_ui.encoder import EventEncoder
+from ag_ui.streaming import DEFAULT_MAX_EVENTS, EventBridge
 
 from .events import (
   BridgedTextMessageChunkEvent,
@@ -51,16 +52,16 @@ QUEUES = {}
 QUEUES_LOCK = asyncio.Lock()
 
 
-async def create_queue(flow: object) -> asyncio.Queue:
-    """Create a queue for a flow."""
+async def create_queue(flow: object, maxsize: int = DEFAULT_MAX_EVENTS) -> EventBridge:
+    """Create a bounded queue for a flow."""
     queue_id = id(flow)
     async with QUEUES_LOCK:
-        queue = asyncio.Queue()
+        queue = EventBridge(maxsize=maxsize)
         QUEUES[queue_id] = queue
         return queue
 
 
-def get_queue(flow: object) -> Optional[asyncio.Queue]:
+def get_queue(flow: object) -> Optional[EventBridge]:
     """Get the queue for a flow."""
     queue_id = id(flow)
     # not using a lock here should be fine
@@ -184,8 +185,25 @@ class FastAPICrewFlowEventListener(BaseEventListener):
                     )
                 )
 
-def add_crewai_flow_fastapi_endpoint(app: FastAPI, flow: Flow, path: str = "/"):
-    """Adds a CrewAI endpoint to the FastAPI app."""
+def add_crewai_flow_fastapi_endpoint(
+    app: FastAPI,
+    flow: Flow,
+    path: str = "/",
+    emit_state_deltas: bool = False,
+    max_queued_events: int = DEFAULT_MAX_EVENTS,
+):
+    """
+    Adds a CrewAI endpoint to the FastAPI app.
+
+    With emit_state_deltas, the state sent after each method goes out as a
+    JSON Patch delta against the last state sent in the run, and unchanged
+    messages snapshots are skipped.
+
+    Each run buffers at most max_queued_events for a slow client. Past that,
+    text and tool call chunks are merged and snapshots replaced; if that is
+    not enough the run is cancelled with a RUN_ERROR. The run is also
+    cancelled when the client disconnects.
+    """
     global GLOBAL_EVENT_LISTENER # pylint: disable=global-statement
 
     # Set up the global event listener singleton
@@ -214,10 +232,14 @@ def add_crewai_flow_fastapi_endpoint(app: FastAPI, flow: Flow, path: str = "/"):
         inputs["id"] = input_data.thread_id
 
         async def event_generator():
-            queue = await create_queue(flow_copy)
+            queue = await create_queue(flow_copy, max_queued_events)
             token = flow_context.set(flow_copy)
+            state_tracker = None
+            if emit_state_deltas:
+                from ag_ui.state import StateTracker  # pylint: disable=import-outside-toplevel
+                state_tracker = StateTracker()
             try:
-                asyncio.create_task(flow_copy.kickoff_async(inputs=inputs))
+                queue.attach(asyncio.create_task(flow_copy.kickoff_async(inputs=inputs)))
 
                 while True:
                     item = await queue.get()
@@ -228,8 +250,22 @@ def add_crewai_flow_fastapi_endpoint(app: FastAPI, flow: Flow, path: str = "/"):
                         item.thread_id = input_data.thread_id
                         item.run_id = input_data.run_id
 
+                    if state_tracker is not None:
+                        item = state_tracker.process(item)
+                        if item is None:
+                            continue
+
                     yield encoder.encode(item)
 
+                if queue.overflowed:
+                    yield encoder.encode(
+                        RunErrorEvent(
+                            type=EventType.RUN_ERROR,
+                            message="Client is not reading the event stream",
+                            code="STREAM_OVERFLOW",
+                        )
+                    )
+
             except Exception as e:  # pylint: disable=broad-exception-caught
                 yield encoder.encode(
                     RunErrorEvent(
@@ -240,14 +276,25 @@ def add_crewai_flow_fastapi_endpoint(app: FastAPI, flow: Flow, path: str = "/"):
                     )
                 )
             finally:
+                # Stop the flow if the client disconnected mid-run
+                if not queue.closed:
+                    queue.cancel()
                 await delete_queue(flow_copy)
                 flow_context.reset(token)
 
         return StreamingResponse(event_generator(), media_type=encoder.get_content_type())
 
-def add_crewai_crew_fastapi_endpoint(app: FastAPI, crew: Crew, path: str = "/"):
+def add_crewai_crew_fastapi_endpoint(
+    app: FastAPI,
+    crew: Crew,
+    path: str = "/",
+    emit_state_deltas: bool = False,
+    max_queued_events: int = DEFAULT_MAX_EVENTS,
+):
     """Adds a CrewAI crew endpoint to the FastAPI app."""
-    add_crewai_flow_fastapi_endpoint(app, ChatWithCrewFlow(crew=crew), path)
+    add_crewai_flow_fastapi_endpoint(
+        app, ChatWithCrewFlow(crew=crew), path, emit_state_deltas, max_queued_events
+    )
 
 
 def crewai_prepare_inputs(  # pylint: disable=unused-argument, too-many-arguments
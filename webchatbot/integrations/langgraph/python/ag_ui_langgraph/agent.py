@@ -1,5 +1,8 @@
 import uuid
 import json
+import weakref
+from collections import OrderedDict
+from contextvars import ContextVar
 from typing import Optional, List, Any, Union, AsyncGenerator, Generator, Literal, Dict
 import inspect
 
@@ -60,6 +63,7 @@ from ag_ui.core import (
     ThinkingEndEvent,
 )
 from ag_ui.encoder import EventEncoder
+from ag_ui.streaming import DEFAULT_MAX_TOOL_RESULT_CHARS, IdentityCache, tool_call_args_delta, truncate_tool_result
 
 ProcessedEvents = Union[
     TextMessageStartEvent,
@@ -80,21 +84,80 @@ ProcessedEvents = Union[
     StepFinishedEvent,
 ]
 
+# Threads whose message -> checkpoint index is kept, per graph
+CHECKPOINT_INDEX_MAX_THREADS = 1024
+
+# Per-graph data shared by every agent wrapping the same compiled graph:
+# schema keys, stream signature, message -> checkpoint index
+_GRAPH_CACHE: "weakref.WeakKeyDictionary[CompiledStateGraph, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def _graph_cache(graph: CompiledStateGraph) -> Dict[str, Any]:
+    try:
+        return _GRAPH_CACHE.setdefault(graph, {})
+    except TypeError:
+        # Not weak-referenceable: cache on a throwaway dict (no caching)
+        return {}
+
+
+class RunContext:
+    """Mutable state of one run. Each run gets its own, through a context variable."""
+    __slots__ = ("active_run", "messages_in_process", "json_cache")
+
+    def __init__(self):
+        self.active_run: Optional[RunMetadata] = None
+        self.messages_in_process: MessagesInProgressRecord = {}
+        # JSON-safe forms of the objects in this run's raw events
+        self.json_cache = IdentityCache()
+
+
 class LangGraphAgent:
-    def __init__(self, *, name: str, graph: CompiledStateGraph, description: Optional[str] = None, config:  Union[Optional[RunnableConfig], dict] = None):
+    # Max checkpoints get_checkpoint_before_message walks back (None: no limit)
+    checkpoint_history_limit: Optional[int] = None
+    # Longest tool result sent in TOOL_CALL_RESULT; longer ones are truncated (None: no limit)
+    max_tool_result_chars: Optional[int] = DEFAULT_MAX_TOOL_RESULT_CHARS
+
+    def __init__(self, *, name: str, graph: CompiledStateGraph, description: Optional[str] = None, config:  Union[Optional[RunnableConfig], dict] = None, emit_state_deltas: bool = False):
         self.name = name
         self.description = description
         self.graph = graph
         self.config = config or {}
-        self.messages_in_process: MessagesInProgressRecord = {}
-        self.active_run: Optional[RunMetadata] = None
+        # Send state changes after the first snapshot of a run as JSON Patch deltas
+        self.emit_state_deltas = emit_state_deltas
         self.constant_schema_keys = ['messages', 'tools']
+        # Run state lives in a context variable, not on the instance, so one
+        # agent can serve concurrent runs (each request runs in its own task)
+        self._run_context: ContextVar[Optional[RunContext]] = ContextVar(f"ag_ui_langgraph_run_{name}", default=None)
+
+    def _get_run_context(self) -> RunContext:
+        context = self._run_context.get()
+        if context is None:
+            context = RunContext()
+            self._run_context.set(context)
+        return context
+
+    @property
+    def active_run(self) -> Optional[RunMetadata]:
+        context = self._run_context.get()
+        return context.active_run if context is not None else None
+
+    @active_run.setter
+    def active_run(self, value: Optional[RunMetadata]):
+        self._get_run_context().active_run = value
+
+    @property
+    def messages_in_process(self) -> MessagesInProgressRecord:
+        return self._get_run_context().messages_in_process
+
+    @messages_in_process.setter
+    def messages_in_process(self, value: MessagesInProgressRecord):
+        self._get_run_context().messages_in_process = value
 
     def _dispatch_event(self, event: ProcessedEvents) -> str:
         if event.type == EventType.RAW:
-            event.event = make_json_safe(event.event)
+            event.event = make_json_safe(event.event, self._get_run_context().json_cache)
         elif event.raw_event:
-            event.raw_event = make_json_safe(event.raw_event)
+            event.raw_event = make_json_safe(event.raw_event, self._get_run_context().json_cache)
 
         return event
 
@@ -104,7 +167,17 @@ class LangGraphAgent:
             forwarded_props = {
                 camel_to_snake(k): v for k, v in input.forwarded_props.items()
             }
+        # Fresh run state for this run (and the task iterating it)
+        self._run_context.set(RunContext())
+        state_tracker = None
+        if self.emit_state_deltas:
+            from ag_ui.state import StateTracker
+            state_tracker = StateTracker()
         async for event_str in self._handle_stream_events(input.copy(update={"forwarded_props": forwarded_props})):
+            if state_tracker is not None:
+                event_str = state_tracker.process(event_str)
+                if event_str is None:
+                    continue
             yield event_str
 
     async def _handle_stream_events(self, input: RunAgentInput) -> AsyncGenerator[str, None]:
@@ -398,6 +471,19 @@ class LangGraphAgent:
         }
 
     def get_schema_keys(self, config) -> SchemaKeys:
+        cache = _graph_cache(self.graph)
+        if "schema_keys" not in cache:
+            cache["schema_keys"] = self._compute_schema_keys(config)
+        schema_keys = cache["schema_keys"]
+        return {
+            "input": [*schema_keys["input"], *self.constant_schema_keys],
+            "output": [*schema_keys["output"], *self.constant_schema_keys],
+            "config": list(schema_keys["config"]),
+            "context": list(schema_keys["context"]),
+        }
+
+    def _compute_schema_keys(self, config) -> SchemaKeys:
+        """Schema keys of the graph, without the constant keys (computed once per graph)."""
         try:
             input_schema = self.graph.get_input_jsonschema(config)
             output_schema = self.graph.get_output_jsonschema(config)
@@ -414,15 +500,15 @@ class LangGraphAgent:
 
 
             return {
-                "input": [*input_schema_keys, *self.constant_schema_keys],
-                "output": [*output_schema_keys, *self.constant_schema_keys],
+                "input": input_schema_keys,
+                "output": output_schema_keys,
                 "config": config_schema_keys,
                 "context": context_schema_keys,
             }
         except Exception:
             return {
-                "input": self.constant_schema_keys,
-                "output": self.constant_schema_keys,
+                "input": [],
+                "output": [],
                 "config": [],
                 "context": [],
             }
@@ -655,8 +741,7 @@ class LangGraphAgent:
                     ToolCallArgsEvent(
                         type=EventType.TOOL_CALL_ARGS,
                         tool_call_id=event["data"]["id"],
-                        delta=event["data"]["args"] if isinstance(event["data"]["args"], str) else json.dumps(
-                            event["data"]["args"]),
+                        delta=tool_call_args_delta(event["data"]["args"]),
                         raw_event=event
                     )
                 )
@@ -707,7 +792,8 @@ class LangGraphAgent:
                     type=EventType.TOOL_CALL_RESULT,
                     tool_call_id=tool_call_output.tool_call_id,
                     message_id=str(uuid.uuid4()),
-                    content=tool_call_output.content,
+                    content=truncate_tool_result(tool_call_output.content, self.max_tool_result_chars)
+                    if isinstance(tool_call_output.content, str) else tool_call_output.content,
                     role="tool"
                 )
             )
@@ -762,35 +848,75 @@ class LangGraphAgent:
             )
 
     async def get_checkpoint_before_message(self, message_id: str, thread_id: str):
+        """
+        Find the checkpoint just before a message was added (for regenerate/edit).
+
+        Checks the per-thread message -> checkpoint index first. Otherwise it
+        walks the history from the newest checkpoint and stops as soon as it
+        passes the checkpoint that added the message, so recent messages cost
+        a few checkpoints whatever the thread length. Messages added at the
+        checkpoints passed on the way are indexed.
+        """
         if not thread_id:
             raise ValueError("Missing thread_id in config")
 
-        history_list = []
-        async for snapshot in self.graph.aget_state_history({"configurable": {"thread_id": thread_id}}):
-            history_list.append(snapshot)
-
-        history_list.reverse()
-        for idx, snapshot in enumerate(history_list):
-            messages = snapshot.values.get("messages", [])
-            if any(getattr(m, "id", None) == message_id for m in messages):
-                if idx == 0:
-                    # No snapshot before this
-                    # Return synthetic "empty before" version
-                    empty_snapshot = snapshot
-                    empty_snapshot.values["messages"] = []
-                    return empty_snapshot
-
-                snapshot_values_without_messages = snapshot.values.copy()
-                del snapshot_values_without_messages["messages"]
-                checkpoint = history_list[idx - 1]
-
-                merged_values = {**checkpoint.values, **snapshot_values_without_messages}
-                checkpoint = checkpoint._replace(values=merged_values)
-
-                return checkpoint
+        index = self._checkpoint_index(thread_id)
+        introduced_at = index.get(message_id)
+        if introduced_at is not None:
+            snapshot = await self.graph.aget_state(introduced_at)
+            if any(getattr(m, "id", None) == message_id for m in snapshot.values.get("messages", [])):
+                parent = await self.graph.aget_state(snapshot.parent_config) if snapshot.parent_config else None
+                return self._checkpoint_before(snapshot, parent)
+            # Stale entry (e.g. checkpoints were deleted): fall back to the walk
+            del index[message_id]
+
+        newer = None
+        newer_ids = set()
+        walked = 0
+        history = self.graph.aget_state_history(
+            {"configurable": {"thread_id": thread_id}}, limit=self.checkpoint_history_limit
+        )
+        async for snapshot in history:
+            walked += 1
+            ids = {getattr(m, "id", None) for m in snapshot.values.get("messages", [])}
+            if newer is not None:
+                for added_id in newer_ids - ids:
+                    index[added_id] = newer.config
+                if message_id in newer_ids and message_id not in ids:
+                    return self._checkpoint_before(newer, snapshot)
+            newer, newer_ids = snapshot, ids
+
+        reached_first = self.checkpoint_history_limit is None or walked < self.checkpoint_history_limit
+        if newer is not None and message_id in newer_ids and reached_first:
+            # Added by the thread's first checkpoint
+            return self._checkpoint_before(newer, None)
 
         raise ValueError("Message ID not found in history")
 
+    def _checkpoint_index(self, thread_id: str) -> Dict[str, RunnableConfig]:
+        """Message id -> config of the checkpoint that added it, for one thread (LRU over threads)."""
+        threads = _graph_cache(self.graph).setdefault("checkpoint_index", OrderedDict())
+        index = threads.pop(thread_id, None)
+        if index is None:
+            index = {}
+        threads[thread_id] = index
+        while len(threads) > CHECKPOINT_INDEX_MAX_THREADS:
+            threads.popitem(last=False)
+        return index
+
+    @staticmethod
+    def _checkpoint_before(snapshot, parent):
+        if parent is None:
+            # No snapshot before this
+            # Return synthetic "empty before" version
+            snapshot.values["messages"] = []
+            return snapshot
+
+        snapshot_values_without_messages = snapshot.values.copy()
+        snapshot_values_without_messages.pop("messages", None)
+        merged_values = {**parent.values, **snapshot_values_without_messages}
+        return parent._replace(values=merged_values)
+
     def handle_node_change(self, node_name: Optional[str]):
         """
         Centralized method to handle node name changes and step transitions.
@@ -849,8 +975,10 @@ class LangGraphAgent:
         )
 
         # Only add context if supported
-        sig = inspect.signature(self.graph.astream_events)
-        if 'context' in sig.parameters:
+        cache = _graph_cache(self.graph)
+        if "stream_accepts_context" not in cache:
+            cache["stream_accepts_context"] = 'context' in inspect.signature(self.graph.astream_events).parameters
+        if cache["stream_accepts_context"]:
             base_context = {}
             if isinstance(config, dict) and 'configurable' in config and isinstance(config['configurable'], dict):
                 base_context.update(config['configurable'])
@@ -1,6 +1,6 @@
 import json
 import re
-from typing import List, Any, Dict, Union
+from typing import List, Any, Dict, Optional, Union
 from dataclasses import is_dataclass, asdict
 from datetime import date, datetime
 
@@ -14,6 +14,7 @@ from ag_ui.core import (
     ToolCall as AGUIToolCall,
     FunctionCall as AGUIFunctionCall,
 )
+from ag_ui.streaming import IdentityCache
 from .types import State, SchemaKeys, LangGraphReasoning
 
 DEFAULT_SCHEMA_KEYS = ["tools"]
@@ -193,7 +194,10 @@ def json_safe_stringify(o):
         return o.isoformat()
     return str(o)                # last resort
 
-def make_json_safe(value: Any) -> Any:
+_MISSING = object()
+
+
+def make_json_safe(value: Any, cache: Optional[IdentityCache] = None) -> Any:
     """
     Recursively convert a value into a JSON-serializable structure.
 
@@ -201,8 +205,25 @@ def make_json_safe(value: Any) -> Any:
     - Handles LangChain messages via `to_dict`.
     - Recursively walks dicts, lists, and tuples.
     - For arbitrary objects, falls back to `__dict__` if available, else `repr()`.
+
+    With `cache` (one per run), objects already converted in the run - such
+    as the messages repeated across a run's raw events - are not converted
+    again. Dicts, lists and tuples are always walked, since they may change.
     """
-    # Pydantic models
+    # Already JSON safe
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+
+    if cache is None or isinstance(value, (dict, list, tuple)):
+        return _make_json_safe(value, cache)
+    converted = cache.get(value, _MISSING)
+    if converted is _MISSING:
+        converted = cache.set(value, _make_json_safe(value, cache))
+    return converted
+
+
+def _make_json_safe(value: Any, cache: Optional[IdentityCache]) -> Any:
+    # Pydantic models (their dump is a fresh structure, nothing in it is cached)
     if hasattr(value, "model_dump"):
         try:
             return make_json_safe(value.model_dump(by_alias=True, exclude_none=True))
@@ -218,21 +239,17 @@ def make_json_safe(value: Any) -> Any:
 
     # Dict
     if isinstance(value, dict):
-        return {key: make_json_safe(sub_value) for key, sub_value in value.items()}
+        return {key: make_json_safe(sub_value, cache) for key, sub_value in value.items()}
 
     # List / tuple
     if isinstance(value, (list, tuple)):
-        return [make_json_safe(sub_value) for sub_value in value]
-
-    # Already JSON safe
-    if isinstance(value, (str, int, float, bool)) or value is None:
-        return value
+        return [make_json_safe(sub_value, cache) for sub_value in value]
 
     # Arbitrary object: try __dict__ first, fallback to repr
     if hasattr(value, "__dict__"):
         return {
             "__type__": type(value).__name__,
-            **make_json_safe(value.__dict__),
+            **make_json_safe(value.__dict__, cache),
         }
 
-    return repr(value)
\ No newline at end of file
+    return repr(value)
@@ -0,0 +1,124 @@
+import unittest
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from ag_ui_langgraph import LangGraphAgent, agent as agent_module
+
+THREAD_ID = "thread-1"
+TURNS = 4
+
+
+def build_graph():
+    def reply(state: MessagesState):
+        last = state["messages"][-1]
+        return {"messages": [AIMessage(id=f"ai-{last.id}", content=f"re: {last.content}")]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("reply", reply)
+    builder.add_edge(START, "reply")
+    builder.add_edge("reply", END)
+    return builder.compile(checkpointer=MemorySaver())
+
+
+class TestCheckpointLookup(unittest.IsolatedAsyncioTestCase):
+    """Test get_checkpoint_before_message and its message -> checkpoint index"""
+
+    async def asyncSetUp(self):
+        self.graph = build_graph()
+        self.agent = LangGraphAgent(name="lookup", graph=self.graph)
+        self.config = {"configurable": {"thread_id": THREAD_ID}}
+        for turn in range(TURNS):
+            await self.graph.ainvoke(
+                {"messages": [HumanMessage(id=f"user-{turn}", content=f"turn {turn}")]}, self.config
+            )
+        state = await self.graph.aget_state(self.config)
+        self.message_ids = [m.id for m in state.values["messages"]]
+
+        self.walks = 0
+        walk = self.graph.aget_state_history
+
+        def counting_walk(*args, **kwargs):
+            self.walks += 1
+            return walk(*args, **kwargs)
+
+        patcher = patch.object(self.graph, "aget_state_history", counting_walk)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def before(self, message_id: str):
+        return await self.agent.get_checkpoint_before_message(message_id, THREAD_ID)
+
+    def assertBefore(self, snapshot, message_id: str):
+        """The snapshot holds exactly the messages that came before message_id"""
+        expected = self.message_ids[:self.message_ids.index(message_id)]
+        self.assertEqual([m.id for m in snapshot.values["messages"]], expected)
+
+    async def test_walk_matches_history(self):
+        """Test every message of the thread resolves to the checkpoint just before it"""
+        for message_id in self.message_ids:
+            with self.subTest(message_id=message_id):
+                self.assertBefore(await self.before(message_id), message_id)
+
+    async def test_index_hit_skips_walk(self):
+        """Test messages passed by an earlier walk are found without walking again"""
+        self.assertBefore(await self.before("user-1"), "user-1")
+        self.assertEqual(self.walks, 1)
+
+        # The walk went past every newer message: all of them are indexed
+        for message_id in self.message_ids[self.message_ids.index("user-1"):]:
+            with self.subTest(message_id=message_id):
+                self.assertBefore(await self.before(message_id), message_id)
+        self.assertEqual(self.walks, 1)
+
+    async def test_stale_index_entry_falls_back_to_walk(self):
+        """Test an index entry pointing at a checkpoint without the message is dropped and the walk used"""
+        await self.before("user-3")
+        index = self.agent._checkpoint_index(THREAD_ID)
+        first_checkpoint = [s async for s in self.graph.aget_state_history(self.config)][-1]
+        index["user-3"] = first_checkpoint.config
+        self.walks = 0
+
+        self.assertBefore(await self.before("user-3"), "user-3")
+        self.assertEqual(self.walks, 1)
+        self.assertNotEqual(index["user-3"], first_checkpoint.config)
+
+    async def test_unknown_message_raises(self):
+        """Test a message that is not in the thread raises ValueError"""
+        with self.assertRaisesRegex(ValueError, "not found"):
+            await self.before("missing")
+        with self.assertRaisesRegex(ValueError, "thread_id"):
+            await self.agent.get_checkpoint_before_message("user-0", "")
+
+    async def test_history_limit_stops_walk(self):
+        """Test a message older than checkpoint_history_limit is reported as not found"""
+        self.agent.checkpoint_history_limit = 3
+        self.assertBefore(await self.before(self.message_ids[-1]), self.message_ids[-1])
+        with self.assertRaisesRegex(ValueError, "not found"):
+            await self.before("user-0")
+
+    async def test_index_evicts_least_recently_used_thread(self):
+        """Test the index keeps CHECKPOINT_INDEX_MAX_THREADS threads, dropping the least recently used"""
+        with patch.object(agent_module, "CHECKPOINT_INDEX_MAX_THREADS", 2):
+            await self.before("user-3")
+            self.agent._checkpoint_index("other-1")
+            self.agent._checkpoint_index(THREAD_ID)  # Used again: most recent
+            self.agent._checkpoint_index("other-2")
+
+            threads = agent_module._graph_cache(self.graph)["checkpoint_index"]
+            self.assertEqual(list(threads), [THREAD_ID, "other-2"])
+            self.assertIn("user-3", threads[THREAD_ID])
+
+            self.agent._checkpoint_index("other-3")
+            self.assertNotIn(THREAD_ID, threads)
+
+        # An evicted thread is walked again
+        self.walks = 0
+        self.assertBefore(await self.before("user-3"), "user-3")
+        self.assertEqual(self.walks, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import asyncio
+import unittest
+from typing import Any, AsyncIterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+from typing_extensions import Annotated, TypedDict
+
+from ag_ui.core import EventType, RunAgentInput, UserMessage
+from ag_ui_langgraph import LangGraphAgent
+
+
+class EchoChatModel(BaseChatModel):
+    """Streams back the last message word by word, yielding to other tasks between words"""
+
+    @property
+    def _llm_type(self) -> str:
+        return "echo"
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"echo {messages[-1].content}"))])
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        for word in f"echo {messages[-1].content}".split(" "):
+            await asyncio.sleep(0.01)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=f"{word} "))
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+class Rendezvous:
+    """Lets the first caller through only once the second one has arrived"""
+
+    def __init__(self, parties: int):
+        self.parties = parties
+        self.arrived = 0
+        self.all_arrived = asyncio.Event()
+
+    async def wait(self):
+        self.arrived += 1
+        if self.arrived >= self.parties:
+            self.all_arrived.set()
+        await asyncio.wait_for(self.all_arrived.wait(), timeout=5)
+
+
+class RoutedState(TypedDict):
+    messages: Annotated[list, add_messages]
+    route: str
+
+
+def build_graph(rendezvous: Rendezvous):
+    model = EchoChatModel()
+
+    def make_node():
+        async def node(state: RoutedState):
+            # Both runs are inside a node before either starts streaming
+            await rendezvous.wait()
+            return {"messages": [await model.ainvoke(state["messages"])]}
+        return node
+
+    builder = StateGraph(RoutedState)
+    builder.add_node("alpha", make_node())
+    builder.add_node("beta", make_node())
+    builder.add_conditional_edges(START, lambda state: state["route"], ["alpha", "beta"])
+    builder.add_edge("alpha", END)
+    builder.add_edge("beta", END)
+    return builder.compile(checkpointer=MemorySaver())
+
+
+def run_input(thread_id: str, route: str, text: str) -> RunAgentInput:
+    return RunAgentInput(
+        thread_id=thread_id,
+        run_id=f"run-{thread_id}",
+        state={"route": route},
+        messages=[UserMessage(id=f"msg-{thread_id}", role="user", content=text)],
+        tools=[],
+        context=[],
+        forwarded_props={},
+    )
+
+
+class TestConcurrentRuns(unittest.IsolatedAsyncioTestCase):
+    """Test that overlapping runs on one agent keep their run state apart"""
+
+    async def collect(self, agent: LangGraphAgent, input: RunAgentInput) -> list:
+        return [event async for event in agent.run(input)]
+
+    async def test_overlapping_runs_stay_separate(self):
+        """Test messages, thread state and node names of two overlapping runs on one agent"""
+        agent = LangGraphAgent(name="shared", graph=build_graph(Rendezvous(2)))
+
+        events_a, events_b = await asyncio.gather(
+            self.collect(agent, run_input("thread-a", "alpha", "apples")),
+            self.collect(agent, run_input("thread-b", "beta", "bananas")),
+        )
+
+        for events, thread_id, node, text, other_text in [
+            (events_a, "thread-a", "alpha", "apples", "bananas"),
+            (events_b, "thread-b", "beta", "bananas", "apples"),
+        ]:
+            with self.subTest(thread_id=thread_id):
+                by_type = lambda t: [e for e in events if e.type == t]
+
+                started, finished = by_type(EventType.RUN_STARTED), by_type(EventType.RUN_FINISHED)
+                self.assertEqual([e.thread_id for e in started + finished], [thread_id, thread_id])
+                self.assertEqual(started[0].run_id, f"run-{thread_id}")
+
+                # Node names come from this run's active_run only (graph entry aside)
+                for step_type in (EventType.STEP_STARTED, EventType.STEP_FINISHED):
+                    steps = [e.step_name for e in by_type(step_type) if e.step_name != "__start__"]
+                    self.assertEqual(steps, [node])
+
+                # One streamed message, with only this run's content
+                message_ids = {e.message_id for e in by_type(EventType.TEXT_MESSAGE_START)}
+                self.assertEqual(len(message_ids), 1)
+                contents = by_type(EventType.TEXT_MESSAGE_CONTENT)
+                self.assertEqual({e.message_id for e in contents}, message_ids)
+                self.assertEqual("".join(e.delta for e in contents).strip(), f"echo {text}")
+                self.assertEqual({e.message_id for e in by_type(EventType.TEXT_MESSAGE_END)}, message_ids)
+
+                # Final thread state belongs to this thread
+                [snapshot] = by_type(EventType.MESSAGES_SNAPSHOT)
+                contents = [m.content for m in snapshot.messages]
+                self.assertEqual(contents[0], text)
+                self.assertEqual(contents[-1].strip(), f"echo {text}")
+                self.assertNotIn(other_text, " ".join(contents))
+                self.assertEqual(by_type(EventType.STATE_SNAPSHOT)[-1].snapshot["route"], node)
+
+        ids_a = {e.message_id for e in events_a if e.type == EventType.TEXT_MESSAGE_START}
+        ids_b = {e.message_id for e in events_b if e.type == EventType.TEXT_MESSAGE_START}
+        self.assertFalse(ids_a & ids_b)
+
+        # No run state leaks back into the caller's context
+        self.assertIsNone(agent.active_run)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,18 @@
 """
-This module contains the EventEncoder class.
+This module contains the EventEncoder class, the SSE fast path and the protobuf event codec.
 """
 
-from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE
+from ag_ui.encoder.encoder import EventEncoder, AGUI_MEDIA_TYPE, accepts_protobuf
+from ag_ui.encoder.proto import EventDecoder, encode_event, encode_frame, decode_event
+from ag_ui.encoder.sse import encode_sse
 
-__all__ = ["EventEncoder", "AGUI_MEDIA_TYPE"]
+__all__ = [
+    "EventEncoder",
+    "AGUI_MEDIA_TYPE",
+    "accepts_protobuf",
+    "EventDecoder",
+    "encode_event",
+    "encode_frame",
+    "decode_event",
+    "encode_sse",
+]
@@ -2,31 +2,124 @@
 This module contains the EventEncoder class
 """
 
-from ag_ui.core.events import BaseEvent
+import os
+from typing import Optional, Union
+
+from ag_ui.core.events import BaseEvent, EventType, TextMessageContentEvent, ToolCallArgsEvent
+from ag_ui.encoder.proto import encode_delta_frame, encode_frame
+from ag_ui.encoder.sse import encode_delta_sse, encode_sse
 
 AGUI_MEDIA_TYPE = "application/vnd.ag-ui.event+proto"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Set to 1 to re-validate every event before encoding (debugging integrations)
+VALIDATE_EVENTS_ENV = "AG_UI_VALIDATE_EVENTS"
+
+
+def _parse_accept(accept: str):
+    """Yield (media type, q) for each media range of an Accept header."""
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        yield media_type.strip().lower(), quality
+
+
+def accepts_protobuf(accept: Optional[str]) -> bool:
+    """
+    Whether an Accept header asks for the protobuf event stream.
+
+    The AG-UI media type has to be listed explicitly (wildcards like */*
+    keep the SSE default, which every client understands) and be preferred
+    at least as much as text/event-stream.
+    """
+    if not accept:
+        return False
+    proto_q = 0.0
+    sse_q = 0.0
+    for media_type, quality in _parse_accept(accept):
+        if media_type == AGUI_MEDIA_TYPE:
+            proto_q = max(proto_q, quality)
+        elif media_type == SSE_MEDIA_TYPE:
+            sse_q = max(sse_q, quality)
+    return proto_q > 0 and proto_q >= sse_q
+
 
 class EventEncoder:
     """
-    Encodes Agent User Interaction events.
+    Encodes Agent User Interaction events, in the format the client accepts.
+
+    Clients sending ``Accept: application/vnd.ag-ui.event+proto`` get
+    length-prefixed protobuf frames (bytes); everyone else gets SSE (str).
+
+    With ``validate=True`` (default: the AG_UI_VALIDATE_EVENTS environment
+    variable) every event is re-validated before encoding, and the
+    encode_text_message_content / encode_tool_call_args shortcuts build and
+    validate a model instead of writing the values directly.
     """
-    def __init__(self, accept: str = None):
-        pass
+    def __init__(self, accept: str = None, validate: Optional[bool] = None):
+        self.accepts_protobuf = accepts_protobuf(accept)
+        if validate is None:
+            validate = os.environ.get(VALIDATE_EVENTS_ENV, "").lower() in ("1", "true", "yes")
+        self.validate = validate
 
     def get_content_type(self) -> str:
         """
         Returns the content type of the encoder.
         """
-        return "text/event-stream"
+        return AGUI_MEDIA_TYPE if self.accepts_protobuf else SSE_MEDIA_TYPE
 
-    def encode(self, event: BaseEvent) -> str:
+    def encode(self, event: BaseEvent) -> Union[str, bytes]:
         """
-        Encodes an event.
+        Encodes an event in the negotiated format.
         """
+        if self.validate:
+            event = event.__class__.model_validate(event.model_dump())
+        if self.accepts_protobuf:
+            return encode_frame(event)
         return self._encode_sse(event)
 
+    def encode_text_message_content(
+        self, message_id: str, delta: str, timestamp: Optional[int] = None
+    ) -> Union[str, bytes]:
+        """
+        Encodes a TEXT_MESSAGE_CONTENT event without building the event model.
+        """
+        if self.validate:
+            return self.encode(TextMessageContentEvent(message_id=message_id, delta=delta, timestamp=timestamp))
+        if not delta:
+            raise ValueError("TEXT_MESSAGE_CONTENT delta must not be empty")
+        if self.accepts_protobuf:
+            return encode_delta_frame(EventType.TEXT_MESSAGE_CONTENT, message_id, delta, timestamp)
+        return encode_delta_sse(EventType.TEXT_MESSAGE_CONTENT, message_id, delta, timestamp)
+
+    def encode_tool_call_args(
+        self, tool_call_id: str, delta: str, timestamp: Optional[int] = None
+    ) -> Union[str, bytes]:
+        """
+        Encodes a TOOL_CALL_ARGS event without building the event model.
+        """
+        if self.validate:
+            return self.encode(ToolCallArgsEvent(tool_call_id=tool_call_id, delta=delta, timestamp=timestamp))
+        if self.accepts_protobuf:
+            return encode_delta_frame(EventType.TOOL_CALL_ARGS, tool_call_id, delta, timestamp)
+        return encode_delta_sse(EventType.TOOL_CALL_ARGS, tool_call_id, delta, timestamp)
+
+    def encode_binary(self, event: BaseEvent) -> bytes:
+        """
+        Encodes an event in the negotiated format, as bytes.
+        """
+        encoded = self.encode(event)
+        return encoded if isinstance(encoded, bytes) else encoded.encode("utf-8")
+
     def _encode_sse(self, event: BaseEvent) -> str:
         """
         Encodes an event into an SSE string.
         """
-        return f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+        return encode_sse(event)
@@ -0,0 +1,586 @@
+"""
+This module contains the protobuf encoding for AG-UI events.
+
+The wire format follows the schema in the TypeScript SDK
+(sdks/typescript/packages/proto/src/proto/events.proto): every event is an
+``ag_ui.Event`` message, framed on the stream by a 4-byte big-endian length
+prefix. The codec is written against the protobuf wire format directly, so
+the SDK keeps pydantic as its only dependency, and it reads event attributes
+instead of going through model_dump.
+"""
+
+import struct
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+from ag_ui.core.events import (
+    BaseEvent,
+    CustomEvent,
+    EventType,
+    MessagesSnapshotEvent,
+    RawEvent,
+    RunErrorEvent,
+    RunFinishedEvent,
+    RunStartedEvent,
+    StateDeltaEvent,
+    StateSnapshotEvent,
+    StepFinishedEvent,
+    StepStartedEvent,
+    TextMessageChunkEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageStartEvent,
+    ThinkingEndEvent,
+    ThinkingStartEvent,
+    ThinkingTextMessageContentEvent,
+    ThinkingTextMessageEndEvent,
+    ThinkingTextMessageStartEvent,
+    ToolCallArgsEvent,
+    ToolCallChunkEvent,
+    ToolCallEndEvent,
+    ToolCallResultEvent,
+    ToolCallStartEvent,
+)
+
+# Length prefix of a framed event: uint32, big-endian
+FRAME_HEADER_SIZE = 4
+
+# Decoders refuse frames larger than this (a corrupt or hostile prefix
+# would otherwise make them buffer without bound)
+DEFAULT_MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+_WIRE_VARINT = 0
+_WIRE_FIXED64 = 1
+_WIRE_LEN = 2
+_WIRE_FIXED32 = 5
+
+# Field kinds
+_STRING = 0           # string, omitted when empty
+_OPTIONAL_STRING = 1  # optional string, omitted when None
+_VALUE = 2            # google.protobuf.Value, always present
+_OPTIONAL_VALUE = 3   # optional google.protobuf.Value, omitted when None
+_MESSAGES = 4         # repeated ag_ui.Message
+_PATCH = 5            # repeated ag_ui.JsonPatchOperation
+
+_PATCH_OPS = ("add", "remove", "replace", "move", "copy", "test")
+
+# EventType -> (oneof field in ag_ui.Event, ag_ui.EventType value, event class, fields)
+_SCHEMA: Dict[EventType, Tuple[int, int, Type[BaseEvent], Tuple[Tuple[int, str, int], ...]]] = {
+    EventType.TEXT_MESSAGE_START: (1, 0, TextMessageStartEvent, (
+        (2, "message_id", _STRING), (3, "role", _OPTIONAL_STRING))),
+    EventType.TEXT_MESSAGE_CONTENT: (2, 1, TextMessageContentEvent, (
+        (2, "message_id", _STRING), (3, "delta", _STRING))),
+    EventType.TEXT_MESSAGE_END: (3, 2, TextMessageEndEvent, (
+        (2, "message_id", _STRING),)),
+    EventType.TOOL_CALL_START: (4, 3, ToolCallStartEvent, (
+        (2, "tool_call_id", _STRING), (3, "tool_call_name", _STRING),
+        (4, "parent_message_id", _OPTIONAL_STRING))),
+    EventType.TOOL_CALL_ARGS: (5, 4, ToolCallArgsEvent, (
+        (2, "tool_call_id", _STRING), (3, "delta", _STRING))),
+    EventType.TOOL_CALL_END: (6, 5, ToolCallEndEvent, (
+        (2, "tool_call_id", _STRING),)),
+    EventType.STATE_SNAPSHOT: (7, 6, StateSnapshotEvent, (
+        (2, "snapshot", _VALUE),)),
+    EventType.STATE_DELTA: (8, 7, StateDeltaEvent, (
+        (2, "delta", _PATCH),)),
+    EventType.MESSAGES_SNAPSHOT: (9, 8, MessagesSnapshotEvent, (
+        (2, "messages", _MESSAGES),)),
+    EventType.RAW: (10, 9, RawEvent, (
+        (2, "event", _VALUE), (3, "source", _OPTIONAL_STRING))),
+    EventType.CUSTOM: (11, 10, CustomEvent, (
+        (2, "name", _STRING), (3, "value", _OPTIONAL_VALUE))),
+    EventType.RUN_STARTED: (12, 11, RunStartedEvent, (
+        (2, "thread_id", _STRING), (3, "run_id", _STRING))),
+    EventType.RUN_FINISHED: (13, 12, RunFinishedEvent, (
+        (2, "thread_id", _STRING), (3, "run_id", _STRING), (4, "result", _OPTIONAL_VALUE))),
+    EventType.RUN_ERROR: (14, 13, RunErrorEvent, (
+        (2, "code", _OPTIONAL_STRING), (3, "message", _STRING))),
+    EventType.STEP_STARTED: (15, 14, StepStartedEvent, (
+        (2, "step_name", _STRING),)),
+    EventType.STEP_FINISHED: (16, 15, StepFinishedEvent, (
+        (2, "step_name", _STRING),)),
+    EventType.TEXT_MESSAGE_CHUNK: (17, 16, TextMessageChunkEvent, (
+        (2, "message_id", _OPTIONAL_STRING), (3, "role", _OPTIONAL_STRING),
+        (4, "delta", _OPTIONAL_STRING))),
+    EventType.TOOL_CALL_CHUNK: (18, 17, ToolCallChunkEvent, (
+        (2, "tool_call_id", _OPTIONAL_STRING), (3, "tool_call_name", _OPTIONAL_STRING),
+        (4, "parent_message_id", _OPTIONAL_STRING), (5, "delta", _OPTIONAL_STRING))),
+    EventType.TOOL_CALL_RESULT: (19, 18, ToolCallResultEvent, (
+        (2, "message_id", _STRING), (3, "tool_call_id", _STRING), (4, "content", _STRING),
+        (5, "role", _OPTIONAL_STRING))),
+    EventType.THINKING_START: (20, 19, ThinkingStartEvent, (
+        (2, "title", _OPTIONAL_STRING),)),
+    EventType.THINKING_END: (21, 20, ThinkingEndEvent, ()),
+    EventType.THINKING_TEXT_MESSAGE_START: (22, 21, ThinkingTextMessageStartEvent, ()),
+    EventType.THINKING_TEXT_MESSAGE_CONTENT: (23, 22, ThinkingTextMessageContentEvent, (
+        (2, "delta", _STRING),)),
+    EventType.THINKING_TEXT_MESSAGE_END: (24, 23, ThinkingTextMessageEndEvent, ()),
+}
+
+_BY_ONEOF = {spec[0]: (event_type,) + spec[1:] for event_type, spec in _SCHEMA.items()}
+
+_pack_double = struct.Struct("<d").pack
+_unpack_double = struct.Struct("<d").unpack_from
+_pack_length = struct.Struct(">I").pack
+_unpack_length = struct.Struct(">I").unpack_from
+
+
+# ---------------------------------------------------------------------------
+# Wire primitives
+# ---------------------------------------------------------------------------
+
+_SMALL_VARINTS = [bytes((value,)) for value in range(0x80)]
+
+
+def _varint(value: int) -> bytes:
+    if 0 <= value < 0x80:
+        return _SMALL_VARINTS[value]
+    if value < 0:
+        value += 1 << 64  # int64: two's complement, ten bytes
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _tag(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+_LEN_TAGS = {field: _tag(field, 2) for field in range(1, 32)}
+
+
+def _length_delimited(field: int, payload: bytes) -> bytes:
+    return b"".join((_LEN_TAGS[field], _varint(len(payload)), payload))
+
+
+def _string(field: int, value: str) -> bytes:
+    return _length_delimited(field, value.encode("utf-8"))
+
+
+def _read_varint(data: memoryview, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 70:
+            raise ValueError("Varint too long")
+
+
+def _iter_fields(data: memoryview) -> Iterator[Tuple[int, int, Any]]:
+    """Yield (field number, wire type, value) for each field of a message."""
+    pos = 0
+    end = len(data)
+    while pos < end:
+        key, pos = _read_varint(data, pos)
+        field, wire_type = key >> 3, key & 0x07
+        if wire_type == _WIRE_VARINT:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == _WIRE_LEN:
+            length, pos = _read_varint(data, pos)
+            if pos + length > end:
+                raise ValueError("Truncated length-delimited field")
+            value = data[pos:pos + length]
+            pos += length
+        elif wire_type == _WIRE_FIXED64:
+            if pos + 8 > end:
+                raise ValueError("Truncated fixed64 field")
+            value = data[pos:pos + 8]
+            pos += 8
+        elif wire_type == _WIRE_FIXED32:
+            if pos + 4 > end:
+                raise ValueError("Truncated fixed32 field")
+            value = data[pos:pos + 4]
+            pos += 4
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+        yield field, wire_type, value
+
+
+def _text(value: memoryview) -> str:
+    return bytes(value).decode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# google.protobuf.Value
+# ---------------------------------------------------------------------------
+
+def _encode_value(value: Any) -> bytes:
+    # Struct and ListValue entries are written inline: this recursion is the
+    # bulk of the work for state snapshots
+    if value is None:
+        return b"\x08\x00"  # null_value: NULL_VALUE
+    if value is True:
+        return b"\x20\x01"
+    if value is False:
+        return b"\x20\x00"
+    if isinstance(value, str):
+        encoded = value.encode("utf-8")
+        return b"".join((b"\x1a", _varint(len(encoded)), encoded))
+    if isinstance(value, (int, float)):
+        return b"\x11" + _pack_double(float(value))
+    if isinstance(value, dict):
+        parts = []
+        for key, item in value.items():
+            key_bytes = str(key).encode("utf-8")
+            item_bytes = _encode_value(item)
+            entry = b"".join((
+                b"\x0a", _varint(len(key_bytes)), key_bytes,
+                b"\x12", _varint(len(item_bytes)), item_bytes,
+            ))
+            parts += (b"\x0a", _varint(len(entry)), entry)
+        struct_bytes = b"".join(parts)
+        return b"".join((b"\x2a", _varint(len(struct_bytes)), struct_bytes))
+    if isinstance(value, (list, tuple)):
+        parts = []
+        for item in value:
+            item_bytes = _encode_value(item)
+            parts += (b"\x0a", _varint(len(item_bytes)), item_bytes)
+        list_bytes = b"".join(parts)
+        return b"".join((b"\x32", _varint(len(list_bytes)), list_bytes))
+    if isinstance(value, BaseModel):
+        return _encode_value(value.model_dump(mode="json", by_alias=True, exclude_none=True))
+    # Anything else (datetime, UUID, ...) is sent the way the JSON encoding would send it
+    return _encode_value(to_jsonable_python(value))
+
+
+def _decode_value(data: memoryview) -> Any:
+    value: Any = None
+    for field, _, raw in _iter_fields(data):
+        if field == 1:
+            value = None
+        elif field == 2:
+            number = _unpack_double(raw)[0]
+            # Value only has doubles; give back ints where the JSON encoding would have
+            value = int(number) if number.is_integer() and abs(number) < 2 ** 53 else number
+        elif field == 3:
+            value = _text(raw)
+        elif field == 4:
+            value = bool(raw)
+        elif field == 5:
+            value = {}
+            for _, _, entry in _iter_fields(raw):
+                key, item = "", None
+                for entry_field, _, entry_raw in _iter_fields(entry):
+                    if entry_field == 1:
+                        key = _text(entry_raw)
+                    elif entry_field == 2:
+                        item = _decode_value(entry_raw)
+                value[key] = item
+        elif field == 6:
+            value = [_decode_value(item) for _, _, item in _iter_fields(raw)]
+    return value
+
+
+# ---------------------------------------------------------------------------
+# ag_ui.Message and ag_ui.JsonPatchOperation
+# ---------------------------------------------------------------------------
+
+def _get(item: Any, name: str, alias: str) -> Any:
+    if isinstance(item, dict):
+        return item.get(alias, item.get(name))
+    return getattr(item, name, None)
+
+
+def _encode_message(message: Any) -> bytes:
+    out = _string(1, _get(message, "id", "id") or "") + _string(2, _get(message, "role", "role") or "")
+    for field, name, alias in ((3, "content", "content"), (4, "name", "name")):
+        value = _get(message, name, alias)
+        if value is not None:
+            out += _string(field, value)
+    for tool_call in _get(message, "tool_calls", "toolCalls") or ():
+        function = _get(tool_call, "function", "function")
+        function_bytes = _string(1, _get(function, "name", "name") or "") + \
+            _string(2, _get(function, "arguments", "arguments") or "")
+        out += _length_delimited(5, (
+            _string(1, _get(tool_call, "id", "id") or "")
+            + _string(2, _get(tool_call, "type", "type") or "function")
+            + _length_delimited(3, function_bytes)
+        ))
+    for field, name, alias in ((6, "tool_call_id", "toolCallId"), (7, "error", "error")):
+        value = _get(message, name, alias)
+        if value is not None:
+            out += _string(field, value)
+    return out
+
+
+def _decode_message(data: memoryview) -> Dict[str, Any]:
+    message: Dict[str, Any] = {"id": "", "role": ""}
+    tool_calls = []
+    names = {1: "id", 2: "role", 3: "content", 4: "name", 6: "tool_call_id", 7: "error"}
+    for field, _, raw in _iter_fields(data):
+        if field == 5:
+            tool_call: Dict[str, Any] = {"id": "", "type": "function", "function": {"name": "", "arguments": ""}}
+            for tc_field, _, tc_raw in _iter_fields(raw):
+                if tc_field == 1:
+                    tool_call["id"] = _text(tc_raw)
+                elif tc_field == 2:
+                    tool_call["type"] = _text(tc_raw)
+                elif tc_field == 3:
+                    for fn_field, _, fn_raw in _iter_fields(tc_raw):
+                        if fn_field in (1, 2):
+                            tool_call["function"]["name" if fn_field == 1 else "arguments"] = _text(fn_raw)
+            tool_calls.append(tool_call)
+        elif field in names:
+            message[names[field]] = _text(raw)
+    # Repeated fields can't be absent on the wire; absent tool calls come back as None
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return message
+
+
+def _encode_patch_operation(operation: Any) -> bytes:
+    if isinstance(operation, BaseModel):
+        operation = operation.model_dump(mode="json", by_alias=True)
+    op = operation.get("op")
+    if op not in _PATCH_OPS:
+        raise ValueError(f"Unsupported JSON Patch operation: {op!r}")
+    out = _tag(1, _WIRE_VARINT) + _varint(_PATCH_OPS.index(op)) + _string(2, operation.get("path", ""))
+    if operation.get("from") is not None:
+        out += _string(3, operation["from"])
+    if "value" in operation:
+        out += _length_delimited(4, _encode_value(operation["value"]))
+    return out
+
+
+def _decode_patch_operation(data: memoryview) -> Dict[str, Any]:
+    operation: Dict[str, Any] = {"op": _PATCH_OPS[0], "path": ""}
+    for field, _, raw in _iter_fields(data):
+        if field == 1:
+            operation["op"] = _PATCH_OPS[raw]
+        elif field == 2:
+            operation["path"] = _text(raw)
+        elif field == 3:
+            operation["from"] = _text(raw)
+        elif field == 4:
+            operation["value"] = _decode_value(raw)
+    return operation
+
+
+# ---------------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------------
+
+def _encode_base_event(proto_type: int, event: BaseEvent) -> bytes:
+    out = b"\x08" + _varint(proto_type)
+    if event.timestamp is not None:
+        out += b"\x10" + _varint(event.timestamp)
+    if event.raw_event is not None:
+        out += _length_delimited(3, _encode_value(event.raw_event))
+    return _length_delimited(1, out)
+
+
+def _encode_field(field: int, kind: int, value: Any) -> bytes:
+    if kind == _STRING:
+        return _string(field, value) if value else b""
+    if kind == _OPTIONAL_STRING:
+        return _string(field, value) if value is not None else b""
+    if kind == _VALUE or (kind == _OPTIONAL_VALUE and value is not None):
+        return _length_delimited(field, _encode_value(value))
+    if kind == _MESSAGES:
+        return b"".join(_length_delimited(field, _encode_message(message)) for message in value or ())
+    if kind == _PATCH:
+        return b"".join(_length_delimited(field, _encode_patch_operation(op)) for op in value or ())
+    return b""
+
+
+def _encode_delta(oneof: int, proto_type: int, ident: str, delta: str, timestamp: Optional[int]) -> bytes:
+    """
+    Precompiled encoding for TEXT_MESSAGE_CONTENT and TOOL_CALL_ARGS.
+
+    These are sent once per streamed token, so they skip the schema walk:
+    the base event is a constant unless a timestamp is set.
+    """
+    base = _HOT_BASE[proto_type]
+    if timestamp is not None:
+        base = _length_delimited(1, b"\x08" + _varint(proto_type) + b"\x10" + _varint(timestamp))
+    ident_bytes = ident.encode("utf-8")
+    delta_bytes = delta.encode("utf-8")
+    body = b"".join((
+        base, b"\x12", _varint(len(ident_bytes)), ident_bytes, b"\x1a", _varint(len(delta_bytes)), delta_bytes,
+    ))
+    return _HOT_ONEOF_TAG[oneof] + _varint(len(body)) + body
+
+
+_HOT_PATHS: Dict[EventType, Callable[[BaseEvent], Optional[bytes]]] = {
+    EventType.TEXT_MESSAGE_CONTENT: lambda event: None if event.raw_event is not None else _encode_delta(
+        2, 1, event.message_id, event.delta, event.timestamp),
+    EventType.TOOL_CALL_ARGS: lambda event: None if event.raw_event is not None else _encode_delta(
+        5, 4, event.tool_call_id, event.delta, event.timestamp),
+}
+_HOT_BASE = {1: _length_delimited(1, b"\x08\x01"), 4: _length_delimited(1, b"\x08\x04")}
+_HOT_ONEOF_TAG = {2: _tag(2, _WIRE_LEN), 5: _tag(5, _WIRE_LEN)}
+
+
+def encode_delta_frame(event_type: EventType, ident: str, delta: str, timestamp: Optional[int] = None) -> bytes:
+    """
+    Encode a framed TEXT_MESSAGE_CONTENT / TOOL_CALL_ARGS event straight from its values.
+
+    Args:
+        event_type: EventType.TEXT_MESSAGE_CONTENT or EventType.TOOL_CALL_ARGS
+        ident: The message id or tool call id
+        delta: The text or arguments fragment
+        timestamp: Optional event timestamp
+    """
+    oneof, proto_type = _SCHEMA[event_type][:2]
+    message = _encode_delta(oneof, proto_type, ident, delta, timestamp)
+    return _pack_length(len(message)) + message
+
+
+def encode_event(event: BaseEvent) -> bytes:
+    """
+    Encode an event as an ag_ui.Event protobuf message (without the length prefix).
+
+    Raises:
+        ValueError: If the event type has no protobuf message
+    """
+    hot_path = _HOT_PATHS.get(event.type)
+    if hot_path is not None:
+        encoded = hot_path(event)
+        if encoded is not None:
+            return encoded
+
+    spec = _SCHEMA.get(event.type)
+    if spec is None:
+        raise ValueError(f"No protobuf encoding for event type {event.type!r}")
+    oneof, proto_type, _, fields = spec
+    body = _encode_base_event(proto_type, event) + b"".join(
+        _encode_field(field, kind, getattr(event, name, None)) for field, name, kind in fields
+    )
+    return _length_delimited(oneof, body)
+
+
+def encode_frame(event: BaseEvent) -> bytes:
+    """Encode an event as a length-prefixed ag_ui.Event, ready to write to the stream."""
+    message = encode_event(event)
+    return _pack_length(len(message)) + message
+
+
+def _decode_hot_path(event_class: Type[BaseEvent], proto_type: int, id_attr: str, body: memoryview) -> BaseEvent:
+    """Decode TEXT_MESSAGE_CONTENT / TOOL_CALL_ARGS without the schema walk."""
+    # What encode_event writes: constant base event, id, delta
+    base = _HOT_BASE[proto_type]
+    if body[:len(base)] == base and len(body) > len(base) and body[len(base)] == 0x12:
+        length, pos = _read_varint(body, len(base) + 1)
+        ident = body[pos:pos + length]
+        pos += length
+        if pos < len(body) and body[pos] == 0x1A:
+            length, pos = _read_varint(body, pos + 1)
+            if pos + length == len(body):
+                return event_class(**{id_attr: _text(ident), "delta": _text(body[pos:])})
+
+    values: Dict[str, Any] = {id_attr: "", "delta": ""}
+    for field, wire_type, raw in _iter_fields(body):
+        if field == 1 and wire_type == _WIRE_LEN:
+            for base_field, base_wire_type, base_raw in _iter_fields(raw):
+                if base_field == 2 and base_wire_type == _WIRE_VARINT:
+                    values["timestamp"] = base_raw - (1 << 64) if base_raw >= 1 << 63 else base_raw
+                elif base_field == 3:
+                    values["raw_event"] = _decode_value(base_raw)
+        elif field == 2 and wire_type == _WIRE_LEN:
+            values[id_attr] = _text(raw)
+        elif field == 3 and wire_type == _WIRE_LEN:
+            values["delta"] = _text(raw)
+    return event_class(**values)
+
+
+def decode_event(data: bytes) -> BaseEvent:
+    """
+    Decode an ag_ui.Event protobuf message (without the length prefix).
+
+    Raises:
+        ValueError: If the message is malformed or holds an unknown event
+    """
+    view = memoryview(data)
+    for oneof, wire_type, body in _iter_fields(view):
+        if wire_type != _WIRE_LEN or oneof not in _BY_ONEOF:
+            continue
+        if oneof == 2:
+            return _decode_hot_path(TextMessageContentEvent, 1, "message_id", body)
+        if oneof == 5:
+            return _decode_hot_path(ToolCallArgsEvent, 4, "tool_call_id", body)
+        event_type, _, event_class, fields = _BY_ONEOF[oneof]
+        kinds = {field: (name, kind) for field, name, kind in fields}
+        values: Dict[str, Any] = {}
+        list_values: Dict[str, List[Any]] = {}
+        for field, _, raw in _iter_fields(body):
+            if field == 1:
+                for base_field, _, base_raw in _iter_fields(raw):
+                    if base_field == 2:
+                        values["timestamp"] = base_raw - (1 << 64) if base_raw >= 1 << 63 else base_raw
+                    elif base_field == 3:
+                        values["raw_event"] = _decode_value(base_raw)
+                continue
+            if field not in kinds:
+                continue
+            name, kind = kinds[field]
+            if kind in (_STRING, _OPTIONAL_STRING):
+                values[name] = _text(raw)
+            elif kind in (_VALUE, _OPTIONAL_VALUE):
+                values[name] = _decode_value(raw)
+            elif kind == _MESSAGES:
+                list_values.setdefault(name, []).append(_decode_message(raw))
+            elif kind == _PATCH:
+                list_values.setdefault(name, []).append(_decode_patch_operation(raw))
+        for _, name, kind in fields:
+            if kind == _STRING:
+                values.setdefault(name, "")
+            elif kind in (_VALUE, _OPTIONAL_VALUE):
+                values.setdefault(name, None)
+            elif kind in (_MESSAGES, _PATCH):
+                values[name] = list_values.get(name, [])
+        return event_class(type=event_type, **values)
+    raise ValueError("Invalid event: no known event in message")
+
+
+class EventDecoder:
+    """
+    Incremental decoder for a length-prefixed protobuf event stream.
+
+    Feed it bytes as they arrive; it returns every event completed so far and
+    keeps partial frames buffered until the rest arrives.
+    """
+
+    def __init__(self, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE):
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[BaseEvent]:
+        """
+        Add received bytes and decode the complete frames.
+
+        Raises:
+            ValueError: If a frame exceeds max_frame_size or is malformed
+        """
+        self._buffer += data
+        events = []
+        pos = 0
+        buffered = len(self._buffer)
+        while buffered - pos >= FRAME_HEADER_SIZE:
+            length = _unpack_length(self._buffer, pos)[0]
+            if length > self.max_frame_size:
+                raise ValueError(f"Frame of {length} bytes exceeds max_frame_size ({self.max_frame_size})")
+            end = pos + FRAME_HEADER_SIZE + length
+            if end > buffered:
+                break
+            events.append(decode_event(bytes(self._buffer[pos + FRAME_HEADER_SIZE:end])))
+            pos = end
+        if pos:
+            del self._buffer[:pos]
+        return events
+
+    @property
+    def pending(self) -> int:
+        """Bytes buffered that don't form a complete frame yet."""
+        return len(self._buffer)
@@ -0,0 +1,120 @@
+"""
+This module contains the SSE fast path for streaming event types.
+
+Token-by-token streaming sends one TEXT_MESSAGE_CONTENT or TOOL_CALL_ARGS
+event per model delta, and pydantic's model_dump_json (alias generation,
+exclude_none) dominates the per-event cost. For the streaming event types
+the SSE line is written from a template instead:
+
+- the camelCase keys and their order are read from the model fields once,
+  when the module is imported, so the templates can't drift from the models
+- string values are escaped with the json module's C escaper
+- anything a template can't write as-is (raw_event, non-string values) falls
+  back to model_dump_json, so the output is always byte-identical to it
+"""
+
+from json.encoder import encode_basestring
+from typing import Callable, Dict, Optional, Type
+
+from ag_ui.core.events import (
+    BaseEvent,
+    EventType,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallStartEvent,
+)
+
+SSE_PREFIX = "data: "
+SSE_SUFFIX = "}\n\n"
+
+
+def _compile(event_class: Type[BaseEvent]) -> Callable[[BaseEvent], Optional[str]]:
+    """Build the SSE writer for one event class, from its fields and aliases."""
+    event_type = event_class.model_fields["type"].default
+    head = f'{SSE_PREFIX}{{"type":{encode_basestring(event_type.value)}'
+    fields = tuple(
+        (name, f',{encode_basestring(field.alias or name)}:')
+        for name, field in event_class.model_fields.items()
+        if name != "type"
+    )
+
+    def write(event: BaseEvent) -> Optional[str]:
+        parts = [head]
+        for name, key in fields:
+            value = getattr(event, name)
+            if value is None:
+                continue
+            if value.__class__ is str:
+                parts += (key, encode_basestring(value))
+            elif value.__class__ is int:
+                parts += (key, str(value))
+            else:
+                return None
+        parts.append(SSE_SUFFIX)
+        return "".join(parts)
+
+    return write
+
+
+_WRITERS: Dict[Type[BaseEvent], Callable[[BaseEvent], Optional[str]]] = {
+    event_class: _compile(event_class)
+    for event_class in (
+        TextMessageStartEvent,
+        TextMessageContentEvent,
+        TextMessageEndEvent,
+        ThinkingTextMessageContentEvent,
+        ToolCallStartEvent,
+        ToolCallArgsEvent,
+        ToolCallEndEvent,
+    )
+}
+
+
+def encode_sse(event: BaseEvent) -> str:
+    """
+    Encode an event as an SSE data line.
+
+    Same output as ``data: {model_dump_json(by_alias=True, exclude_none=True)}``.
+    """
+    # Exact class match: subclasses may add fields the template doesn't know
+    writer = _WRITERS.get(event.__class__)
+    if writer is not None:
+        encoded = writer(event)
+        if encoded is not None:
+            return encoded
+    return f"{SSE_PREFIX}{event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+
+
+def _delta_template(event_class: Type[BaseEvent], id_field: str):
+    fields = event_class.model_fields
+    head = f'{SSE_PREFIX}{{"type":{encode_basestring(fields["type"].default.value)}'
+    return head, ',"timestamp":', f',{encode_basestring(fields[id_field].alias)}:', ',"delta":'
+
+
+_DELTA_TEMPLATES = {
+    EventType.TEXT_MESSAGE_CONTENT: _delta_template(TextMessageContentEvent, "message_id"),
+    EventType.TOOL_CALL_ARGS: _delta_template(ToolCallArgsEvent, "tool_call_id"),
+}
+
+
+def encode_delta_sse(event_type: EventType, ident: str, delta: str, timestamp: Optional[int] = None) -> str:
+    """
+    Write a TEXT_MESSAGE_CONTENT / TOOL_CALL_ARGS SSE line straight from its values.
+
+    Args:
+        event_type: EventType.TEXT_MESSAGE_CONTENT or EventType.TOOL_CALL_ARGS
+        ident: The message id or tool call id
+        delta: The text or arguments fragment
+        timestamp: Optional event timestamp
+    """
+    head, timestamp_key, id_key, delta_key = _DELTA_TEMPLATES[event_type]
+    if timestamp is None:
+        return "".join((head, id_key, encode_basestring(ident), delta_key, encode_basestring(delta), SSE_SUFFIX))
+    return "".join((
+        head, timestamp_key, str(timestamp), id_key, encode_basestring(ident),
+        delta_key, encode_basestring(delta), SSE_SUFFIX,
+    ))
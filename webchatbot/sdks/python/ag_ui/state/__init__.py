@@ -0,0 +1,8 @@
+"""
+This module contains state delta support: JSON Patch diffing and the StateTracker.
+"""
+
+from ag_ui.state.patch import JsonPatch, make_patch
+from ag_ui.state.tracker import StateTracker
+
+__all__ = ["JsonPatch", "make_patch", "StateTracker"]
@@ -0,0 +1,71 @@
+"""
+This module contains the JSON Patch (RFC 6902) diff used for state deltas.
+"""
+
+from typing import Any, Dict, List
+
+JsonPatch = List[Dict[str, Any]]
+
+
+def escape_pointer_token(token: Any) -> str:
+    """Escape one JSON Pointer (RFC 6901) reference token."""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> JsonPatch:
+    """
+    Compute the JSON Patch that turns ``old`` into ``new``.
+
+    Both values must be plain JSON data (dict, list, str, int, float, bool,
+    None). Unchanged subtrees are skipped with one equality check each,
+    which short-circuits on shared (identical) objects (Python equality, so
+    1, 1.0 and True count as unchanged); lists that only grew
+    or shrank at the end become per-item add/remove operations, so appending
+    to a message list costs one operation per new message.
+
+    Args:
+        old: The value the client has
+        new: The value the client should end up with
+        path: JSON Pointer of the values (empty for the document root)
+
+    Returns:
+        The patch operations (empty if the values are equal)
+    """
+    if old is new or old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        return _diff_dicts(old, new, path)
+    if isinstance(old, list) and isinstance(new, list):
+        return _diff_lists(old, new, path)
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def _diff_dicts(old: Dict[str, Any], new: Dict[str, Any], path: str) -> JsonPatch:
+    patch: JsonPatch = []
+    for key in old:
+        if key not in new:
+            patch.append({"op": "remove", "path": f"{path}/{escape_pointer_token(key)}"})
+    for key, value in new.items():
+        child = f"{path}/{escape_pointer_token(key)}"
+        if key not in old:
+            patch.append({"op": "add", "path": child, "value": value})
+        else:
+            patch.extend(make_patch(old[key], value, child))
+    return patch
+
+
+def _diff_lists(old: List[Any], new: List[Any], path: str) -> JsonPatch:
+    old_len, new_len = len(old), len(new)
+    common = min(old_len, new_len)
+    if old_len != new_len and old[:common] != new[:common]:
+        # Insertions or removals in the middle: not worth finding the edit script
+        return [{"op": "replace", "path": path, "value": new}]
+
+    patch: JsonPatch = []
+    for index in range(common):
+        patch.extend(make_patch(old[index], new[index], f"{path}/{index}"))
+    for index in range(common, new_len):
+        patch.append({"op": "add", "path": f"{path}/{index}", "value": new[index]})
+    for index in range(old_len - 1, common - 1, -1):
+        patch.append({"op": "remove", "path": f"{path}/{index}"})
+    return patch
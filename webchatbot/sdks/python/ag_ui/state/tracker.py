@@ -0,0 +1,119 @@
+"""
+This module contains the StateTracker class
+"""
+
+import json
+from typing import Any, List, Optional
+
+from pydantic_core import to_jsonable_python
+
+from ag_ui.core.events import BaseEvent, EventType, MessagesSnapshotEvent, StateDeltaEvent, StateSnapshotEvent
+from ag_ui.state.patch import make_patch
+
+_compact = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str).encode
+
+
+def to_json_data(value: Any) -> Any:
+    """Convert a state value to plain JSON data, the way the encoder would serialize it."""
+    return to_jsonable_python(value, by_alias=True, fallback=str)
+
+
+class StateTracker:
+    """
+    Turns repeated state snapshots into JSON Patch state deltas, for one run.
+
+    It remembers the last state sent to the client: the first state of a run
+    goes out as a STATE_SNAPSHOT, later ones as STATE_DELTA, unless the patch
+    would be larger than ``max_patch_ratio`` times the snapshot. Messages
+    snapshots identical to the last one sent are dropped.
+
+    Use one tracker per run and pass every outgoing event through
+    :meth:`process`.
+    """
+
+    def __init__(self, max_patch_ratio: float = 0.5, min_compare_size: int = 512):
+        """
+        Args:
+            max_patch_ratio: Send a snapshot when the patch is larger than this
+                fraction of the snapshot
+            min_compare_size: Patches smaller than this many bytes are sent
+                without measuring the snapshot
+        """
+        self.max_patch_ratio = max_patch_ratio
+        self.min_compare_size = min_compare_size
+        self._state: Any = None
+        self._has_state = False
+        self._messages: Optional[List[Any]] = None
+        self.snapshots_sent = 0
+        self.deltas_sent = 0
+
+    def reset(self) -> None:
+        """Forget what was sent (e.g. when the client reconnects)."""
+        self._state = None
+        self._has_state = False
+        self._messages = None
+
+    def process(self, event: BaseEvent) -> Optional[BaseEvent]:
+        """
+        Rewrite an outgoing event.
+
+        Returns:
+            The event to send: a STATE_DELTA instead of a STATE_SNAPSHOT where
+            that is smaller, None for a snapshot that changes nothing, and any
+            other event unchanged
+        """
+        if event.type == EventType.STATE_SNAPSHOT:
+            return self.state_event(event.snapshot, timestamp=event.timestamp, raw_event=event.raw_event)
+        if event.type == EventType.MESSAGES_SNAPSHOT:
+            return self.messages_event(event)
+        if event.type == EventType.STATE_DELTA and self._has_state:
+            # Someone else sent a delta: we no longer know the client's state
+            self.reset()
+        return event
+
+    def state_event(
+        self, state: Any, timestamp: Optional[int] = None, raw_event: Any = None
+    ) -> Optional[BaseEvent]:
+        """
+        Build the event that brings the client to ``state``.
+
+        Returns:
+            A STATE_SNAPSHOT or STATE_DELTA, or None if the state is unchanged
+        """
+        current = to_json_data(state)
+        if not self._has_state or not isinstance(current, dict) or not isinstance(self._state, dict):
+            return self._snapshot(current, timestamp, raw_event)
+
+        patch = make_patch(self._state, current)
+        if not patch:
+            return None
+
+        patch_size = len(_compact(patch))
+        if patch_size >= self.min_compare_size:
+            snapshot_size = len(_compact(current))
+            if patch_size > snapshot_size * self.max_patch_ratio:
+                return self._snapshot(current, timestamp, raw_event)
+
+        self._state = current
+        self.deltas_sent += 1
+        return StateDeltaEvent(
+            type=EventType.STATE_DELTA, delta=patch, timestamp=timestamp, raw_event=raw_event
+        )
+
+    def messages_event(self, event: MessagesSnapshotEvent) -> Optional[MessagesSnapshotEvent]:
+        """
+        Pass on a messages snapshot unless it repeats the last one sent.
+        """
+        messages = [to_json_data(message) for message in event.messages]
+        if messages == self._messages:
+            return None
+        self._messages = messages
+        return event
+
+    def _snapshot(self, current: Any, timestamp: Optional[int], raw_event: Any) -> StateSnapshotEvent:
+        self._state = current
+        self._has_state = True
+        self.snapshots_sent += 1
+        return StateSnapshotEvent(
+            type=EventType.STATE_SNAPSHOT, snapshot=current, timestamp=timestamp, raw_event=raw_event
+        )
@@ -0,0 +1,23 @@
+"""
+This module contains the EventBridge, a bounded event queue between agent runs and client streams,
+and helpers for streaming tool call payloads.
+"""
+
+from ag_ui.streaming.bridge import DEFAULT_MAX_EVENTS, EventBridge
+from ag_ui.streaming.payloads import (
+    DEFAULT_MAX_TOOL_RESULT_CHARS,
+    IdentityCache,
+    serialize_tool_result,
+    tool_call_args_delta,
+    truncate_tool_result,
+)
+
+__all__ = [
+    "DEFAULT_MAX_EVENTS",
+    "EventBridge",
+    "DEFAULT_MAX_TOOL_RESULT_CHARS",
+    "IdentityCache",
+    "serialize_tool_result",
+    "tool_call_args_delta",
+    "truncate_tool_result",
+]
@@ -0,0 +1,267 @@
+"""
+This module contains the EventBridge class
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from ag_ui.core.events import BaseEvent, EventType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_EVENTS = 1000
+
+# Delta events that can be merged into the previous event for the same id,
+# and the fields that identify what they belong to
+_COALESCABLE = {
+    EventType.TEXT_MESSAGE_CONTENT: ("message_id",),
+    EventType.TOOL_CALL_ARGS: ("tool_call_id",),
+    EventType.TEXT_MESSAGE_CHUNK: ("message_id", "role"),
+    EventType.TOOL_CALL_CHUNK: ("tool_call_id", "tool_call_name", "parent_message_id"),
+}
+
+# Events a later event of the same type makes obsolete
+_SUPERSEDABLE = (EventType.STATE_SNAPSHOT, EventType.MESSAGES_SNAPSHOT)
+
+
+def _coalesce(previous: BaseEvent, event: BaseEvent) -> Optional[BaseEvent]:
+    """Merge a delta event into the previous one, or None if they don't merge."""
+    if event.type != previous.type or event.raw_event is not None or previous.raw_event is not None:
+        return None
+    fields = _COALESCABLE.get(event.type)
+    if fields is None:
+        return None
+    first = fields[0]
+    if getattr(event, first) != getattr(previous, first):
+        return None
+    # Chunks may repeat the id fields, but must not change them
+    for field in fields[1:]:
+        value = getattr(event, field)
+        if value is not None and value != getattr(previous, field):
+            return None
+    return previous.model_copy(update={"delta": (previous.delta or "") + (event.delta or "")})
+
+
+class EventBridge:
+    """
+    A bounded event queue between a background agent run and the client stream.
+
+    It keeps the asyncio.Queue interface the integrations already use
+    (``put``/``put_nowait``/``get``, ``None`` as end-of-stream) and bounds the
+    memory a slow or stalled client can hold:
+
+    - when the queue is full, text and tool call argument deltas are merged
+      into the queued delta for the same message / tool call, and a state or
+      messages snapshot replaces the queued snapshot of the same type
+    - otherwise ``put`` waits for the consumer (backpressure); ``put_nowait``,
+      for producers that can't wait, gives up on the run instead: the queue is
+      dropped, the producer cancelled, and ``overflowed`` set
+    - ``cancel()`` (the client went away) drops the queue and cancels the
+      producer task registered with ``attach()``
+
+    ``put_nowait`` may be called from other threads (e.g. framework event bus
+    callbacks); everything else must run on the event loop.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAX_EVENTS):
+        """
+        Args:
+            maxsize: Maximum number of queued events
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._items: Deque[Tuple[float, BaseEvent]] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        try:
+            self._loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        self._thread_id = threading.get_ident()
+        self._producer: Optional[asyncio.Future] = None
+        self.closed = False
+        self.cancelled = False
+        self.overflowed = False
+
+        self.events_in = 0
+        self.events_out = 0
+        self.coalesced = 0
+        self.superseded = 0
+        self.high_water = 0
+        self.producer_wait = 0.0
+        self._last_get = time.monotonic()
+
+    def attach(self, producer: asyncio.Future) -> None:
+        """Register the task producing events, to cancel it when the consumer goes away."""
+        self._producer = producer
+
+    # ===== PRODUCER SIDE =====
+
+    async def put(self, event: Optional[BaseEvent]) -> None:
+        """Queue an event, waiting while the queue is full. ``None`` ends the stream."""
+        if event is None:
+            self.close()
+            return
+        if self.closed:
+            return
+        if len(self._items) >= self.maxsize:
+            if self._compact(event):
+                return
+            started = time.monotonic()
+            while len(self._items) >= self.maxsize and not self.closed:
+                self._not_full.clear()
+                await self._not_full.wait()
+            self.producer_wait += time.monotonic() - started
+            if self.closed:
+                return
+        self._append(event)
+
+    def put_nowait(self, event: Optional[BaseEvent]) -> bool:
+        """
+        Queue an event without waiting. ``None`` ends the stream.
+
+        Returns:
+            False if the event was dropped (stream closed or overflowed)
+        """
+        if threading.get_ident() != self._thread_id and self._loop is not None:
+            self._loop.call_soon_threadsafe(self.put_nowait, event)
+            return not self.closed
+        if event is None:
+            self.close()
+            return True
+        if self.closed:
+            return False
+        if len(self._items) >= self.maxsize:
+            if self._compact(event):
+                return True
+            logger.warning(
+                "Event stream overflowed (%d events queued, consumer not reading); cancelling run",
+                len(self._items),
+            )
+            self.overflowed = True
+            self.cancel()
+            return False
+        self._append(event)
+        return True
+
+    def close(self) -> None:
+        """End the stream; the consumer gets what's queued, then None."""
+        self.closed = True
+        self._not_empty.set()
+        self._not_full.set()
+
+    def cancel(self) -> None:
+        """Drop queued events, cancel the producer and end the stream (consumer gone)."""
+        self.cancelled = True
+        self._items.clear()
+        self.close()
+        if self._producer is not None and not self._producer.done():
+            self._producer.cancel()
+
+    def _append(self, event: BaseEvent) -> None:
+        self._items.append((time.monotonic(), event))
+        self.events_in += 1
+        if len(self._items) > self.high_water:
+            self.high_water = len(self._items)
+        self._not_empty.set()
+
+    def _compact(self, event: BaseEvent) -> bool:
+        """Fold an event into the full queue without growing it; True if it was."""
+        if self._items:
+            enqueued_at, previous = self._items[-1]
+            merged = _coalesce(previous, event)
+            if merged is not None:
+                self._items[-1] = (enqueued_at, merged)
+                self.events_in += 1
+                self.coalesced += 1
+                return True
+        if event.type in _SUPERSEDABLE:
+            for index in range(len(self._items) - 1, -1, -1):
+                if self._items[index][1].type == event.type:
+                    del self._items[index]
+                    self.superseded += 1
+                    self._append(event)
+                    return True
+        return False
+
+    # ===== CONSUMER SIDE =====
+
+    async def get(self) -> Optional[BaseEvent]:
+        """Next event, or None once the stream has ended and been drained."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        while not self._items:
+            if self.closed:
+                return None
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._pop()
+
+    def get_nowait(self) -> Optional[BaseEvent]:
+        """Next event without waiting; raises asyncio.QueueEmpty if there is none yet."""
+        if self._items:
+            return self._pop()
+        if self.closed:
+            return None
+        raise asyncio.QueueEmpty
+
+    def _pop(self) -> BaseEvent:
+        _, event = self._items.popleft()
+        self.events_out += 1
+        self._last_get = time.monotonic()
+        self._not_full.set()
+        return event
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> BaseEvent:
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    # ===== METRICS =====
+
+    def qsize(self) -> int:
+        """Number of queued events."""
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+
+    @property
+    def lag(self) -> float:
+        """Seconds the oldest queued event has been waiting for the consumer."""
+        if not self._items:
+            return 0.0
+        return time.monotonic() - self._items[0][0]
+
+    def is_stalled(self, timeout_seconds: float) -> bool:
+        """Whether events have been waiting and the consumer hasn't read any for timeout_seconds."""
+        now = time.monotonic()
+        return bool(self._items) and now - self._items[0][0] > timeout_seconds and now - self._last_get > timeout_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-run counters: queue depth, lag, and what was merged or replaced."""
+        return {
+            "queued": len(self._items),
+            "high_water": self.high_water,
+            "lag": self.lag,
+            "events_in": self.events_in,
+            "events_out": self.events_out,
+            "coalesced": self.coalesced,
+            "superseded": self.superseded,
+            "producer_wait": self.producer_wait,
+            "overflowed": self.overflowed,
+            "cancelled": self.cancelled,
+        }
@@ -0,0 +1,102 @@
+"""
+This module contains helpers for the tool call payloads integrations stream:
+argument deltas, tool results and per-run coercion caching
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Longest tool result (in characters) sent in a TOOL_CALL_RESULT event
+DEFAULT_MAX_TOOL_RESULT_CHARS = 1_000_000
+
+# Objects an IdentityCache holds before it starts over
+DEFAULT_MAX_CACHED_OBJECTS = 4096
+
+TRUNCATION_MARKER = "…[truncated {omitted} chars]"
+
+
+def tool_call_args_delta(args: Any) -> str:
+    """
+    The TOOL_CALL_ARGS delta for tool call arguments.
+
+    Streamed fragments (strings) are passed through as they are: a fragment
+    is usually incomplete JSON and is never parsed or re-encoded. Anything
+    else (the parsed arguments of a whole call) is JSON-encoded once.
+    """
+    if isinstance(args, str):
+        return args
+    if isinstance(args, (bytes, bytearray)):
+        return args.decode()
+    return json.dumps(args)
+
+
+def truncate_tool_result(content: str, max_chars: Optional[int] = DEFAULT_MAX_TOOL_RESULT_CHARS) -> str:
+    """
+    Cut a tool result down to ``max_chars`` characters, plus a marker saying
+    how much was left out. ``max_chars`` None means no limit.
+
+    A truncated JSON result is no longer valid JSON; clients get the start of
+    it as text.
+    """
+    if max_chars is None or len(content) <= max_chars:
+        return content
+    omitted = len(content) - max_chars
+    logger.warning("Truncating tool result from %d to %d chars", len(content), max_chars)
+    return content[:max_chars] + TRUNCATION_MARKER.format(omitted=omitted)
+
+
+def serialize_tool_result(
+    value: Any,
+    coerce: Optional[Callable[[Any], Any]] = None,
+    max_chars: Optional[int] = DEFAULT_MAX_TOOL_RESULT_CHARS,
+) -> str:
+    """
+    Serialize a tool result into TOOL_CALL_RESULT content: coerced with
+    ``coerce`` (if given), JSON-encoded once, then truncated to ``max_chars``.
+    """
+    if coerce is not None:
+        value = coerce(value)
+    return truncate_tool_result(json.dumps(value, ensure_ascii=False), max_chars)
+
+
+class IdentityCache:
+    """
+    Values derived from objects (such as their JSON-safe form), keyed by
+    object identity.
+
+    Meant to live for one run: integrations coerce the same objects
+    (messages, metadata, tool payloads) into many events of a run, and with
+    the cache each object is walked once. Entries keep a reference to their
+    object, so its id can't be reused while it is cached; cached objects are
+    assumed not to change during the run. When ``max_entries`` objects are
+    cached, the cache starts over.
+    """
+
+    __slots__ = ("max_entries", "_entries")
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_CACHED_OBJECTS):
+        self.max_entries = max_entries
+        self._entries: Dict[int, Tuple[Any, Any]] = {}
+
+    def get(self, obj: Any, default: Any = None) -> Any:
+        """The value cached for ``obj``, or ``default``."""
+        entry = self._entries.get(id(obj))
+        if entry is None or entry[0] is not obj:
+            return default
+        return entry[1]
+
+    def set(self, obj: Any, value: Any) -> Any:
+        """Cache ``value`` for ``obj`` and return it."""
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[id(obj)] = (obj, value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,83 @@
+"""
+Encoder benchmark: SSE/JSON vs protobuf framing.
+
+Measures encode throughput and wire size for the events a streaming run
+sends most (TEXT_MESSAGE_CONTENT, TOOL_CALL_ARGS) and for a state snapshot,
+plus decode throughput of the streaming protobuf decoder.
+
+The per-event section prices one streamed token end to end (build the event,
+encode it) for each way of doing it: pydantic model + model_dump_json (what
+every event cost before the SSE templates), model + templates, the
+encode_text_message_content shortcut, and the debug (validate=True) path.
+
+Usage:
+    python benchmarks/encoder_benchmark.py [--number N]
+"""
+
+import argparse
+import timeit
+
+from ag_ui.core import EventType, StateSnapshotEvent, TextMessageContentEvent, ToolCallArgsEvent
+from ag_ui.encoder import AGUI_MEDIA_TYPE, EventDecoder, EventEncoder
+
+EVENTS = {
+    "text_message_content": TextMessageContentEvent(
+        message_id="msg_6f1c2a9e", delta=" the quick brown fox"
+    ),
+    "tool_call_args": ToolCallArgsEvent(tool_call_id="call_3b7d", delta='{"query": "weather in'),
+    "state_snapshot": StateSnapshotEvent(snapshot={
+        "steps": [{"description": f"step {i}", "status": "pending", "progress": i / 10} for i in range(20)],
+        "user": {"id": "u_42", "language": "en", "premium": False},
+    }),
+}
+
+
+def bench(number: int) -> None:
+    sse = EventEncoder()
+    proto = EventEncoder(accept=AGUI_MEDIA_TYPE)
+
+    print(f"{'event':<22}{'format':<8}{'bytes':>7}{'encode/s':>12}{'decode/s':>12}")
+    for name, event in EVENTS.items():
+        for label, encoder in (("sse", sse), ("proto", proto)):
+            encoded = encoder.encode_binary(event)
+            seconds = timeit.timeit(lambda: encoder.encode(event), number=number)
+            if label == "proto":
+                decoder = EventDecoder()
+                decode_seconds = timeit.timeit(lambda: decoder.feed(encoded), number=number)
+                decode_rate = f"{number / decode_seconds:>12,.0f}"
+            else:
+                decode_rate = f"{'-':>12}"
+            print(f"{name:<22}{label:<8}{len(encoded):>7}{number / seconds:>12,.0f}{decode_rate}")
+
+
+
+def bench_per_event(number: int) -> None:
+    message_id, delta = "msg_6f1c2a9e", " the quick brown fox"
+    sse = EventEncoder(validate=False)
+    proto = EventEncoder(accept=AGUI_MEDIA_TYPE, validate=False)
+    debug = EventEncoder(validate=True)
+
+    cases = {
+        "model + model_dump_json": lambda: "data: " + TextMessageContentEvent(
+            type=EventType.TEXT_MESSAGE_CONTENT, message_id=message_id, delta=delta
+        ).model_dump_json(by_alias=True, exclude_none=True) + "\n\n",
+        "model + sse template": lambda: sse.encode(
+            TextMessageContentEvent(type=EventType.TEXT_MESSAGE_CONTENT, message_id=message_id, delta=delta)
+        ),
+        "shortcut, sse": lambda: sse.encode_text_message_content(message_id, delta),
+        "shortcut, proto": lambda: proto.encode_text_message_content(message_id, delta),
+        "shortcut, validate=True": lambda: debug.encode_text_message_content(message_id, delta),
+    }
+
+    print(f"\n{'TEXT_MESSAGE_CONTENT, build + encode':<40}{'us/event':>10}")
+    for label, case in cases.items():
+        seconds = min(timeit.repeat(case, number=number, repeat=3))
+        print(f"{label:<40}{seconds / number * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=50_000, help="Iterations per measurement")
+    args = parser.parse_args()
+    bench(args.number)
+    bench_per_event(args.number)
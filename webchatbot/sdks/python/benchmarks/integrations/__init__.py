@@ -0,0 +1,8 @@
+"""
+Cross-framework AG-UI integration benchmark.
+
+Drives concurrent runs through each integration's FastAPI endpoint
+in-process, with every framework's model replaced by the same scripted,
+deterministic token stream (one backend tool call, then the answer), and
+reports per-adapter overhead. See README.md.
+"""
@@ -0,0 +1,155 @@
+"""
+Cross-framework AG-UI integration benchmark CLI.
+
+Usage (from sdks/python/, with the integrations to compare installed):
+    python -m benchmarks.integrations --runs 200 --concurrency 20
+    python -m benchmarks.integrations --targets reference,adk --save benchmarks/baselines/local.json
+    python -m benchmarks.integrations --compare benchmarks/baselines/local.json
+
+Targets whose framework is not installed are reported as skipped. Exits
+with status 1 when --compare finds a metric worse than the baseline by more
+than --tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .load import run_load
+from .script import ScriptedLLM
+from .targets import TARGETS
+
+HIGHER_IS_BETTER_SUFFIXES = ("_per_second",)
+LOWER_IS_BETTER_SUFFIXES = ("_ms", "_us_per_event", "_ms_per_run", "_kb")
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.integrations", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", default=",".join(TARGETS),
+                        help=f"Comma-separated subset of: {', '.join(TARGETS)}")
+    parser.add_argument("--runs", type=int, default=100, help="Runs per target")
+    parser.add_argument("--concurrency", type=int, default=10, help="Runs in flight at once")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed runs per target")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--first-token-latency", type=float, default=0.05, help="Seconds, per model turn")
+    parser.add_argument("--response-tokens", type=int, default=60)
+    parser.add_argument("--tool-calls", type=int, default=1, help="Backend tool calls before the answer")
+    parser.add_argument("--log-level", default="ERROR", help="Python logging level for the frameworks")
+    parser.add_argument("--save", type=Path, help="Write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="Compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression")
+    return parser.parse_args(argv)
+
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    names = [name.strip() for name in args.targets.split(",") if name.strip()]
+    unknown = [name for name in names if name not in TARGETS]
+    if unknown:
+        raise SystemExit(f"Unknown target(s) {', '.join(unknown)}; choose from {', '.join(TARGETS)}")
+
+    llm = ScriptedLLM(
+        tokens_per_second=args.tokens_per_second,
+        first_token_latency=args.first_token_latency,
+        response_tokens=args.response_tokens,
+        tool_calls=args.tool_calls,
+    )
+    results: Dict[str, Any] = {
+        "meta": {
+            "created_at": int(time.time()),
+            "python": platform.python_version(),
+            "llm": llm.settings(),
+            "min_ttft_ms": llm.min_ttft() * 1000,
+        },
+        "targets": {},
+    }
+    for name in names:
+        try:
+            target = TARGETS[name](llm, args.concurrency)
+        except ImportError as e:
+            results["targets"][name] = {"skipped": f"{type(e).__name__}: {e}"}
+            continue
+        report = await run_load(target, llm, args.runs, args.concurrency, args.warmup)
+        results["targets"][name] = report.summary()
+    return results
+
+
+def _flatten(results: Dict[str, Any]) -> Dict[str, float]:
+    """Flatten comparable metrics into `target.metric` keys."""
+    flat: Dict[str, float] = {}
+    for name, metrics in results.get("targets", {}).items():
+        for metric, value in metrics.items():
+            if isinstance(value, (int, float)) and metric.endswith(
+                HIGHER_IS_BETTER_SUFFIXES + LOWER_IS_BETTER_SUFFIXES
+            ):
+                flat[f"{name}.{metric}"] = float(value)
+    return flat
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return human-readable regressions of `current` against `baseline`."""
+    regressions = []
+    now = _flatten(current)
+    for key, before in _flatten(baseline).items():
+        after = now.get(key)
+        if after is None or before <= 0:
+            continue
+        change = (after - before) / before
+        if key.endswith(HIGHER_IS_BETTER_SUFFIXES):
+            change = -change
+        if change > tolerance:
+            regressions.append(f"{key}: {before:.2f} -> {after:.2f} ({change:+.0%} worse)")
+    return regressions
+
+
+def _print_report(results: Dict[str, Any]) -> None:
+    print(f"script: {results['meta']['llm']}, min ttft {results['meta']['min_ttft_ms']:.1f} ms")
+    for name, summary in results["targets"].items():
+        if "skipped" in summary:
+            print(f"[{name}] skipped ({summary['skipped']})")
+            continue
+        print(
+            f"[{name}] runs={summary['runs']} concurrency={summary['concurrency']} errors={summary['errors']} "
+            f"events/run={summary['events_per_run']:.0f} events/s={summary['events_per_second']:.0f} "
+            f"cpu/run={summary['cpu_ms_per_run']:.2f} ms encoder={summary['encoder_us_per_event']:.1f} us/event "
+            f"ttft p50/p95={summary['ttft_p50_ms']:.1f}/{summary['ttft_p95_ms']:.1f} ms "
+            f"({summary['ttft_overhead_p50_ms']:+.1f} ms) "
+            f"queue lag p50/p95={summary['queue_lag_p50_ms']:.1f}/{summary['queue_lag_p95_ms']:.1f} ms "
+            f"mem/run={summary['memory_per_run_kb']:.0f} KiB"
+        )
+        if summary["first_error"]:
+            print(f"  first error: {summary['first_error']}")
+
+
+def main(argv: List[str] = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    logging.basicConfig(level=args.log_level.upper())
+    results = asyncio.run(_run(args))
+    _print_report(results)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(results, indent=2))
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.compare}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Concurrent run driver and metrics.
+
+Calls each target's ASGI app directly (httpx's ASGITransport buffers the
+whole response body, which would hide time-to-first-token), parses the SSE
+stream, and measures per target:
+
+- events/s and events per run
+- process CPU per run, and the part of it spent in EventEncoder
+- time to first answer token, and the overhead over the script's own latency
+- queue lag: answer token emitted by the scripted model -> received by the client
+- traced memory per in-flight run (separate pass under tracemalloc)
+"""
+
+import asyncio
+import contextlib
+import gc
+import json
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from ag_ui.encoder import EventEncoder
+
+from .script import ScriptedLLM, run_message
+from .targets import Target
+
+TEXT_EVENTS = ("TEXT_MESSAGE_CONTENT", "TEXT_MESSAGE_CHUNK")
+ENCODER_METHODS = ("encode", "encode_text_message_content", "encode_tool_call_args")
+
+
+@dataclass
+class RunResult:
+    """Outcome of one benchmark run."""
+    ttft: Optional[float] = None
+    duration: float = 0.0
+    events: int = 0
+    lags: List[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class EncoderTimer:
+    """Wall time spent in EventEncoder methods (synchronous, so CPU-bound)."""
+    seconds: float = 0.0
+    calls: int = 0
+
+
+@dataclass
+class LoadReport:
+    """Aggregated results for one target."""
+    target: str
+    runs: int
+    concurrency: int
+    min_ttft: float
+    results: List[RunResult] = field(default_factory=list)
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    encoder: EncoderTimer = field(default_factory=EncoderTimer)
+    memory_per_run_bytes: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        ok = [r for r in self.results if r.error is None]
+        ttfts = sorted(r.ttft for r in ok if r.ttft is not None)
+        lags = sorted(lag for r in ok for lag in r.lags)
+        total_events = sum(r.events for r in ok)
+        errors = [r.error for r in self.results if r.error is not None]
+        return {
+            "runs": self.runs,
+            "concurrency": self.concurrency,
+            "errors": len(errors),
+            "first_error": errors[0] if errors else None,
+            "events_per_run": total_events / len(ok) if ok else 0.0,
+            "events_per_second": total_events / self.wall_time if self.wall_time else 0.0,
+            "cpu_ms_per_run": self.cpu_time / len(ok) * 1000 if ok else 0.0,
+            "encoder_us_per_event": self.encoder.seconds / self.encoder.calls * 1e6 if self.encoder.calls else 0.0,
+            "ttft_p50_ms": _percentile(ttfts, 50) * 1000,
+            "ttft_p95_ms": _percentile(ttfts, 95) * 1000,
+            "ttft_overhead_p50_ms": (_percentile(ttfts, 50) - self.min_ttft) * 1000 if ttfts else 0.0,
+            "queue_lag_p50_ms": _percentile(lags, 50) * 1000,
+            "queue_lag_p95_ms": _percentile(lags, 95) * 1000,
+            "memory_per_run_kb": self.memory_per_run_bytes / 1024,
+        }
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+@contextlib.contextmanager
+def time_encoder() -> Iterator[EncoderTimer]:
+    """Time every EventEncoder call made by any integration while active."""
+    timer = EncoderTimer()
+    originals = {name: getattr(EventEncoder, name) for name in ENCODER_METHODS}
+
+    def timed(method):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timer.seconds += time.perf_counter() - start
+                timer.calls += 1
+        return wrapper
+
+    for name, method in originals.items():
+        setattr(EventEncoder, name, timed(method))
+    try:
+        yield timer
+    finally:
+        for name, method in originals.items():
+            setattr(EventEncoder, name, method)
+
+
+async def run_once(target: Target, llm: ScriptedLLM) -> RunResult:
+    """Run one conversation through the target's SSE endpoint and consume the stream."""
+    result = RunResult()
+    run_key = f"bench-run-{uuid.uuid4().hex[:12]}"
+    body = json.dumps({
+        "threadId": f"thread-{run_key}",
+        "runId": run_key,
+        "state": {},
+        "messages": [{"id": f"user-{run_key}", "role": "user", "content": run_message(run_key)}],
+        "tools": [],
+        "context": [],
+        "forwardedProps": {},
+    }).encode()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": target.path,
+        "raw_path": target.path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"accept", b"text/event-stream"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    buffer = b""
+    status = 0
+    received_chars = 0
+    next_token = 0
+    token_ends = llm.token_ends
+    start = time.perf_counter()
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal buffer, status, received_chars, next_token
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            return
+        if message["type"] != "http.response.body":
+            return
+        buffer += message.get("body", b"")
+        while b"\n\n" in buffer:
+            frame, buffer = buffer.split(b"\n\n", 1)
+            if not frame.startswith(b"data: "):
+                continue
+            event = json.loads(frame[6:])
+            result.events += 1
+            event_type = event.get("type")
+            if event_type == "RUN_ERROR":
+                result.error = f"RUN_ERROR: {event.get('message')}"
+            elif event_type in TEXT_EVENTS and event.get("delta"):
+                now = time.perf_counter()
+                if result.ttft is None:
+                    result.ttft = now - start
+                received_chars += len(event["delta"])
+                emitted = llm.emitted.get(run_key, ())
+                while next_token < len(emitted) and token_ends[next_token] <= received_chars:
+                    result.lags.append(now - emitted[next_token])
+                    next_token += 1
+
+    try:
+        await target.app(scope, receive, send)
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+        if result.error is None and received_chars != len(llm.text):
+            raise RuntimeError(f"answer has {received_chars} chars, script has {len(llm.text)}")
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    finally:
+        disconnected.set()
+        llm.emitted.pop(run_key, None)
+    result.duration = time.perf_counter() - start
+    return result
+
+
+async def _run_many(target: Target, llm: ScriptedLLM, runs: int, concurrency: int) -> List[RunResult]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> RunResult:
+        async with semaphore:
+            return await run_once(target, llm)
+
+    return await asyncio.gather(*(one() for _ in range(runs)))
+
+
+async def run_load(target: Target, llm: ScriptedLLM, runs: int, concurrency: int, warmup: int = 2) -> LoadReport:
+    """Warm up, run `runs` conversations `concurrency` at a time, then measure memory per run."""
+    report = LoadReport(target.name, runs, concurrency, llm.min_ttft())
+    await _run_many(target, llm, warmup, concurrency)
+
+    gc.collect()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    with time_encoder() as encoder:
+        report.results = await _run_many(target, llm, runs, concurrency)
+    report.wall_time = time.perf_counter() - wall_start
+    report.cpu_time = time.process_time() - cpu_start
+    report.encoder = encoder
+
+    # One wave of concurrent runs under tracemalloc (kept out of the timed pass)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await _run_many(target, llm, concurrency, concurrency)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    report.memory_per_run_bytes = max(0, peak - baseline) / concurrency
+    return report
@@ -0,0 +1,142 @@
+"""
+Scripted fake LLM shared by all benchmark targets.
+
+Every run gets the same deterministic two-turn exchange:
+
+1. if the conversation has no tool result yet: ``tool_calls`` calls to the
+   backend tool ``lookup``, arguments streamed in ``tool_args_chunks`` pieces
+2. otherwise: ``response_tokens`` text tokens
+
+Each turn waits ``first_token_latency`` before its first chunk, then emits
+chunks at ``tokens_per_second``. The framework targets translate these
+chunks into their own model types; the emit time of every text token is
+recorded per run so the client can measure queue lag (token emitted by the
+model -> token received by the client).
+"""
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+
+TOOL_NAME = "lookup"
+TOOL_RESULT = "42"
+RUN_MARKER = "bench-run-"
+_RUN_MARKER_PATTERN = re.compile(re.escape(RUN_MARKER) + r"[0-9a-f]+")
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    """One streamed text token."""
+    index: int
+    text: str
+
+
+@dataclass(frozen=True)
+class ToolCallChunk:
+    """A piece of a tool call; ``name`` is only set on the first piece."""
+    index: int
+    tool_call_id: str
+    name: Optional[str]
+    args: str
+
+
+Chunk = Union[TextChunk, ToolCallChunk]
+
+
+def run_message(run_key: str) -> str:
+    """User message for a benchmark run; the scripted LLM finds the run by it."""
+    return f"Look it up and answer ({run_key})"
+
+
+def find_run_key(text: str) -> Optional[str]:
+    """The run key in a user message, or None."""
+    match = _RUN_MARKER_PATTERN.search(text or "")
+    return match.group(0) if match else None
+
+
+class ScriptedLLM:
+    """Deterministic token/tool call stream with per-run emit timestamps."""
+
+    def __init__(
+        self,
+        tokens_per_second: float = 200.0,
+        first_token_latency: float = 0.05,
+        response_tokens: int = 60,
+        tool_calls: int = 1,
+        tool_args_chunks: int = 4,
+    ):
+        self.tokens_per_second = tokens_per_second
+        self.first_token_latency = first_token_latency
+        self.response_tokens = response_tokens
+        self.tool_calls = tool_calls
+        self.tool_args_chunks = tool_args_chunks
+        self.tokens = [f" token{i}" for i in range(response_tokens)]
+        self.token_ends = _cumulative_lengths(self.tokens)
+        self.emitted: Dict[str, List[float]] = {}
+
+    @property
+    def text(self) -> str:
+        """The full scripted answer."""
+        return "".join(self.tokens)
+
+    def settings(self) -> Dict[str, float]:
+        return {
+            "tokens_per_second": self.tokens_per_second,
+            "first_token_latency": self.first_token_latency,
+            "response_tokens": self.response_tokens,
+            "tool_calls": self.tool_calls,
+            "tool_args_chunks": self.tool_args_chunks,
+        }
+
+    def min_ttft(self) -> float:
+        """Seconds from request to first answer token if adapters cost nothing."""
+        ttft = self.first_token_latency
+        if self.tool_calls:
+            # Tool turn (latency + argument chunks), then the answer turn's latency
+            pieces = sum(len(self.tool_arguments(call)) for call in range(self.tool_calls))
+            ttft += self.first_token_latency + (pieces - 1) / self.tokens_per_second
+        return ttft
+
+    def tool_arguments(self, call_index: int) -> List[str]:
+        """The JSON arguments of a tool call, split into streamed pieces."""
+        args = json.dumps({"query": f"benchmark query {call_index}", "limit": 10})
+        size = max(1, -(-len(args) // self.tool_args_chunks))
+        return [args[i:i + size] for i in range(0, len(args), size)]
+
+    async def stream(self, run_key: Optional[str], has_tool_result: bool) -> AsyncIterator[Chunk]:
+        """Stream one model turn."""
+        interval = 1.0 / self.tokens_per_second
+        await asyncio.sleep(self.first_token_latency)
+
+        if self.tool_calls and not has_tool_result:
+            for call in range(self.tool_calls):
+                tool_call_id = f"call_{run_key or 'x'}_{call}"
+                for piece, args in enumerate(self.tool_arguments(call)):
+                    if call or piece:
+                        await asyncio.sleep(interval)
+                    yield ToolCallChunk(call, tool_call_id, TOOL_NAME if piece == 0 else None, args)
+            return
+
+        emitted = self.emitted.setdefault(run_key, []) if run_key else None
+        for index, token in enumerate(self.tokens):
+            if index:
+                await asyncio.sleep(interval)
+            if emitted is not None:
+                emitted.append(time.perf_counter())
+            yield TextChunk(index, token)
+
+
+def lookup(query: str, limit: int = 10) -> str:
+    """Backend tool the scripted LLM calls."""
+    return TOOL_RESULT
+
+
+def _cumulative_lengths(tokens: List[str]) -> Tuple[int, ...]:
+    total, ends = 0, []
+    for token in tokens:
+        total += len(token)
+        ends.append(total)
+    return tuple(ends)
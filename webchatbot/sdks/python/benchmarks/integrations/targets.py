@@ -0,0 +1,270 @@
+"""
+Benchmark targets: one FastAPI/ASGI app per integration, each backed by the
+same ScriptedLLM.
+
+Each builder imports its framework lazily and raises ImportError when the
+framework or its AG-UI integration is not installed; the CLI reports such
+targets as skipped. To add an integration, write a builder that wraps the
+framework's model interface around ``ScriptedLLM.stream`` and registers the
+``lookup`` backend tool, and add it to TARGETS.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+from ag_ui.core import (
+    RunAgentInput,
+    RunFinishedEvent,
+    RunStartedEvent,
+    TextMessageEndEvent,
+    TextMessageStartEvent,
+    ToolCallEndEvent,
+    ToolCallResultEvent,
+    ToolCallStartEvent,
+)
+from ag_ui.encoder import EventEncoder
+
+from .script import ScriptedLLM, TextChunk, ToolCallChunk, find_run_key, lookup
+
+PATH = "/"
+
+
+@dataclass
+class Target:
+    """An ASGI app serving one integration's AG-UI endpoint at ``path``."""
+    name: str
+    app: Any
+    path: str = PATH
+
+
+def build_reference(llm: ScriptedLLM, concurrency: int) -> Target:
+    """
+    The script streamed straight through the SDK encoder, no framework.
+
+    The floor the framework targets are compared against: what the harness,
+    the event loop and the encoder cost on their own.
+    """
+    from fastapi import FastAPI, Request
+    from fastapi.responses import StreamingResponse
+
+    app = FastAPI()
+
+    @app.post(PATH)
+    async def endpoint(input_data: RunAgentInput, request: Request):
+        encoder = EventEncoder(accept=request.headers.get("accept"))
+        run_key = find_run_key(str(input_data.messages[-1].content))
+
+        async def events():
+            yield encoder.encode(RunStartedEvent(thread_id=input_data.thread_id, run_id=input_data.run_id))
+            message_id = f"msg_{input_data.run_id}"
+            text_started = has_tool_result = False
+            while True:
+                tool_calls: List[str] = []
+                async for chunk in llm.stream(run_key, has_tool_result):
+                    if isinstance(chunk, ToolCallChunk):
+                        if chunk.name:
+                            tool_calls.append(chunk.tool_call_id)
+                            yield encoder.encode(ToolCallStartEvent(
+                                tool_call_id=chunk.tool_call_id, tool_call_name=chunk.name
+                            ))
+                        yield encoder.encode_tool_call_args(chunk.tool_call_id, chunk.args)
+                    else:
+                        if not text_started:
+                            text_started = True
+                            yield encoder.encode(TextMessageStartEvent(message_id=message_id))
+                        yield encoder.encode_text_message_content(message_id, chunk.text)
+                if not tool_calls:
+                    break
+                for tool_call_id in tool_calls:
+                    yield encoder.encode(ToolCallEndEvent(tool_call_id=tool_call_id))
+                    yield encoder.encode(ToolCallResultEvent(
+                        message_id=f"result_{tool_call_id}", tool_call_id=tool_call_id, content=lookup("")
+                    ))
+                has_tool_result = True
+            if text_started:
+                yield encoder.encode(TextMessageEndEvent(message_id=message_id))
+            yield encoder.encode(RunFinishedEvent(thread_id=input_data.thread_id, run_id=input_data.run_id))
+
+        return StreamingResponse(events(), media_type=encoder.get_content_type())
+
+    return Target("reference", app)
+
+
+def build_adk(llm: ScriptedLLM, concurrency: int) -> Target:
+    """ag_ui_adk over an LlmAgent whose model is the script."""
+    from fastapi import FastAPI
+    from google.adk.agents import LlmAgent
+    from google.adk.models.base_llm import BaseLlm
+    from google.adk.models.llm_response import LlmResponse
+    from google.genai import types
+
+    from ag_ui_adk import ADKAgent, add_adk_fastapi_endpoint
+
+    class ScriptedAdkLlm(BaseLlm):
+        script: Any = None
+
+        async def generate_content_async(self, llm_request, stream: bool = False):
+            run_key, has_tool_result = None, False
+            for content in llm_request.contents:
+                for part in content.parts or []:
+                    if part.function_response is not None:
+                        has_tool_result = True
+                    elif content.role == "user" and part.text:
+                        run_key = find_run_key(part.text) or run_key
+
+            text: List[str] = []
+            calls: Dict[str, List[str]] = {}
+            async for chunk in self.script.stream(run_key, has_tool_result):
+                if isinstance(chunk, TextChunk):
+                    text.append(chunk.text)
+                    if stream:
+                        yield LlmResponse(
+                            content=types.Content(role="model", parts=[types.Part(text=chunk.text)]),
+                            partial=True,
+                        )
+                else:
+                    # ADK function calls carry parsed args, so pieces are joined
+                    calls.setdefault(chunk.tool_call_id, []).append(chunk.args)
+
+            if calls:
+                parts = [
+                    types.Part(function_call=types.FunctionCall(
+                        id=tool_call_id, name="lookup", args=json.loads("".join(pieces))
+                    ))
+                    for tool_call_id, pieces in calls.items()
+                ]
+            else:
+                parts = [types.Part(text="".join(text))]
+            yield LlmResponse(content=types.Content(role="model", parts=parts), turn_complete=True)
+
+    agent = LlmAgent(
+        name="bench",
+        model=ScriptedAdkLlm(model="scripted", script=llm),
+        instruction="Benchmark agent.",
+        tools=[lookup],
+    )
+    app = FastAPI()
+    add_adk_fastapi_endpoint(
+        app,
+        ADKAgent(
+            adk_agent=agent,
+            app_name="bench",
+            user_id="bench",
+            use_in_memory_services=True,
+            max_concurrent_executions=concurrency,
+        ),
+        path=PATH,
+    )
+    return Target("adk", app)
+
+
+def build_langgraph(llm: ScriptedLLM, concurrency: int) -> Target:
+    """ag_ui_langgraph over a two-node agent/tools graph with the script as chat model."""
+    from fastapi import FastAPI
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, ToolMessage
+    from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+    from langchain_core.tools import tool
+    from langgraph.checkpoint.memory import MemorySaver
+    from langgraph.graph import START, MessagesState, StateGraph
+    from langgraph.prebuilt import ToolNode, tools_condition
+
+    from ag_ui_langgraph import LangGraphAgent, add_langgraph_fastapi_endpoint
+
+    class ScriptedChatModel(BaseChatModel):
+        script: Any = None
+
+        @property
+        def _llm_type(self) -> str:
+            return "scripted"
+
+        def bind_tools(self, tools, **kwargs):
+            return self
+
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            raise NotImplementedError("ScriptedChatModel is async-only")
+
+        async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+            run_key, has_tool_result = None, False
+            for message in messages:
+                if isinstance(message, HumanMessage):
+                    run_key = find_run_key(str(message.content)) or run_key
+                    has_tool_result = False
+                elif isinstance(message, ToolMessage):
+                    has_tool_result = True
+
+            async for chunk in self.script.stream(run_key, has_tool_result):
+                if isinstance(chunk, TextChunk):
+                    message = AIMessageChunk(content=chunk.text)
+                else:
+                    message = AIMessageChunk(content="", tool_call_chunks=[{
+                        "name": chunk.name,
+                        "args": chunk.args,
+                        "id": chunk.tool_call_id if chunk.name else None,
+                        "index": chunk.index,
+                    }])
+                yield ChatGenerationChunk(message=message)
+
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+            merged = None
+            async for chunk in self._astream(messages, stop, **kwargs):
+                merged = chunk.message if merged is None else merged + chunk.message
+            message = AIMessage(content=merged.content, tool_calls=merged.tool_calls)
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+    model = ScriptedChatModel(script=llm)
+
+    async def agent_node(state: MessagesState):
+        return {"messages": [await model.ainvoke(state["messages"])]}
+
+    graph = StateGraph(MessagesState)
+    graph.add_node("agent", agent_node)
+    graph.add_node("tools", ToolNode([tool(lookup)]))
+    graph.add_edge(START, "agent")
+    graph.add_conditional_edges("agent", tools_condition)
+    graph.add_edge("tools", "agent")
+
+    app = FastAPI()
+    add_langgraph_fastapi_endpoint(
+        app,
+        LangGraphAgent(name="bench", graph=graph.compile(checkpointer=MemorySaver())),
+        path=PATH,
+    )
+    return Target("langgraph", app)
+
+
+def build_pydantic_ai(llm: ScriptedLLM, concurrency: int) -> Target:
+    """pydantic-ai's AG-UI app over a FunctionModel streaming the script."""
+    from pydantic_ai import Agent
+    from pydantic_ai.messages import ToolReturnPart, UserPromptPart
+    from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+
+    async def stream_function(messages, info):
+        run_key, has_tool_result = None, False
+        for message in messages:
+            for part in message.parts:
+                if isinstance(part, UserPromptPart):
+                    run_key = find_run_key(str(part.content)) or run_key
+                    has_tool_result = False
+                elif isinstance(part, ToolReturnPart):
+                    has_tool_result = True
+
+        async for chunk in llm.stream(run_key, has_tool_result):
+            if isinstance(chunk, TextChunk):
+                yield chunk.text
+            else:
+                yield {chunk.index: DeltaToolCall(
+                    name=chunk.name, json_args=chunk.args, tool_call_id=chunk.tool_call_id
+                )}
+
+    agent = Agent(FunctionModel(stream_function=stream_function), tools=[lookup])
+    return Target("pydantic_ai", agent.to_ag_ui())
+
+
+TARGETS: Dict[str, Callable[[ScriptedLLM, int], Target]] = {
+    "reference": build_reference,
+    "adk": build_adk,
+    "langgraph": build_langgraph,
+    "pydantic_ai": build_pydantic_ai,
+}
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import unittest
+
+from ag_ui.core.events import (
+    EventType,
+    StateSnapshotEvent,
+    StepStartedEvent,
+    TextMessageChunkEvent,
+    TextMessageContentEvent,
+    ToolCallArgsEvent,
+)
+from ag_ui.streaming import EventBridge
+
+
+class TestEventBridge(unittest.IsolatedAsyncioTestCase):
+    """Test the bounded queue between agent runs and client streams"""
+
+    async def test_fifo_until_end_of_stream(self):
+        """Test events come out in order, then None after put(None)"""
+        bridge = EventBridge(maxsize=10)
+        for i in range(3):
+            await bridge.put(StepStartedEvent(step_name=f"step {i}"))
+        await bridge.put(None)
+
+        self.assertEqual([event.step_name async for event in bridge], ["step 0", "step 1", "step 2"])
+        self.assertIsNone(await bridge.get())
+        self.assertEqual(bridge.stats()["events_out"], 3)
+
+    async def test_coalesces_deltas_when_full(self):
+        """Test a full queue merges deltas for the same message instead of growing"""
+        bridge = EventBridge(maxsize=2)
+        await bridge.put(StepStartedEvent(step_name="think"))
+        for token in ("Hel", "lo", " world"):
+            await bridge.put(TextMessageContentEvent(message_id="m1", delta=token))
+
+        self.assertEqual(bridge.qsize(), 2)
+        self.assertEqual(bridge.coalesced, 2)
+        await bridge.get()
+        self.assertEqual((await bridge.get()).delta, "Hello world")
+
+        await bridge.put(StepStartedEvent(step_name="act"))
+        await bridge.put(ToolCallArgsEvent(tool_call_id="c1", delta='{"a"'))
+        self.assertTrue(bridge.put_nowait(ToolCallArgsEvent(tool_call_id="c1", delta=": 1}")))
+        self.assertEqual(bridge.coalesced, 3)
+        self.assertEqual(bridge.qsize(), 2)
+        self.assertFalse(bridge.overflowed)
+
+    async def test_chunks_only_merge_with_matching_ids(self):
+        """Test chunk events keep their boundaries when ids differ"""
+        bridge = EventBridge(maxsize=1)
+        await bridge.put(TextMessageChunkEvent(message_id="m1", role="assistant", delta="a"))
+        bridge.put_nowait(TextMessageChunkEvent(message_id="m1", delta="b"))
+        self.assertEqual(bridge.qsize(), 1)
+        self.assertFalse(bridge.put_nowait(TextMessageChunkEvent(message_id="m2", delta="c")))
+        self.assertTrue(bridge.overflowed)
+
+    async def test_snapshot_replaces_queued_snapshot(self):
+        """Test a newer snapshot supersedes the queued one when full"""
+        bridge = EventBridge(maxsize=2)
+        bridge.put_nowait(StateSnapshotEvent(snapshot={"v": 1}))
+        bridge.put_nowait(StepStartedEvent(step_name="s"))
+        self.assertTrue(bridge.put_nowait(StateSnapshotEvent(snapshot={"v": 2})))
+
+        events = [bridge.get_nowait(), bridge.get_nowait()]
+        self.assertEqual([event.type for event in events], [EventType.STEP_STARTED, EventType.STATE_SNAPSHOT])
+        self.assertEqual(events[1].snapshot, {"v": 2})
+        self.assertEqual(bridge.superseded, 1)
+
+    async def test_backpressure(self):
+        """Test put waits for the consumer when nothing can be merged"""
+        bridge = EventBridge(maxsize=1)
+        await bridge.put(StepStartedEvent(step_name="a"))
+        blocked = asyncio.create_task(bridge.put(StepStartedEvent(step_name="b")))
+        await asyncio.sleep(0)
+        self.assertFalse(blocked.done())
+
+        self.assertEqual((await bridge.get()).step_name, "a")
+        await blocked
+        self.assertEqual((await bridge.get()).step_name, "b")
+        self.assertGreater(bridge.producer_wait, 0)
+
+    async def test_cancel_stops_producer(self):
+        """Test the consumer going away cancels a producer blocked on a full queue"""
+        bridge = EventBridge(maxsize=1)
+
+        async def produce():
+            for i in range(100):
+                await bridge.put(StepStartedEvent(step_name=str(i)))
+
+        producer = asyncio.create_task(produce())
+        bridge.attach(producer)
+        await asyncio.sleep(0)
+        bridge.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await producer
+        self.assertIsNone(await bridge.get())
+        self.assertTrue(bridge.stats()["cancelled"])
+
+    async def test_put_nowait_from_thread(self):
+        """Test event bus callbacks on worker threads reach the loop"""
+        bridge = EventBridge(maxsize=10)
+
+        def callback():
+            bridge.put_nowait(StepStartedEvent(step_name="threaded"))
+            bridge.put_nowait(None)
+
+        thread = threading.Thread(target=callback)
+        thread.start()
+        thread.join()
+
+        self.assertEqual((await bridge.get()).step_name, "threaded")
+        self.assertIsNone(await bridge.get())
+
+    async def test_stalled_consumer(self):
+        """Test lag and stall detection"""
+        bridge = EventBridge()
+        self.assertFalse(bridge.is_stalled(0))
+        await bridge.put(StepStartedEvent(step_name="a"))
+        await asyncio.sleep(0.01)
+        self.assertGreater(bridge.lag, 0)
+        self.assertTrue(bridge.is_stalled(0.005))
+        self.assertFalse(bridge.is_stalled(60))
+
+
+if __name__ == "__main__":
+    unittest.main()
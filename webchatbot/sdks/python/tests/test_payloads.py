@@ -0,0 +1,83 @@
+import json
+import unittest
+
+from ag_ui.streaming import (
+    IdentityCache,
+    serialize_tool_result,
+    tool_call_args_delta,
+    truncate_tool_result,
+)
+
+
+class TestToolCallArgsDelta(unittest.TestCase):
+    """Test tool call argument deltas"""
+
+    def test_fragments_pass_through(self):
+        """Test streamed fragments are sent as they are, even when not valid JSON"""
+        for fragment in ('{"query": "wea', 'ther"}', "", "string_args"):
+            self.assertIs(tool_call_args_delta(fragment), fragment)
+
+    def test_parsed_args_are_encoded(self):
+        """Test parsed arguments are JSON-encoded"""
+        self.assertEqual(tool_call_args_delta({"param1": "value1"}), '{"param1": "value1"}')
+        self.assertEqual(tool_call_args_delta([1, 2]), "[1, 2]")
+        self.assertEqual(tool_call_args_delta(b'{"a": 1}'), '{"a": 1}')
+
+
+class TestToolResults(unittest.TestCase):
+    """Test tool result serialization and truncation"""
+
+    def test_short_result_unchanged(self):
+        """Test results within the limit are returned as they are"""
+        content = "x" * 10
+        self.assertIs(truncate_tool_result(content, 10), content)
+        self.assertIs(truncate_tool_result(content, None), content)
+
+    def test_long_result_truncated_with_marker(self):
+        """Test longer results are cut, with a marker saying how much was left out"""
+        with self.assertLogs("ag_ui.streaming.payloads", level="WARNING"):
+            truncated = truncate_tool_result("a" * 15, 10)
+        self.assertEqual(truncated, "a" * 10 + "…[truncated 5 chars]")
+
+    def test_serialize_coerces_once(self):
+        """Test the result is coerced, then JSON-encoded and truncated"""
+        calls = []
+
+        def coerce(value):
+            calls.append(value)
+            return {"value": value}
+
+        self.assertEqual(json.loads(serialize_tool_result("é", coerce=coerce)), {"value": "é"})
+        self.assertEqual(calls, ["é"])
+        self.assertEqual(serialize_tool_result("é"), '"é"')
+        self.assertEqual(serialize_tool_result({"text": "x" * 20}, max_chars=5), '{"tex…[truncated 27 chars]')
+
+
+class TestIdentityCache(unittest.TestCase):
+    """Test the per-run identity cache"""
+
+    def test_keyed_by_identity(self):
+        """Test values are found for the same object only, not for equal ones"""
+        cache = IdentityCache()
+        key = ["payload"]
+        self.assertEqual(cache.set(key, "coerced"), "coerced")
+        self.assertEqual(cache.get(key), "coerced")
+        self.assertIsNone(cache.get(["payload"]))
+        self.assertEqual(cache.get(object(), "missing"), "missing")
+
+    def test_starts_over_when_full(self):
+        """Test the cache is emptied once max_entries objects are cached"""
+        cache = IdentityCache(max_entries=2)
+        objects = [object() for _ in range(3)]
+        for index, obj in enumerate(objects):
+            cache.set(obj, index)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get(objects[2]), 2)
+        self.assertIsNone(cache.get(objects[0]))
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+
+from ag_ui.core.events import (
+    CustomEvent,
+    EventType,
+    MessagesSnapshotEvent,
+    RunFinishedEvent,
+    RunStartedEvent,
+    StateDeltaEvent,
+    StateSnapshotEvent,
+    TextMessageContentEvent,
+    TextMessageStartEvent,
+    ThinkingStartEvent,
+    ToolCallArgsEvent,
+    ToolCallResultEvent,
+    ToolCallStartEvent,
+)
+from ag_ui.core.types import AssistantMessage, FunctionCall, ToolCall, ToolMessage, UserMessage
+from ag_ui.encoder import AGUI_MEDIA_TYPE, EventDecoder, EventEncoder, accepts_protobuf
+from ag_ui.encoder.proto import decode_event, encode_event, encode_frame
+
+
+class TestContentNegotiation(unittest.TestCase):
+    """Test choosing between SSE and protobuf from the Accept header"""
+
+    def test_accepts_protobuf(self):
+        """Test the AG-UI media type must be explicitly preferred"""
+        self.assertTrue(accepts_protobuf(AGUI_MEDIA_TYPE))
+        self.assertTrue(accepts_protobuf(f"text/event-stream;q=0.5, {AGUI_MEDIA_TYPE}"))
+        self.assertFalse(accepts_protobuf(None))
+        self.assertFalse(accepts_protobuf("*/*"))
+        self.assertFalse(accepts_protobuf("text/event-stream"))
+        self.assertFalse(accepts_protobuf(f"text/event-stream, {AGUI_MEDIA_TYPE};q=0.9"))
+        self.assertFalse(accepts_protobuf(f"{AGUI_MEDIA_TYPE};q=0"))
+
+    def test_encoder_negotiates_format(self):
+        """Test the encoder output and content type follow the negotiation"""
+        event = TextMessageContentEvent(message_id="msg_1", delta="Hello")
+
+        sse = EventEncoder(accept="text/event-stream")
+        self.assertEqual(sse.get_content_type(), "text/event-stream")
+        self.assertIsInstance(sse.encode(event), str)
+        self.assertEqual(sse.encode_binary(event), sse.encode(event).encode("utf-8"))
+
+        proto = EventEncoder(accept=AGUI_MEDIA_TYPE)
+        self.assertEqual(proto.get_content_type(), AGUI_MEDIA_TYPE)
+        encoded = proto.encode(event)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(encoded, encode_frame(event))
+        self.assertEqual(int.from_bytes(encoded[:4], "big"), len(encoded) - 4)
+
+
+class TestProtobufCodec(unittest.TestCase):
+    """Test protobuf encoding and decoding of events"""
+
+    def assertRoundTrip(self, event):
+        decoded = decode_event(encode_event(event))
+        self.assertEqual(decoded, event)
+        self.assertIs(type(decoded), type(event))
+
+    def test_hot_path_events(self):
+        """Test the precompiled TEXT_MESSAGE_CONTENT / TOOL_CALL_ARGS encodings"""
+        self.assertRoundTrip(TextMessageContentEvent(message_id="msg_1", delta="Héllo ✓"))
+        self.assertRoundTrip(TextMessageContentEvent(message_id="msg_1", delta="x", timestamp=1648214400000))
+        self.assertRoundTrip(TextMessageContentEvent(message_id="msg_1", delta="x", raw_event={"id": 1}))
+        self.assertRoundTrip(ToolCallArgsEvent(tool_call_id="call_1", delta='{"query": "we'))
+
+        # Wire bytes as protoc-generated code writes them
+        event = ToolCallArgsEvent(tool_call_id="call_1", delta="{}", timestamp=42)
+        self.assertEqual(
+            encode_event(event),
+            b"\x2a\x12\x0a\x04\x08\x04\x10\x2a\x12\x06call_1\x1a\x02{}",
+        )
+
+    def test_structured_events(self):
+        """Test events carrying JSON values, patches and messages"""
+        self.assertRoundTrip(TextMessageStartEvent(message_id="msg_1", role="assistant"))
+        self.assertRoundTrip(ToolCallStartEvent(tool_call_id="c", tool_call_name="search", parent_message_id="m"))
+        self.assertRoundTrip(StateSnapshotEvent(snapshot={"items": [1, 2.5, None, True, "s", {"nested": {}}]}))
+        self.assertRoundTrip(StateDeltaEvent(delta=[
+            {"op": "add", "path": "/items/-", "value": None},
+            {"op": "move", "from": "/a", "path": "/b"},
+        ]))
+        self.assertRoundTrip(MessagesSnapshotEvent(messages=[
+            UserMessage(id="u1", content="hi"),
+            AssistantMessage(id="a1", tool_calls=[
+                ToolCall(id="c1", function=FunctionCall(name="search", arguments='{"q": 1}')),
+            ]),
+            AssistantMessage(id="a2", content="done"),
+            ToolMessage(id="t1", content="result", tool_call_id="c1"),
+        ]))
+        self.assertRoundTrip(CustomEvent(name="ping", value=None))
+        self.assertRoundTrip(RunFinishedEvent(thread_id="t", run_id="r", result={"ok": True}))
+        self.assertRoundTrip(ToolCallResultEvent(message_id="m", tool_call_id="c", content="result"))
+        self.assertRoundTrip(ThinkingStartEvent(title="Planning"))
+
+    def test_unsupported_patch_operation(self):
+        """Test invalid JSON Patch operations are rejected"""
+        with self.assertRaises(ValueError):
+            encode_event(StateDeltaEvent(delta=[{"op": "merge", "path": "/a"}]))
+
+
+class TestEventDecoder(unittest.TestCase):
+    """Test the streaming decoder"""
+
+    def test_decodes_across_chunk_boundaries(self):
+        """Test frames split at arbitrary byte boundaries"""
+        events = [
+            RunStartedEvent(thread_id="t", run_id="r"),
+            *(TextMessageContentEvent(message_id="m", delta=f"token {i} ") for i in range(5)),
+            RunFinishedEvent(thread_id="t", run_id="r"),
+        ]
+        stream = b"".join(encode_frame(event) for event in events)
+
+        decoder = EventDecoder()
+        decoded = []
+        for i in range(0, len(stream), 7):
+            decoded.extend(decoder.feed(stream[i:i + 7]))
+
+        self.assertEqual(decoded, events)
+        self.assertEqual(decoder.pending, 0)
+        self.assertEqual(decoded[1].type, EventType.TEXT_MESSAGE_CONTENT)
+
+    def test_rejects_oversized_frame(self):
+        """Test a frame larger than max_frame_size fails fast"""
+        decoder = EventDecoder(max_frame_size=16)
+        frame = encode_frame(TextMessageContentEvent(message_id="m", delta="x" * 100))
+        with self.assertRaises(ValueError):
+            decoder.feed(frame[:4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from ag_ui.core.events import (
+    EventType,
+    RunStartedEvent,
+    TextMessageContentEvent,
+    TextMessageEndEvent,
+    TextMessageStartEvent,
+    ThinkingTextMessageContentEvent,
+    ToolCallArgsEvent,
+    ToolCallEndEvent,
+    ToolCallStartEvent,
+)
+from ag_ui.encoder import AGUI_MEDIA_TYPE, EventEncoder, decode_event, encode_sse
+
+TRICKY = 'quote " backslash \\ newline \n tab \t nul \x00 unit \x1f del \x7f é 😀 </script>  '
+
+
+def _pydantic_sse(event):
+    return f"data: {event.model_dump_json(by_alias=True, exclude_none=True)}\n\n"
+
+
+class TestSseFastPath(unittest.TestCase):
+    """Test the templated SSE writers match pydantic's output"""
+
+    def test_matches_model_dump_json(self):
+        """Test byte-identical output for every templated event type"""
+        events = [
+            TextMessageStartEvent(message_id="msg_1"),
+            TextMessageStartEvent(message_id="msg_1", role="user", timestamp=1648214400000),
+            TextMessageContentEvent(message_id="msg_1", delta=TRICKY),
+            TextMessageContentEvent(message_id=TRICKY, delta="x", timestamp=-1),
+            TextMessageEndEvent(message_id="msg_1"),
+            ThinkingTextMessageContentEvent(delta=TRICKY),
+            ToolCallStartEvent(tool_call_id="call_1", tool_call_name="search"),
+            ToolCallStartEvent(tool_call_id="call_1", tool_call_name="search", parent_message_id="msg_1"),
+            ToolCallArgsEvent(tool_call_id="call_1", delta='{"query": "café'),
+            ToolCallEndEvent(tool_call_id="call_1"),
+        ]
+        for event in events:
+            with self.subTest(event=event.type):
+                self.assertEqual(encode_sse(event), _pydantic_sse(event))
+
+    def test_falls_back_to_pydantic(self):
+        """Test raw events and untemplated types go through model_dump_json"""
+        events = [
+            TextMessageContentEvent(message_id="msg_1", delta="hi", raw_event={"chunk": {"id": 1}}),
+            RunStartedEvent(thread_id="t", run_id="r"),
+        ]
+        for event in events:
+            with self.subTest(event=event.type):
+                self.assertEqual(encode_sse(event), _pydantic_sse(event))
+
+    def test_delta_shortcuts(self):
+        """Test encoding deltas from values matches encoding the model"""
+        for accept in (None, AGUI_MEDIA_TYPE):
+            encoder = EventEncoder(accept=accept, validate=False)
+            with self.subTest(accept=accept):
+                self.assertEqual(
+                    encoder.encode_text_message_content("msg_1", TRICKY, timestamp=42),
+                    encoder.encode(TextMessageContentEvent(message_id="msg_1", delta=TRICKY, timestamp=42)),
+                )
+                self.assertEqual(
+                    encoder.encode_tool_call_args("call_1", '{"a": 1}'),
+                    encoder.encode(ToolCallArgsEvent(tool_call_id="call_1", delta='{"a": 1}')),
+                )
+
+        frame = EventEncoder(accept=AGUI_MEDIA_TYPE).encode_text_message_content("msg_1", "hello")
+        self.assertEqual(decode_event(frame[4:]).type, EventType.TEXT_MESSAGE_CONTENT)
+
+    def test_empty_text_delta_rejected(self):
+        """Test the shortcut still refuses what the model would refuse"""
+        with self.assertRaises(ValueError):
+            EventEncoder(validate=False).encode_text_message_content("msg_1", "")
+
+    def test_validate_mode(self):
+        """Test debug validation catches events built without validation"""
+        event = TextMessageContentEvent.model_construct(message_id="msg_1", delta="")
+
+        self.assertIn('"delta":""', EventEncoder(validate=False).encode(event))
+        with self.assertRaises(ValueError):
+            EventEncoder(validate=True).encode(event)
+        with patch.dict(os.environ, {"AG_UI_VALIDATE_EVENTS": "1"}):
+            self.assertTrue(EventEncoder().validate)
+
+
+if __name__ == "__main__":
+    unittest.main()
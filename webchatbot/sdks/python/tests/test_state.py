@@ -0,0 +1,134 @@
+import copy
+import unittest
+
+from pydantic import BaseModel
+
+from ag_ui.core.events import (
+    EventType,
+    MessagesSnapshotEvent,
+    StateDeltaEvent,
+    StateSnapshotEvent,
+    TextMessageContentEvent,
+)
+from ag_ui.core.types import UserMessage
+from ag_ui.state import StateTracker, make_patch
+
+
+def apply_patch(document, patch):
+    """Minimal RFC 6902 apply (add/remove/replace) to check the diffs"""
+    document = copy.deepcopy(document)
+    for operation in patch:
+        if operation["path"] == "":
+            document = operation["value"]
+            continue
+        *parents, last = [
+            token.replace("~1", "/").replace("~0", "~") for token in operation["path"][1:].split("/")
+        ]
+        target = document
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        if isinstance(target, list):
+            index = int(last)
+            if operation["op"] == "add":
+                target.insert(index, operation["value"])
+            elif operation["op"] == "remove":
+                del target[index]
+            else:
+                target[index] = operation["value"]
+        elif operation["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = operation["value"]
+    return document
+
+
+class TestMakePatch(unittest.TestCase):
+    """Test JSON Patch diffing"""
+
+    def assertPatches(self, old, new):
+        patch = make_patch(old, new)
+        self.assertEqual(apply_patch(old, patch), new)
+        return patch
+
+    def test_nested_changes(self):
+        """Test adds, removes and replaces at depth"""
+        old = {"a": 1, "b": {"c": [1, 2], "d": "x"}, "gone": True}
+        new = {"a": 2, "b": {"c": [1, 3], "d": "x", "e": None}, "a/b~": 0}
+        patch = self.assertPatches(old, new)
+        self.assertIn({"op": "remove", "path": "/gone"}, patch)
+        self.assertIn({"op": "replace", "path": "/b/c/1", "value": 3}, patch)
+        self.assertIn({"op": "add", "path": "/a~1b~0", "value": 0}, patch)
+        self.assertNotIn("/b/d", [op["path"] for op in patch])
+
+    def test_list_append_and_truncate(self):
+        """Test lists changed at the end become per-item operations"""
+        messages = [{"id": str(i), "content": "hello"} for i in range(50)]
+        patch = self.assertPatches({"messages": messages}, {"messages": messages + [{"id": "50"}]})
+        self.assertEqual(patch, [{"op": "add", "path": "/messages/50", "value": {"id": "50"}}])
+
+        patch = self.assertPatches({"items": [1, 2, 3, 4]}, {"items": [1, 2]})
+        self.assertEqual([op["path"] for op in patch], ["/items/3", "/items/2"])
+
+    def test_list_insert_in_middle_replaces_list(self):
+        """Test middle insertions replace the list"""
+        patch = self.assertPatches({"items": [1, 2, 3]}, {"items": [1, 9, 2, 3]})
+        self.assertEqual(patch, [{"op": "replace", "path": "/items", "value": [1, 9, 2, 3]}])
+
+    def test_equal_values(self):
+        """Test equal documents give an empty patch"""
+        self.assertEqual(make_patch({"a": [1, {"b": 2}]}, {"a": [1, {"b": 2}]}), [])
+        self.assertEqual(make_patch({"a": 1}, {"a": "1"}), [{"op": "replace", "path": "/a", "value": "1"}])
+
+
+class TestStateTracker(unittest.TestCase):
+    """Test snapshot to delta rewriting"""
+
+    def test_snapshot_then_deltas(self):
+        """Test the first state is a snapshot and later ones are deltas"""
+        tracker = StateTracker()
+        state = {"steps": [{"status": "pending"} for _ in range(20)], "title": "Plan"}
+
+        first = tracker.process(StateSnapshotEvent(snapshot=state))
+        self.assertEqual(first.type, EventType.STATE_SNAPSHOT)
+
+        # The integration mutates its state in place between events
+        state["steps"][3]["status"] = "done"
+        second = tracker.process(StateSnapshotEvent(snapshot=state, timestamp=7))
+        self.assertIsInstance(second, StateDeltaEvent)
+        self.assertEqual(second.delta, [{"op": "replace", "path": "/steps/3/status", "value": "done"}])
+        self.assertEqual(second.timestamp, 7)
+
+        self.assertIsNone(tracker.process(StateSnapshotEvent(snapshot=state)))
+        self.assertEqual((tracker.snapshots_sent, tracker.deltas_sent), (1, 1))
+
+    def test_large_patch_falls_back_to_snapshot(self):
+        """Test a patch bigger than the snapshot is sent as a snapshot"""
+        tracker = StateTracker(min_compare_size=0)
+        tracker.process(StateSnapshotEvent(snapshot={"a": "x" * 100, "b": "y" * 100}))
+        event = tracker.process(StateSnapshotEvent(snapshot={"c": "z" * 150}))
+        self.assertEqual(event.type, EventType.STATE_SNAPSHOT)
+
+    def test_models_in_state(self):
+        """Test pydantic state is diffed as the JSON the client sees"""
+        class Item(BaseModel):
+            item_name: str
+            done: bool = False
+
+        tracker = StateTracker()
+        tracker.process(StateSnapshotEvent(snapshot={"items": [Item(item_name="a")]}))
+        event = tracker.process(StateSnapshotEvent(snapshot={"items": [Item(item_name="a", done=True)]}))
+        self.assertEqual(event.delta, [{"op": "replace", "path": "/items/0/done", "value": True}])
+
+    def test_messages_snapshot_deduplicated(self):
+        """Test an unchanged messages snapshot is dropped"""
+        tracker = StateTracker()
+        snapshot = MessagesSnapshotEvent(messages=[UserMessage(id="u1", content="hi")])
+        self.assertIs(tracker.process(snapshot), snapshot)
+        self.assertIsNone(tracker.process(snapshot.model_copy()))
+
+        other = TextMessageContentEvent(message_id="m", delta="x")
+        self.assertIs(tracker.process(other), other)
+
+
+if __name__ == "__main__":
+    unittest.main()